@@ -24,6 +24,7 @@ import pyubx2
 # local imports
 from xhoundpi.serial import StubSerialBinary
 from xhoundpi.gnss_client import GnssClient
+from xhoundpi.message import PayloadParseError
 from xhoundpi.proto_class import ProtocolClass
 from xhoundpi.proto_classifier import ProtocolClassifier
 from xhoundpi.proto_reader import ProtocolReaderProvider, UBXProtocolReader, NMEAProtocolReader
@@ -33,11 +34,23 @@ from xhoundpi.gnss_service import GnssService
 from xhoundpi.gnss_service_runner import GnssServiceRunner
 from xhoundpi.async_ext import run_sync
 import xhoundpi.gnss_service_decorators # pylint: disable=unused-import
+import xhoundpi.gnss_client_decorators # pylint: disable=unused-import
 
 from tools.hermes.parser import parser
 
 from test.log_utils import setup_test_event_logger
 
+async def get_parsed_message(queue, skipped):
+    ''' Get the next message whose payload parses, frames that fail to
+    parse are only detected when their payload is first accessed '''
+    while True:
+        message = await queue.get()
+        try:
+            message.payload # pylint: disable=pointless-statement
+            return message
+        except PayloadParseError:
+            skipped.append(message)
+
 def setUpModule():
     # parse input file into binary
     setup_test_event_logger()
@@ -56,11 +69,13 @@ def tearDownModule():
 
 class test_Functional_Gnss(unittest.TestCase):
 
-    def create_service(self, inbound_queue, outbound_queue, transport_rx, transport_tx):
+    def create_service(self, inbound_queue, outbound_queue, transport_rx, transport_tx, buffered=False): # pylint: disable=too-many-arguments
         self.maxDiff = None
         logger = structlog.get_logger()
         gnss_serial = StubSerialBinary(transport_rx, transport_tx)
         gnss_client = GnssClient(gnss_serial)
+        if buffered:
+            gnss_client = gnss_client.with_buffer(capacity=4096, chunk_size=256) # pylint: disable=no-member
         gnss_protocol_classifier = ProtocolClassifier({
             bytes(b'\x24') : ProtocolClass.NMEA,
             bytes(b'\xb5\x62') : ProtocolClass.UBX
@@ -70,8 +85,8 @@ class test_Functional_Gnss(unittest.TestCase):
             ProtocolClass.NMEA : NMEAProtocolReader()
         })
         gnss_protocol_parser_provider = ProtocolParserProvider({
-            ProtocolClass.UBX : UBXProtocolParser(lambda frame: pyubx2.UBXReader.parse(frame, validate=True)),
-            ProtocolClass.NMEA : NMEAProtocolParser(lambda frame: pynmea2.parse(frame.decode(), check=True))
+            ProtocolClass.UBX : UBXProtocolParser(lambda frame: pyubx2.UBXReader.parse(bytes(frame), validate=True)),
+            ProtocolClass.NMEA : NMEAProtocolParser(lambda frame: pynmea2.parse(str(frame, 'ascii'), check=True))
         })
         gnss_serializer_provider = ProtocolSerializerProvider({
             ProtocolClass.UBX : UBXProtocolSerializer(lambda message: message.payload.serialize()),
@@ -90,6 +105,12 @@ class test_Functional_Gnss(unittest.TestCase):
             outbound_queue=outbound_queue), gnss_serializer_provider
 
     def test_run(self):
+        self.run_sample(buffered=False)
+
+    def test_run_buffered(self):
+        self.run_sample(buffered=True)
+
+    def run_sample(self, buffered):
 
         gnss_inbound_queue = asyncio.queues.Queue()
         gnss_outbound_queue = asyncio.queues.Queue()
@@ -99,7 +120,7 @@ class test_Functional_Gnss(unittest.TestCase):
         filepath = current_dir.joinpath('functional_gnss_input.hex')
 
         with open(filepath, mode='rb') as transport_rx, BytesIO() as transport_tx:
-            service, deserializer_provider = self.create_service(gnss_inbound_queue, gnss_outbound_queue, transport_rx, transport_tx)
+            service, deserializer_provider = self.create_service(gnss_inbound_queue, gnss_outbound_queue, transport_rx, transport_tx, buffered)
             test_uuids = [f'10000000-2000-3000-4000-500000000{str(d).zfill(3)}' for d in range(999)]
             with capture_logs() as cap_logs, patch('uuid.uuid4', side_effect=test_uuids):
                 # run and wait for all tasks
@@ -140,6 +161,12 @@ class test_Functional_Gnss(unittest.TestCase):
         self.assertGreaterEqual(len(cap_logs), 1)
 
     def test_run_on_corrupt_stream(self):
+        self.run_corrupt_sample(buffered=False)
+
+    def test_run_on_corrupt_stream_buffered(self):
+        self.run_corrupt_sample(buffered=True)
+
+    def run_corrupt_sample(self, buffered):
 
         # input sample data
         input_data = bytearray.fromhex(
@@ -172,16 +199,17 @@ class test_Functional_Gnss(unittest.TestCase):
         gnss_outbound_queue = asyncio.queues.Queue()
         transport_rx = BytesIO(input_data)
         transport_tx = BytesIO()
-        service, deserializer_provider = self.create_service(gnss_inbound_queue, gnss_outbound_queue, transport_rx, transport_tx)
+        service, deserializer_provider = self.create_service(gnss_inbound_queue, gnss_outbound_queue, transport_rx, transport_tx, buffered)
 
         test_uuids = [f'10000000-2000-3000-4000-500000000{str(d).zfill(3)}' for d in range(999)]
+        skipped = []
         with capture_logs() as cap_logs, patch('uuid.uuid4', side_effect=test_uuids):
             # run and wait for all tasks
             loop = asyncio.get_event_loop()
             task = loop.create_task(service.run())
 
             # msg1
-            msg1 = run_sync(gnss_inbound_queue.get())
+            msg1 = run_sync(get_parsed_message(gnss_inbound_queue, skipped))
             raw1 = deserializer_provider.get_serializer(msg1.proto).serialize(msg1)
             run_sync(gnss_outbound_queue.put(msg1))
             self.assertEqual(msg1.proto, ProtocolClass.UBX)
@@ -189,7 +217,7 @@ class test_Functional_Gnss(unittest.TestCase):
             self.assertFalse(task.done())
 
             # msg2
-            msg2 = run_sync(gnss_inbound_queue.get())
+            msg2 = run_sync(get_parsed_message(gnss_inbound_queue, skipped))
             raw2 = deserializer_provider.get_serializer(msg2.proto).serialize(msg2)
             run_sync(gnss_outbound_queue.put(msg2))
             self.assertEqual(msg2.proto, ProtocolClass.UBX)
@@ -197,10 +225,12 @@ class test_Functional_Gnss(unittest.TestCase):
             self.assertFalse(task.done())
 
             # should circle back here
-            msg3 = run_sync(gnss_inbound_queue.get())
+            msg3 = run_sync(get_parsed_message(gnss_inbound_queue, skipped))
             raw3 = deserializer_provider.get_serializer(msg3.proto).serialize(msg3)
             self.assertEqual(msg3.proto, ProtocolClass.UBX)
             self.assertEqual(raw1, raw3)
+            # the bad NMEA checksum frame is read, but fails once parsed
+            self.assertEqual([msg.proto for msg in skipped][:1], [ProtocolClass.NMEA])
 
             task.cancel()
             with self.assertRaises(asyncio.exceptions.CancelledError):
@@ -14,9 +14,10 @@ import pynmea2
 from xhoundpi.async_ext import run_sync
 from xhoundpi.proto_class import ProtocolClass
 from xhoundpi.message import Message
-from xhoundpi.data_formatter import NMEADataFormatter, UBXDataFormatter
+from xhoundpi.data_formatter import NMEADataFormatter, NMEAFloatDataFormatter, UBXDataFormatter, UBXFloatDataFormatter
 from xhoundpi.message_editor import NMEAMessageEditor, UBXMessageEditor
-from xhoundpi.operator import NMEAOffsetOperator, UBXHiResOffsetOperator, UBXOffsetOperator
+from xhoundpi.operator import (NMEAOffsetOperator, UBXHiResOffsetOperator, UBXOffsetOperator,
+    UBXFixedOffsetOperator, UBXHiResFixedOffsetOperator)
 from xhoundpi.coordinates_offset import GeoCoordinates, StaticOffsetProvider
 from xhoundpi.operator_provider import CoordinateOperationProvider
 from xhoundpi.message_policy import HasLocationPolicy
@@ -390,3 +391,47 @@ class test_Functional_OffsetProcessor(unittest.TestCase):
         result = run_sync(processor.process(msg))
         self.assertEqual(result[1].payload.render(),
             '$GPGLL,4916.45000,N,12311.12000,W,225444,A*31')
+
+class test_Functional_OffsetProcessor_Float(test_Functional_OffsetProcessor):
+    ''' Same messages and offsets through the float math tier '''
+
+    def setup_processor(self, lat_off: D, long_off: D, alt_off: D):
+        offset_provider = StaticOffsetProvider(GeoCoordinates(lat=float(lat_off), lon=float(long_off), alt=float(alt_off)))
+        return GenericProcessor(
+            name='TestProcessor',
+            policy_provider=OnePolicyProvider(HasLocationPolicy()),
+            operator_provider=CoordinateOperationProvider(
+                nmea_operator=NMEAOffsetOperator(
+                    msg_editor=NMEAMessageEditor(),
+                    data_formatter=NMEAFloatDataFormatter(),
+                    offset_provider=offset_provider),
+                ubx_operator=UBXOffsetOperator(
+                    msg_editor=UBXMessageEditor(),
+                    data_formatter=UBXFloatDataFormatter(),
+                    offset_provider=offset_provider),
+                ubx_hires_operator=UBXHiResOffsetOperator(
+                    msg_editor=UBXMessageEditor(),
+                    data_formatter=UBXFloatDataFormatter(),
+                    offset_provider=offset_provider)))
+
+class test_Functional_OffsetProcessor_FixedPoint(test_Functional_OffsetProcessor):
+    ''' Same messages and offsets through the integer UBX operators '''
+
+    def setup_processor(self, lat_off: D, long_off: D, alt_off: D):
+        offset_provider = StaticOffsetProvider(GeoCoordinates(lat=lat_off, lon=long_off, alt=alt_off))
+        return GenericProcessor(
+            name='TestProcessor',
+            policy_provider=OnePolicyProvider(HasLocationPolicy()),
+            operator_provider=CoordinateOperationProvider(
+                nmea_operator=NMEAOffsetOperator(
+                    msg_editor=NMEAMessageEditor(),
+                    data_formatter=NMEADataFormatter(),
+                    offset_provider=offset_provider),
+                ubx_operator=UBXFixedOffsetOperator(
+                    msg_editor=UBXMessageEditor(),
+                    data_formatter=UBXDataFormatter(),
+                    offset_provider=offset_provider),
+                ubx_hires_operator=UBXHiResFixedOffsetOperator(
+                    msg_editor=UBXMessageEditor(),
+                    data_formatter=UBXDataFormatter(),
+                    offset_provider=offset_provider)))
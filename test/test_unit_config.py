@@ -18,6 +18,28 @@ class test_Config(unittest.TestCase):
         self.assertFalse(config.mock_gnss)
         self.assertEqual(config.gnss_mock_input, 'data/gnss_mock_input.hex')
         self.assertEqual(config.gnss_mock_output, 'data/gnss_mock_output.hex')
+        self.assertEqual(config.gnss_mock_passes, 0)
+        self.assertEqual(config.gnss_device, None)
+        self.assertEqual(config.gnss_buffer_capacity, 131072)
+        self.assertEqual(config.gnss_read_chunk_size, 4096)
+        self.assertEqual(config.gnss_read_batch_size, 32)
+        self.assertEqual(config.gnss_write_coalescing_size, 0)
+        self.assertEqual(config.gnss_write_coalescing_deadline, 0.01)
+        self.assertEqual(config.gnss_ubx_backend, 'library')
+        self.assertEqual(config.gnss_nmea_backend, 'library')
+        self.assertEqual(config.gnss_inbound_queue_policy, 'block')
+        self.assertEqual(config.gnss_processed_queue_policy, 'block')
+        self.assertEqual(config.gnss_outbound_queue_policy, 'block')
+        self.assertEqual(config.queue_high_watermark, 0.75)
+        self.assertEqual(config.queue_low_watermark, 0.5)
+        self.assertEqual(config.pipeline_batch_size, 32)
+        self.assertEqual(config.math_tier, 'decimal')
+        self.assertEqual(config.ubx_fixed_point, False)
+        self.assertEqual(config.epoch_assembly, False)
+        self.assertEqual(config.epoch_end_nmea, 'GLL')
+        self.assertEqual(config.epoch_timeout, 0.25)
+        self.assertEqual(config.multiprocess, False)
+        self.assertEqual(config.frame_ring_capacity, 1048576)
         self.assertEqual(config.metrics_logger_freq, 1)
         self.assertEqual(config.display_driver, 'pygame')
         self.assertEqual(config.display_height, 64)
@@ -33,6 +55,28 @@ class test_Config(unittest.TestCase):
             '--mock-gnss',
             '--gnss-mock-input /tmp/gnss-mock-in.bin',
             '--gnss-mock-output /tmp/gnss-mock-out.bin',
+            '--gnss-mock-passes 3',
+            '--gnss-device /dev/ttyACM0',
+            '--gnss-buffer-capacity 1024',
+            '--gnss-read-chunk-size 64',
+            '--gnss-read-batch-size 8',
+            '--gnss-write-coalescing-size 4096',
+            '--gnss-write-coalescing-deadline 0.5',
+            '--gnss-ubx-backend native',
+            '--gnss-nmea-backend native',
+            '--gnss-inbound-queue-policy drop-oldest',
+            '--gnss-processed-queue-policy coalesce-latest',
+            '--gnss-outbound-queue-policy drop-newest',
+            '--queue-high-watermark 0.9',
+            '--queue-low-watermark 0.1',
+            '--pipeline-batch-size 4',
+            '--math-tier float',
+            '--ubx-fixed-point',
+            '--epoch-assembly',
+            '--epoch-end-nmea RMC,GNS',
+            '--epoch-timeout 1.5',
+            '--multiprocess',
+            '--frame-ring-capacity 4096',
             '--log-config-file configlog.yml',
             '--metrics-logger-freq 3',
             '--display-driver', 'lcd128x32',
@@ -46,7 +90,29 @@ class test_Config(unittest.TestCase):
         self.assertEqual(config.mock_gnss, True)
         self.assertEqual(config.gnss_mock_input, '/tmp/gnss-mock-in.bin')
         self.assertEqual(config.gnss_mock_output, '/tmp/gnss-mock-out.bin')
+        self.assertEqual(config.gnss_mock_passes, 3)
+        self.assertEqual(config.gnss_device, '/dev/ttyACM0')
+        self.assertEqual(config.gnss_buffer_capacity, 1024)
+        self.assertEqual(config.gnss_read_chunk_size, 64)
+        self.assertEqual(config.gnss_read_batch_size, 8)
+        self.assertEqual(config.gnss_write_coalescing_size, 4096)
+        self.assertEqual(config.gnss_write_coalescing_deadline, 0.5)
+        self.assertEqual(config.gnss_ubx_backend, 'native')
+        self.assertEqual(config.gnss_nmea_backend, 'native')
         self.assertEqual(config.log_config_file, 'configlog.yml')
+        self.assertEqual(config.gnss_inbound_queue_policy, 'drop-oldest')
+        self.assertEqual(config.gnss_processed_queue_policy, 'coalesce-latest')
+        self.assertEqual(config.gnss_outbound_queue_policy, 'drop-newest')
+        self.assertEqual(config.queue_high_watermark, 0.9)
+        self.assertEqual(config.queue_low_watermark, 0.1)
+        self.assertEqual(config.pipeline_batch_size, 4)
+        self.assertEqual(config.math_tier, 'float')
+        self.assertEqual(config.ubx_fixed_point, True)
+        self.assertEqual(config.epoch_assembly, True)
+        self.assertEqual(config.epoch_end_nmea, 'RMC,GNS')
+        self.assertEqual(config.epoch_timeout, 1.5)
+        self.assertEqual(config.multiprocess, True)
+        self.assertEqual(config.frame_ring_capacity, 4096)
         self.assertEqual(config.metrics_logger_freq, 3)
         self.assertEqual(config.display_driver, 'lcd128x32')
         self.assertEqual(config.display_height, 32)
@@ -10,7 +10,7 @@ from decimal import Decimal as D, Inexact, localcontext
 from ddt import ddt, data, unpack
 
 from xhoundpi.dmath import setup_common_context
-from xhoundpi.conversion_factor import ConversionFactor, DistAngleFactorProvider
+from xhoundpi.conversion_factor import ConversionFactor, DistAngleFactorProvider, FloatDistAngleFactorProvider
 from xhoundpi.coordinates import GeoCoordinates
 
 setup_common_context()
@@ -49,3 +49,19 @@ class test_DistAngleFactorProvider(unittest.TestCase):
             self.assertEqual(round(expected.lat, self.TOLERANCE), round(actual.lat, self.TOLERANCE))
             self.assertEqual(round(expected.lon, self.TOLERANCE), round(actual.lon, self.TOLERANCE))
         location_provider.get_coordinates.assert_called_once()
+
+    @data(
+        GeoCoordinates(D("25"), D("-88"), D("0")),
+        GeoCoordinates(D("0.0"), D("-88.0"), D("0")),
+        GeoCoordinates(D("-89.0"), D("-88.0"), D("0")),
+        GeoCoordinates(D("45.0"), D("180.0"), D("1500")),
+    )
+    def test_provide_float(self, locn):
+        location_provider = Mock()
+        location_provider.get_coordinates = Mock(return_value = locn)
+        expected = DistAngleFactorProvider(location_provider).get_factor()
+        actual = FloatDistAngleFactorProvider(location_provider).get_factor()
+        self.assertIsInstance(actual.lat, float)
+        self.assertIsInstance(actual.lon, float)
+        self.assertAlmostEqual(float(expected.lat), actual.lat, delta=1e-6)
+        self.assertAlmostEqual(float(expected.lon), actual.lon, delta=1e-6)
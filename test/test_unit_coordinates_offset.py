@@ -11,7 +11,7 @@ from ddt import ddt, data, unpack
 
 from xhoundpi.dmath import deg2rad, setup_common_context
 from xhoundpi.orientation import EulerAngles
-from xhoundpi.coordinates_offset import GeoCoordinates, OrientationOffsetProvider, StaticOffsetProvider
+from xhoundpi.coordinates_offset import GeoCoordinates, FloatOrientationOffsetProvider, OrientationOffsetProvider, StaticOffsetProvider
 
 setup_common_context()
 
@@ -36,21 +36,23 @@ def _data(yaw: D, pitch: D, roll: D, r: D, lat: D, lon: D, alt: D):
         ctx.traps[Inexact] = False
         return (EulerAngles(deg2rad(yaw), deg2rad(pitch), deg2rad(roll)), r, GeoCoordinates(lat, lon, alt))
 
+ORIENTATION_CASES = (
+    _data(yaw=D("0"), pitch=D("0"), roll=D("0"), r=D("10"), lat=D("0"), lon=D("0"), alt=D("10")),
+    _data(yaw=D("0"), pitch=D("60"), roll=D("0"), r=D("10"), lat=D("8.6602540378443864676372317075294"), lon=D("0"), alt=D("5")),
+    _data(yaw=D("0"), pitch=D("30"), roll=D("0"), r=D("10"), lat=D("5"), lon=D("0"), alt=D("8.6602540378443864676372317075294")),
+    _data(yaw=D("30"), pitch=D("30"), roll=D("0"), r=D("10"), lat=D("4.33012701892219"), lon=D("2.5"), alt=D("8.6602540378443864676372317075294")),
+    _data(yaw=D("0"), pitch=D("45"), roll=D("0"), r=D("10"), lat=D("7.07106781186547"), lon=D("0"), alt=D("7.07106781186547")),
+    _data(yaw=D("45"), pitch=D("45"), roll=D("0"), r=D("10"), lat=D("5"), lon=D("5"), alt=D("7.07106781186547")),
+    _data(yaw=D("45"), pitch=D("45"), roll=D("90"), r=D("10"), lat=D("7.07106781186547"), lon=D("-7.07106781186547"), alt=D("0")),
+    _data(yaw=D("1"), pitch=D("1"), roll=D("1"), r=D("1"), lat=D("0.017751677161"), lon=D("-0.017145208251"), alt=D("0.999695413510")),
+)
+
 @ddt
 class test_OrientationOffsetProvider(unittest.TestCase):
 
     TOLERANCE = 12
 
-    @data(
-        _data(yaw=D("0"), pitch=D("0"), roll=D("0"), r=D("10"), lat=D("0"), lon=D("0"), alt=D("10")),
-        _data(yaw=D("0"), pitch=D("60"), roll=D("0"), r=D("10"), lat=D("8.6602540378443864676372317075294"), lon=D("0"), alt=D("5")),
-        _data(yaw=D("0"), pitch=D("30"), roll=D("0"), r=D("10"), lat=D("5"), lon=D("0"), alt=D("8.6602540378443864676372317075294")),
-        _data(yaw=D("30"), pitch=D("30"), roll=D("0"), r=D("10"), lat=D("4.33012701892219"), lon=D("2.5"), alt=D("8.6602540378443864676372317075294")),
-        _data(yaw=D("0"), pitch=D("45"), roll=D("0"), r=D("10"), lat=D("7.07106781186547"), lon=D("0"), alt=D("7.07106781186547")),
-        _data(yaw=D("45"), pitch=D("45"), roll=D("0"), r=D("10"), lat=D("5"), lon=D("5"), alt=D("7.07106781186547")),
-        _data(yaw=D("45"), pitch=D("45"), roll=D("90"), r=D("10"), lat=D("7.07106781186547"), lon=D("-7.07106781186547"), alt=D("0")),
-        _data(yaw=D("1"), pitch=D("1"), roll=D("1"), r=D("1"), lat=D("0.017751677161"), lon=D("-0.017145208251"), alt=D("0.999695413510")),
-    )
+    @data(*ORIENTATION_CASES)
     @unpack
     def test_provide(self, angles, radius, expected):
         orientation_provider = Mock()
@@ -69,3 +71,15 @@ class test_OrientationOffsetProvider(unittest.TestCase):
             self.assertEqual(D('0'), inverse.lon + actual.lon)
             self.assertEqual(D('0'), inverse.alt + actual.alt)
         orientation_provider.get_orientation.assert_any_call()
+
+    @data(*ORIENTATION_CASES)
+    @unpack
+    def test_provide_float(self, angles, radius, expected):
+        orientation_provider = Mock()
+        orientation_provider.get_orientation = Mock(return_value=angles)
+        provider = FloatOrientationOffsetProvider(orientation_provider, float(radius))
+        actual = provider.get_offset()
+        self.assertAlmostEqual(float(expected.lat), actual.lat, places=self.TOLERANCE)
+        self.assertAlmostEqual(float(expected.lon), actual.lon, places=self.TOLERANCE)
+        self.assertAlmostEqual(float(expected.alt), actual.alt, places=self.TOLERANCE)
+        orientation_provider.get_orientation.assert_any_call()
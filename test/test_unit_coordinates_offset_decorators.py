@@ -12,6 +12,9 @@ from xhoundpi.dmath import DECIMAL1 as D1, DECIMAL3 as D3, DECIMAL2 as D2, setup
 from xhoundpi.conversion_factor import ConversionFactor as CF, IConversionFactorProvider
 from xhoundpi.coordinates import GeoCoordinates as GC
 from xhoundpi.coordinates_offset import ICoordinatesOffsetProvider
+from xhoundpi.coordinates_provider import StaticCoordinatesProvider
+from xhoundpi.metric import CounterMetric
+from xhoundpi.orientation import EulerAngles, StaticOrientationProvider
 
 import xhoundpi.coordinates_offset_decorators # pylint: disable=unused-import
 
@@ -22,9 +25,11 @@ class StubOffsetProvider(ICoordinatesOffsetProvider):
     def __init__(self, offset: GC):
         self.__offset = offset
         self.called = False
+        self.calls = 0
 
     def get_offset(self) -> GC:
         self.called = True
+        self.calls += 1
         return self.__offset
 
 class StubFactorProvider(IConversionFactorProvider):
@@ -81,3 +86,77 @@ class test_CoordinatesOffsetProviderWithConversion(unittest.TestCase):
         # (__delattr__) remove property
         del offset_provider.called
         self.assertFalse(hasattr(offset_provider, 'called'))
+
+class test_CoordinatesOffsetProviderWithCache(unittest.TestCase):
+
+    def setUp(self):
+        self.inner = StubOffsetProvider(GC(D1, D2, D3))
+        self.orientation = StaticOrientationProvider(EulerAngles(D1, D1, D1))
+        self.location = StaticCoordinatesProvider(GC(D2, D2, D2))
+        self.epoch = 'first'
+        self.hits = CounterMetric('hits', [])
+        self.misses = CounterMetric('misses', [])
+        # pylint: disable=no-member
+        self.decorated = self.inner.with_cache( # type: ignore
+            orientation=self.orientation,
+            location=self.location,
+            epoch=lambda: self.epoch,
+            hits=self.hits,
+            misses=self.misses)
+        # pylint: enable=no-member
+
+    def test_memoised(self):
+        self.assertEqual(self.decorated.get_offset(), GC(D1, D2, D3))
+        self.assertEqual(self.decorated.get_offset(), GC(D1, D2, D3))
+        self.assertEqual(self.inner.calls, 1)
+        self.assertEqual((self.hits.value, self.misses.value), (1, 1))
+
+    def test_recomputed_on_change(self):
+        self.decorated.get_offset()
+        # same values in new model instances do not invalidate the offset
+        self.decorated._orientation = StaticOrientationProvider(EulerAngles(D(1), D(1), D(1))) # pylint: disable=protected-access
+        self.decorated.get_offset()
+        self.assertEqual(self.inner.calls, 1)
+
+        self.decorated._orientation = StaticOrientationProvider(EulerAngles(D1, D1, D2)) # pylint: disable=protected-access
+        self.decorated.get_offset()
+        self.assertEqual(self.inner.calls, 2)
+
+        self.decorated._location = StaticCoordinatesProvider(GC(D2, D2, D1)) # pylint: disable=protected-access
+        self.decorated.get_offset()
+        self.assertEqual(self.inner.calls, 3)
+
+        self.epoch = 'second'
+        self.decorated.get_offset()
+        self.decorated.get_offset()
+        self.assertEqual(self.inner.calls, 4)
+        self.assertEqual((self.hits.value, self.misses.value), (2, 4))
+
+    def test_invalidate(self):
+        self.decorated.get_offset()
+        self.decorated.invalidate()
+        self.decorated.get_offset()
+        self.assertEqual(self.inner.calls, 2)
+        self.assertEqual((self.hits.value, self.misses.value), (0, 2))
+
+    def test_without_metrics(self):
+        # pylint: disable=no-member
+        decorated = self.inner.with_cache(orientation=self.orientation, location=self.location) # type: ignore
+        # pylint: enable=no-member
+        decorated.get_offset()
+        decorated.get_offset()
+        self.assertEqual(self.inner.calls, 1)
+
+    def test_access_to_decorated_object_props(self):
+        self.decorated.get_offset()
+
+        # (__getattr__) stub's property, not decorator, should passthrough
+        self.assertTrue(self.decorated.called)
+
+        # (__setattr__) reflects change into decorated
+        self.decorated.called = False
+        self.assertFalse(self.inner.called)
+
+        # (__delattr__) remove property
+        del self.decorated.called
+        self.assertFalse(hasattr(self.inner, 'called'))
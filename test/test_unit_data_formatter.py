@@ -4,13 +4,14 @@
 # pylint: disable=line-too-long
 # pylint: disable=invalid-name
 
+import random
 import unittest
 import unittest.mock
 
 from decimal import Decimal
 
 from xhoundpi.direction import Direction, CoordAxis
-from xhoundpi.data_formatter import NMEADataFormatter, UBXDataFormatter
+from xhoundpi.data_formatter import NMEADataFormatter, NMEAFloatDataFormatter, UBXDataFormatter, UBXFloatDataFormatter
 from xhoundpi.dmath import setup_common_context
 
 setup_common_context()
@@ -455,3 +456,119 @@ class test_UBXDataFormatter(unittest.TestCase):
             converter.minimize_correction(100000000, -51, midpoint=50)
         self.assertEqual('Operation not defined for not matching signs',
             str(context.exception))
+
+    # fixed point units
+
+    def test_units_round_trip(self):
+        converter = UBXDataFormatter()
+        for base, hires in ((0, 0), (1, 1), (-1, -1), (2147483647, 99), (-2147483648, -99), (0, -5)):
+            self.assertEqual((base, hires), converter.units_to_integer(converter.integer_to_units(base, hires)))
+        for base, hires in ((0, 0), (1005, 1), (-1111, -1), (2147483647, 9), (-2147483648, -9)):
+            self.assertEqual((base, hires), converter.units_to_height_field(converter.height_field_to_units(base, hires)))
+
+    def test_decdeg_to_units(self):
+        converter = UBXDataFormatter()
+        self.assertEqual((1, 1), converter.decdeg_to_units(Decimal('0.000000001')))
+        self.assertEqual((1, 2), converter.decdeg_to_units(Decimal('0.0000000015')))
+        self.assertEqual((-2, -1), converter.decdeg_to_units(Decimal('-0.0000000015')))
+        self.assertEqual((1000, 1000), converter.decdeg_to_units(Decimal('0.000001')))
+        self.assertEqual((15, 16), converter.height_to_units(Decimal('0.00155')))
+        self.assertEqual((-16, -15), converter.height_to_units(Decimal('-0.00155')))
+
+    def test_add_units_matches_decimal(self):
+        converter = UBXDataFormatter()
+        for units in (-1000, -101, -100, -1, 0, 1, 100, 101, 1000):
+            for offset in ('0', '0.000000001', '-0.000000001', '0.0000000015', '-0.0000000015', '0.0000010005', '-0.0000010005'):
+                expected = converter.decdeg_to_integer(converter.integer_to_decdeg(0, units) + Decimal(offset))
+                actual = converter.units_to_integer(converter.add_units(units, converter.decdeg_to_units(Decimal(offset))))
+                self.assertEqual(expected, actual, msg=f'{units} + {offset}')
+
+class test_NMEAFloatDataFormatter(unittest.TestCase):
+
+    def test_degmins_to_decdeg(self):
+        converter = NMEAFloatDataFormatter()
+        self.assertAlmostEqual(49.274166666666666, converter.degmins_to_decdeg('4916.45000', Direction.N), delta=1e-13)
+        self.assertAlmostEqual(-123.18533333333333, converter.degmins_to_decdeg('12311.12000', Direction.W), delta=1e-13)
+        self.assertEqual(0.0, converter.degmins_to_decdeg('0', Direction.N))
+
+    def test_round_trip_matches_decimal(self):
+        decimal_converter = NMEADataFormatter()
+        converter = NMEAFloatDataFormatter()
+        for degmins, direction, axis, hipres in (
+            ('4916.45000', Direction.N, CoordAxis.LAT, False),
+            ('0000.00001', Direction.S, CoordAxis.LAT, False),
+            ('12311.1200000', Direction.W, CoordAxis.LON, True),
+            ('00000.0000001', Direction.E, CoordAxis.LON, True),
+            ('8959.9999999', Direction.N, CoordAxis.LAT, True),
+        ):
+            expected = decimal_converter.decdeg_to_degmins(
+                decimal_converter.degmins_to_decdeg(degmins, direction), axis, hipres=hipres)
+            actual = converter.decdeg_to_degmins(converter.degmins_to_decdeg(degmins, direction), axis, hipres=hipres)
+            self.assertEqual((degmins, direction), actual)
+            self.assertEqual(expected, actual)
+
+    def test_height_from_field(self):
+        converter = NMEAFloatDataFormatter()
+        self.assertEqual(1.0, converter.height_from_field('1'))
+        self.assertEqual(0.001, converter.height_from_field('0.001'))
+
+    def test_height_to_field(self):
+        converter = NMEAFloatDataFormatter()
+        self.assertEqual('100.0', converter.height_to_field(100.0))
+        self.assertEqual('0.0', converter.height_to_field(0.0))
+        self.assertEqual('-0.0', converter.height_to_field(-0.0))
+        self.assertEqual('-1.0', converter.height_to_field(-1.0))
+        self.assertEqual('100.123', converter.height_to_field(100.1234))
+        self.assertEqual('100.102', converter.height_to_field(100.1029))
+        self.assertEqual('545.4', converter.height_to_field(545.4))
+        self.assertEqual('1000.0', converter.height_to_field(999.9999999999))
+
+    def test_height_to_field_matches_decimal(self):
+        decimal_converter = NMEADataFormatter()
+        converter = NMEAFloatDataFormatter()
+        for field in ('545.4', '-12.001', '0.1', '8848.86', '-0.0004'):
+            self.assertEqual(
+                decimal_converter.height_to_field(decimal_converter.height_from_field(field)),
+                converter.height_to_field(converter.height_from_field(field)))
+
+class test_UBXFloatDataFormatter(unittest.TestCase):
+
+    def test_integer_round_trip(self):
+        converter = UBXFloatDataFormatter()
+        for base, hires in ((0, 0), (1, 1), (-1, -1), (2147483647, 99), (-2147483648, -99), (1231234567, 0), (51234567, 89)):
+            self.assertEqual((base, hires), converter.decdeg_to_integer(converter.integer_to_decdeg(base, hires)))
+
+    def test_height_round_trip(self):
+        converter = UBXFloatDataFormatter()
+        for base, hires in ((0, 0), (1005, 1), (-1111, -1), (2147483647, 9), (-2147483648, -9)):
+            self.assertEqual((base, hires), converter.height_to_field(converter.height_from_field(base, hires)))
+
+    def test_decdeg_to_integer(self):
+        converter = UBXFloatDataFormatter()
+        self.assertEqual((1231234567, 0), converter.decdeg_to_integer(123.1234567))
+        self.assertEqual((51234567, 89), converter.decdeg_to_integer(5.1234567899))
+        self.assertEqual((-1231234567, -89), converter.decdeg_to_integer(-123.1234567899))
+        self.assertEqual((0, -1), converter.decdeg_to_integer(-0.000000001))
+        self.assertEqual((-1, 0), converter.decdeg_to_integer(-0.0000001))
+
+    def test_units_snapped(self):
+        converter = UBXFloatDataFormatter()
+        self.assertEqual((1000, 1000), converter.decdeg_to_units(0.000001))
+        self.assertEqual((-1000, -1000), converter.decdeg_to_units(-0.000001))
+        self.assertEqual((1, 2), converter.decdeg_to_units(0.0000000015))
+        self.assertEqual((15, 15), converter.height_to_units(0.0015))
+
+    def test_offsets_match_decimal(self):
+        decimal_converter = UBXDataFormatter()
+        converter = UBXFloatDataFormatter()
+        rand = random.Random(0)
+        mismatches = 0
+        for _ in range(2000):
+            base, hires = rand.randint(-1800000000, 1800000000), rand.randint(-99, 99)
+            offset = f'{rand.uniform(-0.001, 0.001):.12f}'
+            expected = decimal_converter.decdeg_to_integer(decimal_converter.integer_to_decdeg(base, hires) + Decimal(offset))
+            actual = converter.decdeg_to_integer(converter.integer_to_decdeg(base, hires) + float(offset))
+            self.assertLessEqual(abs((expected[0] - actual[0]) * 100 + expected[1] - actual[1]), 1,
+                msg='Because the float result is at most one quantum off the Decimal result')
+            mismatches += expected != actual
+        self.assertLess(mismatches, 20, msg='Because it only differs right under a quantum')
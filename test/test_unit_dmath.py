@@ -5,10 +5,12 @@
 # pylint: disable=invalid-name
 
 import unittest
-from decimal import Decimal as D
+from decimal import Decimal as D, Inexact, ROUND_DOWN, localcontext
 from ddt import ddt, unpack, data
 
-from xhoundpi.dmath import setup_common_context, adjust, dec_to_str
+from xhoundpi import dmath
+from xhoundpi.dmath import (DECIMAL0 as D0, DECIMAL1 as D1, setup_common_context, adjust, dec_to_str,
+    pi, sin, cos, sincos, taylor_sin, taylor_cos)
 
 setup_common_context()
 
@@ -40,3 +42,77 @@ class test_adjust(unittest.TestCase):
                 adjust(D(_in),
                 leftexp=leftexp,
                 rightexp=rightexp)))
+
+def correctly_rounded(func, x: D, turns: int = 0) -> D:
+    ''' Reference value, computed with the Taylor series far over the context precision '''
+    with localcontext() as ctx:
+        ctx.traps[Inexact] = False
+        ctx.prec += 40
+        value = func(x - turns * 2 * pi())
+    with localcontext() as ctx:
+        ctx.traps[Inexact] = False
+        return +value
+
+@ddt
+class test_trig(unittest.TestCase):
+
+    @data('0.5', '-0.5', '0.0001', '0.785398', '-0.785399', '1', '1.5707963', '1.5707964',
+          '2.5', '-3.1415926', '3.14159265', '0.0174532925199432957692369', '-1.2345678901234567890123')
+    def test_correctly_rounded(self, x):
+        self.assertEqual(sin(D(x)), correctly_rounded(taylor_sin, D(x)))
+        self.assertEqual(cos(D(x)), correctly_rounded(taylor_cos, D(x)))
+
+    @data(('100', 16), ('-100', -16), ('1000.25', 159), ('123456.789', 19649))
+    @unpack
+    def test_large_arguments(self, x, turns):
+        self.assertEqual(sin(D(x)), correctly_rounded(taylor_sin, D(x), turns))
+        self.assertEqual(cos(D(x)), correctly_rounded(taylor_cos, D(x), turns))
+
+    def test_result_close_to_zero(self):
+        # NOTE pi (pi/2) cut at 25 digits, sin (cos) is the rest of the digits of pi (pi/2)
+        self.assertEqual(sin(D('3.141592653589793238462643')), D('3.83279502884197169399375E-25'))
+        self.assertEqual(cos(D('1.570796326794896619231321')), D('6.91639751442098584699688E-25'))
+
+    @data('1E-10', '-1E-20', '3.3E-45', '0.000976')
+    def test_small_arguments(self, x):
+        # NOTE the sine of small arguments is as small as them, it is correctly
+        #      rounded without building tables beyond the working precision
+        tables = dmath._trig_tables # pylint: disable=protected-access
+        sincos(D('0.5'))
+        built = set(tables)
+        self.assertEqual(sin(D(x)), correctly_rounded(taylor_sin, D(x)))
+        self.assertEqual(cos(D(x)), correctly_rounded(taylor_cos, D(x)))
+        self.assertEqual(set(tables), built)
+
+    def test_zero(self):
+        self.assertEqual(sin(D0), D0)
+        self.assertEqual(cos(D0), D1)
+        self.assertEqual(sincos(D0), (D0, D1))
+
+    @data(0.5, -2.2, 1e-10, 100, 0.0)
+    def test_floats(self, x):
+        self.assertEqual(sin(x), float(sin(D(repr(x)))))
+        self.assertEqual(cos(x), float(cos(D(repr(x)))))
+        self.assertEqual(sincos(x), (sin(x), cos(x)))
+        self.assertIsInstance(sin(x), float)
+
+    def test_complex_sin(self):
+        self.assertEqual(sin(0.5+0j), taylor_sin(0.5+0j))
+
+    def test_sincos(self):
+        for x in ('0.3', '-2.2', '7.77'):
+            self.assertEqual(sincos(D(x)), (sin(D(x)), cos(D(x))))
+
+    @data(12, 24, 40, 60)
+    def test_context_precision(self, prec):
+        with localcontext() as ctx:
+            ctx.prec = prec
+            self.assertEqual(sin(D('0.7')), correctly_rounded(taylor_sin, D('0.7')))
+            self.assertEqual(len(sin(D('0.7')).as_tuple().digits), prec)
+
+    def test_context_rounding(self):
+        # cos(1E-13) = 0.99999999999999999999999999500000...
+        self.assertEqual(cos(D('1E-13')), D('1.00000000000000000000000'))
+        with localcontext() as ctx:
+            ctx.rounding = ROUND_DOWN
+            self.assertEqual(cos(D('1E-13')), D('0.999999999999999999999999'))
@@ -0,0 +1,193 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import asyncio
+import struct
+import unittest
+import uuid
+
+from asyncio.tasks import wait_for
+from unittest.mock import Mock
+
+from xhoundpi.async_ext import run_sync
+from xhoundpi.epoch import Epoch, EpochAssembler, EpochAssemblerPump, epoch_time
+from xhoundpi.message import Message
+from xhoundpi.message_policy import HeaderIdentityPolicy
+from xhoundpi.metric import SuccessCounterMetric
+from xhoundpi.proto_class import ProtocolClass
+
+def ubx(ident: bytes, payload: bytes) -> Message:
+    frame = b'\xb5\x62' + ident + struct.pack('<H', len(payload)) + payload + b'\x00\x00'
+    return Message(message_id=uuid.uuid4(), proto=ProtocolClass.UBX, frame=frame, parser=Mock())
+
+def nmea(sentence: bytes) -> Message:
+    return Message(message_id=uuid.uuid4(), proto=ProtocolClass.NMEA, frame=sentence + b'*00\r\n', parser=Mock())
+
+def nav_pvt(itow: int) -> Message:
+    return ubx(b'\x01\x07', struct.pack('<I', itow) + bytes(88))
+
+def nav_hpposllh(itow: int) -> Message:
+    return ubx(b'\x01\x14', bytes(4) + struct.pack('<I', itow) + bytes(28))
+
+NAV_EOE = b'\x01\x61'
+
+class test_epoch_time(unittest.TestCase):
+
+    def test_ubx_itow(self):
+        self.assertEqual(epoch_time(nav_pvt(498670000)), ('itow', 498670000))
+        self.assertEqual(epoch_time(nav_hpposllh(498670200)), ('itow', 498670200))
+        self.assertEqual(epoch_time(ubx(NAV_EOE, struct.pack('<I', 1000))), ('itow', 1000))
+
+    def test_nmea_utc(self):
+        self.assertEqual(epoch_time(nmea(b'$GPGGA,183246.00,4717.11,N,00833.91,E,1,08,0.9,545.4,M,46.9,M,,')), ('utc', b'183246.00'))
+        self.assertEqual(epoch_time(nmea(b'$GNRMC,183246.00,A,4717.11,N,00833.91,E,0.0,,230394,,,A')), ('utc', b'183246.00'))
+        self.assertEqual(epoch_time(nmea(b'$GNGLL,4717.11,N,00833.91,E,183246.00,A,A')), ('utc', b'183246.00'))
+
+    def test_messages_without_time(self):
+        # sentence types without time, no time yet, truncated frames, other protocols
+        self.assertIsNone(epoch_time(nmea(b'$GPGSV,3,1,09,04,52,188,20')))
+        self.assertIsNone(epoch_time(nmea(b'$GPGGA,,,,,,0,00,99.99,,,,,,')))
+        self.assertIsNone(epoch_time(nmea(b'$GNGLL,4717.11,N')))
+        self.assertIsNone(epoch_time(ubx(b'\x0a\x09', bytes(60))))
+        self.assertIsNone(epoch_time(ubx(b'\x01\x07', bytes(2))))
+        self.assertIsNone(epoch_time(Message(message_id=None, proto=ProtocolClass.NONE, frame=b'\x00')))
+        self.assertIsNone(epoch_time(Message(message_id=None, proto=ProtocolClass.UBX, payload='payload')))
+
+    def test_payload_not_parsed(self):
+        message = nav_pvt(1000)
+        epoch_time(message)
+        message.parser.assert_not_called()
+
+class test_Epoch(unittest.TestCase):
+
+    def test_latest(self):
+        messages = [nmea(b'$GPGGA,1'), nmea(b'$GPGSV,1'), nmea(b'$GPRMC,1')]
+        epoch = Epoch(epoch_id=uuid.uuid4(), messages=messages)
+        self.assertIs(epoch.latest(lambda msg: True), messages[2])
+        self.assertIs(epoch.latest(lambda msg: msg.frame.startswith(b'$GPG')), messages[1])
+        self.assertIsNone(epoch.latest(lambda msg: False))
+
+class test_EpochAssembler(unittest.TestCase):
+
+    def setUp(self):
+        self.counter = SuccessCounterMetric('epochs', [])
+        self.assembler = EpochAssembler(
+            end_policy=HeaderIdentityPolicy({ProtocolClass.UBX: {NAV_EOE}}),
+            counter=self.counter)
+
+    def test_groups_by_time(self):
+        first = [nmea(b'$GPGSV,3,1,09'), nav_pvt(1000), nav_hpposllh(1000), nmea(b'$GPGGA,183246.00,,'), nmea(b'$GPTXT,01')]
+        second = [nav_pvt(2000), nmea(b'$GPRMC,183247.00,A')]
+
+        completed = []
+        for message in first + second:
+            completed += self.assembler.add(message)
+
+        self.assertEqual(len(completed), 1)
+        self.assertEqual(completed[0].messages, first)
+        self.assertEqual((completed[0].itow, completed[0].utc), (1000, b'183246.00'))
+        self.assertEqual(self.assembler.current.messages, second)
+        self.assertEqual((self.assembler.current.itow, self.assembler.current.utc), (2000, b'183247.00'))
+
+    def test_time_change_on_any_base_starts_epoch(self):
+        self.assertEqual(self.assembler.add(nav_pvt(1000)), [])
+        self.assertEqual(self.assembler.add(nmea(b'$GPGGA,183246.00,,')), [])
+        completed = self.assembler.add(nmea(b'$GPGGA,183247.00,,'))
+        self.assertEqual(len(completed), 1)
+        self.assertEqual(completed[0].utc, b'183246.00')
+        # the new epoch is not tagged with the iTOW of the previous one
+        self.assertIsNone(self.assembler.current.itow)
+
+    def test_end_policy_completes_epoch(self):
+        pvt = nav_pvt(1000)
+        eoe = ubx(NAV_EOE, struct.pack('<I', 1000))
+        self.assertEqual(self.assembler.add(pvt), [])
+        completed = self.assembler.add(eoe)
+        self.assertEqual(len(completed), 1)
+        self.assertEqual(completed[0].messages, [pvt, eoe])
+        self.assertTrue(completed[0].complete)
+        self.assertIsNone(self.assembler.current)
+        self.assertEqual(self.counter.success, 1)
+
+    def test_message_closing_and_ending_epochs(self):
+        self.assembler.add(nav_pvt(1000))
+        # NOTE an end marker of a new epoch closes both the previous one and its own
+        completed = self.assembler.add(ubx(NAV_EOE, struct.pack('<I', 2000)))
+        self.assertEqual([(epoch.itow, epoch.complete) for epoch in completed], [(1000, False), (2000, True)])
+        self.assertEqual((self.counter.success, self.counter.failure), (1, 1))
+
+    def test_time_change_without_end_closes_incomplete(self):
+        first = [nav_pvt(1000), nav_hpposllh(1000)]
+        # NOTE the NAV-EOE of the first epoch is lost
+        self.assembler.add(first[0])
+        self.assembler.add(first[1])
+        completed = self.assembler.add(nav_pvt(2000))
+        self.assertEqual(len(completed), 1)
+        self.assertEqual(completed[0].messages, first)
+        self.assertFalse(completed[0].complete)
+        self.assertEqual((self.counter.success, self.counter.failure), (0, 1))
+        completed = self.assembler.add(ubx(NAV_EOE, struct.pack('<I', 2000)))
+        self.assertTrue(completed[0].complete)
+        self.assertEqual((self.counter.success, self.counter.failure), (1, 1))
+
+    def test_time_change_completes_epoch_without_end_policy(self):
+        assembler = EpochAssembler(counter=self.counter)
+        assembler.add(nav_pvt(1000))
+        completed = assembler.add(nav_pvt(2000))
+        self.assertEqual(len(completed), 1)
+        self.assertTrue(completed[0].complete)
+        self.assertEqual((self.counter.success, self.counter.failure), (1, 0))
+
+    def test_close_incomplete(self):
+        self.assertIsNone(self.assembler.close())
+        pvt = nav_pvt(1000)
+        self.assembler.add(pvt)
+        epoch = self.assembler.close()
+        self.assertEqual(epoch.messages, [pvt])
+        self.assertFalse(epoch.complete)
+        self.assertIsNone(self.assembler.current)
+        self.assertEqual((self.counter.success, self.counter.failure), (0, 1))
+
+class test_EpochAssemblerPump(unittest.TestCase):
+
+    def test_run(self):
+        in_queue = asyncio.queues.Queue()
+        out_queue = asyncio.queues.Queue()
+        pump = EpochAssemblerPump(
+            input_queue=in_queue,
+            output_queue=out_queue,
+            assembler=EpochAssembler(end_policy=HeaderIdentityPolicy({ProtocolClass.UBX: {NAV_EOE}})),
+            timeout=0.05,
+            batch_size=4)
+        task = asyncio.get_event_loop().create_task(pump.run())
+
+        first = [nav_pvt(1000), nmea(b'$GPGSV,3,1,09'), ubx(NAV_EOE, struct.pack('<I', 1000))]
+        second = [nav_pvt(2000), nmea(b'$GPTXT,01')]
+        for message in first + second:
+            in_queue.put_nowait(message)
+
+        epoch = run_sync(out_queue.get())
+        self.assertEqual(epoch.messages, first)
+        self.assertTrue(epoch.complete)
+
+        # the end of the second epoch is never seen, it is closed on the timeout
+        epoch = run_sync(out_queue.get())
+        self.assertEqual(epoch.messages, second)
+        self.assertFalse(epoch.complete)
+        self.assertTrue(out_queue.empty())
+
+        # the timeout runs since the first message of the epoch
+        run_sync(in_queue.put(nav_pvt(3000)))
+        run_sync(asyncio.sleep(0.03))
+        run_sync(in_queue.put(nmea(b'$GPGSV,3,1,09')))
+        self.assertTrue(out_queue.empty())
+        epoch = run_sync(out_queue.get())
+        self.assertEqual(len(epoch.messages), 2)
+        self.assertFalse(task.done())
+
+        task.cancel()
+        with self.assertRaises(asyncio.exceptions.CancelledError):
+            run_sync(wait_for(task, 1))
@@ -0,0 +1,68 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+from decimal import Decimal as D, Inexact, localcontext
+from ddt import ddt, data, unpack
+
+from xhoundpi import dmath, fmath
+from xhoundpi.coordinates import GeoCoordinates
+
+dmath.setup_common_context()
+
+@ddt
+class test_fmath(unittest.TestCase):
+
+    @data(
+        (0.1234567, 10 ** 7, 1234567),
+        (-0.1234567, 10 ** 7, -1234567),
+        (0.1234567989, 10 ** 7, 1234567),
+        (-0.1234567989, 10 ** 7, -1234567),
+        (0.12345679999, 10 ** 7, 1234568),
+        (-0.12345679999, 10 ** 7, -1234568),
+        (0.0, 10 ** 9, 0),
+        (-0.0, 10 ** 9, 0),
+        (214.748364799, 10 ** 9, 214748364799),
+        (-214.748364899, 10 ** 9, -214748364899),
+    )
+    @unpack
+    def test_quantize(self, value, scale, expected):
+        self.assertEqual(expected, fmath.quantize(value, scale))
+
+    def test_quantize_snaps_on_field_values(self):
+        for quanta in range(-100000, 100000, 7):
+            self.assertEqual(quanta, fmath.quantize(quanta / 10 ** 9 + 123.0, 10 ** 9) - 123 * 10 ** 9,
+                msg='Because a value read from a field must be written back unchanged')
+
+    def test_split_matches_decimal_divmod(self):
+        for quanta in (0, 1, -1, 99, -99, 100, -100, 101, -101, 214748364799, -214748364899):
+            self.assertEqual(tuple(int(part) for part in divmod(D(quanta), D(100))), fmath.split(quanta, 100))
+
+    @data(
+        (25.0, -88.0, 0.0),
+        (0.0, 0.0, 0.0),
+        (45.0, 180.0, 1500.0),
+        (-89.0, 12.5, -30.0),
+    )
+    @unpack
+    def test_geodethic_to_ecef(self, lat, lon, alt):
+        actual = fmath.geodethic_to_ecef(GeoCoordinates(lat, lon, alt))
+        with localcontext() as ctx:
+            ctx.traps[Inexact] = False
+            expected = dmath.geodethic_to_ecef(GeoCoordinates(D(str(lat)), D(str(lon)), D(str(alt))))
+        for actual_coord, expected_coord in zip(actual, expected):
+            self.assertAlmostEqual(float(expected_coord), actual_coord, delta=abs(float(expected_coord)) * 1e-12 + 1e-9)
+
+    def test_distance(self):
+        self.assertEqual(5.0, fmath.distance((0.0, 0.0), (3.0, 4.0)))
+        with self.assertRaises(ValueError):
+            fmath.distance((0.0, 0.0), (3.0, 4.0, 5.0))
+
+    def test_deg2rad(self):
+        with localcontext() as ctx:
+            ctx.traps[Inexact] = False
+            expected = float(dmath.deg2rad(D('33.3')))
+        self.assertAlmostEqual(expected, fmath.deg2rad(33.3), delta=1e-15)
@@ -0,0 +1,99 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import asyncio
+import unittest
+
+from xhoundpi.frame_ring import FrameRingReader, FrameRingWriter, HEADER
+from xhoundpi.message_route import Route
+from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.async_ext import run_sync
+
+class test_FrameRing(unittest.TestCase):
+
+    def setUp(self):
+        self.reader = FrameRingReader.create(capacity=64)
+        self.writer = FrameRingWriter.attach(self.reader.handle)
+
+    def tearDown(self):
+        self.writer.close()
+        self.reader.close()
+
+    def test_put_get_in_order(self):
+        run_sync(self.writer.put(ProtocolClass.UBX, Route.PROCESS, b'\xb5\x62\x01\x02'))
+        run_sync(self.writer.put(ProtocolClass.NMEA, Route.PASSTHROUGH, b'$GPGSV'))
+        run_sync(self.writer.put(ProtocolClass.NMEA, Route.PROCESS, b''))
+        self.writer.flush()
+
+        self.assertEqual(run_sync(self.reader.get_batch()), [
+            (ProtocolClass.UBX, Route.PROCESS, b'\xb5\x62\x01\x02', b''),
+            (ProtocolClass.NMEA, Route.PASSTHROUGH, b'$GPGSV', b''),
+            (ProtocolClass.NMEA, Route.PROCESS, b'', b''),
+        ])
+
+    def test_put_get_payloads(self):
+        run_sync(self.writer.put(ProtocolClass.NMEA, Route.PROCESS, b'$GPGGA', b'\x80\x05'))
+        run_sync(self.writer.put(ProtocolClass.NMEA, Route.PASSTHROUGH, b'$GPGSV'))
+        self.writer.flush()
+
+        self.assertEqual(run_sync(self.reader.get_batch()), [
+            (ProtocolClass.NMEA, Route.PROCESS, b'$GPGGA', b'\x80\x05'),
+            (ProtocolClass.NMEA, Route.PASSTHROUGH, b'$GPGSV', b''),
+        ])
+
+    def test_frames_published_on_flush(self):
+        run_sync(self.writer.put(ProtocolClass.NMEA, Route.PROCESS, b'$GPGGA'))
+        with self.assertRaises(asyncio.TimeoutError):
+            run_sync(self.reader.get_batch(), timeout=0.1)
+
+        self.writer.flush()
+        self.assertEqual(run_sync(self.reader.get_batch()),
+            [(ProtocolClass.NMEA, Route.PROCESS, b'$GPGGA', b'')])
+
+    def test_wraparound(self):
+        # NOTE 17 and 13 byte records do not divide the ring capacity, headers,
+        #      frames and payloads get split around the end of the ring
+        for index in range(20):
+            records = [(bytes([index, index + 1] * 3) + b'x', b''), (bytes([index] * 2), bytes([index + 1]))]
+            for frame, payload in records:
+                run_sync(self.writer.put(ProtocolClass.UBX, Route.PROCESS, frame, payload))
+            self.writer.flush()
+            self.assertEqual(run_sync(self.reader.get_batch()),
+                [(ProtocolClass.UBX, Route.PROCESS, frame, payload) for frame, payload in records])
+
+    def test_backpressure(self):
+        frame = bytes(32 - HEADER.size)
+        run_sync(self.writer.put(ProtocolClass.UBX, Route.PROCESS, frame))
+        run_sync(self.writer.put(ProtocolClass.UBX, Route.PROCESS, frame))
+
+        # the ring is full, the records pending are flushed while waiting
+        loop = asyncio.get_event_loop()
+        put = loop.create_task(self.writer.put(ProtocolClass.NMEA, Route.PROCESS, b'$GPRMC'))
+        with self.assertRaises(asyncio.TimeoutError):
+            run_sync(asyncio.wait_for(asyncio.shield(put), 0.1))
+        self.assertEqual(len(run_sync(self.reader.get_batch())), 2)
+
+        run_sync(put)
+        self.writer.flush()
+        self.assertEqual(run_sync(self.reader.get_batch()),
+            [(ProtocolClass.NMEA, Route.PROCESS, b'$GPRMC', b'')])
+
+    def test_frame_larger_than_ring(self):
+        with self.assertRaises(ValueError):
+            run_sync(self.writer.put(ProtocolClass.UBX, Route.PROCESS, bytes(64)))
+        with self.assertRaises(ValueError):
+            run_sync(self.writer.put(ProtocolClass.UBX, Route.PROCESS, bytes(32), bytes(32)))
+
+    def test_writer_gone(self):
+        run_sync(self.writer.put(ProtocolClass.NMEA, Route.PROCESS, b'$GPGLL'))
+        self.writer.flush()
+        self.writer.close()
+
+        # records published before the writer is gone are still read
+        self.assertEqual(run_sync(self.reader.get_batch()),
+            [(ProtocolClass.NMEA, Route.PROCESS, b'$GPGLL', b'')])
+        with self.assertRaises(EOFError):
+            run_sync(self.reader.get_batch())
@@ -0,0 +1,77 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+
+from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.metric import CounterMetric
+from xhoundpi.frame_validator import (ChecksumFrameValidator, FrameChecksumError,
+    StubFrameValidator, valid_nmea_checksum, valid_ubx_checksum)
+
+UBX_FRAME = bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+NMEA_FRAME = b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,18.893,M,-25.669,M,2.0,0031*4F\r\n'
+
+class test_FrameChecks(unittest.TestCase):
+
+    def test_ubx_checksum(self):
+        self.assertTrue(valid_ubx_checksum(UBX_FRAME))
+        self.assertTrue(valid_ubx_checksum(memoryview(UBX_FRAME)))
+        self.assertTrue(valid_ubx_checksum(bytes.fromhex('B5 62 01 35 00 00 36 A3')))
+        self.assertFalse(valid_ubx_checksum(UBX_FRAME[:-1] + b'\xf2'))
+        self.assertFalse(valid_ubx_checksum(UBX_FRAME[:6] + b'\x11' + UBX_FRAME[7:]))
+        self.assertFalse(valid_ubx_checksum(bytes.fromhex('B5 62 01')))
+
+    def test_nmea_checksum(self):
+        self.assertTrue(valid_nmea_checksum(NMEA_FRAME))
+        self.assertTrue(valid_nmea_checksum(memoryview(NMEA_FRAME)))
+        self.assertTrue(valid_nmea_checksum(b'!AIVDM,1,1,,B,177KQJ5000G?tO`K>RA1wUbN0TKH,0*5C\r\n'))
+        self.assertTrue(valid_nmea_checksum(NMEA_FRAME.replace(b'*4F', b'*4f')))
+        self.assertFalse(valid_nmea_checksum(NMEA_FRAME.replace(b'*4F', b'*4E')))
+        self.assertFalse(valid_nmea_checksum(NMEA_FRAME.replace(b'172814', b'172815')))
+        self.assertFalse(valid_nmea_checksum(NMEA_FRAME.replace(b'*4F', b'*ZZ')))
+        self.assertFalse(valid_nmea_checksum(NMEA_FRAME.replace(b'*4F', b'')))
+
+class test_ChecksumFrameValidator(unittest.TestCase):
+
+    def test_accepts_valid_frames(self):
+        validator = ChecksumFrameValidator()
+        self.assertTrue(validator.validate(ProtocolClass.UBX, UBX_FRAME))
+        self.assertTrue(validator.validate(ProtocolClass.NMEA, NMEA_FRAME))
+
+    def test_accepts_unchecked_protocols(self):
+        self.assertTrue(ChecksumFrameValidator().validate(ProtocolClass.NONE, b'\x00'))
+
+    def test_rejects_and_counts_per_protocol(self):
+        ubx_rejected = CounterMetric('ubx', [])
+        nmea_rejected = CounterMetric('nmea', [])
+        validator = ChecksumFrameValidator({
+            ProtocolClass.UBX : ubx_rejected,
+            ProtocolClass.NMEA : nmea_rejected,
+        })
+
+        self.assertFalse(validator.validate(ProtocolClass.UBX, memoryview(bytes.fromhex('B5 62 01 35 00 00 36 A4'))))
+        for _ in range(2):
+            self.assertFalse(validator.validate(ProtocolClass.NMEA, NMEA_FRAME.replace(b'*4F', b'*00')))
+
+        self.assertEqual(ubx_rejected.value, 1)
+        self.assertEqual(nmea_rejected.value, 2)
+
+    def test_rejects_without_counters(self):
+        self.assertFalse(ChecksumFrameValidator().validate(ProtocolClass.NMEA, NMEA_FRAME.replace(b'*4F', b'*00')))
+
+class test_FrameChecksumError(unittest.TestCase):
+
+    def test_error(self):
+        frame = bytes.fromhex('B5 62 01 35 00 00 36 A4')
+        error = FrameChecksumError(ProtocolClass.UBX, frame)
+        self.assertEqual(error.protocol, ProtocolClass.UBX)
+        self.assertEqual(error.frame, frame)
+        self.assertEqual(str(error), "Checksum mismatch on ProtocolClass.UBX frame '0xB5620135000036A4'")
+
+class test_StubFrameValidator(unittest.TestCase):
+
+    def test_accepts_everything(self):
+        self.assertTrue(StubFrameValidator().validate(ProtocolClass.UBX, b'\x00'))
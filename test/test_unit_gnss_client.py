@@ -6,7 +6,10 @@
 
 import unittest
 from io import BytesIO
+from unittest.mock import AsyncMock, Mock
 
+from xhoundpi.async_ext import run_sync
+from xhoundpi.serial import ISerial
 from xhoundpi.serial import StubSerialBinary
 from xhoundpi.gnss_client import GnssClient
 
@@ -35,3 +38,42 @@ class test_GnssClient(unittest.TestCase):
 
         self.assertEqual(3, client.write(bytes.fromhex('02 03 04')))
         self.assertEqual(b'\x01\x02\x03\x04', tx.getvalue())
+
+    def test_writev(self):
+        serial = Mock(spec=ISerial)
+        serial.writev = Mock(return_value=3)
+        client = GnssClient(serial)
+
+        self.assertEqual(3, client.writev([b'\x01', b'\x02\x03']))
+        serial.writev.assert_called_once_with([b'\x01', b'\x02\x03'])
+
+        tx = BytesIO()
+        client = GnssClient(tx)
+        self.assertEqual(3, client.writev([b'\x01', b'\x02\x03']))
+        self.assertEqual(b'\x01\x02\x03', tx.getvalue())
+
+    def test_flush(self):
+        # NOTE output is not held by plain clients
+        self.assertEqual(0, GnssClient(BytesIO()).flush())
+
+    def test_wait_readable(self):
+        serial = Mock(spec=ISerial)
+        serial.wait_readable = AsyncMock()
+        client = GnssClient(serial)
+
+        run_sync(client.wait_readable())
+        serial.wait_readable.assert_awaited_once()
+
+        # plain streams are always readable
+        run_sync(GnssClient(BytesIO()).wait_readable())
+
+    def test_wait_writable(self):
+        serial = Mock(spec=ISerial)
+        serial.wait_writable = AsyncMock()
+        client = GnssClient(serial)
+
+        run_sync(client.wait_writable())
+        serial.wait_writable.assert_awaited_once()
+
+        # plain streams are always writable
+        run_sync(GnssClient(BytesIO()).wait_writable())
@@ -4,12 +4,19 @@
 # pylint: disable=line-too-long
 # pylint: disable=invalid-name
 
+import asyncio
 import unittest
 
 from unittest.mock import Mock
 
-from xhoundpi.gnss_client import IGnssClient
-from xhoundpi.metric import ValueMetric
+from test.time_utils import FakeStopWatch
+
+from xhoundpi.async_ext import run_sync
+from xhoundpi.events import AppEvent
+
+from xhoundpi.gnss_client import IGnssClient, IBufferedGnssClient
+from xhoundpi.metric import LatencyMetric, SuccessCounterMetric, ValueMetric
+from xhoundpi.ring_buffer import RingBufferOverflowError
 import xhoundpi.gnss_client_decorators # pylint: disable=unused-import
 
 class StubGnssClient(IGnssClient):
@@ -26,6 +33,27 @@ class StubGnssClient(IGnssClient):
         self.last_written = data
         return len(data)
 
+class VectorGnssClient(IGnssClient):
+
+    def __init__(self):
+        self.writes = []
+        self.limit = None
+        self.error = None
+        self.some_internal_prop = 'test'
+
+    def read(self, size) -> bytes:
+        return b''
+
+    def write(self, data: bytes) -> int:
+        return self.writev([data])
+
+    def writev(self, buffers) -> int:
+        if self.error is not None:
+            raise self.error
+        self.writes.append(list(buffers))
+        data = b''.join(buffers)
+        return len(data) if self.limit is None else min(len(data), self.limit)
+
 class test_GnssClientWithMetrics(unittest.TestCase):
 
     def test_count_read_write_bytes(self):
@@ -61,6 +89,15 @@ class test_GnssClientWithMetrics(unittest.TestCase):
         self.assertEqual(written.value, 4)
         hook.assert_called_with('gnss_client_written_bytes', 4)
 
+    def test_count_writev_bytes(self):
+        client = VectorGnssClient()
+        written = ValueMetric('gnss_client_written_bytes', [])
+        decorated = client.with_metrics(cbytes_read=ValueMetric('read', []), cbytes_written=written) # pylint: disable=no-member
+
+        self.assertEqual(decorated.writev([b'\x01', b'\x02\x03']), 3)
+        self.assertEqual(client.writes, [[b'\x01', b'\x02\x03']])
+        self.assertEqual(written.value, 3)
+
     def test_access_to_decorated_object_props(self):
         client = StubGnssClient(b'\xff')
         hook = Mock()
@@ -74,3 +111,338 @@ class test_GnssClientWithMetrics(unittest.TestCase):
         self.assertEqual('changed', decorated.some_internal_prop)
         del decorated.some_internal_prop
         self.assertFalse(hasattr(decorated, 'some_internal_prop'))
+
+class ChunkedGnssClient(IGnssClient):
+
+    def __init__(self, data: bytes):
+        self.data = bytearray(data)
+        self.reads = []
+        self.last_written = None
+        self.some_internal_prop = 'test'
+
+    def read(self, size) -> bytes:
+        self.reads.append(size)
+        chunk = self.data[:size]
+        del self.data[:size]
+        return bytes(chunk)
+
+    def write(self, data: bytes) -> int:
+        self.last_written = data
+        return len(data)
+
+class NonBlockingGnssClient(ChunkedGnssClient):
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.waits = 0
+
+    def read(self, size) -> bytes:
+        if not self.data:
+            raise BlockingIOError()
+        return super().read(size)
+
+    async def wait_readable(self):
+        self.waits += 1
+
+    async def wait_writable(self):
+        self.waits += 1
+
+class test_GnssClientWithBuffer(unittest.TestCase):
+
+    def test_reads_in_chunks(self):
+        client = ChunkedGnssClient(b'\x01\x02\x03\x04\x05\x06\x07\x08\x09')
+        decorated = client.with_buffer(capacity=16, chunk_size=4) # pylint: disable=no-member
+
+        self.assertIsInstance(decorated, IBufferedGnssClient)
+        self.assertIsInstance(decorated.peek(1), memoryview)
+        self.assertIsInstance(decorated.read(0), memoryview)
+        self.assertEqual(decorated.read(), b'\x01')
+        self.assertEqual(client.reads, [4])
+        self.assertEqual(decorated.read(2), b'\x02\x03')
+        self.assertEqual(client.reads, [4])
+        self.assertEqual(decorated.read(3), b'\x04\x05\x06')
+        self.assertEqual(client.reads, [4, 4])
+        self.assertEqual(decorated.read(10), b'\x07\x08\x09')
+        self.assertEqual(decorated.read(10), b'')
+
+    def test_peek_does_not_consume(self):
+        client = ChunkedGnssClient(b'\xb5\x62\x01\x02')
+        decorated = client.with_buffer(capacity=16, chunk_size=2) # pylint: disable=no-member
+
+        self.assertEqual(bytes(decorated.peek(3)), b'\xb5\x62\x01')
+        self.assertEqual(client.reads, [2, 2])
+        self.assertEqual(bytes(decorated.peek(1)), b'\xb5')
+        self.assertEqual(decorated.read(4), b'\xb5\x62\x01\x02')
+        self.assertEqual(bytes(decorated.peek(1)), b'')
+
+    def test_find(self):
+        client = ChunkedGnssClient(b'$GPGSV,2*52\r\n$GPGGA')
+        decorated = client.with_buffer(capacity=32, chunk_size=4) # pylint: disable=no-member
+
+        self.assertEqual(decorated.find(b'\r\n'), 11)
+        self.assertEqual(client.reads, [4, 4, 4, 4])
+        self.assertEqual(decorated.find(b'\r\n', limit=12), -1)
+        self.assertEqual(decorated.find(b'$', limit=12), 0)
+        decorated.read(1)
+        self.assertEqual(decorated.find(b'$'), 12)
+        self.assertEqual(decorated.find(b'*', limit=4), -1)
+        self.assertEqual(decorated.find(b'?'), -1)
+
+    def test_overflow(self):
+        client = ChunkedGnssClient(b'\x00' * 16)
+        decorated = client.with_buffer(capacity=8, chunk_size=4) # pylint: disable=no-member
+
+        with self.assertRaises(RingBufferOverflowError):
+            decorated.peek(9)
+
+    def test_write_passthrough(self):
+        client = ChunkedGnssClient(b'')
+        decorated = client.with_buffer(capacity=8, chunk_size=4) # pylint: disable=no-member
+
+        self.assertEqual(decorated.write(b'\x01\x02'), 2)
+        self.assertEqual(client.last_written, b'\x01\x02')
+
+    def test_metrics_count_chunks(self):
+        client = ChunkedGnssClient(b'\x00' * 16)
+        hook = Mock()
+        read = ValueMetric('gnss_client_read_bytes', [hook])
+        written = ValueMetric('gnss_client_written_bytes', [hook])
+        decorated = (client # pylint: disable=no-member
+            .with_metrics(cbytes_read=read, cbytes_written=written)
+            .with_buffer(capacity=16, chunk_size=8))
+
+        for _ in range(8):
+            decorated.read(1)
+
+        self.assertEqual(read.value, 8)
+        self.assertEqual(hook.call_count, 3)
+
+    def test_access_to_decorated_object_props(self):
+        client = ChunkedGnssClient(b'')
+        decorated = client.with_buffer(capacity=8, chunk_size=4) # pylint: disable=no-member
+
+        self.assertTrue(hasattr(decorated, 'some_internal_prop'))
+        self.assertEqual('test', decorated.some_internal_prop)
+        decorated.some_internal_prop = 'changed'
+        self.assertEqual('changed', decorated.some_internal_prop)
+        del decorated.some_internal_prop
+        self.assertFalse(hasattr(decorated, 'some_internal_prop'))
+
+    def test_non_blocking_reads_keep_pending_input(self):
+        client = NonBlockingGnssClient(b'\xb5\x62\x01')
+        decorated = (client # pylint: disable=no-member
+            .with_metrics(cbytes_read=ValueMetric('read', []), cbytes_written=ValueMetric('written', []))
+            .with_buffer(capacity=16, chunk_size=2))
+
+        with self.assertRaises(BlockingIOError):
+            decorated.peek(4)
+        with self.assertRaises(BlockingIOError):
+            decorated.find(b'\x02')
+        client.data.extend(b'\x02')
+        self.assertEqual(decorated.find(b'\x02'), 3)
+        self.assertEqual(decorated.read(4), b'\xb5\x62\x01\x02')
+
+        run_sync(decorated.wait_readable())
+        self.assertEqual(client.waits, 1)
+        run_sync(decorated.wait_writable())
+        self.assertEqual(client.waits, 2)
+
+class test_GnssClientWithWriteCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        self.client = VectorGnssClient()
+        self.counter = SuccessCounterMetric('flush_counter', [])
+        self.stopwatch = FakeStopWatch()
+        self.stopwatch.elapsed = 0.5
+        self.latency = LatencyMetric('flush_latency', self.stopwatch, [])
+        self.logger = Mock()
+        self.decorated = self.client.with_write_coalescing( # pylint: disable=no-member
+            size_threshold=8, deadline=0.01, counter=self.counter, latency=self.latency, logger=self.logger)
+
+    def run_loop(self, seconds):
+        run_sync(asyncio.sleep(seconds))
+
+    def test_flush_on_size_threshold(self):
+        async def write():
+            self.assertEqual(self.decorated.write(b'$GPGGA'), 6)
+            self.assertEqual(self.client.writes, [])
+            self.assertEqual(self.decorated.write(b'\r\n'), 2)
+        run_sync(write())
+
+        self.assertEqual(self.client.writes, [[b'$GPGGA', b'\r\n']])
+        self.assertEqual(self.counter.success, 1)
+        self.assertEqual(self.latency.value, 0.5)
+
+        # nothing is left to write on the deadline
+        self.run_loop(0.02)
+        self.assertEqual(len(self.client.writes), 1)
+        self.assertEqual(self.counter.total, 1)
+
+    def test_flush_on_deadline(self):
+        async def write():
+            self.decorated.writev([b'\x01', b'\x02'])
+            self.decorated.write(b'\x03')
+            await asyncio.sleep(0)
+            self.assertEqual(self.client.writes, [])
+        run_sync(write())
+
+        self.run_loop(0.02)
+        self.assertEqual(self.client.writes, [[b'\x01', b'\x02', b'\x03']])
+        self.assertEqual(self.counter.success, 1)
+
+    def test_write_latency_until_written_out(self):
+        write_latency = Mock()
+        decorated = self.client.with_write_coalescing( # pylint: disable=no-member
+            size_threshold=8, deadline=1, write_latency=write_latency)
+        self.client.limit = 3
+        async def write_and_flush():
+            decorated.writev([b'\x01\x02', b'\x03\x04'])
+            await asyncio.sleep(0.02)
+            decorated.flush()
+        run_sync(write_and_flush())
+
+        # NOTE recorded once per write, after the flush that wrote out its last byte
+        self.assertEqual(self.client.writes, [[b'\x01\x02', b'\x03\x04'], [b'\x04']])
+        self.assertEqual(write_latency.record.call_count, 2)
+        for (elapsed,), _ in write_latency.record.call_args_list:
+            self.assertGreaterEqual(elapsed, 0.02)
+
+    def test_failed_flush_records_no_write_latency(self):
+        write_latency = Mock()
+        decorated = self.client.with_write_coalescing( # pylint: disable=no-member
+            size_threshold=8, deadline=0.01, write_latency=write_latency)
+        self.client.error = OSError('device gone')
+        async def write_and_flush():
+            decorated.write(b'\x01\x02')
+            decorated.flush()
+        with self.assertRaises(OSError):
+            run_sync(write_and_flush())
+
+        self.client.error = None
+        async def write_and_flush_again():
+            decorated.write(b'\x03')
+            decorated.flush()
+        run_sync(write_and_flush_again())
+        self.assertEqual(write_latency.record.call_count, 1)
+
+    def test_flush(self):
+        async def write_and_flush():
+            self.decorated.write(b'\xb5\x62')
+            return self.decorated.flush()
+        self.assertEqual(run_sync(write_and_flush()), 2)
+        self.assertEqual(self.client.writes, [[b'\xb5\x62']])
+
+        # the deadline was cancelled, empty flushes are not counted
+        self.run_loop(0.02)
+        self.assertEqual(self.decorated.flush(), 0)
+        self.assertEqual(len(self.client.writes), 1)
+        self.assertEqual(self.counter.total, 1)
+
+    def test_partial_writes_are_resumed(self):
+        self.client.limit = 3
+        async def write_and_flush():
+            self.decorated.writev([b'\x01\x02', b'\x03\x04'])
+            return self.decorated.flush()
+
+        self.assertEqual(run_sync(write_and_flush()), 4)
+        self.assertEqual(self.client.writes, [[b'\x01\x02', b'\x03\x04'], [b'\x04']])
+
+    def test_blocked_output_is_retried_on_deadline(self):
+        self.client.error = BlockingIOError()
+        async def write_and_flush():
+            self.decorated.write(b'\x01\x02')
+            return self.decorated.flush()
+        self.assertEqual(run_sync(write_and_flush()), 0)
+        self.assertEqual(self.client.writes, [])
+
+        self.assertEqual(self.counter.failure, 1)
+
+        self.client.error = None
+        self.run_loop(0.02)
+        self.assertEqual(self.client.writes, [[b'\x01\x02']])
+        self.assertEqual(self.counter.success, 1)
+        self.assertEqual(self.counter.failure, 1)
+
+    def test_writes_refused_over_pending_limit(self):
+        self.client.error = BlockingIOError()
+        async def write():
+            for _ in range(4):
+                self.assertEqual(self.decorated.write(b'\x00' * 8), 8)
+            with self.assertRaises(BlockingIOError):
+                self.decorated.write(b'\x01')
+            with self.assertRaises(BlockingIOError):
+                self.decorated.writev([b'\x01'])
+        run_sync(write())
+
+        self.assertEqual(self.decorated._pending_size, 32) # pylint: disable=protected-access
+        self.assertEqual(self.counter.success, 0)
+        self.assertEqual(self.counter.failure, 6)
+
+    def test_writev_accepts_up_to_pending_limit(self):
+        self.client.error = BlockingIOError()
+        async def write():
+            self.decorated.writev([b'\x00' * 28])
+            return self.decorated.writev([b'\x01' * 4, b'\x02' * 4])
+        self.assertEqual(run_sync(write()), 4)
+        self.assertEqual(self.decorated._pending_size, 32) # pylint: disable=protected-access
+
+    def test_wait_writable_writes_out_pending_output(self):
+        self.client.error = BlockingIOError()
+        async def write():
+            self.decorated.writev([b'\x00' * 32])
+            with self.assertRaises(BlockingIOError):
+                self.decorated.write(b'\x01')
+            self.client.error = None
+            await self.decorated.wait_writable()
+            return self.decorated.write(b'\x01')
+        self.assertEqual(run_sync(write()), 1)
+        self.assertEqual(self.client.writes, [[b'\x00' * 32]])
+        self.assertEqual(self.counter.success, 1)
+
+    def test_large_write_is_accepted_with_nothing_pending(self):
+        self.client.error = BlockingIOError()
+        async def write():
+            return self.decorated.write(b'\x00' * 64)
+        self.assertEqual(run_sync(write()), 64)
+
+    def test_failed_flush_discards_output(self):
+        self.client.error = OSError('device gone')
+        async def write_and_flush():
+            self.decorated.write(b'\x01\x02')
+            self.decorated.flush()
+        with self.assertRaises(OSError):
+            run_sync(write_and_flush())
+        self.assertEqual(self.counter.failure, 1)
+
+        self.client.error = None
+        self.assertEqual(self.decorated.flush(), 0)
+        self.assertEqual(self.client.writes, [])
+
+    def test_failed_deadline_flush_is_counted(self):
+        self.client.error = OSError('device gone')
+        async def write():
+            self.decorated.write(b'\x01\x02')
+        run_sync(write())
+
+        self.run_loop(0.02)
+        self.assertEqual(self.counter.failure, 1)
+        self.logger.error.assert_called_once_with(AppEvent(
+            "GNSS output flush failed, 2 bytes discarded: OSError('device gone')"))
+
+    def test_flush_through_decorators(self):
+        decorated = (self.decorated # pylint: disable=no-member
+            .with_metrics(cbytes_read=ValueMetric('read', []), cbytes_written=ValueMetric('written', []))
+            .with_buffer(capacity=8, chunk_size=4))
+        async def write_and_flush():
+            decorated.writev([b'\x01', b'\x02'])
+            return decorated.flush()
+        self.assertEqual(run_sync(write_and_flush()), 2)
+        self.assertEqual(self.client.writes, [[b'\x01', b'\x02']])
+
+    def test_access_to_decorated_object_props(self):
+        self.assertTrue(hasattr(self.decorated, 'some_internal_prop'))
+        self.assertEqual('test', self.decorated.some_internal_prop)
+        self.decorated.some_internal_prop = 'changed'
+        self.assertEqual('changed', self.decorated.some_internal_prop)
+        del self.decorated.some_internal_prop
+        self.assertFalse(hasattr(self.decorated, 'some_internal_prop'))
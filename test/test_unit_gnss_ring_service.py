@@ -0,0 +1,201 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import asyncio
+import pickle
+import unittest
+import uuid
+
+from unittest.mock import MagicMock
+
+from xhoundpi.status import Status
+from xhoundpi.message import Message
+from xhoundpi.message_route import Route
+from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.proto_parser import StubParserProvider, StubProtocolParser
+from xhoundpi.frame_ring import FrameRingReader, FrameRingWriter
+from xhoundpi.gnss_service_iface import IGnssService
+from xhoundpi.gnss_ring_service import GnssRingService, GnssRingFeeder
+from xhoundpi.async_ext import run_sync
+from xhoundpi.serial import SerialClosedError
+
+class StubGnssService(IGnssService):
+
+    def __init__(self, batches):
+        self.batches = batches
+        self.limits = []
+        self.written = []
+
+    async def read_message(self):
+        return (await self.read_messages(1))[0]
+
+    async def read_messages(self, limit: int):
+        self.limits.append(limit)
+        if not self.batches:
+            await asyncio.get_running_loop().create_future()
+        return self.batches.pop(0)
+
+    async def write_message(self, message: Message):
+        self.written.append(message)
+        return Status.OK(), len(message.frame)
+
+def make_message(proto, frame, route=Route.PROCESS, parser=None):
+    return Message(proto=proto, message_id=uuid.uuid4(), frame=frame, route=route, parser=parser)
+
+class test_GnssRingService(unittest.TestCase):
+
+    def setUp(self):
+        self.reader = FrameRingReader.create(capacity=1024)
+        self.writer = FrameRingWriter.attach(self.reader.handle)
+
+    def tearDown(self):
+        self.writer.close()
+        self.reader.close()
+
+    def publish(self, *records):
+        for record in records:
+            run_sync(self.writer.put(*record))
+        self.writer.flush()
+
+    def test_read_messages(self):
+        parser = StubProtocolParser()
+        parser.parse = MagicMock(side_effect=parser.parse)
+        service = GnssRingService(self.reader, StubParserProvider(parser), StubGnssService([]))
+        self.publish(
+            (ProtocolClass.UBX, Route.PROCESS, b'\xb5\x62\x01\x07'),
+            (ProtocolClass.NMEA, Route.PASSTHROUGH, b'$GPGSV'),
+            (ProtocolClass.NMEA, Route.PROCESS, b'$GPGGA'))
+
+        batch = run_sync(service.read_messages(2))
+        self.assertEqual([status for status, _ in batch], [Status.OK(), Status.OK()])
+        self.assertEqual([(message.proto, message.route, message.frame) for _, message in batch], [
+            (ProtocolClass.UBX, Route.PROCESS, b'\xb5\x62\x01\x07'),
+            (ProtocolClass.NMEA, Route.PASSTHROUGH, b'$GPGSV')])
+
+        # the frames already taken from the ring are read first
+        status, message = run_sync(service.read_message())
+        self.assertEqual(status, Status.OK())
+        self.assertEqual((message.proto, message.route, message.frame),
+            (ProtocolClass.NMEA, Route.PROCESS, b'$GPGGA'))
+
+        # payloads are parsed on first access
+        parser.parse.assert_not_called()
+        self.assertEqual(message.payload, b'$GPGGA')
+        parser.parse.assert_called_once_with(b'$GPGGA')
+
+    def test_read_preparsed_messages(self):
+        parser = StubProtocolParser()
+        parser.parse = MagicMock(side_effect=parser.parse)
+        service = GnssRingService(self.reader, StubParserProvider(parser), StubGnssService([]))
+        self.publish((ProtocolClass.NMEA, Route.PROCESS, b'$GPGGA', pickle.dumps({'lat': 1.5})))
+
+        status, message = run_sync(service.read_message())
+        self.assertEqual(status, Status.OK())
+        self.assertEqual(message.frame, b'$GPGGA')
+        # the payload published along with the frame is unpickled, not parsed
+        self.assertFalse(message.parsed)
+        self.assertEqual(message.payload, {'lat': 1.5})
+        self.assertFalse(message.dirty)
+        parser.parse.assert_not_called()
+
+    def test_read_writer_gone(self):
+        service = GnssRingService(self.reader, StubParserProvider(StubProtocolParser()), StubGnssService([]))
+        self.publish((ProtocolClass.NMEA, Route.PROCESS, b'$GPGGA'))
+        self.writer.close()
+
+        # the frames published before the writer was gone are read first
+        batch = run_sync(service.read_messages(4))
+        self.assertEqual([(status, message.frame) for status, message in batch], [(Status.OK(), b'$GPGGA')])
+
+        # then the input is closed
+        batch = run_sync(service.read_messages(4))
+        self.assertEqual(len(batch), 1)
+        self.assertIsInstance(batch[0][0].error, SerialClosedError)
+        self.assertIsNone(batch[0][1])
+
+    def test_write_message(self):
+        inner = StubGnssService([])
+        service = GnssRingService(self.reader, StubParserProvider(StubProtocolParser()), inner)
+        message = make_message(ProtocolClass.NMEA, b'$GPGGA')
+
+        self.assertEqual(run_sync(service.write_message(message)), (Status.OK(), 6))
+        self.assertEqual(inner.written, [message])
+
+class test_GnssRingFeeder(unittest.TestCase):
+
+    def test_run(self):
+        reader = FrameRingReader.create(capacity=1024)
+        writer = FrameRingWriter.attach(reader.handle)
+        gnss_service = StubGnssService([
+            [(Status.OK(), make_message(ProtocolClass.UBX, b'\xb5\x62\x01\x02')),
+             (Status.OK(), make_message(ProtocolClass.NMEA, b'$GPTXT', Route.PASSTHROUGH)),
+             (Status(RuntimeError('failed read')), None)],
+            [(Status.OK(), make_message(ProtocolClass.NMEA, b'$GPRMC'))],
+        ])
+        feeder = GnssRingFeeder(gnss_service, writer, read_batch_size=8)
+
+        task = asyncio.get_event_loop().create_task(feeder.run())
+        # failed reads are not published, the batches are read in order
+        frames = run_sync(reader.get_batch())
+        while len(frames) < 3:
+            frames += run_sync(reader.get_batch())
+        self.assertEqual(frames, [
+            (ProtocolClass.UBX, Route.PROCESS, b'\xb5\x62\x01\x02', b''),
+            (ProtocolClass.NMEA, Route.PASSTHROUGH, b'$GPTXT', b''),
+            (ProtocolClass.NMEA, Route.PROCESS, b'$GPRMC', b'')])
+        self.assertEqual(gnss_service.limits[:2], [8, 8])
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            run_sync(task)
+        writer.close()
+        reader.close()
+
+    def test_run_until_input_closed(self):
+        reader = FrameRingReader.create(capacity=1024)
+        writer = FrameRingWriter.attach(reader.handle)
+        gnss_service = StubGnssService([
+            [(Status.OK(), make_message(ProtocolClass.NMEA, b'$GPRMC')),
+             (Status(SerialClosedError('end of file')), None)],
+        ])
+        feeder = GnssRingFeeder(gnss_service, writer, read_batch_size=8)
+
+        with self.assertRaises(SerialClosedError):
+            run_sync(feeder.run())
+        # the frames read before the input was closed are published
+        self.assertEqual(run_sync(reader.get_batch()), [(ProtocolClass.NMEA, Route.PROCESS, b'$GPRMC', b'')])
+        self.assertEqual(gnss_service.limits, [8])
+        writer.close()
+        reader.close()
+
+    def test_run_preparsed(self):
+        reader = FrameRingReader.create(capacity=1024)
+        writer = FrameRingWriter.attach(reader.handle)
+        def parse(frame):
+            if frame == b'$GPBAD':
+                raise ValueError(frame)
+            return {'frame': frame}
+        gnss_service = StubGnssService([
+            [(Status.OK(), make_message(ProtocolClass.NMEA, b'$GPGGA', parser=parse)),
+             (Status.OK(), make_message(ProtocolClass.NMEA, b'$GPGSV', Route.PASSTHROUGH, parser=parse)),
+             (Status.OK(), make_message(ProtocolClass.UBX, b'\xb5\x62\x01\x07', parser=parse)),
+             (Status.OK(), make_message(ProtocolClass.NMEA, b'$GPBAD', parser=parse)),
+             (Status(SerialClosedError('end of file')), None)],
+        ])
+        feeder = GnssRingFeeder(gnss_service, writer, read_batch_size=8, preparsed={ProtocolClass.NMEA})
+
+        with self.assertRaises(SerialClosedError):
+            run_sync(feeder.run())
+        # only the messages to process of the preparsed protocols carry their payload,
+        # those failing to parse are published alone
+        frames = run_sync(reader.get_batch())
+        self.assertEqual([(frame, pickle.loads(payload) if payload else None) for _, _, frame, payload in frames], [
+            (b'$GPGGA', {'frame': b'$GPGGA'}),
+            (b'$GPGSV', None),
+            (b'\xb5\x62\x01\x07', None),
+            (b'$GPBAD', None)])
+        writer.close()
+        reader.close()
@@ -4,16 +4,29 @@
 # pylint: disable=line-too-long
 # pylint: disable=invalid-name
 
+import asyncio
+import os
+import tty
 import unittest
 import uuid
+from io import BytesIO
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, call, patch
 from xhoundpi.status import Status
 
 from xhoundpi.async_ext import run_sync
-from xhoundpi.message import Message
+from xhoundpi.message import Message, PayloadParseError
 from xhoundpi.proto_class import ProtocolClass
 from xhoundpi.gnss_service import GnssService
+from xhoundpi.gnss_client import GnssClient
+from xhoundpi.serial import AsyncSerial
+from xhoundpi.message_route import Route
+from xhoundpi.message_router import HeaderMessageRouter
+from xhoundpi.frame_validator import ChecksumFrameValidator, FrameChecksumError
+from xhoundpi.metric import CounterMetric
+from xhoundpi.proto_classifier import ProtocolClassifier
+from xhoundpi.proto_reader import ProtocolReaderProvider, UBXProtocolReader
+import xhoundpi.gnss_client_decorators # pylint: disable=unused-import
 
 class test_GnssService(unittest.TestCase):
 
@@ -53,7 +66,7 @@ class test_GnssService(unittest.TestCase):
         gnss_reader.read_frame.assert_called_once_with(b'\x24', gnss_client)
         gnss_parser.parse.assert_called_once_with(b'\x24\x01\x08')
 
-    def test_read_error(self):
+    def test_read_parse_error_is_deferred(self):
         gnss_client = Mock()
         gnss_protocol_classifier = Mock()
         gnss_protocol_classifier.classify = Mock(return_value=(b'\x24', ProtocolClass.NMEA))
@@ -75,17 +88,220 @@ class test_GnssService(unittest.TestCase):
 
         status, message = run_sync(gnss_service.read_message())
 
-        self.assertEqual(status, Status(Exception('Whoops!')))
-        self.assertEqual(message, None)
+        # parsing is deferred until the payload is accessed
+        self.assertTrue(status.ok)
+        gnss_parser.parse.assert_not_called()
+        with self.assertRaises(PayloadParseError) as context:
+            message.payload # pylint: disable=pointless-statement
+        self.assertEqual(str(context.exception.details), 'Whoops!')
         gnss_protocol_classifier.classify.assert_called_once_with(gnss_client)
         gnss_reader_provider.get_reader.assert_called_once_with(ProtocolClass.NMEA)
         gnss_parser_provider.get_parser.assert_called_once_with(ProtocolClass.NMEA)
         gnss_reader.read_frame.assert_called_once_with(b'\x24', gnss_client)
         gnss_parser.parse.assert_called_once_with(b'\x24\x01\x08')
 
+    def test_read_error(self):
+        gnss_client = Mock()
+        gnss_protocol_classifier = Mock()
+        gnss_protocol_classifier.classify = Mock(side_effect=Exception('Whoops!'))
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=gnss_protocol_classifier,
+            reader_provider=Mock(),
+            parser_provider=Mock(),
+            serializer_provider=Mock())
+
+        status, message = run_sync(gnss_service.read_message())
+
+        self.assertEqual(status, Status(Exception('Whoops!')))
+        self.assertEqual(message, None)
+        gnss_protocol_classifier.classify.assert_called_once_with(gnss_client)
+
+    def test_read_buffered_frames_are_copied(self):
+        frame1 = bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+        frame2 = bytes.fromhex('B5 62 01 03 10 00 20 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+        gnss_client = GnssClient(BytesIO(frame1 + frame2)).with_buffer(capacity=32, chunk_size=16) # pylint: disable=no-member
+        received = []
+        gnss_parser = Mock()
+        gnss_parser.parse = Mock(side_effect=lambda frame: received.append((type(frame), bytes(frame))) or 'payload')
+        gnss_parser_provider = Mock()
+        gnss_parser_provider.get_parser = Mock(return_value=gnss_parser)
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=ProtocolClassifier({ b'\xb5\x62' : ProtocolClass.UBX }),
+            reader_provider=ProtocolReaderProvider({ ProtocolClass.UBX : UBXProtocolReader() }),
+            parser_provider=gnss_parser_provider,
+            serializer_provider=Mock())
+
+        messages = []
+        for _ in range(2):
+            status, message = run_sync(gnss_service.read_message())
+            self.assertTrue(status.ok)
+            self.assertFalse(message.parsed)
+            messages.append(message)
+
+        # the receive buffer has been reused, the messages own their frames
+        self.assertEqual([message.frame for message in messages], [frame1, frame2])
+        self.assertEqual([message.payload for message in messages], ['payload', 'payload'])
+        self.assertEqual(received, [(bytes, frame1), (bytes, frame2)])
+
+    def test_read_routes_frames(self):
+        frame1 = bytes.fromhex('B5 62 01 35 00 00 36 A3')
+        frame2 = bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+        frame3 = bytes.fromhex('B5 62 01 07 00 00 08 19')
+        gnss_client = GnssClient(BytesIO(frame1 + frame2 + frame3)).with_buffer(capacity=64, chunk_size=16) # pylint: disable=no-member
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=ProtocolClassifier({ b'\xb5\x62' : ProtocolClass.UBX }),
+            reader_provider=ProtocolReaderProvider({ ProtocolClass.UBX : UBXProtocolReader() }),
+            parser_provider=Mock(),
+            serializer_provider=Mock(),
+            router=HeaderMessageRouter({ ProtocolClass.UBX : {
+                b'\x01\x35' : Route.DROP,
+                b'\x01\x07' : Route.PROCESS,
+            }}, default=Route.PASSTHROUGH))
+
+        # the first frame is dropped
+        status, message = run_sync(gnss_service.read_message())
+        self.assertTrue(status.ok)
+        self.assertEqual(message.frame, frame2)
+        self.assertEqual(message.route, Route.PASSTHROUGH)
+
+        status, message = run_sync(gnss_service.read_message())
+        self.assertTrue(status.ok)
+        self.assertEqual(message.frame, frame3)
+        self.assertEqual(message.route, Route.PROCESS)
+
+    def test_read_rejects_corrupt_frames(self):
+        frame1 = bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+        frame2 = bytes.fromhex('B5 62 01 03 10 00 20 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+        gnss_client = GnssClient(BytesIO(frame1 + frame2 + frame1)).with_buffer(capacity=64, chunk_size=16) # pylint: disable=no-member
+        gnss_parser_provider = Mock()
+        router = Mock()
+        router.route = Mock(return_value=Route.PROCESS)
+        rejected = CounterMetric('rejected', [])
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=ProtocolClassifier({ b'\xb5\x62' : ProtocolClass.UBX }),
+            reader_provider=ProtocolReaderProvider({ ProtocolClass.UBX : UBXProtocolReader() }),
+            parser_provider=gnss_parser_provider,
+            serializer_provider=Mock(),
+            router=router,
+            validator=ChecksumFrameValidator({ ProtocolClass.UBX : rejected }))
+
+        status, message = run_sync(gnss_service.read_message())
+        self.assertTrue(status.ok)
+        self.assertEqual(message.frame, frame1)
+
+        status, message = run_sync(gnss_service.read_message())
+        self.assertFalse(status.ok)
+        self.assertIsInstance(status.error, FrameChecksumError)
+        self.assertEqual(status.error.frame, frame2)
+        self.assertIsNone(message)
+        self.assertEqual(rejected.value, 1)
+
+        # the corrupt frame was consumed and never routed or parsed
+        status, message = run_sync(gnss_service.read_message())
+        self.assertTrue(status.ok)
+        self.assertEqual(message.frame, frame1)
+        self.assertEqual(router.route.call_count, 2)
+        self.assertEqual(gnss_parser_provider.get_parser.call_count, 2)
+
+    def test_read_waits_for_incomplete_frames(self):
+        frame = bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        serial = AsyncSerial(slave)
+        gnss_client = GnssClient(serial).with_buffer(capacity=64, chunk_size=16) # pylint: disable=no-member
+        gnss_parser = Mock()
+        gnss_parser.parse = Mock(side_effect=bytes)
+        gnss_parser_provider = Mock()
+        gnss_parser_provider.get_parser = Mock(return_value=gnss_parser)
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=ProtocolClassifier({ b'\xb5\x62' : ProtocolClass.UBX }),
+            reader_provider=ProtocolReaderProvider({ ProtocolClass.UBX : UBXProtocolReader() }),
+            parser_provider=gnss_parser_provider,
+            serializer_provider=Mock())
+
+        async def read_in_pieces():
+            reader = asyncio.ensure_future(gnss_service.read_message())
+            for piece in (frame[:1], frame[1:7], frame[7:-1], frame[-1:]):
+                await asyncio.sleep(0.01)
+                self.assertFalse(reader.done())
+                os.write(master, piece)
+            return await asyncio.wait_for(reader, 1)
+
+        try:
+            status, message = run_sync(read_in_pieces())
+        finally:
+            serial.close()
+            os.close(master)
+
+        self.assertTrue(status.ok)
+        self.assertEqual(message.payload, frame)
+        gnss_parser.parse.assert_called_once()
+
+    def test_read_messages_drains_pending_frames(self):
+        frame = bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+        master, slave = os.openpty()
+        tty.setraw(slave)
+        serial = AsyncSerial(slave)
+        gnss_client = GnssClient(serial).with_buffer(capacity=256, chunk_size=16) # pylint: disable=no-member
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=ProtocolClassifier({ b'\xb5\x62' : ProtocolClass.UBX }),
+            reader_provider=ProtocolReaderProvider({ ProtocolClass.UBX : UBXProtocolReader() }),
+            parser_provider=Mock(),
+            serializer_provider=Mock())
+
+        try:
+            os.write(master, frame * 3 + frame[:7])
+            batch = run_sync(gnss_service.read_messages(10))
+            self.assertEqual(len(batch), 3)
+            for status, message in batch:
+                self.assertTrue(status.ok)
+                self.assertEqual(message.frame, frame)
+
+            # the incomplete frame is left pending and completes the next batch
+            os.write(master, frame[7:])
+            batch = run_sync(gnss_service.read_messages(10))
+            self.assertEqual(len(batch), 1)
+            self.assertTrue(batch[0][0].ok)
+            self.assertEqual(batch[0][1].frame, frame)
+        finally:
+            serial.close()
+            os.close(master)
+
+    def test_read_messages_ends_on_limit_and_failures(self):
+        frame1 = bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+        frame2 = bytes.fromhex('B5 62 01 03 10 00 20 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1')
+        gnss_client = GnssClient(BytesIO(frame1 * 3 + frame2 + frame1)).with_buffer(capacity=256, chunk_size=16) # pylint: disable=no-member
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=ProtocolClassifier({ b'\xb5\x62' : ProtocolClass.UBX }),
+            reader_provider=ProtocolReaderProvider({ ProtocolClass.UBX : UBXProtocolReader() }),
+            parser_provider=Mock(),
+            serializer_provider=Mock(),
+            validator=ChecksumFrameValidator())
+
+        batch = run_sync(gnss_service.read_messages(2))
+        self.assertEqual([status.ok for status, _ in batch], [True, True])
+        self.assertEqual([message.frame for _, message in batch], [frame1, frame1])
+
+        batch = run_sync(gnss_service.read_messages(5))
+        self.assertEqual([status.ok for status, _ in batch], [True, False])
+        self.assertEqual(batch[0][1].frame, frame1)
+        self.assertIsInstance(batch[1][0].error, FrameChecksumError)
+        self.assertIsNone(batch[1][1])
+
+        batch = run_sync(gnss_service.read_messages(1))
+        self.assertEqual(len(batch), 1)
+        self.assertEqual(batch[0][1].frame, frame1)
+
     def test_write(self):
         gnss_client = Mock()
-        gnss_client.write = Mock(return_value=1)
+        gnss_client.write = Mock(return_value=2)
         gnss_protocol_classifier = Mock()
         gnss_reader_provider = Mock()
         gnss_parser_provider = Mock()
@@ -107,13 +323,128 @@ class test_GnssService(unittest.TestCase):
 
         self.assertTrue(status.ok)
         self.assertEqual(status.error, None)
-        self.assertEqual(bytes_written, 1)
+        self.assertEqual(bytes_written, 2)
         gnss_serializer_provider.get_serializer.assert_called_once_with(ProtocolClass.UBX)
         gnss_serializer.serialize.assert_called_once_with(
             Message(message_id=uuid.UUID('12345678-1234-5678-1234-567812345678'),
                     proto=ProtocolClass.UBX, payload='test payload'))
         gnss_client.write.assert_called_once_with(b'\x24\x23')
 
+    def test_write_waits_for_the_rest(self):
+        gnss_client = Mock()
+        gnss_client.write = Mock(side_effect=[1, BlockingIOError(), 2])
+        gnss_client.wait_writable = AsyncMock()
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=Mock(),
+            reader_provider=Mock(),
+            parser_provider=Mock(),
+            serializer_provider=Mock())
+
+        status, bytes_written = run_sync(gnss_service.write_message(Message(
+            proto=ProtocolClass.NMEA,
+            message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'),
+            frame=b'$GP')))
+
+        self.assertTrue(status.ok)
+        self.assertEqual(bytes_written, 3)
+        self.assertEqual([bytes(args[0]) for args, _ in gnss_client.write.call_args_list], [b'$GP', b'GP', b'GP'])
+        self.assertEqual(gnss_client.wait_writable.await_count, 2)
+
+    def test_write_flushes_on_policy(self):
+        gnss_client = Mock()
+        gnss_client.write = Mock(return_value=3)
+        flush_policy = Mock()
+        flush_policy.qualifies = Mock(side_effect=[False, True])
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=Mock(),
+            reader_provider=Mock(),
+            parser_provider=Mock(),
+            serializer_provider=Mock(),
+            flush_policy=flush_policy)
+        messages = [Message(
+            proto=ProtocolClass.NMEA,
+            message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'),
+            frame=frame) for frame in (b'$GA', b'$GL')]
+
+        self.assertEqual(run_sync(gnss_service.write_message(messages[0])), (Status.OK(), 3))
+        gnss_client.flush.assert_not_called()
+        self.assertEqual(run_sync(gnss_service.write_message(messages[1])), (Status.OK(), 3))
+        gnss_client.flush.assert_called_once_with()
+        flush_policy.qualifies.assert_has_calls([call(message) for message in messages])
+
+    def test_write_flush_error(self):
+        gnss_client = Mock()
+        gnss_client.write = Mock(return_value=3)
+        gnss_client.flush = Mock(side_effect=OSError('Whoops!'))
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=Mock(),
+            reader_provider=Mock(),
+            parser_provider=Mock(),
+            serializer_provider=Mock(),
+            flush_policy=Mock())
+
+        status, bytes_written = run_sync(gnss_service.write_message(Message(
+            proto=ProtocolClass.NMEA,
+            message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'),
+            frame=b'$GL')))
+        self.assertEqual(status, Status(OSError('Whoops!')))
+        self.assertEqual(bytes_written, 0)
+
+    def test_write_clean_messages_as_frames(self):
+        gnss_client = Mock()
+        gnss_client.write = Mock(return_value=3)
+        gnss_serializer_provider = Mock()
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=Mock(),
+            reader_provider=Mock(),
+            parser_provider=Mock(),
+            serializer_provider=gnss_serializer_provider)
+        message = Message(
+            proto=ProtocolClass.NMEA,
+            message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'),
+            frame=b'$GP',
+            parser=Mock(return_value='test payload'))
+
+        # parsed but not modified, still clean
+        self.assertEqual(message.payload, 'test payload')
+        status, bytes_written = run_sync(gnss_service.write_message(message))
+
+        self.assertTrue(status.ok)
+        self.assertEqual(bytes_written, 3)
+        gnss_serializer_provider.get_serializer.assert_not_called()
+        gnss_client.write.assert_called_once_with(b'$GP')
+
+    def test_write_dirty_messages_serialized(self):
+        gnss_client = Mock()
+        gnss_client.write = Mock(return_value=2)
+        gnss_serializer = Mock()
+        gnss_serializer.serialize = Mock(return_value=b'\x24\x23')
+        gnss_serializer_provider = Mock()
+        gnss_serializer_provider.get_serializer = Mock(return_value=gnss_serializer)
+        gnss_service = GnssService(
+            gnss_client=gnss_client,
+            classifier=Mock(),
+            reader_provider=Mock(),
+            parser_provider=Mock(),
+            serializer_provider=gnss_serializer_provider)
+        message = Message(
+            proto=ProtocolClass.NMEA,
+            message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'),
+            frame=b'$GP',
+            parser=Mock(return_value='test payload'))
+
+        message.payload = 'edited payload'
+        status, bytes_written = run_sync(gnss_service.write_message(message))
+
+        self.assertTrue(status.ok)
+        self.assertEqual(bytes_written, 2)
+        gnss_serializer.serialize.assert_called_once_with(message)
+        gnss_client.write.assert_called_once_with(b'\x24\x23')
+
     def test_write_error(self):
         gnss_client = Mock()
         gnss_client.write = Mock(side_effect=Exception('Whoops!'))
@@ -8,7 +8,7 @@ import io
 import uuid
 import unittest
 
-from typing import Tuple
+from typing import List, Tuple
 from dataclasses import dataclass
 from unittest.mock import Mock, patch
 
@@ -40,6 +40,7 @@ class StubGnssService(IGnssService):
         self.read = 0
         self.write = 0
         self.return_read = None
+        self.return_batch = None
         self.return_written = None
         self.some_prop = 'test'
 
@@ -47,6 +48,10 @@ class StubGnssService(IGnssService):
         self.read += 1
         return self.return_read
 
+    async def read_messages(self, limit: int) -> List[Tuple[Status, Message]]:
+        self.read += 1
+        return self.return_batch[:limit]
+
     async def write_message(self, message: Message) -> Tuple[Status, int]:
         self.write += 1
         return self.return_written
@@ -107,6 +112,28 @@ class test_GnssServiceWithEvents(unittest.TestCase):
             }
         ])
 
+    def test_read_batch(self):
+        service, decorated = self.create_and_decorate()
+        service.return_batch = [
+            (Status.OK(), Message(message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'), proto=ProtocolClass.UBX, payload=None)),
+            (Status.OK(), Message(message_id=uuid.UUID('{87654321-1234-5678-1234-567812345678}'), proto=ProtocolClass.NMEA, payload=None)),
+            (Status(RuntimeError('This parrot is no more')), None)]
+        activity_id = uuid.UUID('{11111111-2222-3333-4444-555555555555}')
+
+        with patch('uuid.uuid4', return_value=activity_id), capture_logs() as capture:
+            batch = run_sync(decorated.read_messages(8))
+
+        self.assertEqual(batch, service.return_batch)
+        self.assertEqual(
+            [(event['opcode_name'], event['success'], event['message_id'], event['protocol_name'], event['log_level']) for event in capture], [
+                ('BeginRead', True, '00000000-0000-0000-0000-000000000000', 'NONE', 'info'),
+                ('EndRead', True, '12345678-1234-5678-1234-567812345678', 'UBX', 'info'),
+                ('EndRead', True, '87654321-1234-5678-1234-567812345678', 'NMEA', 'info'),
+                ('EndRead', False, '00000000-0000-0000-0000-000000000000', 'NONE', 'error'),
+            ])
+        self.assertTrue(all(event['activity_id'] == '11111111-2222-3333-4444-555555555555' for event in capture))
+        self.assertEqual(capture[-1]['details'], 'This parrot is no more')
+
     def test_read_failed(self):
         service, decorated = self.create_and_decorate()
         service.return_read = (Status(RuntimeError('This parrot is gone to meet its maker')), None)
@@ -323,6 +350,21 @@ class test_GnssServiceWithMetrics(unittest.TestCase):
         self.assertEqual(tdata.rlatency.value, 0.5)
         tdata.hook.assert_any_call('gnss_read_latency', 0.5)
 
+    def test_read_batch(self):
+        tdata = self.create_and_decorate()
+        tdata.service.return_batch = [
+            self.make_read_result(is_ok=True),
+            self.make_read_result(is_ok=True),
+            self.make_read_result(is_ok=False)]
+
+        self.assertCounters(tdata, 0, 0, 0, 0)
+        batch = run_sync(tdata.decorated.read_messages(8))
+        self.assertEqual(batch, tdata.service.return_batch)
+        self.assertEqual(tdata.service.read, 1)
+        self.assertCounters(tdata, 2, 1, 0, 0)
+        self.assertEqual(tdata.rlatency.value, 0.5)
+        tdata.hook.assert_any_call('gnss_read_latency', 0.5)
+
     def test_write_success(self):
         tdata = self.create_and_decorate()
         tdata.service.return_written = self.make_write_result(is_ok=True)
@@ -383,6 +425,10 @@ class test_GnssServiceWithTraces(unittest.TestCase):
         self.assertEqual(gnss_service.read, 1)
         self.assertEqual(gnss_service.write, 1)
         self.assertEqual(output.getvalue(), "readwrite")
+        gnss_service.return_batch = [(Status.OK(), msg)] * 3
+        self.assertEqual(run_sync(gnss_service_with_traces.read_messages(2)), [(Status.OK(), msg)] * 2)
+        self.assertEqual(gnss_service.read, 2)
+        self.assertEqual(output.getvalue(), "readwriteread_batch")
 
     def test_access_to_decorated_object_props(self):
         service = StubGnssService()
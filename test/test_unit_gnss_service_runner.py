@@ -16,6 +16,7 @@ from xhoundpi.proto_class import ProtocolClass
 from xhoundpi.async_ext import run_sync
 from xhoundpi.gnss_service_iface import IGnssService
 from xhoundpi.gnss_service_runner import GnssServiceRunner
+from xhoundpi.serial import SerialClosedError
 
 from test.async_utils import wait_for_condition, notify_condition
 
@@ -43,6 +44,38 @@ class StubGnssService(IGnssService):
         self.last_written = message
         return Status.OK(), 1
 
+class StubBatchGnssService(StubGnssService):
+
+    def __init__(self, read_condition, pending):
+        super().__init__(read_condition)
+        self.pending = pending
+        self.limits = []
+
+    async def read_messages(self, limit: int):
+        self.limits.append(limit)
+        batch = [await self.read_message()]
+        while len(batch) < min(limit, self.pending):
+            self.read += 1
+            batch.append((Status.OK(), Message(
+                proto=ProtocolClass.NMEA,
+                payload=bytes(self.read),
+                message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'))))
+        batch.append((Status(RuntimeError('failed read')), None))
+        return batch
+
+class StubClosedGnssService(StubGnssService):
+
+    def __init__(self):
+        super().__init__(None)
+
+    async def read_messages(self, limit: int):
+        self.read += 1
+        return [(Status.OK(), Message(
+            proto=ProtocolClass.NMEA,
+            payload=bytes(self.read),
+            message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'))),
+            (Status(SerialClosedError('end of file')), None)]
+
 class test_GnssServiceRunner(unittest.TestCase):
 
     def test_run(self):
@@ -99,3 +132,54 @@ class test_GnssServiceRunner(unittest.TestCase):
         task.cancel()
         with self.assertRaises(asyncio.exceptions.CancelledError):
             run_sync(wait_for(task, 1))
+
+    def test_run_batches(self):
+        condition = asyncio.Condition()
+        gnss_service = StubBatchGnssService(condition, pending=3)
+        inbound_queue = asyncio.queues.Queue(10)
+        outbound_queue = asyncio.queues.Queue(10)
+        gnss_runner = GnssServiceRunner(gnss_service, inbound_queue, outbound_queue, read_batch_size=4)
+
+        loop = asyncio.get_event_loop()
+        task = loop.create_task(gnss_runner.run())
+
+        run_sync(notify_condition(condition))
+        messages = [run_sync(inbound_queue.get()) for _ in range(3)]
+
+        # the failed read at the end of the batch is not enqueued
+        self.assertEqual(messages, [Message(proto=ProtocolClass.NMEA,
+            payload=bytes(index), message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}')) for index in (1, 2, 3)])
+        self.assertTrue(inbound_queue.empty())
+        self.assertEqual(gnss_service.limits[0], 4)
+        self.assertEqual(gnss_service.read, 3)
+
+        task.cancel()
+        with self.assertRaises(asyncio.exceptions.CancelledError):
+            run_sync(wait_for(task, 1))
+
+    def test_run_until_input_closed(self):
+        gnss_service = StubClosedGnssService()
+        inbound_queue = asyncio.queues.Queue(10)
+        outbound_queue = asyncio.queues.Queue(10)
+        gnss_runner = GnssServiceRunner(gnss_service, inbound_queue, outbound_queue, read_batch_size=4)
+
+        loop = asyncio.get_event_loop()
+        task = loop.create_task(gnss_runner.run())
+
+        # the runner stops reading once the input is closed, messages read before are enqueued
+        error = run_sync(gnss_runner.wait_closed())
+        self.assertIsInstance(error, SerialClosedError)
+        self.assertEqual(gnss_service.read, 1)
+        self.assertEqual(inbound_queue.qsize(), 1)
+
+        # the messages still in the pipeline keep being written
+        run_sync(outbound_queue.put(Message(proto=ProtocolClass.UBX,
+            payload=b'\x01\x02', message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'))))
+        run_sync(asyncio.sleep(0.01))
+        self.assertEqual(gnss_service.write, 1)
+        self.assertEqual(gnss_service.read, 1)
+        self.assertFalse(task.done())
+
+        task.cancel()
+        with self.assertRaises(asyncio.exceptions.CancelledError):
+            run_sync(wait_for(task, 1))
@@ -0,0 +1,40 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+from decimal import Decimal as D
+
+from xhoundpi.conversion_factor import DistAngleFactorProvider, FloatDistAngleFactorProvider
+from xhoundpi.coordinates_offset import OrientationOffsetProvider, FloatOrientationOffsetProvider
+from xhoundpi.data_formatter import NMEADataFormatter, NMEAFloatDataFormatter, UBXDataFormatter, UBXFloatDataFormatter
+from xhoundpi.math_tier import MATH_TIERS, create_math_tier
+
+class test_MathTier(unittest.TestCase):
+
+    def test_create_decimal(self):
+        tier = create_math_tier('decimal')
+        self.assertEqual(D('1.5'), tier.number(D('1.5')))
+        self.assertIsInstance(tier.number(D('1.5')), D)
+        self.assertIs(NMEADataFormatter, tier.nmea_formatter)
+        self.assertIs(UBXDataFormatter, tier.ubx_formatter)
+        self.assertIs(OrientationOffsetProvider, tier.orientation_offset_provider)
+        self.assertIs(DistAngleFactorProvider, tier.dist_angle_factor_provider)
+
+    def test_create_float(self):
+        tier = create_math_tier('float')
+        self.assertEqual(1.5, tier.number(D('1.5')))
+        self.assertIsInstance(tier.number(D('1.5')), float)
+        self.assertIs(NMEAFloatDataFormatter, tier.nmea_formatter)
+        self.assertIs(UBXFloatDataFormatter, tier.ubx_formatter)
+        self.assertIs(FloatOrientationOffsetProvider, tier.orientation_offset_provider)
+        self.assertIs(FloatDistAngleFactorProvider, tier.dist_angle_factor_provider)
+
+    def test_create_unsupported(self):
+        with self.assertRaises(KeyError) as context:
+            create_math_tier('fixed')
+        self.assertIn('fixed', str(context.exception))
+        for name in MATH_TIERS:
+            self.assertIn(name, str(context.exception))
@@ -0,0 +1,77 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+import uuid
+from unittest.mock import Mock
+
+from xhoundpi.message import Message, PayloadParseError
+from xhoundpi.proto_class import ProtocolClass
+
+class test_Message(unittest.TestCase):
+
+    def test_payload_given(self):
+        message = Message(uuid.UUID(int=1), ProtocolClass.NMEA, 'payload')
+
+        self.assertTrue(message.parsed)
+        self.assertFalse(message.dirty)
+        self.assertEqual(message.payload, 'payload')
+        self.assertEqual(message.frame, None)
+        self.assertEqual(message.frame_edits, None)
+
+    def test_payload_parsed_once_on_access(self):
+        parser = Mock(return_value='payload')
+        message = Message(uuid.UUID(int=1), ProtocolClass.UBX, frame=b'\xb5\x62', parser=parser)
+
+        self.assertFalse(message.parsed)
+        parser.assert_not_called()
+        self.assertEqual(message.payload, 'payload')
+        self.assertEqual(message.payload, 'payload')
+        self.assertTrue(message.parsed)
+        self.assertFalse(message.dirty)
+        self.assertEqual(message.frame_edits, {})
+        parser.assert_called_once_with(b'\xb5\x62')
+
+    def test_payload_set_drops_pending_parse(self):
+        parser = Mock(return_value='payload')
+        message = Message(uuid.UUID(int=1), ProtocolClass.UBX, frame=b'\xb5\x62', parser=parser)
+        self.assertFalse(message.dirty)
+
+        message.payload = 'edited'
+
+        self.assertTrue(message.dirty)
+        self.assertTrue(message.parsed)
+        self.assertEqual(message.payload, 'edited')
+        self.assertEqual(message.frame_edits, None)
+        parser.assert_not_called()
+
+    def test_payload_set_drops_frame_edits(self):
+        message = Message(uuid.UUID(int=1), ProtocolClass.NMEA, frame=b'$', parser=lambda frame: 'payload')
+        message.payload # pylint: disable=pointless-statement
+        message.frame_edits[1] = 'edited'
+
+        message.payload = 'replaced'
+
+        self.assertEqual(message.frame_edits, None)
+
+    def test_payload_parse_error(self):
+        error = ValueError('checksum')
+        message = Message(uuid.UUID(int=1), ProtocolClass.NMEA, frame=b'$', parser=Mock(side_effect=error))
+
+        with self.assertRaises(PayloadParseError) as context:
+            message.payload # pylint: disable=pointless-statement
+
+        self.assertEqual(str(context.exception), f'Error parsing payload of message {uuid.UUID(int=1)} with protocol ProtocolClass.NMEA.')
+        self.assertEqual(context.exception.message_id, uuid.UUID(int=1))
+        self.assertEqual(context.exception.proto, ProtocolClass.NMEA)
+        self.assertIs(context.exception.details, error)
+        self.assertFalse(message.parsed)
+
+    def test_equality_compares_payloads(self):
+        lazy = Message(uuid.UUID(int=1), ProtocolClass.UBX, frame=b'\xb5\x62', parser=lambda frame: 'payload')
+        eager = Message(uuid.UUID(int=1), ProtocolClass.UBX, 'payload')
+
+        self.assertEqual(lazy, eager)
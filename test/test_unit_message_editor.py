@@ -40,10 +40,12 @@ class test_UBXMessageEditor(unittest.TestCase):
             proto=ProtocolClass.UBX,
             payload=pyubx2.UBXReader.parse(self.common_frame))
         self.assertEqual(msg.payload.lon, -823964140)
+        self.assertFalse(msg.dirty)
 
         status, msg = editor.set_fields(msg, {'lon': -923964140})
 
         self.assertEqual(status, Status.OK())
+        self.assertTrue(msg.dirty)
         self.assertEqual(msg.message_id, uuid.UUID('{12345678-1234-5678-1234-567812345678}'))
         self.assertEqual(msg.proto, ProtocolClass.UBX)
         self.assertEqual(msg.payload.lon, -923964140)
@@ -128,9 +130,11 @@ class test_NMEAMessageEditor(unittest.TestCase):
             proto=ProtocolClass.NMEA,
             payload=pynmea2.NMEASentence.parse(self.common_frame.decode()))
 
+        self.assertFalse(msg.dirty)
         status, msg = editor.set_fields(msg, {'lon': '09223.77912'})
 
         self.assertEqual(status, Status.OK())
+        self.assertTrue(msg.dirty)
         self.assertEqual(msg.message_id, uuid.UUID('{12345678-1234-5678-1234-567812345678}'))
         self.assertEqual(msg.proto, ProtocolClass.NMEA)
         self.assertEqual(msg.payload.lon, '09223.77912')
@@ -180,6 +184,31 @@ class test_NMEAMessageEditor(unittest.TestCase):
             '38 2C 32 2E 30 36 2C 31  2E 35 31 2C 31 35 2C 30'
             '2C 30 2A 34 31 0D 0A                            '))
 
+    def test_set_fields_records_frame_edits(self):
+        editor = NMEAMessageEditor()
+        msg = Message(
+            message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'),
+            proto=ProtocolClass.NMEA,
+            frame=self.common_frame,
+            parser=lambda frame: pynmea2.NMEASentence.parse(frame.decode()))
+
+        status, msg = editor.set_fields(msg, {'lon': '09223.77912', 'lon_dir': 'E'})
+
+        self.assertEqual(status, Status.OK())
+        self.assertEqual(msg.frame_edits, {5: '09223.77912', 6: 'E'})
+
+    def test_set_fields_on_replaced_payload(self):
+        editor = NMEAMessageEditor()
+        msg = Message(
+            message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'),
+            proto=ProtocolClass.NMEA,
+            payload=pynmea2.NMEASentence.parse(self.common_frame.decode()))
+
+        status, msg = editor.set_fields(msg, {'lon': '09223.77912'})
+
+        self.assertEqual(status, Status.OK())
+        self.assertIsNone(msg.frame_edits)
+
     def test_should_fail_if_field_does_not_exist(self):
         self.maxDiff = None
         editor = NMEAMessageEditor()
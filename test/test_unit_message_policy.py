@@ -11,7 +11,7 @@ import pyubx2
 import pynmea2
 
 from xhoundpi.message import Message
-from xhoundpi.message_policy import AlwaysQualifiesPolicy, HasLocationPolicy
+from xhoundpi.message_policy import AlwaysQualifiesPolicy, HasLocationPolicy, HeaderIdentityPolicy
 from xhoundpi.proto_class import ProtocolClass
 
 class test_AlwaysQualifiesPolicy(unittest.TestCase):
@@ -74,3 +74,37 @@ class test_HasLocationPolicy(unittest.TestCase):
         msg = Message(None, ProtocolClass.NMEA, pynmea2.parse("$GNDTM,W84,,0.0,N,0.0,E,0.0,W84*71"))
         policy = HasLocationPolicy()
         self.assertFalse(policy.qualifies(msg))
+
+    def test_qualifies_lazily_parsed_payload(self):
+        frame = b'$GPGGA,184353.07,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000*6D\r\n'
+        msg = Message(None, ProtocolClass.NMEA, frame=frame, parser=lambda frame: pynmea2.parse(frame.decode(), check=True))
+        policy = HasLocationPolicy()
+        self.assertTrue(policy.qualifies(msg))
+
+    def test_qualifies_not_with_unparseable_frame(self):
+        frame = b'$GPGGA,184353.07,1929.045,S,02410.506,E,1,04,2.6,100.00,M,-33.9,M,,0000*00\r\n'
+        msg = Message(None, ProtocolClass.NMEA, frame=frame, parser=lambda frame: pynmea2.parse(frame.decode(), check=True))
+        policy = HasLocationPolicy()
+        self.assertFalse(policy.qualifies(msg))
+
+class test_HeaderIdentityPolicy(unittest.TestCase):
+
+    def test_qualifies(self):
+        policy = HeaderIdentityPolicy({
+            ProtocolClass.UBX: {b'\x01\x61'},
+            ProtocolClass.NMEA: {b'GLL', b'PUBX'},
+        })
+        parser = Mock()
+        def message(proto, frame):
+            return Message(message_id=None, proto=proto, frame=frame, parser=parser)
+
+        self.assertTrue(policy.qualifies(message(ProtocolClass.UBX, b'\xb5\x62\x01\x61\x04\x00')))
+        self.assertFalse(policy.qualifies(message(ProtocolClass.UBX, b'\xb5\x62\x01\x07\x5c\x00')))
+        self.assertTrue(policy.qualifies(message(ProtocolClass.NMEA, b'$GNGLL,,,,,,V,N*7A\r\n')))
+        self.assertTrue(policy.qualifies(message(ProtocolClass.NMEA, b'$PUBX,00*33\r\n')))
+        self.assertFalse(policy.qualifies(message(ProtocolClass.NMEA, b'$GNGGA,,,,,,0,00*56\r\n')))
+        # protocols without identities and messages without a frame never qualify
+        self.assertFalse(policy.qualifies(message(ProtocolClass.NONE, b'\x00')))
+        self.assertFalse(policy.qualifies(Message(message_id=None, proto=ProtocolClass.UBX, payload='payload')))
+        # the payloads are never parsed
+        parser.assert_not_called()
@@ -0,0 +1,50 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+import uuid
+
+from xhoundpi.message import Message
+from xhoundpi.message_priority import HeaderPriorityClassifier, Priority, StubPriorityClassifier
+from xhoundpi.proto_class import ProtocolClass
+
+def message(proto, frame):
+    return Message(message_id=uuid.uuid4(), proto=proto, frame=frame)
+
+class test_StubPriorityClassifier(unittest.TestCase):
+
+    def test_classify(self):
+        classifier = StubPriorityClassifier(Priority.HIGH)
+        self.assertEqual(classifier.classify(message(ProtocolClass.NMEA, b'$GPGSV,1*00\r\n')), Priority.HIGH)
+
+class test_HeaderPriorityClassifier(unittest.TestCase):
+
+    def test_classify(self):
+        classifier = HeaderPriorityClassifier({
+            ProtocolClass.UBX: {
+                bytes(b'\x01\x07') : Priority.HIGH,
+                bytes(b'\x01\x35') : Priority.LOW,
+            },
+            ProtocolClass.NMEA: {
+                bytes(b'GGA') : Priority.HIGH,
+                bytes(b'GSV') : Priority.LOW,
+                bytes(b'PUBX') : Priority.HIGH,
+            },
+        }, default=Priority.NORMAL)
+
+        self.assertEqual(classifier.classify(message(ProtocolClass.UBX, b'\xb5\x62\x01\x07\x00\x00')), Priority.HIGH)
+        self.assertEqual(classifier.classify(message(ProtocolClass.UBX, b'\xb5\x62\x01\x35\x00\x00')), Priority.LOW)
+        self.assertEqual(classifier.classify(message(ProtocolClass.UBX, b'\xb5\x62\x0a\x04\x00\x00')), Priority.NORMAL)
+        # the talker is ignored
+        self.assertEqual(classifier.classify(message(ProtocolClass.NMEA, b'$GNGGA,1*00\r\n')), Priority.HIGH)
+        self.assertEqual(classifier.classify(message(ProtocolClass.NMEA, b'$GPGSV,1*00\r\n')), Priority.LOW)
+        self.assertEqual(classifier.classify(message(ProtocolClass.NMEA, b'$PUBX,00*00\r\n')), Priority.HIGH)
+        self.assertEqual(classifier.classify(message(ProtocolClass.NMEA, b'$GPVTG,1*00\r\n')), Priority.NORMAL)
+
+    def test_classify_defaults(self):
+        classifier = HeaderPriorityClassifier({ ProtocolClass.NMEA: { bytes(b'GGA') : Priority.HIGH } }, default=Priority.LOW)
+        self.assertEqual(classifier.classify(message(ProtocolClass.UBX, b'\xb5\x62\x01\x07\x00\x00')), Priority.LOW)
+        self.assertEqual(classifier.classify(Message(message_id=uuid.uuid4(), proto=ProtocolClass.NMEA, payload='payload')), Priority.LOW)
@@ -0,0 +1,59 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+
+from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.message_route import Route
+from xhoundpi.message_router import StubMessageRouter, HeaderMessageRouter
+
+class test_StubMessageRouter(unittest.TestCase):
+
+    def test_route(self):
+        router = StubMessageRouter(Route.DROP)
+
+        self.assertEqual(router.route(ProtocolClass.UBX, b'\xb5\x62\x01\x07'), Route.DROP)
+
+class test_HeaderMessageRouter(unittest.TestCase):
+
+    def create_router(self): # pylint: disable=no-self-use
+        return HeaderMessageRouter({
+            ProtocolClass.UBX: {
+                bytes(b'\x01\x07') : Route.PROCESS,
+                bytes(b'\x01\x35') : Route.DROP,
+            },
+            ProtocolClass.NMEA: {
+                bytes(b'GGA') : Route.PROCESS,
+                bytes(b'PUBX') : Route.PROCESS,
+                bytes(b'TXT') : Route.DROP,
+            },
+        }, default=Route.PASSTHROUGH)
+
+    def test_route_ubx(self):
+        router = self.create_router()
+
+        self.assertEqual(router.route(ProtocolClass.UBX, bytes.fromhex('B5 62 01 07 5C 00')), Route.PROCESS)
+        self.assertEqual(router.route(ProtocolClass.UBX, memoryview(bytes.fromhex('B5 62 01 35 08 00'))), Route.DROP)
+        self.assertEqual(router.route(ProtocolClass.UBX, bytes.fromhex('B5 62 01 03 10 00')), Route.PASSTHROUGH)
+
+    def test_route_nmea_ignores_talker(self):
+        router = self.create_router()
+
+        self.assertEqual(router.route(ProtocolClass.NMEA, b'$GPGGA,184353.07,1929.045,S*6D\r\n'), Route.PROCESS)
+        self.assertEqual(router.route(ProtocolClass.NMEA, memoryview(b'$GNGGA,184353.07,1929.045,S*6D\r\n')), Route.PROCESS)
+        self.assertEqual(router.route(ProtocolClass.NMEA, b'$GNTXT,01,01,02,ANTSTATUS=OK*25\r\n'), Route.DROP)
+        self.assertEqual(router.route(ProtocolClass.NMEA, b'$GPGSV,3,1,09,04,52*61\r\n'), Route.PASSTHROUGH)
+
+    def test_route_nmea_proprietary(self):
+        router = self.create_router()
+
+        self.assertEqual(router.route(ProtocolClass.NMEA, b'$PUBX,00,081350.00,4717.113210,N*5C\r\n'), Route.PROCESS)
+        self.assertEqual(router.route(ProtocolClass.NMEA, b'$PGRME,15.0,M,45.0,M,25.0,M*1C\r\n'), Route.PASSTHROUGH)
+
+    def test_route_unmapped_protocol(self):
+        router = HeaderMessageRouter({}, default=Route.PROCESS)
+
+        self.assertEqual(router.route(ProtocolClass.UBX, bytes.fromhex('B5 62 01 07 5C 00')), Route.PROCESS)
@@ -8,7 +8,7 @@ from unittest.mock import Mock, call
 
 from test.time_utils import FakeStopWatch
 
-from xhoundpi.metric import LatencyMetric, CounterMetric, ValueMetric, SuccessCounterMetric, MetricsCollection
+from xhoundpi.metric import LatencyMetric, CounterMetric, ValueMetric, SuccessCounterMetric, ReportedMetric, MetricsCollection
 
 class test_LatencyMetric(unittest.TestCase): # pylint: disable=invalid-name
 
@@ -63,6 +63,15 @@ class test_LatencyMetric(unittest.TestCase): # pylint: disable=invalid-name
 
         self.assertEqual(metric.mappify(), {'latency1': 20.0})
 
+    def test_record(self):
+        hook = Mock()
+        metric = LatencyMetric('latency1', FakeStopWatch(), [hook])
+
+        metric.record(0.25)
+
+        self.assertEqual(metric.value, 0.25)
+        hook.assert_called_once_with('latency1', 0.25)
+
     def test_latency_as_context_manager_bubbles_exception(self):
         stopwatch = FakeStopWatch()
         hook = Mock()
@@ -168,6 +177,29 @@ class test_SuccessCounterMetric(unittest.TestCase): # pylint: disable=invalid-na
 
         self.assertEqual(str(metric), "{'counter1_success': 2, 'counter1_failure': 1}")
 
+class test_ReportedMetric(unittest.TestCase): # pylint: disable=invalid-name
+
+    def test_update(self):
+        hook = Mock()
+        metric = ReportedMetric('reader', [hook])
+        self.assertEqual(metric.mappify(), {})
+
+        metric.update({'read_bytes': 10, 'read_counter_success': 2})
+        hook.assert_has_calls([call('reader_read_bytes', 10), call('reader_read_counter_success', 2)])
+        self.assertEqual(metric.mappify(), {'reader_read_bytes': 10, 'reader_read_counter_success': 2})
+
+        # NOTE a report replaces the previous one
+        metric.update({'read_bytes': 15})
+        hook.assert_called_with('reader_read_bytes', 15)
+        self.assertEqual(metric.mappify(), {'reader_read_bytes': 15})
+        self.assertEqual(str(metric), "{'reader_read_bytes': 15}")
+
+    def test_in_collection(self):
+        metric = ReportedMetric('reader', [])
+        collection = MetricsCollection([CounterMetric('counter1', []), metric])
+        metric.update({'counter1': 3})
+        self.assertEqual(collection.mappify(), {'counter1': 0, 'reader_counter1': 3})
+
 class StubMetric:
 
     def __init__(self, dimension, mapping):
@@ -0,0 +1,87 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import pathlib
+import unittest
+from io import BytesIO
+from unittest.mock import Mock
+
+import pynmea2
+
+from xhoundpi.nmea_fast_parser import NMEAPositionParser
+from tools.hermes.parser import parser
+
+GGA = b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,18.893,M,-25.669,M,2.0,0031*4F\r\n'
+
+def library_parse(frame):
+    return pynmea2.parse(str(frame, 'ascii'), check=True)
+
+def load_capture(name):
+    capture = pathlib.Path(__file__).parent.absolute().joinpath(f'../data/{name}')
+    with capture.open('r', encoding='ascii') as source, BytesIO() as output:
+        parser(source, output)
+        return [frame + b'\r\n' for frame in output.getvalue().split(b'\r\n') if frame]
+
+class test_NMEAPositionParser(unittest.TestCase):
+
+    def test_matches_library_on_capture(self):
+        fallback = Mock(side_effect=library_parse)
+        nmea_parser = NMEAPositionParser(fallback=fallback)
+        frames = load_capture('nmea_capture_sample.cap')
+        fast = [frame for frame in frames if frame[3:6] in NMEAPositionParser.SENTENCES]
+        self.assertEqual({frame[3:6] for frame in fast}, {b'GGA', b'RMC', b'GNS', b'GLL', b'GST'})
+
+        for frame in frames:
+            result = nmea_parser.parse(memoryview(frame))
+            expected = library_parse(frame)
+            self.assertIs(type(result), type(expected))
+            self.assertEqual(result.data, expected.data)
+            self.assertEqual(result.render(newline=True), expected.render(newline=True))
+            self.assertEqual(result.render(newline=True).encode('ascii'), frame)
+            for name in type(expected).name_to_idx:
+                self.assertEqual(getattr(result, name), getattr(expected, name))
+        self.assertEqual(fallback.call_count, len(frames) - len(fast))
+
+    def test_position_fields(self):
+        result = NMEAPositionParser(fallback=Mock()).parse(GGA)
+
+        self.assertIsInstance(result, pynmea2.GGA)
+        self.assertEqual((result.talker, result.sentence_type), ('GP', 'GGA'))
+        self.assertEqual((result.lat, result.lat_dir, result.lon, result.lon_dir), ('3723.46587704', 'N', '12202.26957864', 'W'))
+        self.assertEqual(result.altitude, 18.893)
+        self.assertFalse(hasattr(result, 'alt'))
+        self.assertFalse(hasattr(result, 'manufacturer'))
+
+    def test_fallback(self):
+        frames = [
+            b'$PUBX,00,183246.00,2938.52571,N,08223.77912,W,-3.078,D3,5.7,15,0.199,266.49,0.007,,0.88,2.06,1.51,15,0,0*4B\r\n',
+            b'$GPGSV,2,2,05,30,06,304,,0*52\r\n',
+            GGA.replace(b'$GPGGA', b'$gpgga'),
+            GGA.replace(b'$', b'!'),
+            GGA.replace(b'$GPGGA', b'$G-GGA'),
+            GGA.replace(b'*4F', b'*4E'),
+            GGA.replace(b'*4F', b'*+F'),
+            GGA.replace(b'*4F', b''),
+            GGA.replace(b'\r\n', b'x\r\n'),
+            b'$GPGGA',
+        ]
+        for frame in frames:
+            fallback = Mock(return_value='payload')
+            self.assertEqual(NMEAPositionParser(fallback=fallback).parse(frame), 'payload')
+            fallback.assert_called_once_with(frame)
+
+    def test_fallback_errors(self):
+        nmea_parser = NMEAPositionParser(fallback=library_parse)
+        with self.assertRaises(pynmea2.ChecksumError):
+            nmea_parser.parse(GGA.replace(b'*4F', b'*4E'))
+
+    def test_skip_validation(self):
+        fallback = Mock()
+        result = NMEAPositionParser(fallback=fallback, validate=False).parse(GGA.replace(b'*4F', b'*00'))
+
+        self.assertIsInstance(result, pynmea2.GGA)
+        self.assertEqual(result.lat, '3723.46587704')
+        fallback.assert_not_called()
@@ -0,0 +1,112 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+from unittest.mock import patch
+from uuid import UUID
+
+import pynmea2
+
+from xhoundpi.message import Message
+from xhoundpi.message_editor import NMEAMessageEditor
+from xhoundpi.nmea_patcher import NMEAPatchError, fit_nmea_field, nmea_checksum, render_nmea_message, splice_nmea_fields
+from xhoundpi.proto_class import ProtocolClass
+
+GGA = b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,18.893,M,-25.669,M,2.0,0031*4F\r\n'
+PUBX = b'$PUBX,00,183246.00,2938.52571,N,08223.77912,W,-3.078,D3,5.7,15,0.199,266.49,0.007,,0.88,2.06,1.51,15,0,0*4B\r\n'
+
+class test_NMEAPatcher(unittest.TestCase):
+
+    def test_checksum(self):
+        self.assertEqual(nmea_checksum(GGA[1:-5]), 0x4F)
+        self.assertEqual(nmea_checksum(PUBX[1:-5]), 0x4B)
+        self.assertEqual(nmea_checksum(b'A'), 0x41)
+        self.assertEqual(nmea_checksum(b''), 0)
+
+    def test_splice_fields(self):
+        patched = splice_nmea_fields(memoryview(GGA), {1: '3723.46587705', 4: 'E', 8: '19.893'}, 14)
+
+        self.assertEqual(patched,
+            b'$GPGGA,172814.0,3723.46587705,N,12202.26957864,E,2,6,1.2,19.893,M,-25.669,M,2.0,0031*5D\r\n')
+        self.assertEqual(nmea_checksum(patched[1:-5]), 0x5D)
+
+    def test_splice_no_fields(self):
+        self.assertEqual(splice_nmea_fields(GGA, {}, 14), GGA)
+
+    def test_splice_keeps_widths(self):
+        self.assertEqual(splice_nmea_fields(GGA, {8: '-1.0'}, 14),
+            b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,-1.000,M,-25.669,M,2.0,0031*58\r\n')
+        self.assertEqual(splice_nmea_fields(GGA, {8: '9.89'}, 14),
+            b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,09.890,M,-25.669,M,2.0,0031*4C\r\n')
+
+    def test_splice_widens_when_integer_does_not_fit(self):
+        patched = splice_nmea_fields(GGA, {8: '118.893'}, 14)
+        self.assertEqual(patched,
+            b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,118.893,M,-25.669,M,2.0,0031*7E\r\n')
+        self.assertEqual(nmea_checksum(patched[1:-5]), 0x7E)
+
+    def test_splice_proprietary(self):
+        patched = splice_nmea_fields(PUBX, {3: '0010.00000', 4: 'S'}, 21)
+        self.assertTrue(patched.startswith(b'$PUBX,00,183246.00,0010.00000,S,08223.77912,W,'))
+        self.assertEqual(int(patched[-4:-2], 16), nmea_checksum(patched[1:-5]))
+
+    def test_splice_out_of_range(self):
+        with self.assertRaises(NMEAPatchError) as context:
+            splice_nmea_fields(GGA, {14: '1'}, 14)
+        self.assertEqual(context.exception.details, 'field 14 out of the 14 sentence fields')
+
+    def test_splice_requires_checksum(self):
+        with self.assertRaises(NMEAPatchError) as context:
+            splice_nmea_fields(b'$GPGGA,172814.0\r\n', {0: '172815.0'}, 1)
+        self.assertEqual(context.exception.details, 'frame has no checksum')
+
+    def test_fit_field(self):
+        self.assertEqual(fit_nmea_field(b'100.1', b'100.123'), b'100.100')
+        self.assertEqual(fit_nmea_field(b'100.1234', b'100.123'), b'100.123')
+        self.assertEqual(fit_nmea_field(b'-5.0', b'118.893'), b'-05.000')
+        self.assertEqual(fit_nmea_field(b'5', b'12'), b'05')
+        self.assertEqual(fit_nmea_field(b'5.7', b'12'), b'06')
+        self.assertEqual(fit_nmea_field(b'1000.0', b'99.9'), b'1000.0')
+        self.assertEqual(fit_nmea_field(b'S', b'N'), b'S')
+        self.assertEqual(fit_nmea_field(b'12.5', b''), b'12.5')
+        self.assertEqual(fit_nmea_field(b'', b'12.5'), b'')
+
+    def test_fit_field_rounds_half_even(self):
+        self.assertEqual(fit_nmea_field(b'19.8999', b'18.893'), b'19.900')
+        self.assertEqual(fit_nmea_field(b'9.9999', b'18.893'), b'10.000')
+        self.assertEqual(fit_nmea_field(b'1.0005', b'18.893'), b'01.000')
+        self.assertEqual(fit_nmea_field(b'1.0015', b'18.893'), b'01.002')
+        self.assertEqual(fit_nmea_field(b'1.00050001', b'18.893'), b'01.001')
+        self.assertEqual(fit_nmea_field(b'-18.8926', b'18.893'), b'-18.893')
+        self.assertEqual(fit_nmea_field(b'2.5', b'12'), b'02')
+
+    def test_fit_field_drops_sign_of_zero(self):
+        self.assertEqual(fit_nmea_field(b'-0.0004', b'18.893'), b'00.000')
+        self.assertEqual(fit_nmea_field(b'-0.000', b'18.893'), b'00.000')
+        self.assertEqual(fit_nmea_field(b'-0.0005', b'18.893'), b'00.000')
+        self.assertEqual(fit_nmea_field(b'-0.0006', b'18.893'), b'-0.001')
+
+    def test_render_message(self):
+        for frame, fields in (
+            (GGA, {'lat': '3723.46587705', 'lon_dir': 'E', 'altitude': '19.893'}),
+            (PUBX, {'lat': '0010.00000', 'lat_dir': 'S', 'lon': '01000.00000', 'lon_dir': 'E'}),
+            (PUBX, {'alt_ref': '-3.079'})):
+            message = Message(message_id=UUID(int=1), proto=ProtocolClass.NMEA,
+                frame=frame, parser=lambda frame: pynmea2.parse(bytes(frame).decode()))
+            NMEAMessageEditor().set_fields(message, fields)
+            expected = bytes(message.payload.render(newline=True), 'ascii')
+            with patch.object(type(message.payload), 'render') as render:
+                self.assertEqual(render_nmea_message(message), expected)
+                render.assert_not_called()
+
+    def test_render_message_without_frame_edits(self):
+        sentence = pynmea2.parse(GGA.decode())
+        message = Message(message_id=UUID(int=1), proto=ProtocolClass.NMEA, payload=sentence)
+        self.assertEqual(render_nmea_message(message), GGA)
+        # NOTE a payload replaced as a whole has no edits against the frame
+        message = Message(message_id=UUID(int=1), proto=ProtocolClass.NMEA, frame=PUBX)
+        message.payload = sentence
+        self.assertEqual(render_nmea_message(message), GGA)
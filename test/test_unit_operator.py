@@ -4,18 +4,25 @@
 # pylint: disable=line-too-long
 # pylint: disable=invalid-name
 
+import random
 import unittest
 from unittest.mock import Mock
 from dataclasses import dataclass
-from decimal import Decimal as D
+from decimal import Decimal as D, Inexact, localcontext
 from uuid import UUID
 from xhoundpi.proto_class import ProtocolClass
 
 from xhoundpi.coordinates_offset import GeoCoordinates
 from xhoundpi.direction import CoordAxis, Direction as Dir
-from xhoundpi.operator import NMEAOffsetOperator, UBXOffsetOperator, UBXHiResOffsetOperator
+from xhoundpi.data_formatter import UBXDataFormatter
+from xhoundpi.dmath import setup_common_context
+from xhoundpi.operator import (NMEAOffsetOperator, UBXOffsetOperator, UBXHiResOffsetOperator,
+    UBXFixedOffsetOperator, UBXHiResFixedOffsetOperator, UBXOffsetUnits)
+from xhoundpi.status import Status
 from xhoundpi.message import Message
 
+setup_common_context()
+
 @dataclass
 class NMEAPayload:
     lat: str = '9801.12345'
@@ -435,3 +442,74 @@ class test_UBXHiResOffsetOperator(unittest.TestCase):
                 'lonHp': -30,
             })
         self.assertEqual(result, 'new message')
+
+class test_UBXFixedOffsetOperators(unittest.TestCase):
+    ''' Differential tests against the Decimal operators, the reference '''
+
+    @staticmethod
+    def create_editor():
+        editor = Mock()
+        editor.set_fields = Mock(side_effect=lambda message, fields: (Status.OK(), fields))
+        return editor
+
+    @staticmethod
+    def create_offset_provider(offset: GeoCoordinates):
+        provider = Mock()
+        provider.get_offset = Mock(return_value=offset)
+        return provider
+
+    def operate(self, operator_type, payload, offset: GeoCoordinates):
+        operator = operator_type(
+            msg_editor=self.create_editor(),
+            data_formatter=UBXDataFormatter(),
+            offset_provider=self.create_offset_provider(offset))
+        message = Message(message_id=UUID('{12345678-1234-5678-1234-567812345678}'), proto=ProtocolClass.UBX, payload=payload)
+        return operator.operate(message)[1]
+
+    def assert_matches_reference(self, payload, offset: GeoCoordinates):
+        with localcontext() as ctx:
+            ctx.traps[Inexact] = False
+            for reference_type, fixed_type in (
+                (UBXOffsetOperator, UBXFixedOffsetOperator),
+                (UBXHiResOffsetOperator, UBXHiResFixedOffsetOperator)):
+                try:
+                    expected = self.operate(reference_type, payload, offset)
+                except ValueError:
+                    with self.assertRaises(ValueError):
+                        self.operate(fixed_type, payload, offset)
+                    continue
+                self.assertEqual(expected, self.operate(fixed_type, payload, offset), msg=f'{payload} + {offset}')
+
+    def test_assorted(self):
+        for payload in (UBXPayload(), UBXPayloadWithoutHeight(), UBXPayload(-999, -111, -22, -33, -20, -4, -30, -2), UBXPayload(0, 0, 0, 0, 0, 0, 0, 0)):
+            for offset in (
+                GeoCoordinates(D('0'), D('0'), D('0')),
+                GeoCoordinates(D('0.000000001'), D('-0.000000001'), D('0.0001')),
+                GeoCoordinates(D('0.0000000005'), D('-0.0000000005'), D('0.00005')),
+                GeoCoordinates(D('-0.0000012345678'), D('0.0000098765432'), D('-1.23456')),
+                GeoCoordinates(D('1.000000005'), D('1.000000005'), D('1.0005'))):
+                self.assert_matches_reference(payload, offset)
+
+    def test_random(self):
+        rand = random.Random(0)
+        for _ in range(500):
+            payload = UBXPayload(
+                lat=rand.randint(-900000000, 900000000), lon=rand.randint(-1800000000, 1800000000),
+                latHp=rand.randint(-99, 99), lonHp=rand.randint(-99, 99),
+                height=rand.randint(-100000, 10000000), heightHp=rand.randint(-9, 9),
+                hMSL=rand.randint(-100000, 10000000), hMSLHp=rand.randint(-9, 9))
+            offset = GeoCoordinates(
+                D(f'{rand.uniform(-0.001, 0.001):.13f}'),
+                D(f'{rand.uniform(-0.001, 0.001):.13f}'),
+                D(f'{rand.uniform(-5, 5):.7f}'))
+            self.assert_matches_reference(payload, offset)
+
+    def test_offset_units_cached(self):
+        formatter = Mock(wraps=UBXDataFormatter())
+        units = UBXOffsetUnits(formatter)
+        first = units.get_units(GeoCoordinates(D('0.0000000015'), D('-0.0000000015'), D('0.00015')))
+        self.assertEqual(((1, 2), (-2, -1), (1, 2)), first)
+        self.assertEqual(first, units.get_units(GeoCoordinates(D('0.0000000015'), D('-0.0000000015'), D('0.00015'))))
+        self.assertEqual(2, formatter.decdeg_to_units.call_count, msg='Because an unchanged offset is not converted again')
+        self.assertEqual(((1, 1), (0, 0), (0, 0)), units.get_units(GeoCoordinates(D('0.000000001'), D('0'), D('0'))))
+        self.assertEqual(4, formatter.decdeg_to_units.call_count)
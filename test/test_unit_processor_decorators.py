@@ -19,6 +19,7 @@ import xhoundpi.processor_decorators # pylint: disable=unused-import
 
 from xhoundpi.proto_class import ProtocolClass
 from xhoundpi.message import Message
+from xhoundpi.message_route import Route
 from xhoundpi.status import Status
 from xhoundpi.async_ext import run_sync
 from xhoundpi.processor import IProcessor
@@ -291,3 +292,40 @@ class test_ProcessorWithMetrics(unittest.TestCase):
             payload=None)))
         self.assertEqual((status, message), self.make_result(Status(RuntimeError('Whoops!'))))
         self.assertMetrics(tdata, 0, 1, 0.5)
+
+class test_ProcessorWithRouteBypass(unittest.TestCase):
+
+    def test_process_routed(self):
+        processed = Message(
+            message_id=uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            proto=ProtocolClass.UBX,
+            payload='processed')
+        service = StubProcessor((Status.OK(), processed))
+        decorated = service.with_route_bypass() # pylint: disable=no-member
+        message = Message(
+            message_id=uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            proto=ProtocolClass.UBX,
+            payload=None,
+            route=Route.PROCESS)
+
+        status, result = run_sync(decorated.process(message))
+
+        self.assertEqual(status, Status.OK())
+        self.assertIs(result, processed)
+
+    def test_process_bypassed(self):
+        parser = Mock()
+        service = StubProcessor((Status(RuntimeError('Whoops!')), None))
+        decorated = service.with_route_bypass() # pylint: disable=no-member
+        message = Message(
+            message_id=uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            proto=ProtocolClass.NMEA,
+            frame=b'$GPGSV',
+            parser=parser,
+            route=Route.PASSTHROUGH)
+
+        status, result = run_sync(decorated.process(message))
+
+        self.assertEqual(status, Status.OK())
+        self.assertIs(result, message)
+        parser.assert_not_called()
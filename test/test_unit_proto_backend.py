@@ -0,0 +1,92 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+import uuid
+
+import pynmea2
+import pyubx2
+
+from xhoundpi.message import Message
+from xhoundpi.proto_backend import BACKENDS, create_backend
+from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.proto_parser import NMEAProtocolParser, UBXProtocolParser
+from xhoundpi.proto_serializer import NMEAProtocolSerializer, UBXProtocolSerializer
+from xhoundpi.ubx_nav_codec import UBXNavPayload
+
+GGA = b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,18.893,M,-25.669,M,2.0,0031*4F\r\n'
+BAD_GGA = b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,18.893,M,-25.669,M,2.0,0031*4E\r\n'
+UNCHECKED_GGA = b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,18.893,M,-25.669,M,2.0,0031\r\n'
+NAV_POSLLH = pyubx2.UBXMessage('NAV', 'NAV-POSLLH', pyubx2.GET,
+    iTOW=1000, lon=-1220378263, lat=373910979, height=1000, hMSL=1025, hAcc=3, vAcc=4).serialize()
+BAD_NAV_POSLLH = NAV_POSLLH[:-1] + bytes([NAV_POSLLH[-1] ^ 0xff])
+
+def message(protocol, frame, payload):
+    return Message(message_id=uuid.uuid4(), proto=protocol, payload=payload, frame=frame)
+
+class test_ProtocolBackend(unittest.TestCase):
+
+    def test_registry(self):
+        self.assertEqual(set(BACKENDS), {ProtocolClass.UBX, ProtocolClass.NMEA})
+        for protocol, backends in BACKENDS.items():
+            self.assertEqual(set(backends), {'library', 'native'})
+            for name in backends:
+                backend = create_backend(protocol, name)
+                parser_type, serializer_type = {
+                    ProtocolClass.UBX: (UBXProtocolParser, UBXProtocolSerializer),
+                    ProtocolClass.NMEA: (NMEAProtocolParser, NMEAProtocolSerializer),
+                }[protocol]
+                self.assertIsInstance(backend.parser, parser_type)
+                self.assertIsInstance(backend.serializer, serializer_type)
+
+    def test_raises_for_unknown_backend(self):
+        with self.assertRaises(KeyError) as context:
+            create_backend(ProtocolClass.UBX, 'somebackend')
+        self.assertIn('Backend "somebackend" not supported', context.exception.args[0])
+        self.assertIn("['library', 'native']", context.exception.args[0])
+
+    def test_ubx_backends(self):
+        library = create_backend(ProtocolClass.UBX, 'library')
+        native = create_backend(ProtocolClass.UBX, 'native')
+
+        library_payload = library.parser.parse(memoryview(NAV_POSLLH))
+        native_payload = native.parser.parse(memoryview(NAV_POSLLH))
+
+        self.assertIsInstance(library_payload, pyubx2.UBXMessage)
+        self.assertIsInstance(native_payload, UBXNavPayload)
+        for field in ('iTOW', 'lon', 'lat', 'height', 'hMSL', 'hAcc', 'vAcc'):
+            self.assertEqual(getattr(native_payload, field), getattr(library_payload, field))
+        self.assertEqual(library.serializer.serialize(message(ProtocolClass.UBX, NAV_POSLLH, library_payload)), NAV_POSLLH)
+        self.assertEqual(native.serializer.serialize(message(ProtocolClass.UBX, NAV_POSLLH, native_payload)), NAV_POSLLH)
+
+    def test_nmea_backends(self):
+        for name in ('library', 'native'):
+            backend = create_backend(ProtocolClass.NMEA, name)
+            payload = backend.parser.parse(memoryview(GGA))
+            self.assertIsInstance(payload, pynmea2.GGA)
+            self.assertEqual(payload.altitude, 18.893)
+            self.assertEqual(backend.serializer.serialize(message(ProtocolClass.NMEA, GGA, payload)), GGA)
+            with self.assertRaises(pynmea2.ChecksumError):
+                backend.parser.parse(memoryview(BAD_GGA))
+
+    def test_ubx_backends_check_checksums(self):
+        for name in ('library', 'native'):
+            with self.assertRaises(Exception):
+                create_backend(ProtocolClass.UBX, name).parser.parse(memoryview(BAD_NAV_POSLLH))
+
+    def test_backends_skip_checksums_validated_upstream(self):
+        for name in ('library', 'native'):
+            payload = create_backend(ProtocolClass.UBX, name, validated=True).parser.parse(memoryview(BAD_NAV_POSLLH))
+            self.assertEqual(payload.lat, 373910979)
+            with self.assertRaises(pynmea2.ChecksumError):
+                create_backend(ProtocolClass.NMEA, name).parser.parse(memoryview(UNCHECKED_GGA))
+            payload = create_backend(ProtocolClass.NMEA, name, validated=True).parser.parse(memoryview(UNCHECKED_GGA))
+            self.assertEqual(payload.altitude, 18.893)
+
+    def test_nmea_native_backend_skips_checksums_validated_upstream(self):
+        payload = create_backend(ProtocolClass.NMEA, 'native', validated=True).parser.parse(memoryview(BAD_GGA))
+        self.assertIsInstance(payload, pynmea2.GGA)
+        self.assertEqual(payload.altitude, 18.893)
@@ -8,6 +8,9 @@ import unittest
 from io import BytesIO
 
 from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.gnss_client import GnssClient
+from xhoundpi.metric import ValueMetric
+import xhoundpi.gnss_client_decorators # pylint: disable=unused-import
 from xhoundpi.proto_classifier import StubProtocolClassifier, ProtocolClassifier, ProtocolClassificationError
 
 class test_StubProtocolClassifier(unittest.TestCase):
@@ -44,10 +47,100 @@ class test_ProtocolClassifier(unittest.TestCase):
             classifier.classify(stream)
 
         self.maxDiff = None
-        self.assertEqual("Error identifying protocol from header. Read bytes '0x0000' not among expected headers ['0x24','0xB562','0x01'].", str(context.exception))
-        self.assertEqual(context.exception.data_read, b'\x00\x00')
+        self.assertEqual("Error identifying protocol from header. Read bytes '0x00' not among expected headers ['0x24','0xB562','0x01'].", str(context.exception))
+        self.assertEqual(context.exception.data_read, b'\x00')
         self.assertEqual(context.exception.mapping, {
             bytes(b'\x24') : ProtocolClass.NMEA,
             bytes(b'\xb5\x62') : ProtocolClass.UBX,
             bytes(b'\x01') : ProtocolClass.NONE
         })
+
+    def test_classify_rejects_partial_header_mismatch(self):
+        stream = BytesIO(b'\xb5\x00\x24')
+        classifier = ProtocolClassifier({
+            bytes(b'\x24') : ProtocolClass.NMEA,
+            bytes(b'\xb5\x62') : ProtocolClass.UBX,
+        })
+
+        with self.assertRaises(ProtocolClassificationError) as context:
+            classifier.classify(stream)
+        self.assertEqual(context.exception.data_read, b'\xb5\x00')
+        self.assertEqual(classifier.classify(stream), (bytes(b'\x24'), ProtocolClass.NMEA))
+
+    def test_classify_prefers_shortest_header(self):
+        mapping = {
+            bytes(b'\xb5\x62\x01') : ProtocolClass.NONE,
+            bytes(b'\xb5\x62') : ProtocolClass.UBX,
+            bytes(b'\xd3') : ProtocolClass.NONE,
+        }
+        classifier = ProtocolClassifier(mapping)
+        self.assertEqual(classifier.classify(BytesIO(b'\xb5\x62\x01')), (bytes(b'\xb5\x62'), ProtocolClass.UBX))
+        self.assertEqual(classifier.classify(BytesIO(b'\xd3\x00')), (bytes(b'\xd3'), ProtocolClass.NONE))
+
+        stream = GnssClient(BytesIO(b'\xb5\x62\x01')).with_buffer(capacity=16, chunk_size=4) # pylint: disable=no-member
+        self.assertEqual(classifier.classify(stream), (bytes(b'\xb5\x62'), ProtocolClass.UBX))
+
+    def test_classify_fails_on_empty_stream(self):
+        classifier = ProtocolClassifier({ bytes(b'\x24') : ProtocolClass.NMEA })
+
+        with self.assertRaises(ProtocolClassificationError) as context:
+            classifier.classify(BytesIO(b''))
+        self.assertEqual(context.exception.data_read, b'')
+
+    def test_classify_buffered_only_peeks(self):
+        stream = GnssClient(BytesIO(b'\x24\xb5\x62\x00')).with_buffer(capacity=16, chunk_size=4) # pylint: disable=no-member
+        classifier = ProtocolClassifier({
+            bytes(b'\x24') : ProtocolClass.NMEA,
+            bytes(b'\xb5\x62') : ProtocolClass.UBX,
+            bytes(b'\x00') : ProtocolClass.NONE
+        })
+
+        self.assertEqual(classifier.classify(stream), (bytes(b'\x24'), ProtocolClass.NMEA))
+        self.assertEqual(classifier.classify(stream), (bytes(b'\x24'), ProtocolClass.NMEA))
+        stream.read(1)
+        self.assertEqual(classifier.classify(stream), (bytes(b'\xb5\x62'), ProtocolClass.UBX))
+        stream.read(2)
+        self.assertEqual(classifier.classify(stream), (bytes(b'\x00'), ProtocolClass.NONE))
+
+    def test_classify_buffered_hunts_next_header(self):
+        stream = GnssClient(BytesIO(b'\x00\xb5\x00\x62' * 5 + b'\xb5\x62\x00\x24')).with_buffer(capacity=64, chunk_size=4) # pylint: disable=no-member
+        discarded = ValueMetric('discarded', [])
+        classifier = ProtocolClassifier({
+            bytes(b'\x24') : ProtocolClass.NMEA,
+            bytes(b'\xb5\x62') : ProtocolClass.UBX,
+        }, discarded_bytes=discarded)
+
+        self.assertEqual(classifier.classify(stream), (bytes(b'\xb5\x62'), ProtocolClass.UBX))
+        self.assertEqual(discarded.value, 20)
+        stream.read(2)
+        self.assertEqual(classifier.classify(stream), (bytes(b'\x24'), ProtocolClass.NMEA))
+        self.assertEqual(discarded.value, 21)
+
+    def test_classify_buffered_hunts_past_window(self):
+        stream = GnssClient(BytesIO(b'\x00' * 37 + b'\xb5\x62')).with_buffer(capacity=16, chunk_size=4) # pylint: disable=no-member
+        discarded = ValueMetric('discarded', [])
+        classifier = ProtocolClassifier({
+            bytes(b'\x24') : ProtocolClass.NMEA,
+            bytes(b'\xb5\x62') : ProtocolClass.UBX,
+        }, hunt_window=8, discarded_bytes=discarded)
+
+        self.assertEqual(classifier.classify(stream), (bytes(b'\xb5\x62'), ProtocolClass.UBX))
+        self.assertEqual(discarded.value, 37)
+
+    def test_classify_buffered_fails_on_exhausted_stream(self):
+        stream = GnssClient(BytesIO(b'\x00\x00\xb5')).with_buffer(capacity=16, chunk_size=4) # pylint: disable=no-member
+        discarded = ValueMetric('discarded', [])
+        classifier = ProtocolClassifier({
+            bytes(b'\x24') : ProtocolClass.NMEA,
+            bytes(b'\xb5\x62') : ProtocolClass.UBX,
+        }, discarded_bytes=discarded)
+
+        with self.assertRaises(ProtocolClassificationError) as context:
+            classifier.classify(stream)
+        self.assertEqual(context.exception.data_read, b'\xb5')
+        self.assertEqual(discarded.value, 3)
+
+        with self.assertRaises(ProtocolClassificationError) as context:
+            classifier.classify(stream)
+        self.assertEqual(context.exception.data_read, b'')
+        self.assertEqual(discarded.value, 3)
@@ -19,6 +19,16 @@ class test_StubProtocolParser(unittest.TestCase):
 
         self.assertEqual(parser.parse(data_source), b'\x01\x02')
 
+    def test_parse_copies_views(self):
+        data_source = bytearray(b'\x01\x02')
+        parser = StubProtocolParser()
+
+        result = parser.parse(memoryview(data_source))
+        data_source[0] = 0xff
+
+        self.assertIsInstance(result, bytes)
+        self.assertEqual(result, b'\x01\x02')
+
 class test_UBXProtocolParser(unittest.TestCase):
 
     def test_parse(self):
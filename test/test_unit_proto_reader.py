@@ -10,6 +10,8 @@ from unittest.mock import Mock
 from io import BytesIO
 
 from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.gnss_client import GnssClient
+import xhoundpi.gnss_client_decorators # pylint: disable=unused-import
 from xhoundpi.proto_reader import ProtocolReaderProvider, StubProtocolReader,\
                                   UBXProtocolReader,\
                                   NMEAProtocolReader,\
@@ -17,6 +19,9 @@ from xhoundpi.proto_reader import ProtocolReaderProvider, StubProtocolReader,\
                                   HeaderMismatchError,\
                                   MalformedFrameError
 
+def buffered(data: bytes, chunk_size: int = 8):
+    return GnssClient(BytesIO(data)).with_buffer(capacity=1024, chunk_size=chunk_size) # pylint: disable=no-member
+
 class test_StubProtocolReader(unittest.TestCase):
 
     def test_read_with_defaults(self):
@@ -146,6 +151,48 @@ class test_UBXProtocolReader(unittest.TestCase):
         self.assertEqual(context.exception.details, bytes.fromhex('C6'))
         self.assertEqual(context.exception.protocol, ProtocolClass.UBX)
 
+    def test_read_buffered_frame(self):
+        reader = UBXProtocolReader()
+        # on buffered streams the header is still pending
+        stream = buffered(bytes.fromhex(
+              'B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1'
+            + 'B5 62 01 25 14 00 10 0A B9 1D EA 9B 07 00 79 2E 06 00 62 04 12 07 27 00 00 00 09 60'))
+
+        self.assertEqual(reader.read_frame(b'\xb5\x62', stream),
+            bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6 F1'))
+        self.assertEqual(reader.read_frame(b'\xb5\x62', stream),
+            bytes.fromhex('B5 62 01 25 14 00 10 0A B9 1D EA 9B 07 00 79 2E 06 00 62 04 12 07 27 00 00 00 09 60'))
+        self.assertEqual(stream.read(1), b'')
+
+    def test_buffered_throws_on_malformed_preamble(self):
+        reader = UBXProtocolReader()
+        stream = buffered(bytes.fromhex('B5 62 01 03 10'))
+        with self.assertRaises(MalformedFrameError) as context:
+            reader.read_frame(b'\xb5\x62', stream)
+
+        self.assertEqual('Error reading ProtocolClass.UBX frame: Found EOF attempting to read frame preamble. Read 3 bytes out of 4 expected.', str(context.exception))
+        self.assertEqual(context.exception.details, bytes.fromhex('01 03 10'))
+        # the header is dropped so the stream can resynchronise past it
+        self.assertEqual(stream.read(3), bytes.fromhex('01 03 10'))
+
+    def test_buffered_throws_on_malformed_body(self):
+        reader = UBXProtocolReader()
+        stream = buffered(bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11'))
+        with self.assertRaises(MalformedFrameError) as context:
+            reader.read_frame(b'\xb5\x62', stream)
+
+        self.assertEqual('Error reading ProtocolClass.UBX frame: Found EOF attempting to read frame body. Read 15 bytes out of 16 expected.', str(context.exception))
+        self.assertEqual(context.exception.details, bytes.fromhex('10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11'))
+
+    def test_buffered_throws_on_malformed_checksum(self):
+        reader = UBXProtocolReader()
+        stream = buffered(bytes.fromhex('B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01 00 00 D7 EF 11 00 C6'))
+        with self.assertRaises(MalformedFrameError) as context:
+            reader.read_frame(b'\xb5\x62', stream)
+
+        self.assertEqual('Error reading ProtocolClass.UBX frame: Found EOF attempting to read frame checksum. Read 1 bytes out of 2 expected.', str(context.exception))
+        self.assertEqual(context.exception.details, bytes.fromhex('C6'))
+
 class test_NMEAProtocolReader(unittest.TestCase):
 
     def test_read_frame(self):
@@ -287,6 +334,34 @@ class test_NMEAProtocolReader(unittest.TestCase):
         self.assertEqual("Error reading ProtocolClass.NMEA frame: Failed to find the frame's end marker of non-special message before the max expected size (82 bytes).", str(context.exception))
         self.assertEqual(context.exception.protocol, ProtocolClass.NMEA)
 
+    def test_read_buffered_frame(self):
+        reader = NMEAProtocolReader()
+        frames = [
+            b'$GPGSV,2,2,05,30,06,304,,0*52\r\n',
+            b'$GLGSV,1,1,02,71,37,273,37,73,43,340,16,1*79\r\n',
+            b'$PUBX,03,32,1,-,172,00,,000,3,e,198,-1,,000,4,U,188,52,21,000,7,U,319,37,28,005,8,U,161,71,27,008*4C\r\n',
+        ]
+        stream = buffered(b''.join(frames), chunk_size=16)
+
+        for frame in frames:
+            self.assertEqual(reader.read_frame(b'\x24', stream), frame)
+        self.assertEqual(stream.read(1), b'')
+
+    def test_buffered_throws_on_non_vendor_frame_too_long(self):
+        reader = NMEAProtocolReader()
+        body_ok = b'GPGSV' + b'0' * 74 + b'\r\n' # 82 with the header
+        body_too_long = b'GPGSV' + b'0' * 75 + b'\r\n' # 83 with the header
+        stream = buffered(b'$' + body_ok + b'$' + body_too_long)
+
+        self.assertEqual(reader.read_frame(b'\x24', stream), b'$' + body_ok)
+
+        with self.assertRaises(MalformedFrameError) as context:
+            reader.read_frame(b'\x24', stream)
+
+        self.assertEqual("Error reading ProtocolClass.NMEA frame: Failed to find the frame's end marker of non-special message before the max expected size (82 bytes).", str(context.exception))
+        self.assertEqual(context.exception.details, body_too_long[:81])
+        self.assertEqual(stream.read(5), b'GPGSV')
+
 class test_StubProtocolReaderProvider(unittest.TestCase):
 
     def test_provide(self):
@@ -53,6 +53,44 @@ class test_AsyncQueueWithGetTransform(unittest.TestCase):
         self.assertEqual(item2, 'item2')
         self.assertEqual(queue_with_transform.qsize(), 0)
 
+    def test_get_batch(self):
+        async def callback(item):
+            return f'transformed {item}'
+        queue = asyncio.queues.Queue()
+        queue_with_transform = (queue # pylint: disable=no-member
+            .with_transform(lambda item: item * 2)
+            .with_transform(callback))
+
+        for item in ('a', 'b', 'c'):
+            queue.put_nowait(item)
+
+        self.assertEqual(run_sync(queue_with_transform.get_batch(2)), ['transformed aa', 'transformed bb'])
+        self.assertEqual(run_sync(queue_with_transform.get_batch(2)), ['transformed cc'])
+        self.assertEqual(queue.qsize(), 0)
+
+    def test_get_batch_failed_transform(self):
+        async def callback(item):
+            if item == 'b':
+                raise ValueError(item)
+            return f'transformed {item}'
+        queue = asyncio.queues.Queue()
+        queue_with_transform = queue.with_transform(callback) # pylint: disable=no-member
+
+        for item in ('a', 'b', 'c', 'd'):
+            queue.put_nowait(item)
+
+        # the batch ends at the failed transform, the items after it stay queued
+        self.assertEqual(run_sync(queue_with_transform.get_batch(4)), ['transformed a'])
+        self.assertEqual(queue.qsize(), 2)
+        # the error is raised on the next call, only the failed item is lost
+        with self.assertRaises(ValueError):
+            run_sync(queue_with_transform.get_batch(4))
+        self.assertEqual(run_sync(queue_with_transform.get_batch(4)), ['transformed c', 'transformed d'])
+
+        queue.put_nowait('b')
+        with self.assertRaises(ValueError):
+            run_sync(queue_with_transform.get_batch(4))
+
 class test_AsyncQueueWithGetCallback(unittest.TestCase):
 
     def test_get(self):
@@ -91,6 +129,18 @@ class test_AsyncQueueWithGetCallback(unittest.TestCase):
         self.assertEqual(queue_with_callback.qsize(), 0)
         callback.assert_called_once_with('item1')
 
+    def test_get_batch(self):
+        callback = unittest.mock.MagicMock()
+        queue = asyncio.queues.Queue()
+        queue_with_callback = queue.with_callback(callback) # pylint: disable=no-member
+
+        for item in ('item1', 'item2', 'item3'):
+            queue.put_nowait(item)
+
+        self.assertEqual(run_sync(queue_with_callback.get_batch(5)), ['item1', 'item2', 'item3'])
+        self.assertEqual(callback.call_args_list, [unittest.mock.call('item1'), unittest.mock.call('item2'), unittest.mock.call('item3')])
+        self.assertEqual(queue.qsize(), 0)
+
     def test_get_forever_until_cancelled(self):
         callback = asynctest.CoroutineMock()
         queue = asyncio.queues.Queue()
@@ -0,0 +1,47 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+import asyncio
+from asyncio.tasks import wait_for
+
+import xhoundpi.queue_ext # pylint: disable=unused-import
+from xhoundpi.async_ext import run_sync
+
+class test_QueueExtensions(unittest.TestCase):
+
+    def test_get_batch_drains_available_items(self):
+        queue = asyncio.queues.Queue()
+        for item in range(5):
+            queue.put_nowait(item)
+
+        self.assertEqual(run_sync(queue.get_batch(3)), [0, 1, 2]) # pylint: disable=no-member
+        self.assertEqual(run_sync(queue.get_batch(3)), [3, 4]) # pylint: disable=no-member
+        self.assertTrue(queue.empty())
+
+    def test_get_batch_waits_for_first_item(self):
+        queue = asyncio.queues.Queue()
+
+        loop = asyncio.get_event_loop()
+        task = loop.create_task(queue.get_batch(3)) # pylint: disable=no-member
+        run_sync(asyncio.sleep(0.01))
+        self.assertFalse(task.done())
+
+        queue.put_nowait('item')
+        self.assertEqual(run_sync(wait_for(task, 1)), ['item'])
+
+    def test_put_batch_waits_for_free_slots(self):
+        queue = asyncio.queues.Queue(2)
+
+        loop = asyncio.get_event_loop()
+        task = loop.create_task(queue.put_batch(['item1', 'item2', 'item3'])) # pylint: disable=no-member
+        run_sync(asyncio.sleep(0.01))
+        self.assertFalse(task.done())
+        self.assertEqual(queue.qsize(), 2)
+
+        self.assertEqual(run_sync(queue.get()), 'item1')
+        run_sync(wait_for(task, 1))
+        self.assertEqual(run_sync(queue.get_batch(3)), ['item2', 'item3']) # pylint: disable=no-member
@@ -0,0 +1,200 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import asyncio
+import unittest
+import uuid
+from asyncio.tasks import wait_for
+
+from xhoundpi.async_ext import run_sync
+from xhoundpi.message import Message
+from xhoundpi.metric import CounterMetric
+from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.queue_overflow import OverflowPolicy, OverflowQueue, SheddingQueue, message_type
+from xhoundpi.message_priority import IPriorityClassifier, Priority
+import xhoundpi.queue_decorators # pylint: disable=unused-import
+
+GGA = b'$GPGGA,172814.0,3723.46587704,N,12202.26957864,W,2,6,1.2,18.893,M,-25.669,M,2.0,0031*4F\r\n'
+RMC = b'$GNRMC,225446.33,A,4916.45,N,12311.12,W,000.5,054.7,191194,020.3,E,A*2B\r\n'
+NAV_PVT = bytes.fromhex('B5 62 01 07 5C 00') + bytes(92) + b'\x00\x00'
+
+def message(frame, proto=ProtocolClass.NMEA):
+    return Message(message_id=uuid.uuid4(), proto=proto, frame=frame)
+
+class FirstLetterClassifier(IPriorityClassifier):
+
+    PRIORITIES = { 'l': Priority.LOW, 'n': Priority.NORMAL, 'h': Priority.HIGH }
+
+    def classify(self, item):
+        return self.PRIORITIES[item[0]]
+
+def drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+        queue.task_done()
+    return items
+
+class test_OverflowQueue(unittest.TestCase):
+
+    def test_policy_names(self):
+        self.assertEqual([policy.value for policy in OverflowPolicy], ['block', 'drop-oldest', 'drop-newest', 'coalesce-latest'])
+        self.assertIs(OverflowPolicy('coalesce-latest'), OverflowPolicy.COALESCE_LATEST)
+        with self.assertRaises(ValueError):
+            OverflowPolicy('somepolicy')
+
+    def test_message_type(self):
+        self.assertEqual(message_type(message(GGA)), (ProtocolClass.NMEA, b'GGA'))
+        self.assertEqual(message_type(message(NAV_PVT, ProtocolClass.UBX)), (ProtocolClass.UBX, b'\x01\x07'))
+        self.assertEqual(message_type(Message(message_id=uuid.uuid4(), proto=ProtocolClass.UBX, payload='payload')), (ProtocolClass.UBX, None))
+
+    def test_block(self):
+        dropped = CounterMetric('dropped', [])
+        queue = OverflowQueue(2, OverflowPolicy.BLOCK, dropped)
+        queue.put_nowait(1)
+        run_sync(queue.put(2))
+        with self.assertRaises(asyncio.QueueFull):
+            queue.put_nowait(3)
+
+        loop = asyncio.get_event_loop()
+        task = loop.create_task(queue.put(3))
+        run_sync(asyncio.sleep(0.01))
+        self.assertFalse(task.done())
+
+        self.assertEqual(run_sync(queue.get()), 1)
+        run_sync(wait_for(task, 1))
+        self.assertEqual(drain(queue), [2, 3])
+        self.assertEqual(dropped.value, 0)
+        self.assertIs(queue.policy, OverflowPolicy.BLOCK)
+
+    def test_drop_oldest(self):
+        dropped = CounterMetric('dropped', [])
+        queue = OverflowQueue(2, OverflowPolicy.DROP_OLDEST, dropped)
+        for item in range(4):
+            run_sync(queue.put(item))
+        queue.put_nowait(4)
+
+        self.assertEqual(drain(queue), [3, 4])
+        self.assertEqual(dropped.value, 3)
+        # the discarded items do not keep the queue from joining
+        run_sync(queue.join())
+
+    def test_drop_newest(self):
+        dropped = CounterMetric('dropped', [])
+        queue = OverflowQueue(2, OverflowPolicy.DROP_NEWEST, dropped)
+        for item in range(4):
+            run_sync(queue.put(item))
+        queue.put_nowait(4)
+
+        self.assertEqual(drain(queue), [0, 1])
+        self.assertEqual(dropped.value, 3)
+        run_sync(queue.join())
+
+    def test_coalesce_latest(self):
+        dropped = CounterMetric('dropped', [])
+        queue = OverflowQueue(3, OverflowPolicy.COALESCE_LATEST, dropped)
+        gga1, rmc1, pvt1, gga2, pvt2, rmc2 = (message(GGA), message(RMC), message(NAV_PVT, ProtocolClass.UBX),
+            message(GGA), message(NAV_PVT, ProtocolClass.UBX), message(RMC))
+        for item in (gga1, rmc1, pvt1, gga2, pvt2):
+            run_sync(queue.put(item))
+
+        # the latest of each type is queued last, the types not queued evict the oldest
+        self.assertEqual(list(queue._queue), [rmc1, gga2, pvt2]) # pylint: disable=protected-access
+        queue.put_nowait(rmc2)
+        self.assertEqual(drain(queue), [gga2, pvt2, rmc2])
+        self.assertEqual(dropped.value, 3)
+        run_sync(queue.join())
+
+    def test_coalesce_latest_evicts_oldest_without_match(self):
+        queue = OverflowQueue(2, OverflowPolicy.COALESCE_LATEST, key=lambda item: item[0])
+        for item in ('a1', 'b1', 'c1'):
+            queue.put_nowait(item)
+        self.assertEqual(drain(queue), ['b1', 'c1'])
+
+    def test_policies_apply_through_decorators(self):
+        dropped = CounterMetric('dropped', [])
+        queue = OverflowQueue(2, OverflowPolicy.DROP_OLDEST, dropped)
+        decorated = queue.with_callback(lambda item: None).with_transform(lambda item: item * 10) # pylint: disable=no-member
+        for item in range(3):
+            run_sync(decorated.put(item))
+        decorated.put_nowait(3)
+
+        self.assertEqual(run_sync(decorated.get()), 20)
+        self.assertEqual(decorated.get_nowait(), 30)
+        self.assertEqual(dropped.value, 2)
+
+class test_SheddingQueue(unittest.TestCase):
+
+    @staticmethod
+    def create(maxsize=4, high=3, low=1, policy=OverflowPolicy.BLOCK):
+        shed = { Priority.LOW: CounterMetric('shed_low', []), Priority.NORMAL: CounterMetric('shed_normal', []) }
+        dropped = CounterMetric('dropped', [])
+        queue = SheddingQueue(maxsize, FirstLetterClassifier(), high, low, shed, policy=policy, dropped=dropped, key=lambda item: item[0])
+        return queue, shed, dropped
+
+    def test_watermarks_hysteresis(self):
+        queue, shed, _ = self.create()
+        for item in ('l1', 'n1', 'l2'):
+            queue.put_nowait(item)
+        self.assertFalse(queue.shedding)
+
+        # past the high watermark the low priority items are shed
+        queue.put_nowait('l3')
+        self.assertTrue(queue.shedding)
+        self.assertEqual(shed[Priority.LOW].value, 1)
+
+        # and keep being shed until the queue drains to the low watermark
+        queue.get_nowait()
+        queue.put_nowait('l4')
+        self.assertTrue(queue.shedding)
+        self.assertEqual(queue.get_nowait(), 'n1')
+        self.assertEqual(queue.get_nowait(), 'l2')
+        queue.put_nowait('l5')
+        self.assertFalse(queue.shedding)
+        self.assertEqual(list(queue._queue), ['l5']) # pylint: disable=protected-access
+        self.assertEqual(shed[Priority.LOW].value, 2)
+        self.assertEqual(shed[Priority.NORMAL].value, 0)
+
+    def test_full_queue_evicts_lower_priority(self):
+        queue, shed, dropped = self.create(policy=OverflowPolicy.DROP_NEWEST)
+        for item in ('n1', 'h1', 'n2', 'h2'):
+            queue.put_nowait(item)
+
+        run_sync(queue.put('h3'))
+        queue.put_nowait('h4')
+        self.assertEqual(list(queue._queue), ['h1', 'h2', 'h3', 'h4']) # pylint: disable=protected-access
+        self.assertEqual(shed[Priority.NORMAL].value, 2)
+
+        # nothing lower to evict, the overflow policy applies
+        queue.put_nowait('h5')
+        self.assertEqual(dropped.value, 1)
+        self.assertEqual(drain(queue), ['h1', 'h2', 'h3', 'h4'])
+        run_sync(queue.join())
+
+    def test_block_policy_waits_only_for_admitted_items(self):
+        queue, shed, _ = self.create()
+        for item in ('n1', 'n2', 'h1', 'h2'):
+            queue.put_nowait(item)
+
+        # shed and evicting puts do not wait
+        run_sync(queue.put('l1'))
+        run_sync(queue.put('h3'))
+        self.assertEqual(shed[Priority.LOW].value, 1)
+        self.assertEqual(shed[Priority.NORMAL].value, 1)
+
+        loop = asyncio.get_event_loop()
+        task = loop.create_task(queue.put('n3'))
+        run_sync(asyncio.sleep(0.01))
+        self.assertFalse(task.done())
+        self.assertEqual(run_sync(queue.get()), 'n2')
+        run_sync(wait_for(task, 1))
+        self.assertEqual(drain(queue), ['h1', 'h2', 'h3', 'n3'])
+
+    def test_invalid_watermarks(self):
+        with self.assertRaises(ValueError):
+            SheddingQueue(4, FirstLetterClassifier(), high_watermark=5, low_watermark=1)
+        with self.assertRaises(ValueError):
+            SheddingQueue(4, FirstLetterClassifier(), high_watermark=2, low_watermark=3)
@@ -6,10 +6,12 @@
 
 from asyncio.tasks import wait_for
 import unittest
+import unittest.mock
 import asyncio
 
-from xhoundpi.queue_pump import AsyncPump
+from xhoundpi.queue_pump import AsyncPump, BatchAsyncPump, FlattenAsyncPump
 from xhoundpi.async_ext import run_sync
+import xhoundpi.queue_decorators # pylint: disable=unused-import
 
 class test_AsyncPump(unittest.TestCase):
 
@@ -33,3 +35,59 @@ class test_AsyncPump(unittest.TestCase):
         task.cancel()
         with self.assertRaises(asyncio.exceptions.CancelledError):
             run_sync(wait_for(task, 1))
+
+class test_BatchAsyncPump(unittest.TestCase):
+
+    def test_run(self):
+        in_queue = asyncio.queues.Queue()
+        out_queue = asyncio.queues.Queue()
+        transform = unittest.mock.MagicMock(side_effect=lambda item: item.upper())
+        pump = BatchAsyncPump(
+            input_queue=in_queue.with_transform(transform), # pylint: disable=no-member
+            output_queue=out_queue,
+            batch_size=2)
+
+        for item in ('first item', 'second item', 'third item'):
+            in_queue.put_nowait(item)
+
+        loop = asyncio.get_event_loop()
+        task = loop.create_task(pump.run())
+
+        self.assertEqual(run_sync(out_queue.get()), 'FIRST ITEM')
+        self.assertEqual(run_sync(out_queue.get()), 'SECOND ITEM')
+        self.assertEqual(run_sync(out_queue.get()), 'THIRD ITEM')
+        self.assertEqual(transform.call_count, 3)
+
+        run_sync(in_queue.put('fourth item'))
+        self.assertEqual(run_sync(out_queue.get()), 'FOURTH ITEM')
+
+        self.assertTrue(out_queue.empty())
+        self.assertFalse(task.done())
+
+        task.cancel()
+        with self.assertRaises(asyncio.exceptions.CancelledError):
+            run_sync(wait_for(task, 1))
+
+class test_FlattenAsyncPump(unittest.TestCase):
+
+    def test_run(self):
+        in_queue = asyncio.queues.Queue()
+        out_queue = asyncio.queues.Queue()
+        pump = FlattenAsyncPump(input_queue=in_queue, output_queue=out_queue, batch_size=2)
+
+        for group in (['first', 'second'], [], ['third']):
+            in_queue.put_nowait(group)
+
+        loop = asyncio.get_event_loop()
+        task = loop.create_task(pump.run())
+
+        self.assertEqual([run_sync(out_queue.get()) for _ in range(3)], ['first', 'second', 'third'])
+        run_sync(in_queue.put(['fourth']))
+        self.assertEqual(run_sync(out_queue.get()), 'fourth')
+
+        self.assertTrue(out_queue.empty())
+        self.assertFalse(task.done())
+
+        task.cancel()
+        with self.assertRaises(asyncio.exceptions.CancelledError):
+            run_sync(wait_for(task, 1))
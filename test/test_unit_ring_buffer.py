@@ -0,0 +1,71 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+import unittest
+
+from xhoundpi.ring_buffer import RingBuffer, RingBufferOverflowError
+
+class test_RingBuffer(unittest.TestCase):
+
+    def test_write_peek_consume(self):
+        buffer = RingBuffer(8)
+
+        self.assertEqual(buffer.write(b'\x01\x02\x03'), 3)
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.free, 5)
+        self.assertEqual(bytes(buffer.peek(2)), b'\x01\x02')
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(bytes(buffer.consume(2)), b'\x01\x02')
+        self.assertEqual(len(buffer), 1)
+        self.assertEqual(bytes(buffer.peek(10)), b'\x03')
+        self.assertEqual(bytes(buffer.consume(10)), b'\x03')
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(buffer.free, 8)
+
+    def test_wraps_keeping_unread_bytes_contiguous(self):
+        buffer = RingBuffer(8)
+
+        buffer.write(b'abcdef')
+        buffer.consume(4)
+        buffer.write(b'ghijkl')
+
+        self.assertEqual(len(buffer), 8)
+        self.assertEqual(buffer.free, 0)
+        self.assertEqual(bytes(buffer.peek(8)), b'efghijkl')
+
+    def test_overflow(self):
+        buffer = RingBuffer(4)
+        buffer.write(b'abc')
+
+        with self.assertRaises(RingBufferOverflowError) as context:
+            buffer.write(b'de')
+
+        self.assertEqual(str(context.exception), 'Cannot write 2 bytes into ring buffer with 1 bytes available.')
+        self.assertEqual(bytes(buffer.peek(4)), b'abc')
+
+    def test_find(self):
+        buffer = RingBuffer(8)
+        buffer.write(b'xx$ab')
+        buffer.consume(1)
+        buffer.write(b'\r\n')
+
+        self.assertEqual(buffer.find(b'$'), 1)
+        self.assertEqual(buffer.find(b'\r\n'), 4)
+        self.assertEqual(buffer.find(b'\r\n', 0, 5), -1)
+        self.assertEqual(buffer.find(b'x', 1), -1)
+        self.assertEqual(buffer.find(b'?'), -1)
+
+    def test_clear(self):
+        buffer = RingBuffer(4)
+        buffer.write(b'abc')
+        buffer.clear()
+
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(bytes(buffer.peek(4)), b'')
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
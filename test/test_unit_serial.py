@@ -4,10 +4,189 @@
 # pylint: disable=line-too-long
 # pylint: disable=invalid-name
 
+import asyncio
+import io
+import os
+import tempfile
+import tty
 import unittest
 from io import BytesIO, StringIO
 
-from xhoundpi.serial import StubSerialBinary, StubSerialText
+from xhoundpi.async_ext import run_sync
+from xhoundpi.serial import AsyncSerial, MmapReplaySerial, OutputSerial, SerialClosedError, StubSerialBinary, StubSerialText
+
+class test_AsyncSerial(unittest.TestCase):
+
+    def setUp(self):
+        self.master, slave = os.openpty()
+        tty.setraw(slave)
+        self.serial = AsyncSerial(slave)
+
+    def tearDown(self):
+        self.serial.close()
+        if self.master is not None:
+            os.close(self.master)
+
+    def test_read_does_not_block(self):
+        with self.assertRaises(BlockingIOError):
+            self.serial.read(16)
+
+        os.write(self.master, b'\x01\x0a\x0b')
+        run_sync(asyncio.wait_for(self.serial.wait_readable(), 1))
+
+        self.assertEqual(b'\x01\x0a', self.serial.read(2))
+        self.assertEqual(b'\x0b', self.serial.read(16))
+        with self.assertRaises(BlockingIOError):
+            self.serial.read(16)
+
+    def test_read_hung_up(self):
+        os.write(self.master, b'\x01')
+        run_sync(asyncio.wait_for(self.serial.wait_readable(), 1))
+        self.assertEqual(b'\x01', self.serial.read(16))
+
+        # NOTE closing the master end hangs up the tty
+        os.close(self.master)
+        self.master = None
+        with self.assertRaises(SerialClosedError):
+            self.serial.read(16)
+        # reads keep failing, there will be no more input
+        with self.assertRaises(SerialClosedError):
+            self.serial.read(16)
+
+    def test_wait_readable(self):
+        async def wait_and_read():
+            waiter = asyncio.ensure_future(self.serial.wait_readable())
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiter.done())
+            os.write(self.master, b'\xb5\x62')
+            await asyncio.wait_for(waiter, 1)
+            return self.serial.read(16)
+
+        self.assertEqual(b'\xb5\x62', run_sync(wait_and_read()))
+        # the descriptor is released from the loop once readable
+        self.assertFalse(asyncio.get_event_loop().remove_reader(self.serial.fileno()))
+
+    def test_write(self):
+        self.assertEqual(3, self.serial.write(bytes.fromhex('01 02 03')))
+        self.assertEqual(b'\x01\x02\x03', os.read(self.master, 16))
+
+    def test_open_output_only(self):
+        serial = AsyncSerial.open(os.ttyname(self.serial.fileno()), output_only=True)
+        self.addCleanup(serial.close)
+
+        self.assertEqual(2, serial.write(b'\xb5\x62'))
+        self.assertEqual(b'\xb5\x62', os.read(self.master, 16))
+
+    def test_writev(self):
+        self.assertEqual(5, self.serial.writev([b'\x01\x02', b'', b'\x03\x04\x05']))
+        self.assertEqual(b'\x01\x02\x03\x04\x05', os.read(self.master, 16))
+
+    def test_write_does_not_block(self):
+        # NOTE fill the tty output until it takes no more
+        written = 0
+        with self.assertRaises(BlockingIOError):
+            while True:
+                written += self.serial.write(b'\xff' * 4096)
+
+        async def wait_and_write():
+            waiter = asyncio.ensure_future(self.serial.wait_writable())
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiter.done())
+            drained = 0
+            while drained < written:
+                drained += len(os.read(self.master, 65536))
+            await asyncio.wait_for(waiter, 1)
+            return self.serial.write(b'\x01')
+
+        self.assertEqual(1, run_sync(wait_and_write()))
+        # the descriptor is released from the loop once writable
+        self.assertFalse(asyncio.get_event_loop().remove_writer(self.serial.fileno()))
+
+class test_MmapReplaySerial(unittest.TestCase):
+
+    def replay(self, data: bytes, passes: int = 0, tx: BytesIO = None):
+        rx = tempfile.TemporaryFile() # pylint: disable=consider-using-with
+        rx.write(data)
+        rx.flush()
+        self.addCleanup(rx.close)
+        ss = MmapReplaySerial(transport_rx=rx, transport_tx=tx or BytesIO(), passes=passes)
+        self.addCleanup(ss.close)
+        return ss
+
+    def test_read(self):
+        ss = self.replay(b'\x01\x0a\x0b\xff\x0d\x1f')
+
+        self.assertIsInstance(ss.read(), memoryview)
+        self.assertEqual(b'\x0a', ss.read())
+        self.assertEqual(b'\x0b\xff\x0d', ss.read(3))
+        # reads stop at the end of the capture and loop back
+        self.assertEqual(b'\x1f', ss.read(4))
+        self.assertEqual(ss.completed_passes, 1)
+        self.assertEqual(b'\x01\x0a\x0b\xff\x0d\x1f', ss.read(13))
+        self.assertEqual(b'\x01', ss.read())
+        self.assertEqual(ss.completed_passes, 2)
+
+    def test_read_passes(self):
+        ss = self.replay(b'\x01\x02\x03', passes=2)
+
+        self.assertEqual(b'\x01\x02\x03', ss.read(8))
+        self.assertEqual(b'\x01\x02', ss.read(2))
+        self.assertEqual(b'\x03', ss.read(2))
+        self.assertEqual(ss.completed_passes, 2)
+        # the input is closed once all passes are replayed, waits return for reads to raise
+        run_sync(asyncio.wait_for(ss.wait_readable(), 1))
+        with self.assertRaises(SerialClosedError) as context:
+            ss.read(2)
+        self.assertEqual(context.exception.details, 'capture replayed 2 times')
+
+    def test_read_empty_capture(self):
+        ss = self.replay(b'')
+
+        # an empty capture replayed forever behaves like an idle device
+        with self.assertRaises(BlockingIOError):
+            ss.read(2)
+        with self.assertRaises(asyncio.TimeoutError):
+            run_sync(asyncio.wait_for(ss.wait_readable(), 0.01))
+
+    def test_read_empty_capture_passes(self):
+        ss = self.replay(b'', passes=1)
+
+        run_sync(asyncio.wait_for(ss.wait_readable(), 1))
+        with self.assertRaises(SerialClosedError):
+            ss.read(2)
+
+    def test_wait_readable(self):
+        ss = self.replay(b'\x01')
+
+        run_sync(asyncio.wait_for(ss.wait_readable(), 1))
+
+    def test_write(self):
+        tx = BytesIO()
+        ss = self.replay(b'', tx=tx)
+
+        self.assertEqual(3, ss.write(bytes.fromhex('01 02 03')))
+        self.assertEqual(b'\x01\x02\x03', tx.getvalue())
+
+    def test_writev(self):
+        tx = BytesIO()
+        ss = self.replay(b'', tx=tx)
+
+        self.assertEqual(3, ss.writev([b'\x01', b'\x02\x03']))
+        self.assertEqual(b'\x01\x02\x03', tx.getvalue())
+
+class test_OutputSerial(unittest.TestCase):
+
+    def test_write(self):
+        tx = BytesIO()
+        ss = OutputSerial(tx)
+
+        self.assertEqual(3, ss.write(bytes.fromhex('01 02 03')))
+        self.assertEqual(2, ss.writev([b'\x04', b'\x05']))
+        self.assertEqual(b'\x01\x02\x03\x04\x05', tx.getvalue())
+
+    def test_read(self):
+        with self.assertRaises(io.UnsupportedOperation):
+            OutputSerial(BytesIO()).read(1)
 
 class test_StubSerialBinary(unittest.TestCase):
 
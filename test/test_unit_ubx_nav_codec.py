@@ -0,0 +1,200 @@
+# pylint: disable=missing-module-docstring
+# pylint: disable=missing-class-docstring
+# pylint: disable=missing-function-docstring
+# pylint: disable=line-too-long
+# pylint: disable=invalid-name
+
+from decimal import Decimal as D
+import unittest
+import uuid
+from unittest.mock import Mock
+
+import pyubx2
+
+from xhoundpi.async_ext import run_sync
+from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.message import Message
+from xhoundpi.status import Status
+from xhoundpi.data_formatter import UBXDataFormatter
+from xhoundpi.message_editor import UBXMessageEditor, UBXNavMessageEditor
+from xhoundpi.operator import UBXHiResOffsetOperator, UBXOffsetOperator
+from xhoundpi.coordinates_offset import GeoCoordinates, StaticOffsetProvider
+from xhoundpi.operator_provider import CoordinateOperationProvider
+from xhoundpi.message_policy import HasLocationPolicy
+from xhoundpi.message_policy_provider import OnePolicyProvider
+from xhoundpi.processor import GenericProcessor
+from xhoundpi.dmath import setup_common_context
+from xhoundpi.ubx_nav_codec import UBXNavCodec, UBXNavCodecError, UBXNavPayload, ubx_checksum
+
+setup_common_context()
+
+NAV_HPPOSLLH = bytes.fromhex(
+    'B5 62 01 14 24 00 00 00 00 00 F8 0D B9 1D 14 4E'
+    'E3 CE 09 07 AB 11 7F 45 00 00 E6 BB 00 00 23 29'
+    'FE FC 38 99 01 00 59 69 02 00 34 63            ')
+
+NAV_PVT = bytes.fromhex(
+    'B5 62 01 07 5C 00 F8 0D B9 1D E5 07 02 1A 12 1E'
+    '31 37 3B 00 00 00 A7 2D 06 00 03 03 EB 0C 14 4E'
+    'E3 CE 09 07 AB 11 7F 45 00 00 E6 BB 00 00 EC 28'
+    '00 00 BC 3D 00 00 B0 00 00 00 D6 FF FF FF E7 FE'
+    'FF FF B5 00 00 00 F8 A2 96 01 EA 01 00 00 80 A8'
+    '12 01 B0 00 00 00 6C 18 42 3E 00 00 00 00 00 00'
+    '00 00 68 66                                    ')
+
+NAV_POSLLH = bytes.fromhex(
+    'B5 62 01 02 1C 00 B0 19 B9 1D A5 4D E3 CE 34 07'
+    'AB 11 42 4D 00 00 A8 C3 00 00 12 29 00 00 9F 3E'
+    '00 00 6A 78                                    ')
+
+NAV_STATUS = bytes.fromhex(
+    'B5 62 01 03 10 00 10 0A B9 1D 03 DF 02 08 FE 01'
+    '00 00 D7 EF 11 00 C6 F1                        ')
+
+def pyubx2_parse(frame):
+    return pyubx2.UBXReader.parse(bytes(frame), validate=True)
+
+class test_UBXChecksum(unittest.TestCase):
+
+    def test_checksum(self):
+        for frame in (NAV_HPPOSLLH, NAV_PVT, NAV_POSLLH, NAV_STATUS):
+            self.assertEqual(ubx_checksum(frame[2:-2]), (frame[-2], frame[-1]))
+
+class test_UBXNavCodec(unittest.TestCase):
+
+    def test_parse_matches_pyubx2(self):
+        codec = UBXNavCodec(fallback=pyubx2_parse)
+        for frame in (NAV_HPPOSLLH, NAV_PVT, NAV_POSLLH):
+            native = codec.parse(memoryview(frame))
+            reference = pyubx2_parse(frame)
+            self.assertIsInstance(native, UBXNavPayload)
+            self.assertEqual(native.identity, reference.identity)
+            self.assertEqual(native.msg_cls, reference.msg_cls)
+            self.assertEqual(native.msg_id, reference.msg_id)
+            for name in ('iTOW', 'lat', 'lon', 'height', 'hMSL', 'hAcc', 'vAcc'):
+                self.assertEqual(getattr(native, name), getattr(reference, name))
+            self.assertEqual(native.serialize(), frame)
+
+    def test_parse_exposes_layout_fields_only(self):
+        codec = UBXNavCodec(fallback=pyubx2_parse)
+
+        hires = codec.parse(NAV_HPPOSLLH)
+        self.assertEqual((hires.lonHp, hires.latHp, hires.heightHp, hires.hMSLHp), (35, 41, -2, -4))
+        self.assertFalse(hasattr(codec.parse(NAV_PVT), 'latHp'))
+        self.assertFalse(hasattr(codec.parse(NAV_POSLLH), 'lonHp'))
+
+    def test_parse_fallback(self):
+        fallback = Mock(return_value='payload')
+        codec = UBXNavCodec(fallback=fallback)
+
+        self.assertEqual(codec.parse(NAV_STATUS), 'payload')
+        fallback.assert_called_once_with(NAV_STATUS)
+
+    def test_parse_fails_on_checksum(self):
+        codec = UBXNavCodec(fallback=pyubx2_parse)
+
+        with self.assertRaises(UBXNavCodecError) as context:
+            codec.parse(NAV_POSLLH[:-1] + b'\x00')
+        self.assertEqual(str(context.exception), 'Error decoding UBX message NAV-POSLLH, checksum mismatch.')
+
+    def test_parse_skips_checksum(self):
+        codec = UBXNavCodec(fallback=pyubx2_parse, validate=False)
+
+        payload = codec.parse(NAV_POSLLH[:-1] + b'\x00')
+        self.assertEqual(payload.lat, pyubx2_parse(NAV_POSLLH).lat) # pylint: disable=no-member
+
+    def test_set_fields_matches_pyubx2(self):
+        codec = UBXNavCodec(fallback=pyubx2_parse)
+        edits = {'lon': -923964140, 'lat': 15, 'height': 256, 'hMSL': -257}
+        for frame in (NAV_HPPOSLLH, NAV_PVT, NAV_POSLLH):
+            native = codec.parse(frame)
+            native.set_fields(edits)
+            reference = Message(uuid.UUID(int=1), ProtocolClass.UBX, pyubx2_parse(frame))
+            UBXMessageEditor().set_fields(reference, edits)
+            self.assertEqual(native.serialize(), reference.payload.serialize())
+            self.assertEqual(pyubx2_parse(native.serialize()).lon, -923964140) # pylint: disable=no-member
+
+    def test_set_fields_is_atomic(self):
+        payload = UBXNavCodec(fallback=pyubx2_parse).parse(NAV_PVT)
+
+        with self.assertRaises(AttributeError) as context:
+            payload.set_fields({'lon': 15, 'lonHp': 16})
+
+        self.assertEqual(str(context.exception), "UBX message 'NAV-PVT' does not contain field 'lonHp'")
+        self.assertEqual(payload.serialize(), NAV_PVT)
+
+class test_UBXNavMessageEditor(unittest.TestCase):
+
+    def test_set_fields(self):
+        editor = UBXNavMessageEditor(fallback=Mock())
+        msg = Message(
+            message_id=uuid.UUID('{12345678-1234-5678-1234-567812345678}'),
+            proto=ProtocolClass.UBX,
+            frame=NAV_HPPOSLLH,
+            parser=UBXNavCodec(fallback=pyubx2_parse).parse)
+
+        status, msg = editor.set_fields(msg, {'lon': 15, 'lonHp': 16, 'height': 256, 'hMSL': 257})
+
+        self.assertEqual(status, Status.OK())
+        self.assertTrue(msg.dirty)
+        self.assertEqual(msg.payload.serialize(), bytes.fromhex(
+            'B5 62 01 14 24 00' # header + class + id + length
+            '00 00 00 00 F8 0D B9 1D'
+            '0F 00 00 00' # lon == 15
+            '09 07 AB 11' # lat
+            '00 01 00 00' # height == 256
+            '01 01 00 00' # height (above sea level) == 257
+            '10'          # lonHp
+            '29'          # latHp
+            'FE FC 38 99 01 00 59 69 02 00'
+            'BB 5F')) # checksum also changed
+
+    def test_set_fields_out_of_range(self):
+        editor = UBXNavMessageEditor(fallback=Mock())
+        msg = Message(uuid.UUID(int=1), ProtocolClass.UBX, UBXNavCodec(fallback=pyubx2_parse).parse(NAV_HPPOSLLH))
+
+        status, msg = editor.set_fields(msg, {'lonHp': 128})
+
+        self.assertFalse(status.ok)
+        self.assertEqual(msg.payload.serialize(), NAV_HPPOSLLH)
+
+    def test_set_fields_fallback(self):
+        fallback = Mock()
+        fallback.set_fields = Mock(return_value=(Status.OK(), 'result'))
+        editor = UBXNavMessageEditor(fallback=fallback)
+        msg = Message(uuid.UUID(int=1), ProtocolClass.UBX, pyubx2_parse(NAV_HPPOSLLH))
+
+        self.assertEqual(editor.set_fields(msg, {'lon': 15}), (Status.OK(), 'result'))
+        fallback.set_fields.assert_called_once_with(msg, {'lon': 15})
+
+class test_UBXNavOffsetProcessing(unittest.TestCase):
+
+    # pylint: disable=no-self-use
+    def setup_processor(self, editor, offset: D):
+        offset_provider = StaticOffsetProvider(GeoCoordinates(lat=offset, lon=offset, alt=offset))
+        return GenericProcessor(
+            name='TestProcessor',
+            policy_provider=OnePolicyProvider(HasLocationPolicy()),
+            operator_provider=CoordinateOperationProvider(
+                nmea_operator=Mock(),
+                ubx_operator=UBXOffsetOperator(
+                    msg_editor=editor,
+                    data_formatter=UBXDataFormatter(),
+                    offset_provider=offset_provider),
+                ubx_hires_operator=UBXHiResOffsetOperator(
+                    msg_editor=editor,
+                    data_formatter=UBXDataFormatter(),
+                    offset_provider=offset_provider)))
+
+    def test_native_path_matches_pyubx2_path(self):
+        codec = UBXNavCodec(fallback=pyubx2_parse)
+        native_editor = UBXNavMessageEditor(fallback=UBXMessageEditor())
+        for frame in (NAV_HPPOSLLH, NAV_PVT, NAV_POSLLH):
+            for offset in (D('0'), D('0.005'), D('-0.005'), D('1.000000005')):
+                native = Message(uuid.UUID(int=1), ProtocolClass.UBX, frame=frame, parser=codec.parse)
+                reference = Message(uuid.UUID(int=1), ProtocolClass.UBX, frame=frame, parser=pyubx2_parse)
+                nstatus, native = run_sync(self.setup_processor(native_editor, offset).process(native))
+                rstatus, reference = run_sync(self.setup_processor(UBXMessageEditor(), offset).process(reference))
+                self.assertTrue(nstatus.ok)
+                self.assertTrue(rstatus.ok)
+                self.assertEqual(native.payload.serialize().hex(' '), reference.payload.serialize().hex(' '))
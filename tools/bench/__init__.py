@@ -0,0 +1 @@
+''' xHound protocol backends benchmark '''
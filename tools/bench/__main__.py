@@ -0,0 +1,17 @@
+''' Protocol backends benchmark entry point '''
+# pylint: disable=wrong-import-position
+
+from xhoundpi.diagnostics import describe_environment
+print(describe_environment())
+
+from .config import setup_argparser
+from .bench import run_benchmark
+
+def main():
+    ''' Entry point for the benchmark '''
+    config = setup_argparser()
+    options = config.parse_args()
+    for report in run_benchmark(options.captures, options.repeat):
+        print(report)
+
+main()
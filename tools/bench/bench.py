@@ -0,0 +1,134 @@
+''' Protocol parser/serializer backends benchmark '''
+
+import sys
+import time
+import uuid
+from io import BytesIO
+from typing import Any, Dict, Iterator, List, NamedTuple, Tuple
+
+from xhoundpi.message import Message
+from xhoundpi.message_editor import NMEAMessageEditor
+from xhoundpi.proto_backend import BACKENDS, ProtocolBackend, create_backend
+from xhoundpi.proto_class import ProtocolClass
+from xhoundpi.proto_classifier import ProtocolClassifier, ProtocolClassificationError
+from xhoundpi.proto_reader import FrameReadingError, NMEAProtocolReader, UBXProtocolReader
+from tools.hermes.parser import parser
+
+CLASSIFICATIONS = {
+    bytes(b'\x24') : ProtocolClass.NMEA,
+    bytes(b'\x21') : ProtocolClass.NMEA,
+    bytes(b'\xb5\x62') : ProtocolClass.UBX,
+}
+
+# NOTE the fields the offset processors edit on the position sentences
+NMEA_EDITED_FIELDS = ('lat', 'lat_dir', 'lon', 'lon_dir', 'altitude')
+
+NMEA_EDITOR = NMEAMessageEditor()
+
+READERS = {
+    ProtocolClass.UBX : UBXProtocolReader(),
+    ProtocolClass.NMEA : NMEAProtocolReader(),
+}
+
+class BackendReport(NamedTuple):
+    ''' Measures of a backend over the frames of a capture '''
+    capture: str
+    protocol: ProtocolClass
+    backend: str
+    frames: int
+    failures: int
+    parse_rate: float
+    serialize_rate: float
+    blocks_per_frame: float
+    roundtrip_matches: int
+
+    def __str__(self):
+        return (f'{self.capture} {self.protocol.name} {self.backend}: '
+            f'{self.frames} frames ({self.failures} failed to parse), '
+            f'parse {self.parse_rate:,.0f} frames/sec, '
+            f'serialize {self.serialize_rate:,.0f} frames/sec, '
+            f'{self.blocks_per_frame:.1f} blocks/frame, '
+            f'{self.roundtrip_matches}/{self.frames - self.failures} byte exact round trips')
+
+def load_frames(capture: str) -> Dict[ProtocolClass, List[bytes]]:
+    ''' Extract the frames of the ascii capture grouped by protocol,
+    unknown bytes and malformed frames are skipped '''
+    with open(capture, 'r', encoding='utf8') as source, BytesIO() as output:
+        parser(source, output)
+        data = output.getvalue()
+    classifier = ProtocolClassifier(CLASSIFICATIONS)
+    frames: Dict[ProtocolClass, List[bytes]] = {}
+    stream = BytesIO(data)
+    while stream.tell() < len(data):
+        try:
+            header, protocol = classifier.classify(stream)
+            frame = READERS[protocol].read_frame(header, stream)
+        except (ProtocolClassificationError, FrameReadingError):
+            continue
+        frames.setdefault(protocol, []).append(bytes(frame))
+    return frames
+
+def parse_frames(backend: ProtocolBackend, frames: List[bytes]) -> List[Tuple[bytes, Any]]:
+    ''' Parse the frames into payloads, frames failing to parse are left out '''
+    payloads = []
+    parse = backend.parser.parse
+    for frame in frames:
+        try:
+            payloads.append((frame, parse(frame)))
+        except Exception: # pylint: disable=broad-except
+            pass
+    return payloads
+
+def measure(capture: str, protocol: ProtocolClass, name: str,
+    frames: List[bytes], repeat: int) -> BackendReport:
+    ''' Time the parser and serializer of the backend over the frames, the
+    allocations are the memory blocks still held by the parsed payloads '''
+    backend = create_backend(protocol, name)
+    parse_time = min(_timed(parse_frames, backend, frames) for _ in range(repeat))
+    blocks = sys.getallocatedblocks()
+    payloads = parse_frames(backend, frames)
+    blocks = sys.getallocatedblocks() - blocks
+    messages = [create_message(protocol, backend, frame) for frame, _ in payloads]
+    serialize = backend.serializer.serialize
+    serialize_time = min(_timed(lambda: [serialize(message) for message in messages])
+        for _ in range(repeat))
+    # NOTE serializers are called directly, as for edited (dirty) messages,
+    #      so the round trip goes through the backend and not the raw frame
+    matches = sum(bytes(serialize(message)) == message.frame for message in messages)
+    return BackendReport(
+        capture=capture,
+        protocol=protocol,
+        backend=name,
+        frames=len(frames),
+        failures=len(frames) - len(messages),
+        parse_rate=len(frames) / parse_time if parse_time else 0.0,
+        serialize_rate=len(messages) / serialize_time if serialize_time else 0.0,
+        blocks_per_frame=blocks / len(frames),
+        roundtrip_matches=matches)
+
+def create_message(protocol: ProtocolClass, backend: ProtocolBackend, frame: bytes) -> Message:
+    ''' Message parsed from the frame as the GNSS service does, the position
+    fields of NMEA sentences are edited (set to their own values so the round
+    trip stays byte exact) as the offset processors do '''
+    message = Message(message_id=uuid.uuid4(), proto=protocol,
+        frame=frame, parser=backend.parser.parse)
+    if protocol == ProtocolClass.NMEA:
+        sentence = message.payload
+        fields = {name: sentence.data[sentence.name_to_idx[name]]
+            for name in NMEA_EDITED_FIELDS if name in sentence.name_to_idx}
+        NMEA_EDITOR.set_fields(message, fields)
+    else:
+        _ = message.payload
+    return message
+
+def run_benchmark(captures: List[str], repeat: int) -> Iterator[BackendReport]:
+    ''' Measure every backend of every protocol found in the captures '''
+    for capture in captures:
+        for protocol, frames in load_frames(capture).items():
+            for name in BACKENDS[protocol]:
+                yield measure(capture, protocol, name, frames, repeat)
+
+def _timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
@@ -0,0 +1,16 @@
+''' Backends benchmark configuration parser module '''
+
+import argparse
+
+def setup_argparser():
+    ''' Prepare shell arguments parser '''
+    config = argparse.ArgumentParser(
+        description='Benchmarks the protocol parser/serializer backends over device captures')
+    config.add_argument('captures', metavar='FILE', type=str, nargs='*',
+        default=['data/mixed_nmea_ubx_sample.cap', 'data/nmea_capture_sample.cap',
+                 'data/rtcm_capture_sample.cap', 'data/smoke_test_data.cap',
+                 'data/ubx_capture_sample.cap'],
+        help='ascii capture files to run the backends over')
+    config.add_argument('--repeat', metavar='N', dest='repeat', type=int, default=5,
+        help='number of timed passes per capture, the best one is reported')
+    return config
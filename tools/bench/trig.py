@@ -0,0 +1,100 @@
+''' Decimal trig benchmark, the table based engine against the plain Taylor series
+
+Run as `python -m tools.bench.trig` from the root of the repository.
+'''
+
+import argparse
+import random
+import time
+from decimal import Decimal as D, Inexact, localcontext
+from typing import Callable, Iterator, List, NamedTuple, Tuple
+
+from xhoundpi.diagnostics import describe_environment
+from xhoundpi.dmath import (
+    deg2rad, setup_common_context, sin, cos, sincos, taylor_sin, taylor_cos)
+
+class TrigReport(NamedTuple):
+    ''' Measures of an implementation over a set of angles '''
+    angles: str
+    implementation: str
+    count: int
+    usec_per_angle: float
+    mismatches: int
+
+    def __str__(self):
+        return (f'{self.angles} {self.implementation}: '
+            f'{self.usec_per_angle:,.1f} usec/angle (sin and cos), '
+            f'{self.mismatches}/{self.count} not correctly rounded')
+
+IMPLEMENTATIONS: List[Tuple[str, Callable[[D], Tuple[D, D]]]] = [
+    ('taylor', lambda x: (taylor_sin(x), taylor_cos(x))),
+    ('table', lambda x: (sin(x), cos(x))),
+    ('table-sincos', sincos),
+]
+
+def make_angles(count: int, seed: int) -> Iterator[Tuple[str, List[D]]]:
+    ''' Orientation angles (radians, up to pi/4) and geodetic coordinates
+    (degrees to radians, as converted to ECEF) '''
+    rand = random.Random(seed)
+    with localcontext() as ctx:
+        ctx.traps[Inexact] = False
+        yield 'orientation', [D(f'{rand.uniform(-0.785, 0.785):.9f}') for _ in range(count)]
+        yield 'geodetic', [deg2rad(D(f'{rand.uniform(-180, 180):.9f}')) for _ in range(count)]
+
+def reference(x: D) -> Tuple[D, D]:
+    ''' Correctly rounded sin and cos, from the Taylor series far over the context precision '''
+    with localcontext() as ctx:
+        ctx.traps[Inexact] = False
+        ctx.prec += 40
+        values = taylor_sin(x), taylor_cos(x)
+    with localcontext() as ctx:
+        ctx.traps[Inexact] = False
+        return +values[0], +values[1]
+
+def measure(name: str, angles: List[D], implementation: str,
+    func: Callable[[D], Tuple[D, D]], repeat: int) -> TrigReport:
+    ''' Time the implementation over the angles, the best pass is reported '''
+    func(angles[0]) # NOTE tables are built on first use for each precision
+    elapsed = min(_timed(lambda: [func(x) for x in angles]) for _ in range(repeat))
+    mismatches = sum(func(x) != reference(x) for x in angles)
+    return TrigReport(
+        angles=name,
+        implementation=implementation,
+        count=len(angles),
+        usec_per_angle=elapsed / len(angles) * 1e6,
+        mismatches=mismatches)
+
+def run_benchmark(count: int, repeat: int, seed: int) -> Iterator[TrigReport]:
+    ''' Measure every implementation over every set of angles '''
+    for name, angles in make_angles(count, seed):
+        for implementation, func in IMPLEMENTATIONS:
+            yield measure(name, angles, implementation, func, repeat)
+
+def setup_argparser():
+    ''' Prepare shell arguments parser '''
+    config = argparse.ArgumentParser(
+        description='Benchmarks the Decimal sin/cos implementations '
+            'at the common context precision')
+    config.add_argument('--count', metavar='N', dest='count', type=int, default=2000,
+        help='number of angles per set')
+    config.add_argument('--repeat', metavar='N', dest='repeat', type=int, default=5,
+        help='number of timed passes per set, the best one is reported')
+    config.add_argument('--seed', metavar='N', dest='seed', type=int, default=0,
+        help='seed of the random angles')
+    return config
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+def main():
+    ''' Entry point for the benchmark '''
+    options = setup_argparser().parse_args()
+    print(describe_environment())
+    setup_common_context()
+    for report in run_benchmark(options.count, options.repeat, options.seed):
+        print(report)
+
+if __name__ == '__main__':
+    main()
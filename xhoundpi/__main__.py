@@ -151,4 +151,6 @@ def create_log_dirs(logger_config):
             dirpath = os.path.dirname(handler_dict['filename'])
             os.makedirs(dirpath, exist_ok=True)
 
-main()
+# NOTE guarded so spawned processes (eg, the frame reader) do not re-run it
+if __name__ == '__main__':
+    main()
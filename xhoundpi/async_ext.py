@@ -16,3 +16,25 @@ def run_sync(coro: Coroutine, timeout=1):
     ''' Run sync on main event loop with timeout '''
     loop = asyncio.get_event_loop()
     return run_sync_with_loop(loop, coro, timeout)
+
+async def wait_readable(fileobj):
+    ''' Wait on the running loop for a file descriptor (or an object
+    with a fileno method, eg, a pipe connection) to be readable '''
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    loop.add_reader(fileobj, lambda: future.done() or future.set_result(None))
+    try:
+        await future
+    finally:
+        loop.remove_reader(fileobj)
+
+async def wait_writable(fileobj):
+    ''' Wait on the running loop for a file descriptor (or an object
+    with a fileno method) to be writable '''
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    loop.add_writer(fileobj, lambda: future.done() or future.set_result(None))
+    try:
+        await future
+    finally:
+        loop.remove_writer(fileobj)
@@ -22,6 +22,71 @@ def setup_configparser() -> configargparse.ArgumentParser:
         type=str,help='input file for gnss mock serial data')
     parser.add('--gnss-mock-output', default='data/gnss_mock_output.hex', dest='gnss_mock_output',
         type=str, help='output file for gnss mock serial data')
+    parser.add('--gnss-mock-passes', default=0, dest='gnss_mock_passes',
+        type=int, help='number of times the gnss mock input is replayed (0 to loop forever), '
+        'the program exits once they are replayed and their messages written')
+    parser.add('--gnss-device', default=None, dest='gnss_device',
+        type=str, help='tty device of the gnss receiver (eg, /dev/ttyACM0), '
+        'read without blocking the event loop')
+    parser.add('--gnss-buffer-capacity', default=131072, dest='gnss_buffer_capacity',
+        type=int, help='capacity in bytes of the gnss client read buffer '
+        '(must fit the largest expected frame)')
+    parser.add('--gnss-read-chunk-size', default=4096, dest='gnss_read_chunk_size',
+        type=int, help='max number of bytes pulled from the gnss transport per read')
+    parser.add('--gnss-read-batch-size', default=32, dest='gnss_read_batch_size',
+        type=int, help='max number of pending gnss messages read in one go')
+    parser.add('--gnss-write-coalescing-size', default=0, dest='gnss_write_coalescing_size',
+        type=int, help='bytes of gnss output held before they are written out together '
+        '(eg, 4096), disabled by default (0) so every message is written on its own. '
+        'Once enabled the gnss service write latency only covers holding the messages, '
+        'the gnss client write latency covers them until written out')
+    parser.add('--gnss-write-coalescing-deadline', default=0.01,
+        dest='gnss_write_coalescing_deadline', type=float,
+        help='max time, in seconds, gnss output is held before it is written out '
+        '(it is written out earlier at the end of each epoch)')
+    parser.add('--gnss-ubx-backend', default='library', dest='gnss_ubx_backend',
+        type=str, help='UBX parser/serializer backend, valid values are "library" (pyubx2) and '
+        '"native" (NAV position messages decoded and patched in place with a struct codec)')
+    parser.add('--gnss-nmea-backend', default='library', dest='gnss_nmea_backend',
+        type=str, help='NMEA parser/serializer backend, valid values are "library" (pynmea2) and '
+        '"native" (position sentences parsed on a fast path, edits spliced into the frames)')
+    parser.add('--gnss-inbound-queue-policy', default='block', dest='gnss_inbound_queue_policy',
+        type=str, help='overflow policy of the queue of messages read, valid values are '
+        '"block", "drop-oldest", "drop-newest", and "coalesce-latest"')
+    parser.add('--gnss-processed-queue-policy', default='block', dest='gnss_processed_queue_policy',
+        type=str, help='overflow policy of the queue of processed messages')
+    parser.add('--gnss-outbound-queue-policy', default='block', dest='gnss_outbound_queue_policy',
+        type=str, help='overflow policy of the queue of messages to write')
+    parser.add('--queue-high-watermark', default=0.75, dest='queue_high_watermark',
+        type=float, help='fraction of the queues capacity past which the low priority '
+        'messages (eg, GSV, GSA, TXT) are shed')
+    parser.add('--queue-low-watermark', default=0.5, dest='queue_low_watermark',
+        type=float, help='fraction of the queues capacity the queues must drain down to '
+        'before the low priority messages stop being shed')
+    parser.add('--pipeline-batch-size', default=32, dest='pipeline_batch_size',
+        type=int, help='max number of queued messages moved together through the pipeline stages')
+    parser.add('--math-tier', default='decimal', dest='math_tier',
+        type=str, help='number type the coordinate offsets are computed in, valid values are '
+        '"decimal" (the reference) and "float" (float64, within documented error bounds)')
+    parser.add('--ubx-fixed-point', dest='ubx_fixed_point', action='store_true',
+        help='apply the offsets to the UBX lat/lon/height fields with integer arithmetic '
+        'in the field units (1e-9 deg, 0.1 mm) rather than through the math tier numbers')
+    parser.add('--epoch-assembly', dest='epoch_assembly', action='store_true',
+        help='group the gnss messages of each navigation epoch (by UBX iTOW or NMEA UTC time) '
+        'so location and display updates happen once per epoch')
+    parser.add('--epoch-end-nmea', default='GLL', dest='epoch_end_nmea',
+        type=str, help='comma separated NMEA sentence types that close an epoch (eg, GLL, '
+        'the last of the default u-blox NMEA output), the assembled epochs are completed '
+        'and the coalesced gnss output is written out after them (empty for none)')
+    parser.add('--epoch-timeout', default=0.25, dest='epoch_timeout',
+        type=float, help='time, in seconds, after its first message an epoch is closed '
+        'incomplete if its end was not seen yet')
+    parser.add('--multiprocess', dest='multiprocess', action='store_true',
+        help='read, frame, validate and route the gnss input on a separate process that '
+        'publishes the frames to the processors over a shared memory ring')
+    parser.add('--frame-ring-capacity', default=1048576, dest='frame_ring_capacity',
+        type=int, help='capacity in bytes of the shared memory ring of frames '
+        '(must fit the largest expected frame)')
     # logs
     parser.add('--log-config-file', default='logconf.yml', dest='log_config_file',
         type=str, help='yml file with the logger configuration')
@@ -8,6 +8,7 @@ from abc import ABC, abstractmethod
 from .dmath import MINUTE, geodethic_to_ecef, distance
 from .coordinates import GeoCoordinates
 from .coordinates_provider import ICoordinatesProvider
+from . import fmath
 
 @dataclass
 class ConversionFactor:
@@ -57,3 +58,29 @@ class DistAngleFactorProvider(IConversionFactorProvider):
             factor_lon = distance(p0_ecef, p2_ecef) / MINUTE
 
         return ConversionFactor(factor_lat, factor_lon)
+
+class FloatDistAngleFactorProvider(IConversionFactorProvider):
+    '''
+    Converion factor provider;
+    translates surface distance to latitude/longitude increments,
+    computed in float64 (see fmath for the error bounds)
+    '''
+
+    def __init__(self, location: ICoordinatesProvider):
+        self.__location = location
+
+    def get_factor(self) -> ConversionFactor:
+        location = self.__location.get_coordinates()
+        p0_geo = GeoCoordinates(float(location.lat), float(location.lon), float(location.alt))
+        p1_geo = GeoCoordinates(p0_geo.lat + fmath.MINUTE, p0_geo.lon, p0_geo.alt)
+        p2_geo = GeoCoordinates(p0_geo.lat, p0_geo.lon + fmath.MINUTE, p0_geo.alt)
+
+        # pylint: disable=invalid-name
+        p0_ecef = fmath.geodethic_to_ecef(p0_geo)
+        p1_ecef = fmath.geodethic_to_ecef(p1_geo)
+        p2_ecef = fmath.geodethic_to_ecef(p2_geo)
+
+        factor_lat = fmath.distance(p0_ecef, p1_ecef) / fmath.MINUTE
+        factor_lon = fmath.distance(p0_ecef, p2_ecef) / fmath.MINUTE
+
+        return ConversionFactor(factor_lat, factor_lon)
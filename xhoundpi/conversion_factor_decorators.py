@@ -4,7 +4,6 @@ Decorators and extensions for IConversionFactorProvider contract
 
 from decimal import Inexact, localcontext
 
-from .dmath import DECIMAL0 as D0, DECIMAL1 as D1
 from .monkey_patching import add_method
 from .conversion_factor import ConversionFactor, IConversionFactorProvider
 
@@ -33,8 +32,9 @@ class ConversionFactorProviderWithInversion(IConversionFactorProvider):
             #     we tolerate this problem up to the configured precision
             #  2. in theory if the c.f. is 0, its inverse would produce
             #     an infinite value, we clamp to 0 in such cases
-            lat = D0 if factor.lat == D0 else D1 / factor.lat
-            lon = D0 if factor.lon == D0 else D1 / factor.lon
+            #  3. the factors keep their type (Decimal or float, see math_tier)
+            lat = factor.lat if factor.lat == 0 else 1 / factor.lat
+            lon = factor.lon if factor.lon == 0 else 1 / factor.lon
         return ConversionFactor(lat=lat, lon=lon)
 
     # Live intercept properties and methods access
@@ -5,7 +5,8 @@ Coordinate offset models and providers definition
 from abc import ABC, abstractmethod
 from decimal import Decimal, Inexact, localcontext
 
-from .dmath import sin, cos
+from .dmath import sincos
+from . import fmath
 from .coordinates import GeoCoordinates
 from .orientation import IOrientationProvider
 
@@ -47,16 +48,39 @@ class OrientationOffsetProvider(ICoordinatesOffsetProvider):
         angles = self.__orientation.get_orientation()
         radius = self.__radius
 
-        yaw = angles.yaw
-        pitch = angles.pitch
-        roll = angles.roll
-
         with localcontext() as ctx:
             # NOTE the sin/cos operations can produce irrational values
             #      that cannot guarantee exactitude, we accept it
             ctx.traps[Inexact] = False
-            delta_latitude = radius * (sin(roll) * sin(yaw) + cos(roll) * cos(yaw) * sin(pitch))
-            delta_longitude = -radius * (sin(roll) * cos(yaw) - cos(roll) * sin(pitch) * sin(yaw))
-            delta_alt = radius * cos(roll) * cos(pitch)
+            sin_yaw, cos_yaw = sincos(angles.yaw)
+            sin_pitch, cos_pitch = sincos(angles.pitch)
+            sin_roll, cos_roll = sincos(angles.roll)
+            delta_latitude = radius * (sin_roll * sin_yaw + cos_roll * cos_yaw * sin_pitch)
+            delta_longitude = -radius * (sin_roll * cos_yaw - cos_roll * sin_pitch * sin_yaw)
+            delta_alt = radius * cos_roll * cos_pitch
+
+        return GeoCoordinates(delta_latitude, delta_longitude, delta_alt)
+
+class FloatOrientationOffsetProvider(ICoordinatesOffsetProvider):
+    '''
+    Geographic coordinates dynamic offset provider
+    based off euler angles orientation and radius,
+    computed in float64 (see fmath for the error bounds)
+    '''
+
+    def __init__(self, orientation: IOrientationProvider, radius: float):
+        self.__orientation = orientation
+        self.__radius = float(radius)
+
+    def get_offset(self) -> GeoCoordinates:
+        angles = self.__orientation.get_orientation()
+        radius = self.__radius
+
+        sin_yaw, cos_yaw = fmath.sincos(float(angles.yaw))
+        sin_pitch, cos_pitch = fmath.sincos(float(angles.pitch))
+        sin_roll, cos_roll = fmath.sincos(float(angles.roll))
+        delta_latitude = radius * (sin_roll * sin_yaw + cos_roll * cos_yaw * sin_pitch)
+        delta_longitude = -radius * (sin_roll * cos_yaw - cos_roll * sin_pitch * sin_yaw)
+        delta_alt = radius * cos_roll * cos_pitch
 
         return GeoCoordinates(delta_latitude, delta_longitude, delta_alt)
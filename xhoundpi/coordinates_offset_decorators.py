@@ -2,10 +2,15 @@
 Decorators and extensions for ICoordinatesOffsetProviders contract
 '''
 
+from typing import Callable, Hashable, Optional
+
 from .monkey_patching import add_method
 from .coordinates import GeoCoordinates
+from .coordinates_provider import ICoordinatesProvider
 from .conversion_factor import IConversionFactorProvider
 from .coordinates_offset import ICoordinatesOffsetProvider
+from .metric import CounterMetric
+from .orientation import IOrientationProvider
 
 @add_method(ICoordinatesOffsetProvider)
 def with_conversion(self, factor_provider: IConversionFactorProvider):
@@ -47,3 +52,82 @@ class CoordinatesOffsetProviderWithConversion(ICoordinatesOffsetProvider):
 
     def __delattr__(self, name):
         delattr(self.__dict__['_inner'], name)
+
+@add_method(ICoordinatesOffsetProvider)
+def with_cache(self, # pylint: disable=too-many-arguments
+    orientation: IOrientationProvider,
+    location: ICoordinatesProvider,
+    epoch: Callable[[], Hashable] = lambda: None,
+    hits: Optional[CounterMetric] = None,
+    misses: Optional[CounterMetric] = None):
+    '''
+    Decorates an offset provider and memoises the last offset for the
+    orientation, location and epoch it was computed for
+    '''
+    return CoordinatesOffsetProviderWithCache(self, orientation, location, epoch, hits, misses)
+
+class CoordinatesOffsetProviderWithCache(ICoordinatesOffsetProvider): # pylint: disable=too-many-instance-attributes
+    '''
+    Decorates an offset provider and memoises the last offset for the
+    orientation, location and epoch it was computed for
+
+    The inner provider is only invoked when any of the three changed since
+    the last offset was computed, so the processors sharing the decorated
+    provider compute it once per epoch. The orientation and location must
+    be the ones the inner provider computes the offset from.
+    '''
+
+    def __init__(self, # pylint: disable=too-many-arguments
+        inner: ICoordinatesOffsetProvider,
+        orientation: IOrientationProvider,
+        location: ICoordinatesProvider,
+        epoch: Callable[[], Hashable],
+        hits: Optional[CounterMetric] = None,
+        misses: Optional[CounterMetric] = None):
+        self.__class__.__name__ = inner.__class__.__name__
+        self._inner = inner
+        self._orientation = orientation
+        self._location = location
+        self._epoch = epoch
+        self._hits = hits
+        self._misses = misses
+        self._key = None
+        self._offset = None
+
+    def get_offset(self) -> GeoCoordinates:
+        angles = self._orientation.get_orientation()
+        coordinates = self._location.get_coordinates()
+        # NOTE the models are mutable dataclasses (unhashable), their values are compared instead
+        key = (angles.yaw, angles.pitch, angles.roll,
+            coordinates.lat, coordinates.lon, coordinates.alt, self._epoch())
+        if self._offset is not None and key == self._key:
+            if self._hits is not None:
+                self._hits.increase()
+            return self._offset
+        if self._misses is not None:
+            self._misses.increase()
+        self._offset = self._inner.get_offset()
+        self._key = key
+        return self._offset
+
+    def invalidate(self):
+        '''
+        Discards the memoised offset, the next one is computed by the inner provider
+        '''
+        self._key = None
+        self._offset = None
+
+    # Live intercept properties and methods access
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['_inner'], name)
+
+    def __setattr__(self, name, value):
+        if name in ('_inner', '_orientation', '_location', '_epoch',
+            '_hits', '_misses', '_key', '_offset'):
+            self.__dict__[name] = value
+        else:
+            setattr(self.__dict__['_inner'], name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__dict__['_inner'], name)
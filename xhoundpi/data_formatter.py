@@ -2,12 +2,15 @@
 Format converters for message fields
 '''
 
+import math
 import re
-from typing import Tuple
+from fractions import Fraction
+from typing import Tuple, Union
 from decimal import localcontext, Inexact, Decimal as D
 
 from .direction import CoordAxis, Direction
 from .dmath import DECIMAL0, DECIMAL0_1, DECIMAL1, DECIMAL60, adjust, dec_to_str
+from .fmath import QUANTUM_SNAP, quantize, split
 
 class NMEADataFormatter:
     '''
@@ -120,6 +123,10 @@ class UBXDataFormatter:
     HIGH_RES = 9
     MAX = 2147483647
     MIN = -2147483648
+    DEG_SCALE = 10 ** HIGH_RES
+    DEG_HIRES_BASE = 10 ** (HIGH_RES - BASE_RES)
+    HEIGHT_SCALE = 10 ** 4
+    HEIGHT_HIRES_BASE = 10
 
     def integer_to_decdeg(self, base: int, hires: int = 0) -> D:
         '''
@@ -175,6 +182,179 @@ class UBXDataFormatter:
             hires -= (midpoint * 2) * sign
         return base, hires
 
+    # fixed point units, 1e-9 deg and 0.1 mm counts
+
+    def integer_to_units(self, base: int, hires: int = 0) -> int:
+        '''
+        Converts an UBX integer geographic co-ordinate into 1e-9 deg units
+        '''
+        return base * self.DEG_HIRES_BASE + hires
+
+    def units_to_integer(self, units: int) -> Tuple[int, int]:
+        '''
+        Converts 1e-9 deg units into an UBX integer geographic co-ordinate
+        '''
+        return split(units, self.DEG_HIRES_BASE)
+
+    def decdeg_to_units(self, decdeg: Union[D, float]) -> Tuple[int, int]:
+        '''
+        Converts signed decimal degrees into the floor
+        and the ceiling of their count of 1e-9 deg units
+        '''
+        return self._unit_bounds(decdeg, self.DEG_SCALE)
+
+    def height_field_to_units(self, base: int, hires: int = 0) -> int:
+        '''
+        Converts the two integer altitude components into 0.1 mm units
+        '''
+        return base * self.HEIGHT_HIRES_BASE + hires
+
+    def units_to_height_field(self, units: int) -> Tuple[int, int]:
+        '''
+        Converts 0.1 mm units into the two integer altitude components
+        '''
+        return split(units, self.HEIGHT_HIRES_BASE)
+
+    def height_to_units(self, height: Union[D, float]) -> Tuple[int, int]:
+        '''
+        Converts a signed altitude in meters into the floor
+        and the ceiling of its count of 0.1 mm units
+        '''
+        return self._unit_bounds(height, self.HEIGHT_SCALE)
+
+    @staticmethod
+    def add_units(units: int, offset: Tuple[int, int]) -> int:
+        '''
+        Adds an offset, given by the floor and the ceiling of its count of units,
+        to a count of units truncating towards zero as decdeg_to_integer and
+        height_to_field do on the exact sum
+        '''
+        floor, ceiling = offset
+        # NOTE the exact sum is positive (or an integer) iff the floor sum is not negative
+        total = units + floor
+        return total if total >= 0 else units + ceiling
+
+    @staticmethod
+    def _unit_bounds(value: Union[D, float], scale: int) -> Tuple[int, int]:
+        # NOTE exact for Decimal and float values regardless of the context precision
+        units = Fraction(value) * scale
+        return math.floor(units), math.ceil(units)
+
     @classmethod
     def _sign(cls, val: int) -> int:
         return -1 if val < 0 else 1
+
+class NMEAFloatDataFormatter(NMEADataFormatter):
+    '''
+    Transforms values from float64 decimal degrees to
+    high precision NMEA geographic co-ordinates
+
+    NOTE the minutes are rounded to the nearest on the binary value, the
+    result matches the Decimal formatter unless the exact value is within
+    the float error (see fmath) of the midpoint of two representations
+    '''
+
+    MM_SCALE = 1000
+
+    def degmins_to_decdeg(self, degmins: str, direction: Direction) -> float:
+        '''
+        Converts a geographic co-ordinate given in
+        (d)ddmm.mmmmm(mm) format to signed decimal degrees
+        '''
+        if degmins in (None, '0', '0.0'):
+            decdeg = 0.0
+        else:
+            degs, mins = re.match(r'^(\d+)(\d\d\.\d+)$', degmins).groups()
+            decdeg = int(degs) + float(mins) / 60
+        return -decdeg if direction in (Direction.S, Direction.W) else decdeg
+
+    @classmethod
+    def height_from_field(cls, field: str) -> float:
+        '''
+        Converts an NMEA height field in meters
+        into a float meter representation
+        '''
+        return float(field)
+
+    @classmethod
+    def height_to_field(cls, height: float) -> str:
+        '''
+        Converts a float meter height into an NMEA height field
+        (truncated to millimeters, trailing zeros dropped)
+        '''
+        millimeters = quantize(height, cls.MM_SCALE)
+        # NOTE a zero keeps the sign of the height, as a Decimal zero would,
+        #      unless the height was only snapped to it
+        negative = millimeters < 0 or (millimeters == 0 and math.copysign(1.0, height) < 0
+            and (height == 0 or abs(height * cls.MM_SCALE) > QUANTUM_SNAP))
+        meters, fraction = divmod(abs(millimeters), cls.MM_SCALE)
+        return f"{'-' if negative else ''}{meters}.{f'{fraction:03d}'.rstrip('0') or '0'}"
+
+    @classmethod
+    def _get_data(cls, dec_deg: float, axis: CoordAxis, hipres: bool
+    ) -> Tuple[str, Direction, int, float]:
+        if axis is CoordAxis.LON:
+            direction = Direction.E if dec_deg >= 0 else Direction.W
+            deg_length = 3
+        else: # axis is CoordAxis.LAT
+            direction = Direction.N if dec_deg >= 0 else Direction.S
+            deg_length = 2
+        precision = cls.HI_PRES if hipres else cls.LO_PRES
+        template = cls.FORMAT.format(
+            degs_width=deg_length,
+            mins_width=3 + precision,
+            prec=precision)
+        degs, mins = divmod(abs(dec_deg), 1)
+        if degs > 10 ** deg_length:
+            raise ValueError('Too many digits in decimal degrees result')
+        return template, direction, int(degs), mins * 60
+
+class UBXFloatDataFormatter(UBXDataFormatter):
+    '''
+    Transform values from float64 decimal degrees to
+    high precision UBX geographic co-ordinates
+
+    NOTE the values are quantised as by the Decimal formatter, see fmath for the bounds
+    '''
+
+    def integer_to_decdeg(self, base: int, hires: int = 0) -> float:
+        '''
+        Converts an UBX integer geographic
+        co-ordinate into signed float decimal degrees
+        '''
+        return (base * self.DEG_HIRES_BASE + hires) / self.DEG_SCALE
+
+    def decdeg_to_integer(self, decdeg: float) -> Tuple[int, int]:
+        '''
+        Converts signed float decimal degrees
+        into an UBX integer geographic co-ordinate
+        '''
+        return split(quantize(decdeg, self.DEG_SCALE), self.DEG_HIRES_BASE)
+
+    @staticmethod
+    def height_from_field(base: int, hires: int = 0) -> float:
+        '''
+        Converts signed altitude value from two integer
+        components in millimiters to float meters representation
+        '''
+        return ((base * UBXFloatDataFormatter.HEIGHT_HIRES_BASE + hires)
+            / UBXFloatDataFormatter.HEIGHT_SCALE)
+
+    @staticmethod
+    def height_to_field(height: float) -> Tuple[int, int]:
+        '''
+        Converts signed altitude value from float meters
+        to two integer components representation in millimiters
+        '''
+        return split(
+            quantize(height, UBXFloatDataFormatter.HEIGHT_SCALE),
+            UBXFloatDataFormatter.HEIGHT_HIRES_BASE)
+
+    @staticmethod
+    def _unit_bounds(value: float, scale: int) -> Tuple[int, int]:
+        # NOTE snapped as quantize does, so the fixed point operators match this formatter
+        units = value * scale
+        nearest = round(units)
+        if abs(units - nearest) <= QUANTUM_SNAP:
+            return nearest, nearest
+        return math.floor(units), math.ceil(units)
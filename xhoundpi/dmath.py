@@ -6,11 +6,12 @@ Basic operations on Decimal type values
 # NOTE this code is based off  https://docs.python.org/3/library/decimal.html#recipes
 # it will be ignored from styling and test coverage
 
-from typing import Tuple
+from typing import Dict, List, NamedTuple, Tuple
 from collections import defaultdict
 from decimal import (
     DefaultContext,
     ROUND_DOWN,
+    ROUND_HALF_EVEN,
     ROUND_HALF_UP,
     getcontext,
     localcontext,
@@ -94,11 +95,14 @@ def geodethic_to_ecef(point: GeoCoordinates) -> Tuple[D, D, D]:
     lon = point.lon
     alt = point.alt
 
-    prime_vert_rad = EQUAT_RAD_M / D.sqrt(1 - ELLIPSOID_ECC_SQRD * sin(deg2rad(lat)))
+    sin_lat, cos_lat = sincos(deg2rad(lat))
+    sin_lon, cos_lon = sincos(deg2rad(lon))
 
-    x_coord = (prime_vert_rad + alt) * cos(deg2rad(lat)) * cos(deg2rad(lon))
-    y_coord = (prime_vert_rad + alt) * cos(deg2rad(lat)) * sin(deg2rad(lon))
-    z_coord = (SQRD_RADIAL_RATIO * prime_vert_rad + alt) * sin(deg2rad(lat))
+    prime_vert_rad = EQUAT_RAD_M / D.sqrt(1 - ELLIPSOID_ECC_SQRD * sin_lat)
+
+    x_coord = (prime_vert_rad + alt) * cos_lat * cos_lon
+    y_coord = (prime_vert_rad + alt) * cos_lat * sin_lon
+    z_coord = (SQRD_RADIAL_RATIO * prime_vert_rad + alt) * sin_lat
 
     return x_coord, y_coord, z_coord
 
@@ -128,17 +132,17 @@ def exp(x: D) -> D:
         ctx.prec -= 2
         return D(+s)
 
-def cos(x: D) -> D:
+def taylor_cos(x: D) -> D:
     '''Return the cosine of x as measured in radians.
 
     The Taylor series approximation works best for a small value of x.
     For larger values, first compute x = x % (2 * pi).
 
-    >>> print(cos(Decimal('0.5')))
+    >>> print(taylor_cos(Decimal('0.5')))
     0.8775825618903727161162815826
-    >>> print(cos(0.5))
+    >>> print(taylor_cos(0.5))
     0.87758256189
-    >>> print(cos(0.5+0j))
+    >>> print(taylor_cos(0.5+0j))
     (0.87758256189+0j)
 
     '''
@@ -156,17 +160,17 @@ def cos(x: D) -> D:
         ctx.prec -= 2
         return D(+s)
 
-def sin(x: D) -> D:
+def taylor_sin(x: D) -> D:
     '''Return the sine of x as measured in radians.
 
     The Taylor series approximation works best for a small value of x.
     For larger values, first compute x = x % (2 * pi).
 
-    >>> print(sin(Decimal('0.5')))
+    >>> print(taylor_sin(Decimal('0.5')))
     0.4794255386042030002732879352
-    >>> print(sin(0.5))
+    >>> print(taylor_sin(0.5))
     0.479425538604
-    >>> print(sin(0.5+0j))
+    >>> print(taylor_sin(0.5+0j))
     (0.479425538604+0j)
 
     '''
@@ -184,6 +188,154 @@ def sin(x: D) -> D:
         ctx.prec -= 2
         return +s
 
+# NOTE sin/cos are reduced modulo pi/2 onto the anchors of a table of sin/cos
+#      values (multiples of 1/TRIG_ANCHORS rad up to pi/4) and a short series for
+#      the remainder, |remainder| <= 1/(2*TRIG_ANCHORS), at guard digits over the
+#      context precision. the guard is widened until the value rounds unambiguously
+TRIG_ANCHORS = 512
+TRIG_GUARD_DIGITS = 8
+
+class _TrigTable(NamedTuple):
+    '''pi/2, the sin/cos of the anchors and the coefficients of the remainder series'''
+    half_pi: D
+    anchors: List[Tuple[D, D]]
+    sin_series: List[D]
+    cos_series: List[D]
+
+_trig_tables: Dict[int, _TrigTable] = {}
+def _trig_table(prec: int) -> _TrigTable:
+    '''Trig table to prec digits (built once per precision)'''
+    table = _trig_tables.get(prec)
+    if table is None:
+        with localcontext() as ctx:
+            ctx.traps[Inexact] = False
+            ctx.rounding = ROUND_HALF_EVEN
+            ctx.prec = prec
+            half_pi = pi() / 2
+            # NOTE the anchors (j/512) are exact, the last one covers the reduction error
+            count = int(half_pi / 2 * TRIG_ANCHORS) + 2
+            anchors = [(taylor_sin(a), taylor_cos(a))
+                for a in (D(j) / TRIG_ANCHORS for j in range(count))]
+            # NOTE series coefficients (-1)^n/(2n+1)! and (-1)^n/(2n)!, as many as
+            #      the largest remainder needs for its terms to fall under prec digits
+            bound = DECIMAL1 / (2 * TRIG_ANCHORS)
+            sin_series, cos_series = [DECIMAL1], [DECIMAL1]
+            factorial, n = 1, 1
+            while bound ** (2 * n) / factorial >= DECIMAL1.scaleb(-prec - 1):
+                factorial *= 2 * n - 1
+                cos_series.append((-1) ** n / D(factorial * 2 * n))
+                factorial *= 2 * n
+                sin_series.append((-1) ** n / D(factorial * (2 * n + 1)))
+                n += 1
+            table = _TrigTable(half_pi, anchors, sin_series[::-1], cos_series[::-1])
+        _trig_tables[prec] = table
+    return table
+
+def _sincos(x: D, guard: int) -> Tuple[D, D, Tuple[D, D], int]: # pylint: disable=too-many-locals
+    '''sin and cos of x to the context precision plus guard digits, along
+    with bounds of their errors and the working precision'''
+    # NOTE the reduction of large arguments loses as many digits as the
+    #      integer part of x has, the working precision makes up for them
+    magnitude = max(0, x.adjusted() + 1)
+    prec = getcontext().prec + guard + magnitude
+    table = _trig_table(prec)
+    with localcontext() as ctx:
+        ctx.traps[Inexact] = False
+        ctx.rounding = ROUND_HALF_EVEN
+        ctx.prec = prec
+        quadrant = (x / table.half_pi).to_integral_value()
+        r = x - quadrant * table.half_pi
+        anchor = int((r * TRIG_ANCHORS).to_integral_value())
+        t = r - D(anchor) / TRIG_ANCHORS
+        t2 = t * t
+        sin_t, cos_t = DECIMAL0, DECIMAL0
+        for coefficient in table.sin_series:
+            sin_t = sin_t * t2 + coefficient
+        for coefficient in table.cos_series:
+            cos_t = cos_t * t2 + coefficient
+        sin_t *= t
+        error = DECIMAL1.scaleb(magnitude + 2 - prec)
+        if not quadrant and not anchor:
+            # NOTE nothing was subtracted from x (t is x), the series error is
+            #      relative to sin(x), however small it is, and not absolute
+            return sin_t, cos_t, (DECIMAL1.scaleb(sin_t.adjusted() + 2 - prec), error), prec
+        sin_a, cos_a = table.anchors[abs(anchor)]
+        if anchor < 0:
+            sin_a = -sin_a
+        sin_x = sin_a * cos_t + cos_a * sin_t
+        cos_x = cos_a * cos_t - sin_a * sin_t
+        quadrant = int(quadrant) % 4
+        if quadrant == 1:
+            sin_x, cos_x = cos_x, -sin_x
+        elif quadrant == 2:
+            sin_x, cos_x = -sin_x, -cos_x
+        elif quadrant == 3:
+            sin_x, cos_x = -cos_x, sin_x
+    return sin_x, cos_x, (error, error), prec
+
+def sincos(x: D, want: Tuple[bool, bool] = (True, True)) -> Tuple[D, D]:
+    '''Return the sine and the cosine of x (radians), correctly rounded
+    to the context precision. Only the wanted values are guaranteed
+    to be correctly rounded, the others are accurate to the guard digits.
+
+    Floats (and ints) are computed from their shortest decimal repr and
+    the results returned as floats.
+
+    >>> print(sincos(Decimal('0.5')))
+    (Decimal('0.4794255386042030002732879352'), Decimal('0.8775825618903727161162815826'))
+    >>> print(sincos(0.5))
+    (0.479425538604203, 0.8775825618903728)
+
+    '''
+    if not isinstance(x, D):
+        sin_x, cos_x = sincos(D(repr(x)), want)
+        return float(sin_x), float(cos_x)
+    if x.is_zero():
+        return +x, +DECIMAL1
+    guard = TRIG_GUARD_DIGITS
+    while True:
+        sin_x, cos_x, errors, prec = _sincos(x, guard)
+        with localcontext() as ctx:
+            ctx.traps[Inexact] = False
+            rounded = +sin_x, +cos_x
+            # NOTE the values are correctly rounded when every value within
+            #      the error rounds the same, the bounds themselves are exact
+            exact = ctx.copy()
+            exact.prec = prec + 2
+            if all(not wanted or (ctx.plus(exact.subtract(value, error)) == result
+                    == ctx.plus(exact.add(value, error)))
+                    for wanted, value, error, result in zip(want, (sin_x, cos_x), errors, rounded)):
+                return rounded
+        guard *= 2
+
+def sin(x: D) -> D:
+    '''Return the sine of x as measured in radians, correctly rounded to the context precision.
+    Floats are rounded to float, complex numbers are summed with the Taylor series.
+
+    >>> print(sin(Decimal('0.5')))
+    0.4794255386042030002732879352
+    >>> print(sin(0.5))
+    0.479425538604203
+    >>> print(sin(0.5+0j))
+    (0.479425538604203+0j)
+
+    '''
+    if isinstance(x, complex):
+        return taylor_sin(x)
+    return sincos(x, want=(True, False))[0]
+
+def cos(x: D) -> D:
+    '''Return the cosine of x as measured in radians, correctly rounded to the context precision.
+    Floats are rounded to float.
+
+    >>> print(cos(Decimal('0.5')))
+    0.8775825618903727161162815826
+    >>> print(cos(0.5))
+    0.8775825618903728
+
+    '''
+    return sincos(x, want=(False, True))[1]
+
 def deg2rad(deg: D) -> D:
     '''
     Convert from degrees to radians
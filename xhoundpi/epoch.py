@@ -0,0 +1,199 @@
+''' GNSS navigation epoch assembly '''
+
+import asyncio
+import struct
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from .message import Message
+from .message_policy_iface import IMessagePolicy
+from .message_router import HeaderMessageRouter
+from .metric import SuccessCounterMetric
+from .proto_class import ProtocolClass
+from .queue_ext import get_batch, put_batch # pylint: disable=unused-import
+
+# offset of the GPS time of week (iTOW, ms) within the payload of the UBX navigation messages
+UBX_ITOW_OFFSETS = {
+    bytes(b'\x01\x01') : 0, # NAV-POSECEF
+    bytes(b'\x01\x02') : 0, # NAV-POSLLH
+    bytes(b'\x01\x03') : 0, # NAV-STATUS
+    bytes(b'\x01\x04') : 0, # NAV-DOP
+    bytes(b'\x01\x05') : 0, # NAV-ATT
+    bytes(b'\x01\x06') : 0, # NAV-SOL
+    bytes(b'\x01\x07') : 0, # NAV-PVT
+    bytes(b'\x01\x09') : 4, # NAV-ODO
+    bytes(b'\x01\x11') : 0, # NAV-VELECEF
+    bytes(b'\x01\x12') : 0, # NAV-VELNED
+    bytes(b'\x01\x13') : 4, # NAV-HPPOSECEF
+    bytes(b'\x01\x14') : 4, # NAV-HPPOSLLH
+    bytes(b'\x01\x20') : 0, # NAV-TIMEGPS
+    bytes(b'\x01\x21') : 0, # NAV-TIMEUTC
+    bytes(b'\x01\x22') : 0, # NAV-CLOCK
+    bytes(b'\x01\x23') : 0, # NAV-TIMEGLO
+    bytes(b'\x01\x24') : 0, # NAV-TIMEBDS
+    bytes(b'\x01\x25') : 0, # NAV-TIMEGAL
+    bytes(b'\x01\x30') : 0, # NAV-SVINFO
+    bytes(b'\x01\x35') : 0, # NAV-SAT
+    bytes(b'\x01\x36') : 0, # NAV-COV
+    bytes(b'\x01\x3c') : 4, # NAV-RELPOSNED
+    bytes(b'\x01\x43') : 0, # NAV-SIG
+    bytes(b'\x01\x61') : 0, # NAV-EOE
+}
+
+# index of the UTC time (hhmmss.ss) field of the NMEA sentences
+NMEA_UTC_FIELDS = {
+    bytes(b'GGA') : 1,
+    bytes(b'RMC') : 1,
+    bytes(b'GNS') : 1,
+    bytes(b'GST') : 1,
+    bytes(b'GBS') : 1,
+    bytes(b'GRS') : 1,
+    bytes(b'ZDA') : 1,
+    bytes(b'GLL') : 5,
+}
+
+UBX_PAYLOAD_OFFSET = 6
+UBX_LENGTH = struct.Struct('<H')
+ITOW = struct.Struct('<I')
+
+def _ubx_time(frame: bytes) -> Optional[Tuple[str, Hashable]]:
+    offset = UBX_ITOW_OFFSETS.get(HeaderMessageRouter.IDENTITIES[ProtocolClass.UBX](frame))
+    if offset is None or len(frame) < UBX_PAYLOAD_OFFSET:
+        return None
+    # NOTE checked against the declared payload length so a short payload never reads the checksum
+    if UBX_LENGTH.unpack_from(frame, UBX_PAYLOAD_OFFSET - UBX_LENGTH.size)[0] < offset + ITOW.size:
+        return None
+    return 'itow', ITOW.unpack_from(frame, UBX_PAYLOAD_OFFSET + offset)[0]
+
+def _nmea_time(frame: bytes) -> Optional[Tuple[str, Hashable]]:
+    index = NMEA_UTC_FIELDS.get(HeaderMessageRouter.IDENTITIES[ProtocolClass.NMEA](frame))
+    if index is None:
+        return None
+    fields = bytes(frame).split(b',', index + 1)
+    if len(fields) <= index or not fields[index]:
+        return None
+    return 'utc', fields[index]
+
+EPOCH_TIMES = {
+    ProtocolClass.UBX : _ubx_time,
+    ProtocolClass.NMEA : _nmea_time,
+}
+
+def epoch_time(message: Message) -> Optional[Tuple[str, Hashable]]:
+    ''' Time of the epoch a message belongs to, as the UBX iTOW or the NMEA UTC time,
+    read from the frame without parsing the payload (None for messages without time) '''
+    reader = EPOCH_TIMES.get(message.proto)
+    if reader is None or message.frame is None:
+        return None
+    return reader(message.frame)
+
+@dataclass
+class Epoch:
+    ''' Messages of one GNSS navigation epoch in the order they were read,
+    along with the times (UBX iTOW and NMEA UTC) the epoch was tagged with.
+    Incomplete epochs were closed before their end was seen. '''
+    epoch_id: uuid.UUID
+    itow: Optional[int] = None
+    utc: Optional[bytes] = None
+    messages: List[Message] = field(default_factory=list)
+    complete: bool = False
+
+    def latest(self, predicate: Callable[[Message], bool]) -> Optional[Message]:
+        ''' Last message of the epoch that satisfies the predicate, if any '''
+        for message in reversed(self.messages):
+            if predicate(message):
+                return message
+        return None
+
+class EpochAssembler:
+    ''' Groups the messages read into epochs
+
+    Messages tagged with a time different from the one of the current
+    epoch (for the same time base) start a new epoch, messages without
+    time (eg, GSV, TXT) join the current one. The messages qualified by
+    the end policy (eg, UBX NAV-EOE) complete the current epoch, epochs
+    closed by a time change only complete when there is no end policy (the
+    end was lost otherwise). Epochs closed are counted as successes when
+    complete, failures otherwise. '''
+
+    def __init__(self,
+        end_policy: Optional[IMessagePolicy] = None,
+        counter: Optional[SuccessCounterMetric] = None):
+        self.__end_policy = end_policy
+        self.__counter = counter
+        self.__current = None
+
+    @property
+    def current(self) -> Optional[Epoch]:
+        ''' Epoch being assembled, if any '''
+        return self.__current
+
+    def add(self, message: Message) -> List[Epoch]:
+        ''' Add the message to the current epoch, returns the epochs closed by it '''
+        completed = []
+        time = epoch_time(message)
+        if self.__current is not None and time is not None:
+            base, value = time
+            if getattr(self.__current, base) not in (None, value):
+                completed.append(self.__close(complete=self.__end_policy is None))
+        if self.__current is None:
+            self.__current = Epoch(epoch_id=uuid.uuid4())
+        self.__current.messages.append(message)
+        if time is not None:
+            setattr(self.__current, *time)
+        if self.__end_policy is not None and self.__end_policy.qualifies(message):
+            completed.append(self.__close(complete=True))
+        return completed
+
+    def close(self) -> Optional[Epoch]:
+        ''' Close the current epoch as incomplete (eg, on a timeout) '''
+        if self.__current is None:
+            return None
+        return self.__close(complete=False)
+
+    def __close(self, complete: bool) -> Epoch:
+        epoch = self.__current
+        epoch.complete = complete
+        self.__current = None
+        if self.__counter is not None:
+            self.__counter.increase(is_success=complete)
+        return epoch
+
+class EpochAssemblerPump:
+    ''' Async pump grouping the messages of the input queue into the
+    epochs put on the output queue, epochs still open after the timeout
+    (in seconds, since their first message) are closed incomplete '''
+
+    def __init__(self, # pylint: disable=too-many-arguments
+        input_queue,
+        output_queue,
+        assembler: EpochAssembler,
+        timeout: float,
+        batch_size: int = 1):
+        self.__input = input_queue
+        self.__output = output_queue
+        self.__assembler = assembler
+        self.__timeout = timeout
+        self.__batch_size = batch_size
+
+    async def run(self):
+        ''' Assemble epochs from the input queue until cancelled '''
+        loop = asyncio.get_running_loop()
+        epoch, deadline = None, None
+        while True:
+            if self.__assembler.current is not epoch:
+                epoch = self.__assembler.current
+                deadline = None if epoch is None else loop.time() + self.__timeout
+            try:
+                if deadline is None:
+                    messages = await self.__input.get_batch(self.__batch_size)
+                else:
+                    messages = await asyncio.wait_for(
+                        self.__input.get_batch(self.__batch_size),
+                        max(0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                await self.__output.put(self.__assembler.close())
+                continue
+            for message in messages:
+                await self.__output.put_batch(self.__assembler.add(message))
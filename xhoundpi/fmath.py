@@ -0,0 +1,100 @@
+'''
+Float64 counterparts of the dmath operations
+
+Error bounds, for the quantities the offset operators handle:
+
+    - coordinates, |value| <= 180 deg, every step (field to degrees, offset
+      addition, degrees to field units) is one correctly rounded float64
+      operation, so the result is within 3 * 2^-53 * 180 < 1e-13 deg of the
+      exact value, below 1e-4 of the UBX hi-res quantum (1e-9 deg) and of
+      the NMEA hi-res quantum (1e-7 min ~ 1.7e-9 deg)
+    - heights, |value| <= 1e5 m, within 3 * 2^-53 * 1e5 < 1e-10 m of the exact
+      value, below 1e-6 of the UBX hi-res quantum (0.1 mm)
+    - offsets, the sin/cos of the math module and the ECEF conversions carry
+      relative errors below 1e-12 (the factor is a difference of ECEF
+      coordinates ~1.85 km apart out of ~6.4e6 m), negligible on offsets of
+      a few meters (1e-4 deg) against the quanta above
+
+Quantising truncates towards zero, as the Decimal path does, but values
+within QUANTUM_SNAP quanta of a quantum are taken as that quantum first,
+otherwise the float error of a value that is exactly on a quantum (e.g. a
+field read back unchanged) would truncate it to the one below. The float
+path then matches the Decimal path unless the exact value lies less than
+QUANTUM_SNAP quanta under a quantum, and differs by one quantum there.
+'''
+
+# pylint: disable=invalid-name
+
+import math
+from typing import Tuple
+
+from .coordinates import GeoCoordinates
+
+DEG_RAD_RATIO = math.pi / 180
+MINUTE = 1 / 60
+EQUAT_RAD_M = 6378137.0
+POLAR_RAD_M = 6356752.314
+SQRD_RADIAL_RATIO = POLAR_RAD_M ** 2 / EQUAT_RAD_M ** 2
+ELLIPSOID_ECC_SQRD = 1 - SQRD_RADIAL_RATIO
+
+# NOTE an order of magnitude over the float error of the coordinates (1e-4 quanta)
+QUANTUM_SNAP = 1e-3
+
+def geodethic_to_ecef(point: GeoCoordinates) -> Tuple[float, float, float]:
+    '''
+    Function to convert from Geodethic coordinates
+    to Earth Centered - Earth Fixed (ECEF) coordinate system,
+    same as dmath.geodethic_to_ecef over floats
+    '''
+    sin_lat, cos_lat = sincos(deg2rad(point.lat))
+    sin_lon, cos_lon = sincos(deg2rad(point.lon))
+
+    prime_vert_rad = EQUAT_RAD_M / math.sqrt(1 - ELLIPSOID_ECC_SQRD * sin_lat)
+
+    x_coord = (prime_vert_rad + point.alt) * cos_lat * cos_lon
+    y_coord = (prime_vert_rad + point.alt) * cos_lat * sin_lon
+    z_coord = (SQRD_RADIAL_RATIO * prime_vert_rad + point.alt) * sin_lat
+
+    return x_coord, y_coord, z_coord
+
+def sincos(x: float) -> Tuple[float, float]:
+    '''
+    Return the sine and the cosine of x (radians)
+    '''
+    return math.sin(x), math.cos(x)
+
+def deg2rad(deg: float) -> float:
+    '''
+    Convert from degrees to radians
+    '''
+    return deg * DEG_RAD_RATIO
+
+def distance(p0: Tuple[float, ...], p1: Tuple[float, ...]) -> float:
+    '''
+    Calculates the cartesian distance between two points
+    '''
+    if len(p0) != len(p1):
+        raise ValueError('both tuples must be of equal length')
+    return math.dist(p0, p1)
+
+def quantize(value: float, scale: float) -> int:
+    '''
+    Count of quanta (1/scale) in value, truncated towards zero
+    once snapped to a quantum within QUANTUM_SNAP of it
+    '''
+    scaled = value * scale
+    nearest = round(scaled)
+    if abs(scaled - nearest) <= QUANTUM_SNAP:
+        return nearest
+    return math.trunc(scaled)
+
+def split(quanta: int, base: int) -> Tuple[int, int]:
+    '''
+    Split a count of fine quanta into the coarse quanta (of base fine
+    quanta each) and the remaining fine quanta, both truncated towards zero
+    (same sign) as the Decimal divmod does
+    '''
+    coarse = abs(quanta) // base
+    if quanta < 0:
+        coarse = -coarse
+    return coarse, quanta - coarse * base
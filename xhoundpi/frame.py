@@ -0,0 +1,8 @@
+''' Defines raw frame representations '''
+
+from typing import Union
+
+# NOTE frames read from buffered clients are memoryview slices over the
+#      receive buffer, they are only valid until the next read and must be
+#      copied (e.g., bytes(frame)) by anything that keeps them around
+Frame = Union[bytes, bytearray, memoryview]
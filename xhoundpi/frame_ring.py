@@ -0,0 +1,188 @@
+''' Shared memory ring of routed frames between processes '''
+
+import struct
+import multiprocessing
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, NamedTuple, Tuple
+
+from .async_ext import wait_readable
+from .message_route import Route
+from .proto_class import ProtocolClass
+
+# record header: frame length, payload length, protocol class and route
+HEADER = struct.Struct('<IIBB')
+# control message: count of bytes published/released
+COUNT = struct.Struct('<Q')
+
+class FrameRingHandle(NamedTuple):
+    ''' What the writer process needs to attach to a frame ring '''
+    name: str
+    capacity: int
+    published: Connection
+    released: Connection
+
+class _FrameRing:
+    ''' Byte ring over a shared memory block, positions are absolute
+    byte counts and wrap around the end of the block '''
+
+    def __init__(self, shm: SharedMemory, capacity: int):
+        self._shm = shm
+        self._capacity = capacity
+
+    @property
+    def capacity(self) -> int:
+        ''' Size of the ring in bytes '''
+        return self._capacity
+
+    def _write(self, position: int, data: bytes):
+        start = position % self._capacity
+        head = min(len(data), self._capacity - start)
+        view = memoryview(data)
+        self._shm.buf[start:start + head] = view[:head]
+        self._shm.buf[:len(data) - head] = view[head:]
+
+    def _read(self, position: int, size: int) -> bytes:
+        start = position % self._capacity
+        head = min(size, self._capacity - start)
+        return bytes(self._shm.buf[start:start + head]) + bytes(self._shm.buf[:size - head])
+
+class FrameRingReader(_FrameRing):
+    ''' Single consumer end of a frame ring, owns the shared memory block
+
+    The producer and the consumer only exchange counts of bytes written
+    and read over a pair of pipes, the records never cross the pipes and
+    the counters in each process are only ever updated by it. The pipes
+    also let both ends wait for each other on the event loop. '''
+
+    def __init__(self, shm: SharedMemory, capacity: int, handle: FrameRingHandle, # pylint: disable=too-many-arguments
+        published: Connection, released: Connection):
+        super().__init__(shm, capacity)
+        self.__handle = handle
+        self.__published = published
+        self.__released = released
+        self.__available = 0
+        self.__position = 0
+
+    @classmethod
+    def create(cls, capacity: int, context=multiprocessing):
+        ''' Allocate a ring of capacity bytes and its control pipes '''
+        shm = SharedMemory(create=True, size=capacity)
+        published_rx, published_tx = context.Pipe(duplex=False)
+        released_rx, released_tx = context.Pipe(duplex=False)
+        handle = FrameRingHandle(shm.name, capacity, published_tx, released_rx)
+        return cls(shm, capacity, handle, published_rx, released_tx)
+
+    @property
+    def handle(self) -> FrameRingHandle:
+        ''' Handle to pass on to the writer process '''
+        return self.__handle
+
+    def detach_writer(self):
+        ''' Close the writer ends of the control pipes once handed over
+        to the writer process, so its exit is seen as an end of file '''
+        self.__handle.published.close()
+        self.__handle.released.close()
+
+    async def get_batch(self) -> List[Tuple[ProtocolClass, Route, bytes, bytes]]:
+        ''' Wait for frames to be published and take all of them (along with
+        their payloads, empty if none) in order, raises EOFError once the writer is gone '''
+        self.__collect()
+        while not self.__available:
+            await wait_readable(self.__published)
+            self.__collect()
+        batch = []
+        consumed = 0
+        while consumed < self.__available:
+            position = self.__position + consumed
+            length, payload_length, proto, route = HEADER.unpack(self._read(position, HEADER.size))
+            frame = self._read(position + HEADER.size, length)
+            payload = self._read(position + HEADER.size + length, payload_length)
+            batch.append((ProtocolClass(proto), Route(route), frame, payload))
+            consumed += HEADER.size + length + payload_length
+        # NOTE the frames were copied out, the space is handed back right away
+        self.__position += consumed
+        self.__available = 0
+        try:
+            self.__released.send_bytes(COUNT.pack(consumed))
+        except BrokenPipeError:
+            pass # the writer is gone, nothing waits for the space anymore
+        return batch
+
+    def close(self):
+        ''' Release and destroy the shared memory block '''
+        self.__published.close()
+        self.__released.close()
+        self._shm.close()
+        self._shm.unlink()
+
+    def __collect(self):
+        try:
+            while self.__published.poll():
+                self.__available += COUNT.unpack(self.__published.recv_bytes())[0]
+        except EOFError:
+            # NOTE the records published before the writer was gone are read first
+            if not self.__available:
+                raise
+
+class FrameRingWriter(_FrameRing):
+    ''' Single producer end of a frame ring
+
+    Records are a frame and, optionally, an opaque payload (eg, the frame
+    already decoded by the producer). Records are only visible to the
+    reader once flushed, producers write a batch of frames and flush once
+    for all of them. The producer waits for the reader to release space
+    when the ring is full. '''
+
+    def __init__(self, shm: SharedMemory, capacity: int,
+        published: Connection, released: Connection):
+        super().__init__(shm, capacity)
+        self.__published = published
+        self.__released = released
+        self.__written = 0
+        self.__freed = 0
+        self.__pending = 0
+
+    @classmethod
+    def attach(cls, handle: FrameRingHandle):
+        ''' Attach to the ring of a handle created by the reader '''
+        return cls(SharedMemory(name=handle.name), handle.capacity,
+            handle.published, handle.released)
+
+    async def put(self, proto: ProtocolClass, route: Route, frame: bytes, payload: bytes = b''):
+        ''' Write a frame record, waiting for space if the ring is full '''
+        size = HEADER.size + len(frame) + len(payload)
+        if size > self._capacity:
+            raise ValueError(f'Frame of {len(frame) + len(payload)} bytes does not fit '
+                f'a ring of {self._capacity} bytes')
+        while self._capacity - (self.__written - self.__freed) < size:
+            # NOTE the reader may be waiting on the records still pending
+            self.flush()
+            if self._capacity - (self.__written - self.__freed) >= size:
+                break
+            await wait_readable(self.__released)
+            self.__collect()
+        self._write(self.__written, HEADER.pack(len(frame), len(payload), proto.value, route.value))
+        self._write(self.__written + HEADER.size, frame)
+        self._write(self.__written + HEADER.size + len(frame), payload)
+        self.__written += size
+        self.__pending += size
+
+    def flush(self):
+        ''' Publish the records written since the last flush '''
+        if self.__pending:
+            self.__published.send_bytes(COUNT.pack(self.__pending))
+            self.__pending = 0
+        # NOTE draining the releases here keeps the reader from ever
+        #      blocking on a full pipe while the ring has room to spare
+        self.__collect()
+
+    def close(self):
+        ''' Detach from the shared memory block '''
+        self.__published.close()
+        self.__released.close()
+        self._shm.close()
+
+    def __collect(self):
+        while self.__released.poll():
+            self.__freed += COUNT.unpack(self.__released.recv_bytes())[0]
@@ -0,0 +1,77 @@
+''' Raw frame checksum validation module '''
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional
+
+from .frame import Frame
+from .metric import CounterMetric
+from .nmea_patcher import NMEA_CHECKSUM_MARKER, nmea_checksum
+from .proto_class import ProtocolClass
+from .proto_reader import FrameReadingError
+from .ubx_nav_codec import ubx_checksum
+
+class FrameChecksumError(FrameReadingError):
+    ''' Error for frames failing the checksum validation, the message
+    is only formatted when the error is printed (eg, logged) '''
+
+    def __init__(self, protocol: ProtocolClass, frame: bytes):
+        self.protocol = protocol
+        self.frame = frame
+        super().__init__(protocol, frame)
+
+    def __str__(self):
+        return f'Checksum mismatch on {self.protocol} frame \'0x{self.frame.hex().upper()}\''
+
+class IFrameValidator(ABC):
+    ''' Interface/contract for frame validator implementations '''
+
+    @abstractmethod
+    def validate(self, protocol: ProtocolClass, frame: Frame) -> bool:
+        ''' Whether the raw frame is sound, corrupt frames are rejected '''
+
+class StubFrameValidator(IFrameValidator):
+    ''' Stub for a frame validator that accepts every frame '''
+
+    def validate(self, protocol: ProtocolClass, frame: Frame) -> bool:
+        ''' Accept the frame '''
+        return True
+
+def valid_ubx_checksum(frame: Frame) -> bool:
+    ''' Check the Fletcher-8 checksum closing the UBX frame '''
+    return len(frame) >= 8 and ubx_checksum(frame[2:-2]) == (frame[-2], frame[-1])
+
+def valid_nmea_checksum(frame: Frame) -> bool:
+    ''' Check the XOR checksum following the '*' marker of the NMEA frame '''
+    data = bytes(frame)
+    marker = data.rfind(NMEA_CHECKSUM_MARKER)
+    if marker < 0:
+        return False
+    try:
+        return int(data[marker + 1:marker + 3], 16) == nmea_checksum(data[1:marker])
+    except ValueError:
+        return False
+
+class ChecksumFrameValidator(IFrameValidator):
+    ''' Validates the checksum of the raw frames before they get to
+    the parser libraries, rejected frames are counted per protocol and
+    frames of protocols without a check in the table are accepted '''
+
+    CHECKS: Dict[ProtocolClass, Callable[[Frame], bool]] = {
+        ProtocolClass.UBX: valid_ubx_checksum,
+        ProtocolClass.NMEA: valid_nmea_checksum,
+    }
+
+    def __init__(self, rejected: Optional[Dict[ProtocolClass, CounterMetric]] = None):
+        self.__rejected = rejected or {}
+
+    def validate(self, protocol: ProtocolClass, frame: Frame) -> bool:
+        ''' Whether the checksum matches, mismatches are counted '''
+        # NOTE nothing is raised nor formatted here, a noisy link rejects
+        #      frames at the read rate and this is on the read hot path
+        check = self.CHECKS.get(protocol)
+        if check is None or check(frame):
+            return True
+        counter = self.__rejected.get(protocol)
+        if counter is not None:
+            counter.increase()
+        return False
@@ -2,9 +2,10 @@
 
 from abc import ABC, abstractmethod
 from io import BytesIO
-from typing import Union
+from typing import Sequence, Union
 
 from .serial import ISerial
+from .frame import Frame
 
 class IGnssClient(ABC):
     ''' Interface for GNSS client implementations '''
@@ -15,7 +16,23 @@ class IGnssClient(ABC):
 
     @abstractmethod
     def write(self, data: bytes) -> int:
-        ''' Write bytes to GNSS device transport '''
+        ''' Write bytes to GNSS device transport, returns the number of bytes written,
+        non-blocking transports can write fewer (or raise BlockingIOError) '''
+
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        ''' Write a sequence of buffers to GNSS device transport in one go,
+        returns the number of bytes written (can be fewer than the total) '''
+        return self.write(b''.join(buffers))
+
+    def flush(self) -> int:
+        ''' Write out any output held by the client, returns the number of bytes written '''
+        return 0
+
+    async def wait_readable(self):
+        ''' Wait until the GNSS device transport has input pending '''
+
+    async def wait_writable(self):
+        ''' Wait until the GNSS device transport can take output '''
 
 class GnssClient(IGnssClient):
     ''' Gnss client implementation facade '''
@@ -30,3 +47,39 @@ class GnssClient(IGnssClient):
     def write(self, data: bytes) -> int:
         ''' Write n bytes to GNSS serial iface '''
         return self.__serial.write(data)
+
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        ''' Write a sequence of buffers to GNSS serial iface in one go '''
+        if isinstance(self.__serial, ISerial):
+            return self.__serial.writev(buffers)
+        return self.__serial.write(b''.join(buffers))
+
+    async def wait_readable(self):
+        ''' Wait until the GNSS serial iface has input pending '''
+        if isinstance(self.__serial, ISerial):
+            await self.__serial.wait_readable()
+
+    async def wait_writable(self):
+        ''' Wait until the GNSS serial iface can take output '''
+        if isinstance(self.__serial, ISerial):
+            await self.__serial.wait_writable()
+
+class IBufferedGnssClient(IGnssClient):
+    ''' Interface for GNSS clients that buffer the device transport input.
+    Consumers can inspect pending input without consuming it and only
+    slice out whole frames once they are complete. Reads return views
+    over the buffer that are valid until the next read. '''
+
+    @abstractmethod
+    def read(self, size) -> Frame:
+        ''' Consume n bytes and return a view over them '''
+
+    @abstractmethod
+    def peek(self, size: int) -> Frame:
+        ''' Return up to n pending bytes without consuming them, fewer
+        bytes are returned only if the transport is exhausted '''
+
+    @abstractmethod
+    def find(self, sub: bytes, limit: int = None) -> int:
+        ''' Return the offset of sub within the next n pending bytes
+        (or the whole buffer if no limit is given), -1 if not found '''
@@ -1,7 +1,14 @@
 ''' Decorators for IGnssClient implementations '''
 
-from .metric import ValueMetric
-from .gnss_client import IGnssClient
+import time
+import asyncio
+import contextlib
+from typing import Optional, Sequence
+
+from .events import AppEvent
+from .metric import LatencyMetric, SuccessCounterMetric, ValueMetric
+from .gnss_client import IGnssClient, IBufferedGnssClient
+from .ring_buffer import RingBuffer, RingBufferOverflowError
 from .monkey_patching import add_method
 
 @add_method(IGnssClient)
@@ -11,6 +18,23 @@ def with_metrics(self,
     ''' Provides decorated GNSS client with metrics '''
     return GnssClientWithMetrics(self, cbytes_read, cbytes_written)
 
+@add_method(IGnssClient)
+def with_buffer(self, capacity: int, chunk_size: int):
+    ''' Provides decorated GNSS client with a chunked read buffer '''
+    return GnssClientWithBuffer(self, RingBuffer(capacity), chunk_size)
+
+@add_method(IGnssClient)
+def with_write_coalescing(self, # pylint: disable=too-many-arguments
+    size_threshold: int,
+    deadline: float,
+    counter: Optional[SuccessCounterMetric] = None,
+    latency: Optional[LatencyMetric] = None,
+    logger = None,
+    write_latency: Optional[LatencyMetric] = None):
+    ''' Provides decorated GNSS client that coalesces the writes '''
+    return GnssClientWithWriteCoalescing(self, size_threshold, deadline, counter, latency, logger,
+        write_latency)
+
 class GnssClientWithMetrics(IGnssClient):
     ''' IGnssClient decorator for metrics '''
 
@@ -34,6 +58,24 @@ class GnssClientWithMetrics(IGnssClient):
         self._cbytes_written.add(cbytes)
         return cbytes
 
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        ''' Write a sequence of buffers to GNSS device transport and count bytes '''
+        cbytes = self._inner.writev(buffers)
+        self._cbytes_written.add(cbytes)
+        return cbytes
+
+    def flush(self) -> int:
+        ''' Write out any output held by the inner client '''
+        return self._inner.flush()
+
+    async def wait_readable(self):
+        ''' Wait until the GNSS device transport has input pending '''
+        await self._inner.wait_readable()
+
+    async def wait_writable(self):
+        ''' Wait until the GNSS device transport can take output '''
+        await self._inner.wait_writable()
+
     # Live intercept properties and methods access
 
     def __getattr__(self, name):
@@ -47,3 +89,249 @@ class GnssClientWithMetrics(IGnssClient):
 
     def __delattr__(self, name):
         delattr(self.__dict__['_inner'], name)
+
+class GnssClientWithBuffer(IBufferedGnssClient):
+    ''' IGnssClient decorator that reads the transport in large
+    chunks into a reusable ring buffer and serves reads from it '''
+
+    def __init__(self,
+        inner: IGnssClient,
+        buffer: RingBuffer,
+        chunk_size: int):
+        self._inner = inner
+        self._buffer = buffer
+        self._chunk_size = chunk_size
+
+    def read(self, size: int = 1) -> memoryview:
+        ''' Read n bytes from the buffer, refilling it from the transport
+        as needed, the view returned is valid until the next read '''
+        self._fill(size)
+        return self._buffer.consume(size)
+
+    def write(self, data: bytes) -> int:
+        ''' Write bytes to GNSS device transport, writes are not buffered '''
+        return self._inner.write(data)
+
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        ''' Write a sequence of buffers to GNSS device transport '''
+        return self._inner.writev(buffers)
+
+    def flush(self) -> int:
+        ''' Write out any output held by the inner client '''
+        return self._inner.flush()
+
+    async def wait_readable(self):
+        ''' Wait until the GNSS device transport has input pending, on
+        non-blocking transports reads raise BlockingIOError until then '''
+        await self._inner.wait_readable()
+
+    async def wait_writable(self):
+        ''' Wait until the GNSS device transport can take output '''
+        await self._inner.wait_writable()
+
+    def peek(self, size: int = 1) -> memoryview:
+        ''' Return up to n pending bytes without consuming them '''
+        self._fill(size)
+        return self._buffer.peek(size)
+
+    def find(self, sub: bytes, limit: int = None) -> int:
+        ''' Return the offset of sub within the next n pending bytes, -1 if not found '''
+        limit = self._buffer.capacity if limit is None else limit
+        start = 0
+        while True:
+            index = self._buffer.find(sub, start, limit)
+            if index >= 0 or len(self._buffer) >= limit:
+                return index
+            # resume the search where a partial match could begin
+            start = max(0, len(self._buffer) - len(sub) + 1)
+            if not self._fill_chunk():
+                return -1
+
+    def _fill(self, size: int):
+        while len(self._buffer) < size and self._fill_chunk():
+            pass
+
+    def _fill_chunk(self) -> bool:
+        if not self._buffer.free:
+            raise RingBufferOverflowError(self._chunk_size, 0)
+        data = self._inner.read(min(self._chunk_size, self._buffer.free))
+        return self._buffer.write(data) > 0
+
+    # Live intercept properties and methods access
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['_inner'], name)
+
+    def __setattr__(self, name, value):
+        if name in ('_inner', '_buffer', '_chunk_size'):
+            self.__dict__[name] = value
+        else:
+            setattr(self.__dict__['_inner'], name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__dict__['_inner'], name)
+
+class GnssClientWithWriteCoalescing(IGnssClient): # pylint: disable=too-many-instance-attributes
+    ''' IGnssClient decorator that holds the bytes written and writes them
+    out together in one scatter write (writev) once they reach a size
+    threshold, after a short deadline or when flushed (eg, at the end of
+    a GNSS epoch), so the transport sees one syscall per burst of frames.
+
+    Writes report the bytes accepted, the flushes are counted (failures
+    included) and timed on their own metrics. The latency of each write,
+    from the time it is held to the flush that writes out its last byte,
+    is recorded on the write latency metric. Output the transport cannot
+    take yet is kept and retried on the deadline, the flush counted as
+    failed. Once the output held reaches the pending limit (PENDING_THRESHOLDS
+    times the size threshold) writes raise BlockingIOError until the transport
+    takes it, callers wait for it with wait_writable as with any non-blocking
+    client. Output lost to a failed flush is discarded and the error raised
+    to the caller of the flush, or logged for flushes on the deadline. '''
+
+    PENDING_THRESHOLDS = 4
+
+    def __init__(self, # pylint: disable=too-many-arguments
+        inner: IGnssClient,
+        size_threshold: int,
+        deadline: float,
+        counter: Optional[SuccessCounterMetric] = None,
+        latency: Optional[LatencyMetric] = None,
+        logger = None,
+        write_latency: Optional[LatencyMetric] = None):
+        self._inner = inner
+        self._size_threshold = size_threshold
+        self._pending_limit = size_threshold * self.PENDING_THRESHOLDS
+        self._deadline = deadline
+        self._counter = counter
+        self._latency = latency
+        self._logger = logger
+        self._write_latency = write_latency
+        self._pending = []
+        self._held = []
+        self._pending_size = 0
+        self._timer = None
+
+    def read(self, size) -> bytes:
+        ''' Read n bytes from GNSS device transport '''
+        return self._inner.read(size)
+
+    def write(self, data: bytes) -> int:
+        ''' Hold the bytes until the next flush, returns the number of bytes
+        accepted. Raises BlockingIOError, accepting none of them, if the
+        output held is over the pending limit and the transport cannot take it '''
+        if self._is_full(len(data)):
+            self.flush()
+            if self._is_full(len(data)):
+                raise BlockingIOError(f'{self._pending_size} bytes of GNSS output pending')
+        self._pending.append(bytes(data))
+        self._held.append(time.perf_counter())
+        self._pending_size += len(data)
+        if self._pending_size >= self._size_threshold:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self._deadline, self._flush_on_deadline)
+        return len(data)
+
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        ''' Hold the buffers until the next flush, returns the number of
+        bytes accepted (fewer than the total once the pending limit is hit) '''
+        cbytes = 0
+        for data in buffers:
+            try:
+                cbytes += self.write(data)
+            except BlockingIOError:
+                if not cbytes:
+                    raise
+                break
+        return cbytes
+
+    def flush(self) -> int:
+        ''' Write out the bytes held, returns the number of bytes written '''
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return 0
+        written = 0
+        with self._latency if self._latency is not None else contextlib.nullcontext():
+            try:
+                while self._pending:
+                    cbytes = self._inner.writev(self._pending)
+                    if not cbytes:
+                        break
+                    self._consume(cbytes)
+                    written += cbytes
+            except BlockingIOError:
+                pass
+            except Exception:
+                self._pending.clear()
+                self._held.clear()
+                self._pending_size = 0
+                self._count(is_success=False)
+                raise
+        # NOTE output the transport refused is kept but the flush failed
+        self._count(is_success=not self._pending)
+        if self._pending:
+            # NOTE the transport could not take it all, retry on the deadline
+            self._timer = asyncio.get_running_loop().call_later(
+                self._deadline, self._flush_on_deadline)
+        return written
+
+    async def wait_readable(self):
+        ''' Wait until the GNSS device transport has input pending '''
+        await self._inner.wait_readable()
+
+    async def wait_writable(self):
+        ''' Wait until the GNSS device transport can take output and write
+        out the output held, so writes are accepted again '''
+        await self._inner.wait_writable()
+        self.flush()
+
+    def _is_full(self, size: int) -> bool:
+        # NOTE a write is always accepted with nothing held, however large
+        return bool(self._pending) and self._pending_size + size > self._pending_limit
+
+    def _flush_on_deadline(self):
+        self._timer = None
+        discarded = self._pending_size
+        try:
+            self.flush()
+        except Exception as ex: # pylint: disable=broad-except
+            # NOTE counted as a failed flush, there is no caller to raise it to
+            if self._logger is not None:
+                self._logger.error(AppEvent(
+                    f'GNSS output flush failed, {discarded} bytes discarded: {ex!r}'))
+
+    def _consume(self, cbytes: int):
+        self._pending_size -= cbytes
+        while cbytes:
+            head = self._pending[0]
+            if len(head) > cbytes:
+                self._pending[0] = head[cbytes:]
+                return
+            cbytes -= len(head)
+            del self._pending[0]
+            held = self._held.pop(0)
+            if self._write_latency is not None:
+                self._write_latency.record(time.perf_counter() - held)
+
+    def _count(self, is_success: bool):
+        if self._counter is not None:
+            self._counter.increase(is_success=is_success)
+
+    # Live intercept properties and methods access
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['_inner'], name)
+
+    def __setattr__(self, name, value):
+        if name in ('_inner', '_size_threshold', '_pending_limit', '_deadline',
+            '_counter', '_latency', '_logger', '_write_latency', '_pending', '_held',
+            '_pending_size', '_timer'):
+            self.__dict__[name] = value
+        else:
+            setattr(self.__dict__['_inner'], name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__dict__['_inner'], name)
@@ -0,0 +1,114 @@
+''' GNSS service ends of the shared memory frame ring '''
+
+import asyncio
+import collections
+import pickle
+import uuid
+
+from functools import partial
+from typing import Any, Container, List, Tuple
+
+from .gnss_service_iface import IGnssService
+from .frame_ring import FrameRingReader, FrameRingWriter
+from .proto_parser import IProtocolParserProvider
+from .status import Status
+from .message import Message
+from .message_route import Route
+from .proto_class import ProtocolClass
+from .serial import SerialClosedError
+
+def _load_payload(payload: bytes, _frame: bytes) -> Any:
+    return pickle.loads(payload)
+
+class GnssRingService(IGnssService):
+    ''' Gnss service reading the frames another process published on a
+    frame ring, writes are delegated to an inner service. Frames are
+    taken in the order they were read and parsed on first access to the
+    payload, as the messages read from a GNSS client are, frames published
+    along with their payload (see GnssRingFeeder) unpickle it instead. Once
+    the writer is gone and its frames were read the input is closed (SerialClosedError) '''
+
+    def __init__(
+        self,
+        ring: FrameRingReader,
+        parser_provider: IProtocolParserProvider,
+        writer: IGnssService):
+        self.__ring = ring
+        self.__parser_provider = parser_provider
+        self.__writer = writer
+        self.__pending = collections.deque()
+
+    async def read_message(self) -> Tuple[Status, Message]:
+        ''' Read the next frame published on the ring into a message '''
+        return (await self.read_messages(1))[0]
+
+    async def read_messages(self, limit: int) -> List[Tuple[Status, Message]]:
+        ''' Waits for frames to be published, then reads up to limit of
+        the frames already taken from the ring '''
+        try:
+            if not self.__pending:
+                self.__pending.extend(await self.__ring.get_batch())
+            batch = []
+            while self.__pending and len(batch) < limit:
+                batch.append((Status.OK(), self.__message(*self.__pending.popleft())))
+            return batch
+        except EOFError:
+            return [(Status(SerialClosedError('the frame reader is gone')), None)]
+        except Exception as err: # pylint: disable=broad-except
+            return [(Status(err), None)]
+
+    async def write_message(self, message: Message) -> Tuple[Status, int]:
+        ''' Write the message through the inner service '''
+        return await self.__writer.write_message(message)
+
+    def __message(self, protocol, route, frame, payload) -> Message:
+        parse = partial(_load_payload, payload) if payload \
+            else self.__parser_provider.get_parser(protocol).parse
+        return Message(
+            proto=protocol,
+            message_id=uuid.uuid4(),
+            frame=frame,
+            parser=parse,
+            route=route)
+
+class GnssRingFeeder:
+    ''' Publishes the messages read from a GNSS service on a frame ring,
+    the frames of a batch are flushed to the reader together. Messages
+    to be processed of the preparsed protocols are parsed here, their
+    payload is published pickled along with the frame (frames that fail
+    to parse or pickle are published alone, the reader parses them) '''
+
+    def __init__(
+        self,
+        gnss_service: IGnssService,
+        ring: FrameRingWriter,
+        read_batch_size: int = 1,
+        preparsed: Container[ProtocolClass] = ()):
+        self.__gnss_service = gnss_service
+        self.__ring = ring
+        self.__read_batch_size = read_batch_size
+        self.__preparsed = preparsed
+
+    async def run(self):
+        ''' Feed the ring until cancelled, the ring reader is gone or
+        the GNSS input is closed (SerialClosedError is raised then) '''
+        while True:
+            batch = await self.__gnss_service.read_messages(self.__read_batch_size)
+            for status, message in batch:
+                if status.ok:
+                    await self.__ring.put(message.proto, message.route, message.frame,
+                        self.__payload(message))
+                elif isinstance(status.error, SerialClosedError):
+                    # NOTE the frames read before the input was closed are published
+                    self.__ring.flush()
+                    raise status.error
+            self.__ring.flush()
+            await asyncio.sleep(0)
+
+    def __payload(self, message: Message) -> bytes:
+        if message.route is not Route.PROCESS or message.proto not in self.__preparsed:
+            return b''
+        try:
+            return pickle.dumps(message.payload, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception: # pylint: disable=broad-except
+            return b''
@@ -2,7 +2,7 @@
 
 import uuid
 
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 from .gnss_service_iface import IGnssService
 from .gnss_client import IGnssClient
@@ -10,11 +10,15 @@ from .proto_classifier import IProtocolClassifier
 from .proto_reader import IProtocolReaderProvider
 from .proto_parser import IProtocolParserProvider
 from .proto_serializer import IProtocolSerializerProvider
+from .frame_validator import FrameChecksumError, IFrameValidator
+from .message_router import IMessageRouter
+from .message_policy_iface import IMessagePolicy
+from .message_route import Route
 from .status import Status
 from .message import Message
 
 
-class GnssService(IGnssService):
+class GnssService(IGnssService): # pylint: disable=too-many-instance-attributes
     ''' Gnss service facade '''
 
     def __init__( # pylint: disable=too-many-arguments
@@ -23,31 +27,103 @@ class GnssService(IGnssService):
         classifier: IProtocolClassifier,
         reader_provider: IProtocolReaderProvider,
         parser_provider: IProtocolParserProvider,
-        serializer_provider: IProtocolSerializerProvider):
+        serializer_provider: IProtocolSerializerProvider,
+        router: Optional[IMessageRouter] = None,
+        validator: Optional[IFrameValidator] = None,
+        flush_policy: Optional[IMessagePolicy] = None):
         self.__gnss_client = gnss_client
         self.__classifier = classifier
         self.__reader_provider = reader_provider
         self.__parser_provider = parser_provider
         self.__serializer_provider = serializer_provider
+        self.__router = router
+        self.__validator = validator
+        self.__flush_policy = flush_policy
 
     async def read_message(self) -> Tuple[Status, Message]:
-        ''' Reads, classifies, and parses input from the GNSS client stream '''
+        ''' Reads and classifies input from the GNSS client stream, the
+        frame is copied into the message and parsed on first access to
+        the payload. Non-blocking clients raise BlockingIOError on incomplete
+        input before consuming it, the read is retried once data is pending.
+        Corrupt frames are rejected by the validator before they get to be
+        routed or parsed, their read fails without raising. The message is
+        routed from its frame header, dropped frames are skipped without being copied '''
         try:
-            (header, protocol) = self.__classifier.classify(self.__gnss_client)
-            reader = self.__reader_provider.get_reader(protocol)
-            parser = self.__parser_provider.get_parser(protocol)
-            frame = reader.read_frame(header, self.__gnss_client)
-            payload = parser.parse(frame)
-            return Status.OK(), Message(proto=protocol, payload=payload, message_id=uuid.uuid4())
+            while True:
+                try:
+                    return self.__next_message()
+                except BlockingIOError:
+                    await self.__gnss_client.wait_readable()
         except Exception as err: # pylint: disable=broad-except
             return Status(err), None
 
+    async def read_messages(self, limit: int) -> List[Tuple[Status, Message]]:
+        ''' Waits for a message as read_message does, then keeps reading the
+        frames already pending on the GNSS client without giving up the loop.
+        The batch ends once the input is incomplete (BlockingIOError), limit
+        messages are read or a read fails (the failure is its last entry) '''
+        batch = [await self.read_message()]
+        while batch[-1][0].ok and len(batch) < limit:
+            try:
+                batch.append(self.__next_message())
+            except BlockingIOError:
+                break
+            except Exception as err: # pylint: disable=broad-except
+                batch.append((Status(err), None))
+        return batch
+
     async def write_message(self, message: Message) -> Tuple[Status, int]:
-        ''' Writes messages as byte strings to the GNSS client input '''
+        ''' Writes messages as byte strings to the GNSS client input, messages
+        that were not modified are written as their original frame. The client
+        output is flushed after the messages qualified by the flush policy
+        (eg, the last message of a GNSS epoch). The whole message is written,
+        non-blocking clients are waited on until they take the rest of it '''
         try:
-            serializer = self.__serializer_provider.get_serializer(message.proto)
-            data = serializer.serialize(message)
-            cbytes = self.__gnss_client.write(data)
+            if message.frame is not None and not message.dirty:
+                data = message.frame
+            else:
+                serializer = self.__serializer_provider.get_serializer(message.proto)
+                data = serializer.serialize(message)
+            cbytes = await self.__write(data)
+            if self.__flush_policy is not None and self.__flush_policy.qualifies(message):
+                self.__gnss_client.flush()
             return Status.OK(), cbytes
         except Exception as err: # pylint: disable=broad-except
             return Status(err), 0
+
+    async def __write(self, data: bytes) -> int:
+        ''' Write all the data to the GNSS client, waiting for it to be
+        writable whenever it takes only part (or none) of the data '''
+        cbytes = 0
+        pending = data
+        while True:
+            try:
+                cbytes += self.__gnss_client.write(pending)
+            except BlockingIOError:
+                pass
+            if cbytes >= len(data):
+                return cbytes
+            pending = memoryview(data)[cbytes:]
+            await self.__gnss_client.wait_writable()
+
+    def __next_message(self) -> Tuple[Status, Message]:
+        ''' Read the next routed frame into a message, raises
+        BlockingIOError if the input pending is incomplete '''
+        route = Route.PROCESS
+        while True:
+            (header, protocol) = self.__classifier.classify(self.__gnss_client)
+            reader = self.__reader_provider.get_reader(protocol)
+            frame = reader.read_frame(header, self.__gnss_client)
+            if self.__validator is not None and not self.__validator.validate(protocol, frame):
+                return Status(FrameChecksumError(protocol, bytes(frame))), None
+            if self.__router is not None:
+                route = self.__router.route(protocol, frame)
+            if route is not Route.DROP:
+                break
+        parser = self.__parser_provider.get_parser(protocol)
+        return Status.OK(), Message(
+            proto=protocol,
+            message_id=uuid.uuid4(),
+            frame=bytes(frame),
+            parser=parser.parse,
+            route=route)
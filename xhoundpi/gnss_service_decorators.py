@@ -3,7 +3,7 @@
 import logging
 import uuid
 
-from typing import Tuple
+from typing import List, Tuple
 
 from .proto_class import ProtocolClass
 from .events.common import ZERO_UUID
@@ -46,6 +46,11 @@ class GnssServiceWithTraces(IGnssService):
             status, message = await self._inner.read_message()
             return status, message
 
+    async def read_messages(self, limit: int) -> List[Tuple[Status, Message]]:
+        ''' Reads a batch of messages from the GNSS client stream with traces '''
+        with self._trace_provider.start_as_current_span("read_batch"):
+            return await self._inner.read_messages(limit)
+
     async def write_message(self, message: Message) -> Tuple[Status, int]:
         ''' Writes messages as byte strings to the GNSS client input with traces '''
         with self._trace_provider.start_as_current_span("write"):
@@ -82,6 +87,16 @@ class GnssServiceWithEvents(IGnssService):
         self._log_read_end(activity_id, status, message)
         return status, message
 
+    async def read_messages(self, limit: int) -> List[Tuple[Status, Message]]:
+        ''' Reads a batch of messages from the GNSS client stream with
+        log events, the end of each read in the batch is logged '''
+        activity_id = uuid.uuid4()
+        self._log_read_start(activity_id)
+        batch = await self._inner.read_messages(limit)
+        for status, message in batch:
+            self._log_read_end(activity_id, status, message)
+        return batch
+
     async def write_message(self, message: Message) -> Tuple[Status, int]:
         ''' Writes messages as byte strings to the GNSS client input with log events '''
         activity_id = uuid.uuid4()
@@ -182,6 +197,15 @@ class GnssServiceWithMetrics(IGnssService):
         self._rcounter.increase(is_success=status.ok)
         return status, message
 
+    async def read_messages(self, limit: int) -> List[Tuple[Status, Message]]:
+        ''' Reads a batch of messages from the GNSS client stream with
+        metrics, the latency is that of the batch and each read is counted '''
+        with self._rlatency:
+            batch = await self._inner.read_messages(limit)
+        for status, _ in batch:
+            self._rcounter.increase(is_success=status.ok)
+        return batch
+
     async def write_message(self, message: Message) -> Tuple[Status, int]:
         ''' Writes messages as byte strings to the GNSS
         client stream with latency and success metrics '''
@@ -1,6 +1,6 @@
 ''' Defines GNSS service interface/contracts '''
 
-from typing import Tuple
+from typing import List, Tuple
 from abc import ABC, abstractmethod
 
 from .message import Message
@@ -13,6 +13,11 @@ class IGnssService(ABC):
     async def read_message(self) -> Tuple[Status, Message]:
         ''' Read a GNSS message '''
 
+    async def read_messages(self, limit: int) -> List[Tuple[Status, Message]]: # pylint: disable=unused-argument
+        ''' Read at least one GNSS message and up to limit messages when
+        more input is already pending, a failed read ends the batch '''
+        return [await self.read_message()]
+
     @abstractmethod
     async def write_message(self, message: Message) -> Tuple[Status, int]:
         ''' Write a GNSS message '''
@@ -3,6 +3,7 @@ import asyncio
 
 from .gnss_service import IGnssService
 from .async_ext import loop_forever_async
+from .serial import SerialClosedError
 
 class GnssServiceRunner:
     ''' Gnss service runner reads/writes from in/out-bound queues'''
@@ -11,22 +12,46 @@ class GnssServiceRunner:
         self,
         gnss_service: IGnssService,
         inbound_queue: asyncio.queues.Queue,
-        outbound_queue: asyncio.queues.Queue):
+        outbound_queue: asyncio.queues.Queue,
+        read_batch_size: int = 1):
         self.__gnss_service = gnss_service
         self.__inbound_qeue = inbound_queue
         self.__outbound_queue = outbound_queue
+        self.__read_batch_size = read_batch_size
+        self.__closed = asyncio.Event()
+        self.__closed_error = None
 
     async def run(self):
-        ''' Run inbound and outbound data flows in a loop '''
+        ''' Run inbound and outbound data flows in a loop, the inbound
+        flow stops once the GNSS input is closed (see wait_closed) '''
         return await asyncio.gather(
-            loop_forever_async(self.__inbound),
+            self.__run_inbound(),
             loop_forever_async(self.__outbound),
             return_exceptions=True)
 
+    async def wait_closed(self) -> SerialClosedError:
+        ''' Wait until the GNSS input is closed, returns the error closing it '''
+        await self.__closed.wait()
+        return self.__closed_error
+
+    async def __run_inbound(self):
+        try:
+            await loop_forever_async(self.__inbound)
+        except SerialClosedError as ex:
+            # NOTE there is no more input, reading again would only fail again
+            self.__closed_error = ex
+            self.__closed.set()
+
     async def __inbound(self):
-        status, message = await self.__gnss_service.read_message()
-        if status.ok:
-            await self.__inbound_qeue.put(message)
+        # NOTE frames pending on the client (eg, a whole epoch burst) are read
+        #      in one call and enqueued together, the loop is given up once
+        #      per batch instead of once per message
+        batch = await self.__gnss_service.read_messages(self.__read_batch_size)
+        for status, message in batch:
+            if status.ok:
+                await self.__inbound_qeue.put(message)
+            elif isinstance(status.error, SerialClosedError):
+                raise status.error
         # workaround to force the queue to give up the loop to the getters
         # see https://github.com/aio-libs/janus/issues/82
         await asyncio.sleep(0)
@@ -0,0 +1,55 @@
+''' Registry of the math tiers the coordinate offsets are computed in '''
+
+from decimal import Decimal
+from typing import Any, Callable, Dict, NamedTuple
+
+from .conversion_factor import (
+    DistAngleFactorProvider, FloatDistAngleFactorProvider, IConversionFactorProvider)
+from .coordinates_offset import (
+    ICoordinatesOffsetProvider, OrientationOffsetProvider, FloatOrientationOffsetProvider)
+from .coordinates_provider import ICoordinatesProvider
+from .data_formatter import (
+    NMEADataFormatter, NMEAFloatDataFormatter, UBXDataFormatter, UBXFloatDataFormatter)
+from .orientation import IOrientationProvider
+
+class MathTier(NamedTuple):
+    ''' Number type of the offsets and the formatters and providers computing them in it '''
+    number: Callable[[Decimal], Any]
+    nmea_formatter: Callable[[], NMEADataFormatter]
+    ubx_formatter: Callable[[], UBXDataFormatter]
+    orientation_offset_provider: Callable[[IOrientationProvider, Any], ICoordinatesOffsetProvider]
+    dist_angle_factor_provider: Callable[[ICoordinatesProvider], IConversionFactorProvider]
+
+def decimal_tier() -> MathTier:
+    ''' Decimal at the common context precision, the reference '''
+    return MathTier(
+        number=lambda value: value,
+        nmea_formatter=NMEADataFormatter,
+        ubx_formatter=UBXDataFormatter,
+        orientation_offset_provider=OrientationOffsetProvider,
+        dist_angle_factor_provider=DistAngleFactorProvider)
+
+def float_tier() -> MathTier:
+    ''' float64, within the bounds documented in fmath of the Decimal tier '''
+    return MathTier(
+        number=float,
+        nmea_formatter=NMEAFloatDataFormatter,
+        ubx_formatter=UBXFloatDataFormatter,
+        orientation_offset_provider=FloatOrientationOffsetProvider,
+        dist_angle_factor_provider=FloatDistAngleFactorProvider)
+
+MATH_TIERS: Dict[str, Callable[[], MathTier]] = {
+    'decimal': decimal_tier,
+    'float': float_tier,
+}
+
+def create_math_tier(name: str) -> MathTier:
+    '''
+    Create the named math tier
+    '''
+    try:
+        factory = MATH_TIERS[name]
+    except KeyError as ex:
+        raise KeyError(f'Math tier "{name}" not supported. '
+            f'Please use one of {list(MATH_TIERS)}') from ex
+    return factory()
@@ -2,12 +2,64 @@
 
 import uuid
 import typing
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from .proto_class import ProtocolClass
+from .message_route import Route
+
+class PayloadParseError(RuntimeError):
+    """ Exception type for message frames that fail to parse on payload access """
+
+    def __init__(self, message_id: uuid.UUID, proto: ProtocolClass, details=None):
+        self.message_id = message_id
+        self.proto = proto
+        self.details = details
+        super().__init__(f'Error parsing payload of message {message_id} '
+                         f'with protocol {proto}.')
 
 @dataclass
-class Message:
-    """ Message DTO (data transfer object) """
+class Message: # pylint: disable=too-many-instance-attributes
+    """ Message DTO (data transfer object)
+
+    The payload is either set directly or parsed on first access from
+    the raw frame bytes, messages that are never inspected are never
+    decoded. Setting the payload drops any pending parse and marks the
+    message dirty, in place payload edits must mark it explicitly. Clean
+    messages with a frame can be written out as the original bytes. Field
+    edits to a payload parsed from the frame are recorded by field index
+    so they can be spliced into it (None for any other payload). The route
+    tells the pipeline whether the message must be processed. """
     message_id: uuid.UUID
     proto: ProtocolClass
-    payload: typing.Any
+    payload: typing.Any = None
+    frame: typing.Optional[bytes] = field(default=None, compare=False, repr=False)
+    parser: typing.Optional[typing.Callable[[bytes], typing.Any]] = \
+        field(default=None, compare=False, repr=False)
+    dirty: bool = field(default=False, compare=False, repr=False)
+    route: Route = field(default=Route.PROCESS, compare=False, repr=False)
+    frame_edits: typing.Optional[typing.Dict[int, typing.Any]] = \
+        field(default=None, compare=False, repr=False)
+
+    @property
+    def parsed(self) -> bool:
+        """ Whether the payload is available without parsing the frame """
+        return self.parser is None
+
+def _get_payload(self: Message) -> typing.Any:
+    if self.parser is not None:
+        try:
+            self.__dict__['_payload'] = self.parser(self.frame)
+            self.frame_edits = {}
+        except Exception as ex:
+            raise PayloadParseError(self.message_id, self.proto, details=ex) from ex
+        self.parser = None
+    return self.__dict__['_payload']
+
+def _set_payload(self: Message, payload: typing.Any):
+    self.__dict__['_payload'] = payload
+    self.__dict__['parser'] = None
+    self.__dict__['dirty'] = True
+    self.__dict__['frame_edits'] = None
+
+# NOTE set after the dataclass is built so the payload stays a regular
+#      field (constructor, equality, repr) backed by the lazy accessors
+Message.payload = property(_get_payload, _set_payload) # type: ignore
@@ -1,5 +1,6 @@
 ''' Message fields manipulation module '''
 
+import struct
 from typing import Dict, Tuple
 
 import pynmea2
@@ -8,6 +9,7 @@ import pyubx2
 from .message import Message
 from .status import Status
 from .message_editor_iface import IMessageEditor
+from .ubx_nav_codec import UBXNavPayload
 
 class NMEAMessageEditor(IMessageEditor):
     ''' Editor for NMEA sentences generated by the pynmea2 library '''
@@ -15,7 +17,10 @@ class NMEAMessageEditor(IMessageEditor):
     def set_fields(self, message: Message, fields: Dict) -> Tuple[Status, Message]:
         ''' Set the message payload fields using a list of substitutions '''
         try:
-            self._set_fields(message.payload, fields)
+            # NOTE the sentence is edited in place, so the message must be
+            #      flagged even if only some of the fields get to be set
+            message.dirty = True
+            self._set_fields(message, fields)
             error = None
         except KeyError as ex:
             error = AttributeError(
@@ -24,9 +29,15 @@ class NMEAMessageEditor(IMessageEditor):
         return Status(error), message
 
     # pylint: disable=no-self-use
-    def _set_fields(self, sentence: pynmea2.NMEASentence, fields: Dict):
+    def _set_fields(self, message: Message, fields: Dict):
+        sentence: pynmea2.NMEASentence = message.payload
+        # NOTE edits are recorded so the serializer can splice them into the frame
+        edits = message.frame_edits
         for key, value in fields.items():
-            sentence.data[sentence.name_to_idx[key]] = value
+            index = sentence.name_to_idx[key]
+            sentence.data[index] = value
+            if edits is not None:
+                edits[index] = value
 
 class UBXMessageEditor(IMessageEditor):
     ''' Editor for UBX messages generated by the pyubx2 library '''
@@ -54,3 +65,23 @@ class UBXMessageEditor(IMessageEditor):
         message.payload = pyubx2.UBXMessage(
             ubx_msg.msg_cls, ubx_msg.msg_id,
             ubx_msg._mode, **ubx_msg_data) # pylint: disable=protected-access
+
+class UBXNavMessageEditor(IMessageEditor):
+    ''' Editor patching native UBX NAV payloads in place,
+    other payloads are edited by the fallback editor '''
+
+    def __init__(self, fallback: IMessageEditor):
+        self.__fallback = fallback
+
+    def set_fields(self, message: Message, fields: Dict) -> Tuple[Status, Message]:
+        ''' Set the message payload fields using a list of substitutions '''
+        payload = message.payload
+        if not isinstance(payload, UBXNavPayload):
+            return self.__fallback.set_fields(message, fields)
+        try:
+            message.dirty = True
+            payload.set_fields(fields)
+            error = None
+        except (AttributeError, struct.error) as ex:
+            error = ex
+        return Status(error), message
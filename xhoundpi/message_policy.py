@@ -3,8 +3,9 @@
 from typing import Any
 from xhoundpi.proto_class import ProtocolClass
 
-from .message import Message
+from .message import Message, PayloadParseError
 from .message_policy_iface import IMessagePolicy
+from .message_router import HeaderMessageRouter
 
 class AlwaysQualifiesPolicy(IMessagePolicy):
     '''
@@ -32,9 +33,13 @@ class HasLocationPolicy(IMessagePolicy):
     def qualifies(self, message: Message) -> bool:
         '''
         Message qualifies if it contains latitude and
-        longitude information and is not in the exception lists
+        longitude information and is not in the exception lists,
+        messages whose frame fails to parse never qualify
         '''
-        return self.__has_coordinates(message.payload) and self.__is_not_exception(message)
+        try:
+            return self.__has_coordinates(message.payload) and self.__is_not_exception(message)
+        except PayloadParseError:
+            return False
 
     @classmethod
     def __has_coordinates(cls, payload: Any) -> bool:
@@ -52,3 +57,22 @@ class HasLocationPolicy(IMessagePolicy):
     @classmethod
     def __is_propietary(cls, payload: Any):
         return hasattr(payload, 'manufacturer')
+
+class HeaderIdentityPolicy(IMessagePolicy):
+    '''
+    Qualifies messages whose frame header identity (eg, UBX class
+    and id, NMEA sentence type) is in the set of their protocol
+    '''
+
+    def __init__(self, identities: dict):
+        self.__identities = identities
+
+    def qualifies(self, message: Message) -> bool:
+        '''
+        Message qualifies if it has a frame and its identity is listed,
+        the payload is never parsed
+        '''
+        identities = self.__identities.get(message.proto)
+        if identities is None or message.frame is None:
+            return False
+        return HeaderMessageRouter.IDENTITIES[message.proto](message.frame) in identities
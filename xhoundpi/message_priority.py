@@ -0,0 +1,50 @@
+''' Header based message priority classification module '''
+
+from abc import ABC, abstractmethod
+from enum import IntEnum
+
+from .message import Message
+from .message_router import HeaderMessageRouter
+
+class Priority(IntEnum):
+    ''' Value of a message for the downstream consumers, the
+    lower priorities are shed first under backpressure '''
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+class IPriorityClassifier(ABC):
+    ''' Interface/contract for message priority classifier implementations '''
+
+    @abstractmethod
+    def classify(self, message: Message) -> Priority:
+        ''' Determine the priority of the message, without decoding it '''
+
+class StubPriorityClassifier(IPriorityClassifier):
+    ''' Stub for a message priority classifier '''
+
+    def __init__(self, stub_value: Priority):
+        ''' Set a default priority '''
+        self.__stub_value = stub_value
+
+    def classify(self, message: Message) -> Priority:
+        ''' Returns a fixed setup priority '''
+        return self.__stub_value
+
+class HeaderPriorityClassifier(IPriorityClassifier):
+    ''' Classifies messages looking up the identity bytes of their frame
+    header (eg, UBX class and id, NMEA sentence type) in a table per
+    protocol, messages not in the tables (or without a frame) take the
+    default priority '''
+
+    def __init__(self, mapping: dict, default: Priority = Priority.NORMAL):
+        self.__mapping = mapping
+        self.__default = default
+
+    def classify(self, message: Message) -> Priority:
+        ''' Look up the priority of the message frame identity '''
+        table = self.__mapping.get(message.proto)
+        if table is None or message.frame is None:
+            return self.__default
+        identity = HeaderMessageRouter.IDENTITIES[message.proto](message.frame)
+        return table.get(identity, self.__default)
@@ -0,0 +1,9 @@
+''' Defines message route enumeration '''
+
+from enum import Enum
+
+class Route(Enum):
+    ''' Message routes through the processing pipeline '''
+    PROCESS = 0
+    PASSTHROUGH = 1
+    DROP = 2
@@ -0,0 +1,57 @@
+''' Header based message routing module '''
+
+from abc import ABC, abstractmethod
+from typing import Callable, Dict
+
+from .frame import Frame
+from .message_route import Route
+from .proto_class import ProtocolClass
+
+class IMessageRouter(ABC):
+    ''' Interface/contract for message router implementations '''
+
+    @abstractmethod
+    def route(self, protocol: ProtocolClass, frame: Frame) -> Route:
+        ''' Determine the message route from the raw frame, before decoding '''
+
+class StubMessageRouter(IMessageRouter):
+    ''' Stub for a message router '''
+
+    def __init__(self, stub_value: Route):
+        ''' Set a default route '''
+        self.__stub_value = stub_value
+
+    def route(self, protocol: ProtocolClass, frame: Frame) -> Route:
+        ''' Returns a fixed setup route '''
+        return self.__stub_value
+
+def ubx_identity(frame: Frame) -> bytes:
+    ''' UBX message class and id bytes '''
+    return bytes(frame[2:4])
+
+def nmea_identity(frame: Frame) -> bytes:
+    ''' NMEA sentence type (talker is ignored) or proprietary manufacturer '''
+    if frame[1:2] == b'P':
+        return bytes(frame[1:5])
+    return bytes(frame[3:6])
+
+class HeaderMessageRouter(IMessageRouter):
+    ''' Routes messages looking up the identity bytes of their
+    header (eg, UBX class and id, NMEA sentence type) in a table
+    per protocol, frames not in the tables take the default route '''
+
+    IDENTITIES: Dict[ProtocolClass, Callable[[Frame], bytes]] = {
+        ProtocolClass.UBX: ubx_identity,
+        ProtocolClass.NMEA: nmea_identity,
+    }
+
+    def __init__(self, mapping: dict, default: Route = Route.PASSTHROUGH):
+        self.__mapping = mapping
+        self.__default = default
+
+    def route(self, protocol: ProtocolClass, frame: Frame) -> Route:
+        ''' Look up the route of the frame identity '''
+        table = self.__mapping.get(protocol)
+        if table is None:
+            return self.__default
+        return table.get(self.IDENTITIES[protocol](frame), self.__default)
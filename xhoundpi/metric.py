@@ -58,6 +58,11 @@ class LatencyMetric(MetricBase):
         self._value, _ = self.__stopwatch.stop()
         self._call_hooks()
 
+    def record(self, elapsed: float):
+        ''' Record the latency of an operation timed elsewhere '''
+        self._value = elapsed
+        self._call_hooks()
+
     def __enter__(self):
         '''Start a new timer as a context manager'''
         self.start()
@@ -146,6 +151,20 @@ class SuccessCounterMetric(MetricBase):
         self._call_hooks_single_dim(dimension, self._value[dimension])
         return self.value
 
+class ReportedMetric(MetricBase):
+    ''' Metrics reported by another process as a map of dimensions
+    to values, the reported dimensions are prefixed with this one '''
+
+    def __init__(self, dimension: str, hooks = List[Callable]):
+        super().__init__(dimension, hooks)
+        self._value = {}
+
+    def update(self, report: Mapping):
+        ''' Replace the values with the latest report '''
+        self._value = {f'{self.dimension}_{key}': value for key, value in report.items()}
+        self._call_hooks()
+        return self.value
+
 class MetricsCollection:
     ''' Metrics container with manipulation helpers '''
 
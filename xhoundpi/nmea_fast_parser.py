@@ -0,0 +1,65 @@
+''' Fast path parser for the NMEA position sentences '''
+
+from typing import Any, Callable
+
+import pynmea2
+
+from .frame import Frame
+from .nmea_patcher import nmea_checksum
+
+NMEA_START_MARKER = b'$'
+NMEA_CHECKSUM_MARKER = b'*'
+
+class NMEAPositionParser:
+    ''' Parses the NMEA position sentences splitting the frame once,
+    skipping the generic regex matching done by pynmea2
+
+    The sentences built are the same pynmea2 types the library returns,
+    so the field names, conversions and rendering are those of the library.
+    Other sentences, and anything the fast path does not recognize (eg,
+    lowercase types, missing or bad checksums), go to the fallback parser
+    which also raises the library errors. The checksum check can be skipped
+    when the frames are validated upstream. '''
+
+    SENTENCES = {
+        bytes(b'GGA'): pynmea2.GGA,
+        bytes(b'RMC'): pynmea2.RMC,
+        bytes(b'GNS'): pynmea2.GNS,
+        bytes(b'GLL'): pynmea2.GLL,
+        bytes(b'GST'): pynmea2.GST,
+    }
+
+    def __init__(self, fallback: Callable[[Frame], Any], validate: bool = True):
+        self.__fallback = fallback
+        self.__validate = validate
+
+    def parse(self, frame: Frame) -> Any:
+        ''' Validate and decode the frame '''
+        data = bytes(frame)
+        sentence_type = data[3:6]
+        sentence = self.SENTENCES.get(sentence_type)
+        if sentence is None or data[:1] != NMEA_START_MARKER or data[6:7] != b',':
+            return self.__fallback(frame)
+        talker = data[1:3]
+        marker = data.find(NMEA_CHECKSUM_MARKER, 7)
+        if not talker.isalnum() or marker < 0 or data[marker + 3:].strip():
+            return self.__fallback(frame)
+        if self.__validate and not self.__valid_checksum(data, marker):
+            return self.__fallback(frame)
+        # NOTE same state the library constructor sets, but skipping the
+        #      per attribute field lookups of the NMEASentence.__setattr__ hook
+        result = sentence.__new__(sentence)
+        result.__dict__.update(
+            talker=talker.upper().decode('ascii'),
+            sentence_type=sentence_type.decode('ascii'),
+            data=data[7:marker].decode('ascii').split(','))
+        return result
+
+    @staticmethod
+    def __valid_checksum(data: bytes, marker: int) -> bool:
+        checksum = data[marker + 1:marker + 3]
+        try:
+            return len(checksum) == 2 and checksum.isalnum() \
+                and int(checksum, 16) == nmea_checksum(data[1:marker])
+        except ValueError:
+            return False
@@ -0,0 +1,103 @@
+''' In place patching of NMEA 0183 sentence frames '''
+
+import re
+from typing import Dict
+
+from .frame import Frame
+from .message import Message
+
+NMEA_CHECKSUM_MARKER = ord('*')
+NMEA_FIELD_SEPARATOR = b','
+
+# NOTE sign, integer and fraction digits of a numeric field
+_NUMERIC_FIELD = re.compile(rb'(-?)(\d+)(?:\.(\d*))?')
+
+def nmea_checksum(data: Frame) -> int:
+    ''' XOR checksum over the bytes between the
+    start marker ('$' or '!') and the checksum marker '''
+    return _fold(int.from_bytes(data, 'big'), len(data))
+
+class NMEAPatchError(RuntimeError):
+    ''' Exception type for sentences that cannot be spliced into their frame '''
+
+    def __init__(self, details=None):
+        self.details = details
+        super().__init__(f'Unable to patch NMEA sentence in place, {details}.')
+
+def splice_nmea_fields(frame: Frame, edits: Dict[int, str], data_fields: int) -> bytes:
+    ''' Splice the edited fields (values by index among the data_fields
+    last fields of the comma separated body, the ones before them are the
+    sentence header) into a copy of the frame and update the checksum by
+    XOR delta
+
+    Each value is fitted to the width of the field it replaces (see
+    fit_nmea_field), so the frame keeps its layout and only the bytes of
+    the edited fields change. '''
+    data = bytes(frame)
+    marker = data.rfind(NMEA_CHECKSUM_MARKER)
+    if marker < 0 or len(data) < marker + 3:
+        raise NMEAPatchError('frame has no checksum')
+    fields = data[1:marker].split(NMEA_FIELD_SEPARATOR)
+    offset = len(fields) - data_fields
+    checksum = int(data[marker + 1:marker + 3], 16)
+    for index, value in edits.items():
+        position = index + offset
+        if offset < 0 or not 0 < position < len(fields):
+            raise NMEAPatchError(f'field {index} out of the {data_fields} sentence fields')
+        original = fields[position]
+        fields[position] = fit_nmea_field(bytes(value, 'ascii'), original)
+        # NOTE the checksum XORs every byte regardless of its position, XOR is
+        #      its own inverse so the old bytes cancel out and the new ones are
+        #      added, both folded at once
+        checksum ^= nmea_checksum(original + fields[position])
+    return b'%b%b*%02X%b' % (
+        data[:1], NMEA_FIELD_SEPARATOR.join(fields), checksum, data[marker + 3:])
+
+def fit_nmea_field(value: bytes, original: bytes) -> bytes:
+    ''' Format a numeric value as wide as the original numeric field, the
+    fraction is padded with zeros or rounded half to even to the original
+    precision and the integer part padded with leading zeros. Other values,
+    and values whose integer part does not fit, are returned as they are '''
+    number, reference = _NUMERIC_FIELD.fullmatch(value), _NUMERIC_FIELD.fullmatch(original)
+    if number is None or reference is None:
+        return value
+    sign, integer, fraction = number.groups()
+    decimals = reference.group(3)
+    precision = 0 if decimals is None else len(decimals)
+    digits = _round_digits(integer, fraction or b'', precision)
+    if sign and not digits.strip(b'0'):
+        sign = b''
+    fraction = b'' if decimals is None else b'.' + digits[len(digits) - precision:]
+    integer = digits[:len(digits) - precision]
+    integer = integer.rjust(len(original) - len(sign) - len(fraction), b'0')
+    return sign + integer + fraction
+
+def render_nmea_message(message: Message) -> bytes:
+    ''' Serialize the sentence by splicing its edited fields into the frame
+    it was parsed from, sentences without a frame or replaced as a whole
+    (no edits recorded against the frame) are fully rendered '''
+    sentence = message.payload
+    if message.frame is not None and message.frame_edits is not None:
+        return splice_nmea_fields(message.frame, message.frame_edits, len(sentence.data))
+    return bytes(sentence.render(newline=True), 'ascii')
+
+def _round_digits(integer: bytes, fraction: bytes, precision: int) -> bytes:
+    ''' Digits of the integer and fraction parts rounded half to even to
+    precision fraction digits, the last precision digits are the fraction '''
+    if len(fraction) <= precision:
+        return integer + fraction.ljust(precision, b'0')
+    digits, rest = integer + fraction[:precision], fraction[precision:]
+    # NOTE rounds up above half, and at exactly half only after an odd digit
+    if rest[:1] < b'5' or (rest[:1] == b'5' and not rest[1:].strip(b'0')
+        and digits[-1] in b'02468'):
+        return digits
+    return b'%0*d' % (len(digits), int(digits) + 1)
+
+def _fold(value: int, size: int) -> int:
+    ''' XOR together the bytes of a size bytes long integer '''
+    # NOTE halving shifts, the low byte ends up folded with all the others
+    shift = 4 << (size - 1).bit_length()
+    while shift > 4:
+        value ^= value >> shift
+        shift >>= 1
+    return value & 0xFF
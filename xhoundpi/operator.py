@@ -207,3 +207,146 @@ class UBXHiResOffsetOperator(IMessageOperator):
             thmsl, thmsl_hp = self.__formatter.minimize_correction(thmsl, thmsl_hp, midpoint=self.HEIGHT_MP)
             result |= { 'hMSL' : thmsl, 'hMSLHp': thmsl_hp }
         return result
+
+class UBXOffsetUnits:
+    '''
+    Offset in the UBX field units, as the floor and the ceiling
+    of the lat/lon (1e-9 deg) and height (0.1 mm) counts,
+    computed again only when the provided offset changes
+    '''
+
+    def __init__(self, data_formatter: UBXDataFormatter):
+        self.__formatter = data_formatter
+        self.__key = None
+        self.__units = None
+
+    def get_units(self, offset: GeoCoordinates) -> Tuple[Tuple[int, int], ...]:
+        '''
+        Returns the lat, lon and height units of the offset
+        '''
+        key = (offset.lat, offset.lon, offset.alt)
+        if key != self.__key:
+            self.__key = key
+            self.__units = (
+                self.__formatter.decdeg_to_units(offset.lat),
+                self.__formatter.decdeg_to_units(offset.lon),
+                self.__formatter.height_to_units(offset.alt))
+        return self.__units
+
+class UBXFixedOffsetOperator(IMessageOperator):
+    '''
+    Correct coordinates of a UBX message by adding an offset,
+    with integer arithmetic on the field units
+
+    NOTE produces the fields of UBXOffsetOperator, the reference
+    '''
+
+    HEIGHT_MP = 5
+
+    def __init__(
+        self,
+        msg_editor: IMessageEditor,
+        data_formatter: UBXDataFormatter,
+        offset_provider: ICoordinatesOffsetProvider):
+        self.__editor = msg_editor
+        self.__formatter = data_formatter
+        self.__offset_provider = offset_provider
+        self.__offset_units = UBXOffsetUnits(data_formatter)
+
+    def operate(self, message: Message) -> Tuple[Status, Message]:
+        '''
+        Operate on the message and return the transformed version
+        '''
+        units = self.__offset_units.get_units(self.__offset_provider.get_offset())
+        edited = self.__common(message, units) | self.__optional(message, units)
+        return self.__editor.set_fields(message, edited)
+
+    def __common(self, message: Message, units: Tuple[Tuple[int, int], ...]) -> Dict[str, Any]:
+        ubx = message.payload
+        fmt = self.__formatter
+        lat_units, lon_units, _ = units
+        tlat, _ = fmt.units_to_integer(fmt.add_units(fmt.integer_to_units(ubx.lat), lat_units))
+        tlon, _ = fmt.units_to_integer(fmt.add_units(fmt.integer_to_units(ubx.lon), lon_units))
+        return {
+            'lat': tlat,
+            'lon': tlon,
+        }
+
+    def __optional(self, message: Message, units: Tuple[Tuple[int, int], ...]) -> Dict[str, Any]:
+        ubx = message.payload
+        result = {}
+        for field in ('height', 'hMSL'):
+            if hasattr(ubx, field):
+                value, _ = self.__height(getattr(ubx, field), 0, units[2])
+                result |= { field : value }
+        return result
+
+    def __height(self, base: int, hires: int, alt_units: Tuple[int, int]) -> Tuple[int, int]:
+        fmt = self.__formatter
+        tbase, thires = fmt.units_to_height_field(
+            fmt.add_units(fmt.height_field_to_units(base, hires), alt_units))
+        return fmt.minimize_correction(tbase, thires, midpoint=self.HEIGHT_MP)
+
+class UBXHiResFixedOffsetOperator(IMessageOperator):
+    '''
+    Correct coordinates of a hi res UBX message by adding an offset,
+    with integer arithmetic on the field units
+
+    NOTE produces the fields of UBXHiResOffsetOperator, the reference
+    '''
+
+    LATLON_MP = 50
+    HEIGHT_MP = 5
+
+    def __init__(
+        self,
+        msg_editor: IMessageEditor,
+        data_formatter: UBXDataFormatter,
+        offset_provider: ICoordinatesOffsetProvider):
+        self.__editor = msg_editor
+        self.__formatter = data_formatter
+        self.__offset_provider = offset_provider
+        self.__offset_units = UBXOffsetUnits(data_formatter)
+
+    def operate(self, message: Message) -> Tuple[Status, Message]:
+        '''
+        Operate on the message and return the transformed hi res version
+        '''
+        units = self.__offset_units.get_units(self.__offset_provider.get_offset())
+        edited = self.__common(message, units) | self.__optional(message, units)
+        return self.__editor.set_fields(message, edited)
+
+    def __common(self, message: Message, units: Tuple[Tuple[int, int], ...]) -> Dict[str, Any]:
+        ubx = message.payload
+        lat_units, lon_units, _ = units
+        tlat, tlat_hp = self.__coordinate(ubx.lat, ubx.latHp, lat_units)
+        tlon, tlon_hp = self.__coordinate(ubx.lon, ubx.lonHp, lon_units)
+        return {
+            'lat': tlat,
+            'lon': tlon,
+            'latHp': tlat_hp,
+            'lonHp': tlon_hp,
+        }
+
+    def __optional(self, message: Message, units: Tuple[Tuple[int, int], ...]) -> Dict[str, Any]:
+        ubx = message.payload
+        result = {}
+        for field in ('height', 'hMSL'):
+            if hasattr(ubx, field) and hasattr(ubx, f'{field}Hp'):
+                value, value_hp = self.__height(
+                    getattr(ubx, field), getattr(ubx, f'{field}Hp'), units[2])
+                result |= { field : value, f'{field}Hp' : value_hp }
+        return result
+
+    def __coordinate(self, base: int, hires: int, offset_units: Tuple[int, int]) -> Tuple[int, int]:
+        fmt = self.__formatter
+        tbase, thires = fmt.units_to_integer(
+            fmt.add_units(fmt.integer_to_units(base, hires), offset_units))
+        # minimize hi pres correction delta
+        return fmt.minimize_correction(tbase, thires, midpoint=self.LATLON_MP)
+
+    def __height(self, base: int, hires: int, alt_units: Tuple[int, int]) -> Tuple[int, int]:
+        fmt = self.__formatter
+        tbase, thires = fmt.units_to_height_field(
+            fmt.add_units(fmt.height_field_to_units(base, hires), alt_units))
+        return fmt.minimize_correction(tbase, thires, midpoint=self.HEIGHT_MP)
@@ -9,6 +9,7 @@ from .processor_iface import IProcessor
 from .events import ProcessorAction, ProcessorOp
 from .status import Status
 from .message import Message
+from .message_route import Route
 from .monkey_patching import add_method
 from .metric import LatencyMetric, SuccessCounterMetric
 
@@ -24,6 +25,11 @@ def with_metrics(self,
     ''' Provides decorated processors with metrics '''
     return ProcessorWithMetrics(self, counter, latency)
 
+@add_method(IProcessor)
+def with_route_bypass(self):
+    ''' Provides decorated processors that skip pass-through messages '''
+    return ProcessorWithRouteBypass(self)
+
 class ProcessorWithEvents(IProcessor):
     ''' IProcessor decorator for event logs '''
 
@@ -113,3 +119,30 @@ class ProcessorWithMetrics(IProcessor):
 
     def __delattr__(self, name):
         delattr(self.__dict__['_inner'], name)
+
+class ProcessorWithRouteBypass(IProcessor):
+    ''' IProcessor decorator that returns messages routed as
+    pass-through untouched (and undecoded) '''
+
+    def __init__(self, inner: IProcessor):
+        self._inner = inner
+
+    async def process(self, message: Message) -> Tuple[Status, Message]:
+        ''' Process GNSS message only if routed for processing '''
+        if message.route is Route.PASSTHROUGH:
+            return Status.OK(), message
+        return await self._inner.process(message)
+
+    # Live intercept properties and methods access
+
+    def __getattr__(self, name):
+        return getattr(self.__dict__['_inner'], name)
+
+    def __setattr__(self, name, value):
+        if name in ('_inner',):
+            self.__dict__[name] = value
+        else:
+            setattr(self.__dict__['_inner'], name, value)
+
+    def __delattr__(self, name):
+        delattr(self.__dict__['_inner'], name)
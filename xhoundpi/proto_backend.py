@@ -0,0 +1,89 @@
+''' Registry of the protocol parser and serializer backends '''
+
+from functools import partial
+from typing import Callable, Dict, NamedTuple
+
+import pynmea2
+import pyubx2
+
+from .proto_class import ProtocolClass
+from .proto_parser import IProtocolParser, NMEAProtocolParser, UBXProtocolParser
+from .proto_serializer import IProtocolSerializer, NMEAProtocolSerializer, UBXProtocolSerializer
+from .ubx_nav_codec import UBXNavCodec
+from .nmea_fast_parser import NMEAPositionParser
+from .nmea_patcher import render_nmea_message
+
+class ProtocolBackend(NamedTuple):
+    ''' Parser and serializer pair implementing a protocol, preparse tells
+    whether its payloads are cheaper to unpickle than to parse (they are
+    parsed by the frame reader process in multi-process mode then) '''
+    parser: IProtocolParser
+    serializer: IProtocolSerializer
+    preparse: bool = False
+
+def ubx_library_parse(frame, validate: bool = True) -> pyubx2.UBXMessage:
+    ''' Parse the UBX frame with pyubx2 '''
+    return pyubx2.UBXReader.parse(bytes(frame), validate=validate)
+
+def nmea_library_parse(frame, check: bool = True) -> pynmea2.NMEASentence:
+    ''' Parse the NMEA frame with pynmea2 '''
+    return pynmea2.parse(str(frame, 'ascii'), check=check)
+
+# NOTE backends built for validated frames (checksums checked upstream,
+#      eg, by the frame validator on read) skip the checksum checks
+
+def ubx_library_backend(validated: bool) -> ProtocolBackend:
+    ''' pyubx2 messages '''
+    return ProtocolBackend(
+        parser=UBXProtocolParser(partial(ubx_library_parse, validate=not validated)),
+        serializer=UBXProtocolSerializer(lambda message: message.payload.serialize()),
+        preparse=True)
+
+def ubx_native_backend(validated: bool) -> ProtocolBackend:
+    ''' NAV position messages decoded and patched natively, pyubx2 for the rest '''
+    return ProtocolBackend(
+        parser=UBXProtocolParser(UBXNavCodec(
+            fallback=partial(ubx_library_parse, validate=not validated),
+            validate=not validated).parse),
+        serializer=UBXProtocolSerializer(lambda message: message.payload.serialize()))
+
+def nmea_library_backend(validated: bool) -> ProtocolBackend:
+    ''' pynmea2 sentences, rendered from scratch '''
+    # NOTE pynmea2 checks the checksums present either way, check requires them
+    return ProtocolBackend(
+        parser=NMEAProtocolParser(partial(nmea_library_parse, check=not validated)),
+        serializer=NMEAProtocolSerializer(
+            lambda message: bytearray(message.payload.render(newline=True), 'ascii')),
+        preparse=True)
+
+def nmea_native_backend(validated: bool) -> ProtocolBackend:
+    ''' Position sentences split on a fast path, pynmea2 for the rest,
+    edited sentences spliced into their original frames '''
+    return ProtocolBackend(
+        parser=NMEAProtocolParser(NMEAPositionParser(
+            fallback=partial(nmea_library_parse, check=not validated),
+            validate=not validated).parse),
+        serializer=NMEAProtocolSerializer(render_nmea_message))
+
+BACKENDS: Dict[ProtocolClass, Dict[str, Callable[[bool], ProtocolBackend]]] = {
+    ProtocolClass.UBX: {
+        'library': ubx_library_backend,
+        'native': ubx_native_backend,
+    },
+    ProtocolClass.NMEA: {
+        'library': nmea_library_backend,
+        'native': nmea_native_backend,
+    },
+}
+
+def create_backend(protocol: ProtocolClass, name: str, validated: bool = False) -> ProtocolBackend:
+    '''
+    Create the named backend of the protocol, validated tells
+    whether the frame checksums are checked before parsing
+    '''
+    try:
+        factory = BACKENDS[protocol][name]
+    except KeyError as ex:
+        raise KeyError(f'Backend "{name}" not supported for protocol {protocol}. '
+            f'Please use one of {list(BACKENDS.get(protocol, {}))}') from ex
+    return factory(validated)
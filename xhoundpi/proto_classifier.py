@@ -2,9 +2,11 @@
 
 from abc import ABC, abstractmethod
 from io import BytesIO
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 from .proto_class import ProtocolClass
+from .gnss_client import IBufferedGnssClient
+from .metric import ValueMetric
 
 class ProtocolClassificationError(RuntimeError):
     ''' Error representation for protocol header classification errors '''
@@ -23,7 +25,8 @@ class IProtocolClassifier(ABC):
     @abstractmethod
     def classify(self, stream: BytesIO) -> Tuple[bytes, ProtocolClass]:
         ''' Determine the protocol by reading the first few bytes of the stream
-        and returnt the bytes read and the protocol classification'''
+        and returnt the bytes read and the protocol classification. Buffered
+        streams are only peeked, the header is left for the frame reader '''
 
 class StubProtocolClassifier(IProtocolClassifier):
     ''' Stub for a GNSS message protocol classifier '''
@@ -37,17 +40,96 @@ class StubProtocolClassifier(IProtocolClassifier):
         return (stream.read(1), self.__stub_value)
 
 class ProtocolClassifier(IProtocolClassifier):
-    ''' Classifies protocols based on header matching '''
+    ''' Classifies protocols based on header matching
 
-    def __init__(self, mapping: dict):
+    Headers are compiled into a prefix trie of 256 entry dispatch tables,
+    so classification takes one lookup per header byte and bytes that
+    can not start a known header are rejected right away. When a header
+    is a prefix of another the shortest one wins. Buffered streams are
+    classified in hunt mode, when the bytes at the
+    head of the stream are not a known header the buffered input is
+    scanned for the next one and the noise in between is skipped in a
+    single step. Skipped bytes are counted in the optional metric. '''
+
+    def __init__(self,
+            mapping: dict,
+            hunt_window: int = 4096,
+            discarded_bytes: Optional[ValueMetric] = None):
         self.__mapping = mapping
         self.__max_size = len(max(self.__mapping.keys(), key=len))
+        self.__table = self.__build_table(mapping)
+        self.__hunt_window = max(hunt_window, self.__max_size)
+        self.__discarded_bytes = discarded_bytes
 
     def classify(self, stream: BytesIO) -> Tuple[bytes, ProtocolClass]:
+        if isinstance(stream, IBufferedGnssClient):
+            return self.__classify_buffered(stream)
         data = bytearray()
-        # TODO improve this, horribly inefficient (eg, if 1st byte not matching, drop already)
-        while len(data) < self.__max_size:
-            data.extend(stream.read(1))
-            if bytes(data) in self.__mapping.keys():
-                return bytes(data), self.__mapping[bytes(data)]
-        raise ProtocolClassificationError(data, self.__mapping)
+        node = self.__table
+        while True:
+            byte = stream.read(1)
+            data.extend(byte)
+            entry = node[byte[0]] if byte else None
+            if entry is None:
+                raise ProtocolClassificationError(data, self.__mapping)
+            if isinstance(entry, tuple):
+                return entry
+            node = entry
+
+    def __classify_buffered(self, stream: IBufferedGnssClient) -> Tuple[bytes, ProtocolClass]:
+        while True:
+            data = stream.peek(self.__max_size)
+            match = self.__match(data)
+            if match is not None:
+                return match
+            skip = self.__hunt(stream)
+            if not skip:
+                # nothing left to hunt through (eg, a partial header at the end
+                # of the stream), drop one byte so the next attempt moves past it
+                data = bytes(data)
+                self.__discard(stream, 1)
+                raise ProtocolClassificationError(data, self.__mapping)
+            self.__discard(stream, skip)
+
+    def __match(self, data: bytes) -> Optional[Tuple[bytes, ProtocolClass]]:
+        node = self.__table
+        for byte in data:
+            entry = node[byte]
+            if not isinstance(entry, list):
+                return entry
+            node = entry
+        return None
+
+    @staticmethod
+    def __build_table(mapping: dict) -> List:
+        ''' Compile the headers mapping into nested dispatch tables, entries
+        are either None, a (header, protocol) match or the next table '''
+        root: List = [None] * 256
+        # shorter headers first so they shadow the longer ones they prefix
+        for header, proto in sorted(mapping.items(), key=lambda item: len(item[0])):
+            node = root
+            for byte in header[:-1]:
+                if node[byte] is None:
+                    node[byte] = [None] * 256
+                if isinstance(node[byte], tuple):
+                    break
+                node = node[byte]
+            else:
+                if node[header[-1]] is None:
+                    node[header[-1]] = (bytes(header), proto)
+        return root
+
+    def __hunt(self, stream: IBufferedGnssClient) -> int:
+        ''' Return the number of bytes preceding the next known header '''
+        offsets = [stream.find(header, self.__hunt_window) for header in self.__mapping]
+        offsets = [offset for offset in offsets if offset > 0]
+        if offsets:
+            return min(offsets)
+        # keep the tail, it could hold the beginning of a header
+        available = len(stream.peek(self.__hunt_window))
+        return max(available - self.__max_size + 1, 0)
+
+    def __discard(self, stream: IBufferedGnssClient, size: int):
+        size = len(stream.read(size))
+        if size and self.__discarded_bytes is not None:
+            self.__discarded_bytes.add(size)
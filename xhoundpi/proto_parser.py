@@ -4,13 +4,15 @@ from abc import ABC, abstractmethod
 from typing import Callable, Any
 
 from .proto_class import ProtocolClass
+from .frame import Frame
 
 class IProtocolParser(ABC):
     ''' Interface/contract for protocol parser implementations '''
 
     @abstractmethod
-    def parse(self, frame: bytes) -> Any:
-        ''' Parse the frame byte array into a DTO '''
+    def parse(self, frame: Frame) -> Any:
+        ''' Parse the frame byte array into a DTO, the frame may be a view over
+        the receive buffer and must be copied if the result references it '''
 
 class IProtocolParserProvider(ABC):
     ''' Interface/contract for protocol parser provider implementations '''
@@ -22,18 +24,18 @@ class IProtocolParserProvider(ABC):
 class StubProtocolParser(IProtocolParser):
     ''' Stub for message parser '''
 
-    def parse(self, frame: bytes) -> Any:
-        return frame
+    def parse(self, frame: Frame) -> Any:
+        return bytes(frame)
 
 class UBXProtocolParser(IProtocolParser):
     ''' UBX protocol parser proxy '''
 
     protocol_class = ProtocolClass.UBX
 
-    def __init__(self, parser_lib_entry_point: Callable[[bytes], Any]):
+    def __init__(self, parser_lib_entry_point: Callable[[Frame], Any]):
         self.__parser_lib_entry_point = parser_lib_entry_point
 
-    def parse(self, frame: bytes) -> Any:
+    def parse(self, frame: Frame) -> Any:
         ''' Parse the UBX frame byte array into a deserialized message '''
         return self.__parser_lib_entry_point(frame)
 
@@ -43,10 +45,10 @@ class NMEAProtocolParser(IProtocolParser):
     protocol_class = ProtocolClass.NMEA
     protocol_revision = 'NMEA-0183'
 
-    def __init__(self, parser_lib_entry_point: Callable[[bytes], Any]):
+    def __init__(self, parser_lib_entry_point: Callable[[Frame], Any]):
         self.__parser_lib_entry_point = parser_lib_entry_point
 
-    def parse(self, frame: bytes) -> Any:
+    def parse(self, frame: Frame) -> Any:
         ''' Parse the NMEA frame byte array into a deserialized message '''
         return self.__parser_lib_entry_point(frame)
 
@@ -5,6 +5,8 @@ from io import BytesIO
 from typing import Tuple
 
 from .proto_class import ProtocolClass
+from .gnss_client import IBufferedGnssClient
+from .frame import Frame
 
 class FrameReadingError(RuntimeError):
     ''' Stub to group all types of reading errors '''
@@ -36,8 +38,10 @@ class IProtocolReader(ABC):
     ''' Interface/contract for protocol reader implementations '''
 
     @abstractmethod
-    def read_frame(self, header: bytes, stream: BytesIO) -> bytes:
-        ''' Reads a frame body assuming header was already consumed '''
+    def read_frame(self, header: bytes, stream: BytesIO) -> Frame:
+        ''' Reads a frame body assuming header was already consumed. On
+        buffered streams the header is still pending and the whole frame
+        is returned as a view over the buffer once it is complete '''
 
 class IProtocolReaderProvider(ABC):
     ''' Interface/contract for protocol reader provider implementations '''
@@ -68,18 +72,47 @@ class UBXProtocolReader(IProtocolReader):
     __message_checksum_size = 2
     __expected_headers = [b'\xb5\x62']
 
-    def read_frame(self, header: bytes, stream: BytesIO) -> bytes:
+    def read_frame(self, header: bytes, stream: BytesIO) -> Frame:
         ''' Check header match and read UBX binary data frame from stream '''
         if header not in self.__expected_headers:
             raise HeaderMismatchError(self.__expected_headers, header, self.protocol_class)
-        return header + UBXProtocolReader.__read_frame(stream)
+        if isinstance(stream, IBufferedGnssClient):
+            return UBXProtocolReader.__read_buffered_frame(header, stream)
+        return UBXProtocolReader.__read_frame(header, stream)
+
+    @staticmethod
+    def __read_buffered_frame(header: bytes, stream: IBufferedGnssClient) -> Frame:
+        body_start = len(header) + UBXProtocolReader.__message_preamble_size
+        preamble = stream.peek(body_start)[len(header):]
+        if len(preamble) != UBXProtocolReader.__message_preamble_size:
+            stream.read(len(header))
+            raise MalformedFrameError(UBXProtocolReader.protocol_class,
+                f'Found EOF attempting to read frame preamble. Read {len(preamble)} bytes '\
+                f'out of {UBXProtocolReader.__message_preamble_size} expected.',
+                details=bytes(preamble))
+        length = int.from_bytes(preamble[2:4], "little", signed=False)
+        checksum_start = body_start + length
+        frame_size = checksum_start + UBXProtocolReader.__message_checksum_size
+        frame = stream.peek(frame_size)
+        if len(frame) != frame_size:
+            stream.read(len(header))
+            if len(frame) < checksum_start:
+                raise MalformedFrameError(UBXProtocolReader.protocol_class,
+                    f'Found EOF attempting to read frame body. '\
+                    f'Read {len(frame) - body_start} bytes out of {length} expected.',
+                    details=bytes(frame[body_start:]))
+            raise MalformedFrameError(UBXProtocolReader.protocol_class,
+                f'Found EOF attempting to read frame checksum. Read {len(frame) - checksum_start} '\
+                f'bytes out of {UBXProtocolReader.__message_checksum_size} expected.',
+                details=bytes(frame[checksum_start:]))
+        return stream.read(frame_size)
 
     @staticmethod
-    def __read_frame(stream: BytesIO) -> bytes:
+    def __read_frame(header: bytes, stream: BytesIO) -> bytes:
         preamble, length = UBXProtocolReader.__read_preamble(stream)
         body = UBXProtocolReader.__read_body(stream, length)
         checksum = UBXProtocolReader.__read_checksum(stream)
-        return preamble + body + checksum
+        return b''.join((header, preamble, body, checksum))
 
     @staticmethod
     def __read_preamble(stream: BytesIO) -> Tuple[bytes, int]:
@@ -132,16 +165,39 @@ class NMEAProtocolReader(IProtocolReader):
     ]
     __extended_message_marker = bytearray('P', __encoding)
 
-    def read_frame(self, header: bytes, stream: BytesIO) -> bytes:
+    def read_frame(self, header: bytes, stream: BytesIO) -> Frame:
         ''' Check header match and read NMEA packet as binary data frame from stream '''
         if header not in self.__header_markers:
             raise HeaderMismatchError(self.__header_markers, header, self.protocol_class)
+        if isinstance(stream, IBufferedGnssClient):
+            return NMEAProtocolReader.__read_buffered_frame(header, stream)
 
         (first_byte, is_special) = NMEAProtocolReader.__read_special_marker(stream, header)
         if is_special:
             return header + NMEAProtocolReader.__read_special_frame(stream, first_byte)
         return header + NMEAProtocolReader.__read_frame(stream, first_byte)
 
+    @staticmethod
+    def __read_buffered_frame(header: bytes, stream: IBufferedGnssClient) -> Frame:
+        ''' Slice NMEA packet as binary data frame out of the buffered stream '''
+        first_byte = bytes(stream.peek(len(header) + 1)[len(header):])
+        is_special = (header == NMEAProtocolReader.__header_markers[0] \
+            and first_byte == NMEAProtocolReader.__extended_message_marker)
+        limit = None if is_special else NMEAProtocolReader.__max_nmea_frame_size
+        end = stream.find(NMEAProtocolReader.__end_marker, limit)
+        if end < 0:
+            details = bytes(stream.peek(limit or 0)[len(header):])
+            stream.read(len(header))
+            if is_special:
+                raise MalformedFrameError(NMEAProtocolReader.protocol_class,
+                    'Failed to find the frame\'s end marker of special message '
+                    'before exhausting the stream buffer.')
+            raise MalformedFrameError(NMEAProtocolReader.protocol_class,
+                f'Failed to find the frame\'s end marker of non-special message before '
+                f'the max expected size ({NMEAProtocolReader.__max_nmea_frame_size} bytes).',
+                details=details)
+        return stream.read(end + len(NMEAProtocolReader.__end_marker))
+
     @staticmethod
     def __read_special_marker(stream: BytesIO, header: bytes) -> Tuple[bytes, bool]:
         ''' Read first byte of the NMEA frame to determine if special vendor message '''
@@ -1,9 +1,10 @@
 ''' asyncio Queue decorators '''
 
 import asyncio
-from typing import Awaitable
+from typing import Awaitable, List
 
 from .monkey_patching import add_method
+from .queue_ext import get_batch # pylint: disable=unused-import
 
 @add_method(asyncio.queues.Queue)
 def with_transform(self, transform):
@@ -23,6 +24,7 @@ class AsyncQueueWithGetTransform(asyncio.queues.Queue):
     def __init__(self, inner, transform):
         self._inner = inner
         self._transform = transform
+        self._error = None
 
     async def get(self):
         ''' Get the item async, apply transform, and return '''
@@ -37,6 +39,34 @@ class AsyncQueueWithGetTransform(asyncio.queues.Queue):
         item = self._inner.get_nowait()
         return self._transform(item)
 
+    async def get_batch(self, limit: int) -> List:
+        ''' Get a batch of items async, apply transform to each as it is
+        dequeued, and return. As with get, a failing transform loses only
+        its item, the batch ends with the results so far and the error is
+        raised on the next call '''
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        # NOTE items are dequeued one at a time through get (which does not
+        #      give up the loop while items are available), so the transforms
+        #      of inner decorators are awaited too
+        results = [await self.get()]
+        while len(results) < limit and not self._inner.empty():
+            try:
+                results.append(await self.get())
+            except Exception as ex: # pylint: disable=broad-except
+                self._error = ex
+                break
+        return results
+
+    async def put(self, item):
+        ''' Put the item async on the decorated queue '''
+        return await self._inner.put(item)
+
+    def put_nowait(self, item):
+        ''' Put the item sync on the decorated queue '''
+        return self._inner.put_nowait(item)
+
     # Iterability requires explicit dunder methods
 
     def __iter__(self):
@@ -51,7 +81,7 @@ class AsyncQueueWithGetTransform(asyncio.queues.Queue):
         return getattr(self.__dict__['_inner'], name)
 
     def __setattr__(self, name, value):
-        if name in ('_inner', '_transform'):
+        if name in ('_inner', '_transform', '_error'):
             self.__dict__[name] = value
         else:
             setattr(self.__dict__['_inner'], name, value)
@@ -80,6 +110,21 @@ class AsyncQueueWithCallback(asyncio.queues.Queue):
         self._callback(item)
         return item
 
+    async def get_batch(self, limit: int) -> List:
+        ''' Get a batch of items async, pass each to callback, and return '''
+        items = await self._inner.get_batch(limit)
+        for item in items:
+            self._callback(item)
+        return items
+
+    async def put(self, item):
+        ''' Put the item async on the decorated queue '''
+        return await self._inner.put(item)
+
+    def put_nowait(self, item):
+        ''' Put the item sync on the decorated queue '''
+        return self._inner.put_nowait(item)
+
     # Iterability requires explicit dunder methods
 
     def __iter__(self):
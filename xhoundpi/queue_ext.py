@@ -1,6 +1,7 @@
 ''' asyncio Queue extensions '''
 
-from asyncio.queues import Queue
+from asyncio.queues import Queue, QueueEmpty
+from typing import Iterable, List
 
 from .monkey_patching import add_method
 
@@ -9,3 +10,21 @@ async def get_forever_async(self):
     ''' Reads the queue forever and passes items to the on_item callback '''
     while True:
         await self.get()
+
+@add_method(Queue)
+async def get_batch(self, limit: int) -> List:
+    ''' Waits for an item and dequeues it along with the
+    items already available, up to limit items '''
+    items = [await self.get()]
+    while len(items) < limit:
+        try:
+            items.append(self.get_nowait())
+        except QueueEmpty:
+            break
+    return items
+
+@add_method(Queue)
+async def put_batch(self, items: Iterable):
+    ''' Enqueues the items in order, waits for free slots only when the queue is full '''
+    for item in items:
+        await self.put(item)
@@ -0,0 +1,163 @@
+''' Overflow policies for bounded asyncio queues '''
+
+import asyncio
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .message import Message
+from .message_priority import IPriorityClassifier, Priority
+from .message_router import HeaderMessageRouter
+from .metric import CounterMetric
+
+class OverflowPolicy(Enum):
+    ''' What a bounded queue does with an item put while it is full '''
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop-oldest'
+    DROP_NEWEST = 'drop-newest'
+    COALESCE_LATEST = 'coalesce-latest'
+
+def message_type(message: Message) -> Hashable:
+    ''' Protocol and header identity (eg, UBX class and id, NMEA sentence type) '''
+    identity = HeaderMessageRouter.IDENTITIES.get(message.proto)
+    if identity is None or message.frame is None:
+        return message.proto, None
+    return message.proto, identity(message.frame)
+
+class OverflowQueue(asyncio.queues.Queue):
+    ''' Bounded queue that sheds items instead of blocking the producer when full
+
+    - block: wait for a free slot (regular queue behavior)
+    - drop-oldest: discard the item at the head of the queue
+    - drop-newest: discard the item being put
+    - coalesce-latest: discard the queued item of the same type as the
+      one being put (by default the message type), the oldest item if
+      there is none, the latest item is queued last in either case
+
+    Every discarded item is counted on the dropped metric. '''
+
+    def __init__(self,
+        maxsize: int,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        dropped: Optional[CounterMetric] = None,
+        key: Callable[[Any], Hashable] = message_type):
+        super().__init__(maxsize)
+        self.__policy = policy
+        self.__dropped = dropped
+        self.__key = key
+
+    @property
+    def policy(self) -> OverflowPolicy:
+        ''' Overflow policy of the queue '''
+        return self.__policy
+
+    async def put(self, item):
+        ''' Put the item, waiting for a free slot only under the block policy '''
+        if self.__policy is OverflowPolicy.BLOCK:
+            return await super().put(item)
+        return self.put_nowait(item)
+
+    def put_nowait(self, item):
+        ''' Put the item, applying the overflow policy if the queue is full '''
+        if self.full() and self.__policy is not OverflowPolicy.BLOCK:
+            if self.__policy is OverflowPolicy.DROP_NEWEST:
+                self.__count_drop()
+                return
+            self.__discard(self.__victim(item))
+        super().put_nowait(item)
+
+    def __victim(self, item) -> int:
+        ''' Index of the queued item to discard for the item being put '''
+        if self.__policy is OverflowPolicy.COALESCE_LATEST:
+            key = self.__key(item)
+            for index, queued in enumerate(self._queue): # type: ignore # pylint: disable=no-member
+                if self.__key(queued) == key:
+                    return index
+        return 0
+
+    def __discard(self, index: int):
+        del self._queue[index] # type: ignore # pylint: disable=no-member
+        # NOTE the discarded item will never be processed by a consumer
+        self.task_done()
+        self.__count_drop()
+
+    def __count_drop(self):
+        if self.__dropped is not None:
+            self.__dropped.increase()
+
+class SheddingQueue(OverflowQueue):
+    ''' Overflow queue that sheds the low priority items under backpressure
+
+    Once the queue reaches the high watermark the low priority items
+    put are discarded until it drains down to the low watermark. When
+    the queue is full the oldest queued item of lower priority than the
+    one put is discarded to make room for it, the overflow policy only
+    applies if there is none. Every shed item is counted on the metric
+    of its priority. '''
+
+    # pylint: disable=too-many-arguments
+    def __init__(self,
+        maxsize: int,
+        classifier: IPriorityClassifier,
+        high_watermark: int,
+        low_watermark: int,
+        shed: Optional[Dict[Priority, CounterMetric]] = None,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        dropped: Optional[CounterMetric] = None,
+        key: Callable[[Any], Hashable] = message_type):
+        if not 0 <= low_watermark <= high_watermark <= maxsize:
+            raise ValueError(f'Watermarks must satisfy 0 <= low ({low_watermark}) '
+                f'<= high ({high_watermark}) <= maxsize ({maxsize})')
+        super().__init__(maxsize, policy=policy, dropped=dropped, key=key)
+        self.__classifier = classifier
+        self.__high_watermark = high_watermark
+        self.__low_watermark = low_watermark
+        self.__shed = shed or {}
+        self.__shedding = False
+
+    @property
+    def shedding(self) -> bool:
+        ''' Whether the low priority items are being shed '''
+        return self.__shedding
+
+    async def put(self, item):
+        ''' Put the item, when the queue is full only the items that are
+        neither shed nor make room discarding a lower priority one are
+        subject to the overflow policy (eg, wait for a free slot) '''
+        if self.full():
+            priority = self.__classifier.classify(item)
+            if priority is Priority.LOW or self.__evict_lower(priority):
+                return self.put_nowait(item)
+        return await super().put(item)
+
+    def put_nowait(self, item):
+        ''' Put the item unless it is shed, applying the overflow policy if the queue is full '''
+        size = self.qsize()
+        if size >= self.__high_watermark:
+            self.__shedding = True
+        elif size <= self.__low_watermark:
+            self.__shedding = False
+        priority = self.__classifier.classify(item)
+        if self.__shedding and priority is Priority.LOW:
+            self.__count_shed(priority)
+            return
+        if self.full():
+            self.__evict_lower(priority)
+        super().put_nowait(item)
+
+    def __evict_lower(self, priority: Priority) -> bool:
+        ''' Discard the oldest queued item with lower priority, if any '''
+        queue = self._queue # type: ignore # pylint: disable=no-member
+        for index, queued in enumerate(queue):
+            queued_priority = self.__classifier.classify(queued)
+            if queued_priority < priority:
+                del queue[index]
+                # NOTE the discarded item will never be processed by a consumer
+                self.task_done()
+                self.__count_shed(queued_priority)
+                return True
+        return False
+
+    def __count_shed(self, priority: Priority):
+        counter = self.__shed.get(priority)
+        if counter is not None:
+            counter.increase()
@@ -2,6 +2,8 @@
 
 from abc import ABC, abstractmethod
 
+from .queue_ext import get_batch, put_batch # pylint: disable=unused-import
+
 class IAsyncPump(ABC):
     ''' Interface for async pump implementations '''
 
@@ -21,3 +23,34 @@ class AsyncPump(IAsyncPump):
         while True:
             item = await self.__input.get()
             await self.__output.put(item)
+
+class BatchAsyncPump(IAsyncPump):
+    ''' Async pump between two queues moving the items in batches '''
+
+    def __init__(self, input_queue, output_queue, batch_size: int):
+        self.__input = input_queue
+        self.__output = output_queue
+        self.__batch_size = batch_size
+
+    async def run(self):
+        ''' Passes over every item from input queue to output queue, the
+        items already available when one arrives are moved along with it '''
+        while True:
+            items = await self.__input.get_batch(self.__batch_size)
+            await self.__output.put_batch(items)
+
+class FlattenAsyncPump(IAsyncPump):
+    ''' Async pump between two queues that takes groups of items (eg, the
+    messages of an epoch) from the input queue and puts their items in order '''
+
+    def __init__(self, input_queue, output_queue, batch_size: int):
+        self.__input = input_queue
+        self.__output = output_queue
+        self.__batch_size = batch_size
+
+    async def run(self):
+        ''' Passes over every item of the groups from input queue to output queue '''
+        while True:
+            groups = await self.__input.get_batch(self.__batch_size)
+            for group in groups:
+                await self.__output.put_batch(group)
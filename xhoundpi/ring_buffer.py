@@ -0,0 +1,79 @@
+''' Reusable byte ring buffer for chunked transport reads '''
+
+class RingBufferOverflowError(BufferError):
+    ''' Exception type for writes that exceed the buffer free space '''
+
+    def __init__(self, requested: int, available: int):
+        self.requested = requested
+        self.available = available
+        super().__init__(f'Cannot write {requested} bytes into ring '
+                         f'buffer with {available} bytes available.')
+
+class RingBuffer:
+    ''' Fixed capacity byte buffer with contiguous unread data
+
+    Writes append at the tail and reads consume from the head. When
+    the tail runs out of room the unread bytes wrap back to the start
+    of the storage, so any pending frame can be peeked and sliced in
+    one piece. Views returned by peek/consume are only valid until
+    the next write. '''
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError('Ring buffer capacity must be positive')
+        self.__storage = bytearray(capacity)
+        self.__view = memoryview(self.__storage)
+        self.__head = 0
+        self.__tail = 0
+
+    def __len__(self) -> int:
+        return self.__tail - self.__head
+
+    @property
+    def capacity(self) -> int:
+        ''' Total number of bytes the buffer can hold '''
+        return len(self.__storage)
+
+    @property
+    def free(self) -> int:
+        ''' Number of bytes that can be written before overflowing '''
+        return self.capacity - len(self)
+
+    def write(self, data: bytes) -> int:
+        ''' Append data at the tail and return the number of bytes written '''
+        size = len(data)
+        if size > self.free:
+            raise RingBufferOverflowError(size, self.free)
+        if self.__tail + size > self.capacity:
+            self.__wrap()
+        self.__storage[self.__tail:self.__tail + size] = data
+        self.__tail += size
+        return size
+
+    def peek(self, size: int) -> memoryview:
+        ''' Return a view over up to n unread bytes without consuming them '''
+        return self.__view[self.__head:min(self.__head + size, self.__tail)]
+
+    def consume(self, size: int) -> memoryview:
+        ''' Return a view over up to n unread bytes and consume them '''
+        data = self.peek(size)
+        self.__head += len(data)
+        if self.__head == self.__tail:
+            self.__head = self.__tail = 0
+        return data
+
+    def find(self, sub: bytes, start: int = 0, end: int = None) -> int:
+        ''' Return the lowest offset of sub within the unread
+        bytes range [start, end), or -1 if it is not found '''
+        end = len(self) if end is None else min(end, len(self))
+        index = self.__storage.find(sub, self.__head + start, self.__head + end)
+        return index if index < 0 else index - self.__head
+
+    def clear(self):
+        ''' Drop all unread bytes '''
+        self.__head = self.__tail = 0
+
+    def __wrap(self):
+        size = len(self)
+        self.__storage[0:size] = self.__storage[self.__head:self.__tail]
+        self.__head, self.__tail = 0, size
@@ -1,8 +1,26 @@
-''' Serial emulator for tests and stubs '''
+''' Serial transports and emulators for tests and stubs '''
+
+import asyncio
+import io
+import mmap
+import os
+import tty
 
 from abc import ABC, abstractmethod
 from io import BytesIO
-from typing import TextIO
+from typing import BinaryIO, Sequence, TextIO
+
+from .async_ext import wait_readable, wait_writable
+
+# max number of buffers of a scatter write
+IOV_MAX = os.sysconf('SC_IOV_MAX') if hasattr(os, 'sysconf') else 16
+
+class SerialClosedError(EOFError):
+    ''' Exception type for serial transports with no more input to read '''
+
+    def __init__(self, details=None):
+        self.details = details
+        super().__init__(f'Serial transport closed, {details}.')
 
 class ISerial(ABC):
     ''' Interface/contract for serial transport implementations '''
@@ -13,7 +31,158 @@ class ISerial(ABC):
 
     @abstractmethod
     def write(self, data: bytes) -> int:
-        ''' Write n bytes to the serial transport '''
+        ''' Write n bytes to the serial transport, returns the number of bytes
+        written, non-blocking transports can write fewer (or raise BlockingIOError) '''
+
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        ''' Write a sequence of buffers to the serial transport in one go,
+        returns the number of bytes written (can be fewer than the total) '''
+        return self.write(b''.join(buffers))
+
+    async def wait_readable(self):
+        ''' Wait until the transport has input pending, transports
+        with blocking reads are always considered readable '''
+
+    async def wait_writable(self):
+        ''' Wait until the transport can take output, transports
+        with blocking writes are always considered writable '''
+
+class AsyncSerial(ISerial):
+    ''' Non-blocking serial transport over a tty file descriptor
+
+    Reads never block, they return what the OS has pending (up to n
+    bytes) and raise BlockingIOError when there is nothing to read.
+    Consumers await wait_readable, which registers the descriptor with
+    the running loop reader callbacks, and retry once data arrives.
+    NOTE reads can return partial frames, consumers must be buffered
+    and able to retry reads without losing pending input.
+    Writes never block either, they write what the tty can take and raise
+    BlockingIOError when it can take nothing, writers must write the rest
+    after awaiting wait_writable or the output is truncated. Reads on a
+    hung up tty raise SerialClosedError, there will be no more input. '''
+
+    def __init__(self, descriptor: int):
+        os.set_blocking(descriptor, False)
+        self.__fd = descriptor
+
+    @classmethod
+    def open(cls, path: str, output_only: bool = False) -> 'AsyncSerial':
+        ''' Open a tty device in raw mode, write only for output only transports '''
+        access = os.O_WRONLY if output_only else os.O_RDWR
+        descriptor = os.open(path, access | os.O_NOCTTY | os.O_NONBLOCK)
+        tty.setraw(descriptor)
+        return cls(descriptor)
+
+    def fileno(self) -> int:
+        ''' Underlying file descriptor '''
+        return self.__fd
+
+    def read(self, size=1) -> bytes:
+        ''' Read up to n pending bytes, raises SerialClosedError once
+        the tty hung up (eg, device unplugged or pty closed) '''
+        try:
+            data = os.read(self.__fd, size)
+        except BlockingIOError:
+            raise
+        except OSError as ex:
+            raise SerialClosedError(ex.strerror) from ex
+        if not data:
+            raise SerialClosedError('end of file')
+        return data
+
+    def write(self, data: bytes) -> int:
+        ''' Write bytes to the tty, returns the number of bytes written
+        (can be fewer than given), raises BlockingIOError if none fit '''
+        return os.write(self.__fd, data)
+
+    def writev(self, buffers: Sequence[bytes]) -> int:
+        ''' Scatter write the buffers to the tty in one syscall, returns the
+        number of bytes written, only the first IOV_MAX buffers are written '''
+        return os.writev(self.__fd, buffers[:IOV_MAX])
+
+    async def wait_readable(self):
+        ''' Wait until the tty has input pending '''
+        await wait_readable(self.__fd)
+
+    async def wait_writable(self):
+        ''' Wait until the tty can take output '''
+        await wait_writable(self.__fd)
+
+    def close(self):
+        ''' Close the tty file descriptor '''
+        os.close(self.__fd)
+
+class MmapReplaySerial(ISerial):
+    ''' Serial implementation replaying a memory mapped capture file
+
+    Reads are served as views over the mapping, no copies nor syscalls
+    are involved once the capture pages are resident. The capture is
+    replayed a number of passes (zero to loop forever), reads never cross
+    the end of the capture so they can return fewer bytes than requested.
+    Once all passes are done the input is closed, reads raise
+    SerialClosedError. An empty capture replayed forever behaves like an
+    idle device, reads raise BlockingIOError and wait_readable never completes. '''
+
+    def __init__(self, transport_rx: BinaryIO, transport_tx: BinaryIO, passes: int = 0):
+        size = os.fstat(transport_rx.fileno()).st_size
+        self.__map = mmap.mmap(transport_rx.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self.__view = memoryview(self.__map) if self.__map is not None else memoryview(b'')
+        self.__transport_tx = transport_tx
+        self.__passes = passes
+        self.__completed = 0
+        self.__pos = 0
+
+    @property
+    def completed_passes(self) -> int:
+        ''' Number of times the whole capture has been replayed '''
+        return self.__completed
+
+    def read(self, size=1) -> memoryview:
+        ''' Read up to n bytes from the capture, the view is
+        valid until the transport is closed '''
+        if self.__passes and self.__completed >= self.__passes:
+            raise SerialClosedError(f'capture replayed {self.__completed} times')
+        if not self.__view:
+            if self.__passes:
+                raise SerialClosedError('capture is empty')
+            raise BlockingIOError('Capture is empty')
+        data = self.__view[self.__pos:self.__pos + size]
+        self.__pos += len(data)
+        if self.__pos == len(self.__view):
+            self.__pos = 0
+            self.__completed += 1
+        return data
+
+    def write(self, data: bytes) -> int:
+        ''' Write n bytes to the stream '''
+        return self.__transport_tx.write(data)
+
+    async def wait_readable(self):
+        ''' Wait until there is capture left to replay (or the replay is
+        over, reads raise then), forever for empty captures replayed forever '''
+        if not self.__view and not self.__passes:
+            await asyncio.get_running_loop().create_future()
+
+    def close(self):
+        ''' Release the capture mapping '''
+        self.__view.release()
+        if self.__map is not None:
+            self.__map.close()
+
+class OutputSerial(ISerial):
+    ''' Output only serial transport writing to a binary stream (eg, the
+    mock output file), it has no input and reads are not supported '''
+
+    def __init__(self, transport_tx: BinaryIO):
+        self.__transport_tx = transport_tx
+
+    def read(self, size=1) -> bytes:
+        ''' Not supported, the transport has no input '''
+        raise io.UnsupportedOperation('Output only serial transport')
+
+    def write(self, data: bytes) -> int:
+        ''' Write n bytes to the stream '''
+        return self.__transport_tx.write(data)
 
 class StubSerialBinary(ISerial):
     ''' Serial implementation reading and writing circularly '''
@@ -0,0 +1,174 @@
+''' Native codec for the UBX NAV messages carrying positions '''
+
+import struct
+from operator import mul
+from typing import Any, Callable, Dict, Tuple
+
+from .frame import Frame
+
+UBX_HEADER_SIZE = 6
+UBX_CHECKSUM_SIZE = 2
+
+def ubx_checksum(data: Frame) -> Tuple[int, int]:
+    ''' 8-bit Fletcher checksum (CK_A, CK_B) over the class, id,
+    length and payload bytes of a UBX frame '''
+    size = len(data)
+    ck_a = sum(data)
+    ck_b = sum(map(mul, data, range(size, 0, -1)))
+    return ck_a & 0xFF, ck_b & 0xFF
+
+class UBXNavCodecError(RuntimeError):
+    ''' Exception type for frames the native codec cannot decode '''
+
+    def __init__(self, identity: str, details=None):
+        self.identity = identity
+        self.details = details
+        super().__init__(f'Error decoding UBX message {identity}, {details}.')
+
+class UBXNavLayout: # pylint: disable=too-few-public-methods
+    ''' Precompiled field layout of a UBX NAV message, field
+    offsets are relative to the payload start '''
+
+    def __init__(self, identity: str, length: int, fields: Dict[str, Tuple[int, str]]):
+        self.identity = identity
+        self.length = length
+        self.fields = {
+            name: (UBX_HEADER_SIZE + offset, struct.Struct(f'<{fmt}'))
+            for name, (offset, fmt) in fields.items() }
+
+NAV_POSLLH = UBXNavLayout('NAV-POSLLH', 28, {
+    'iTOW': (0, 'I'),
+    'lon': (4, 'i'),
+    'lat': (8, 'i'),
+    'height': (12, 'i'),
+    'hMSL': (16, 'i'),
+    'hAcc': (20, 'I'),
+    'vAcc': (24, 'I'),
+})
+
+NAV_PVT = UBXNavLayout('NAV-PVT', 92, {
+    'iTOW': (0, 'I'),
+    'fixType': (20, 'B'),
+    'numSV': (23, 'B'),
+    'lon': (24, 'i'),
+    'lat': (28, 'i'),
+    'height': (32, 'i'),
+    'hMSL': (36, 'i'),
+    'hAcc': (40, 'I'),
+    'vAcc': (44, 'I'),
+})
+
+NAV_HPPOSLLH = UBXNavLayout('NAV-HPPOSLLH', 36, {
+    'version': (0, 'B'),
+    'iTOW': (4, 'I'),
+    'lon': (8, 'i'),
+    'lat': (12, 'i'),
+    'height': (16, 'i'),
+    'hMSL': (20, 'i'),
+    'lonHp': (24, 'b'),
+    'latHp': (25, 'b'),
+    'heightHp': (26, 'b'),
+    'hMSLHp': (27, 'b'),
+    'hAcc': (28, 'I'),
+    'vAcc': (32, 'I'),
+})
+
+class UBXNavPayload:
+    ''' UBX NAV message payload over a mutable copy of its frame
+
+    Fields are unpacked from the frame on access and packed back
+    in place on edit, the checksum is updated with the delta of the
+    patched bytes. Only the fields in the layout are exposed, so the
+    attribute checks done by the policies and operators still hold. '''
+
+    __slots__ = ('_frame', '_layout')
+
+    def __init__(self, frame: bytearray, layout: UBXNavLayout):
+        self._frame = frame
+        self._layout = layout
+
+    @property
+    def identity(self) -> str:
+        ''' Message identity (eg, NAV-PVT) '''
+        return self._layout.identity
+
+    @property
+    def msg_cls(self) -> bytes:
+        ''' Message class byte '''
+        return bytes(self._frame[2:3])
+
+    @property
+    def msg_id(self) -> bytes:
+        ''' Message id byte '''
+        return bytes(self._frame[3:4])
+
+    def __getattr__(self, name):
+        field = self._layout.fields.get(name)
+        if field is None:
+            raise AttributeError(f"UBX message '{self._layout.identity}' "
+                                 f"does not contain field '{name}'")
+        offset, codec = field
+        return codec.unpack_from(self._frame, offset)[0]
+
+    def set_fields(self, fields: Dict[str, int]):
+        ''' Patch the fields in the frame and update its checksum '''
+        patches = []
+        for name, value in fields.items():
+            field = self._layout.fields.get(name)
+            if field is None:
+                raise AttributeError(f"UBX message '{self._layout.identity}' "
+                                     f"does not contain field '{name}'")
+            # NOTE pack everything upfront so a bad value leaves the frame untouched
+            offset, codec = field
+            patches.append((offset, codec.pack(value)))
+        frame = self._frame
+        size = len(frame) - UBX_CHECKSUM_SIZE - 2
+        ck_a, ck_b = frame[-2], frame[-1]
+        for offset, data in patches:
+            for index, value in enumerate(data, offset):
+                delta = value - frame[index]
+                frame[index] = value
+                if delta:
+                    ck_a += delta
+                    # NOTE byte k (counted from the class byte) is added into
+                    #      CK_B once per byte from k to the end of the payload
+                    ck_b += (size - (index - 2)) * delta
+        frame[-2] = ck_a & 0xFF
+        frame[-1] = ck_b & 0xFF
+
+    def serialize(self) -> bytes:
+        ''' Frame bytes, including the updated checksum '''
+        return bytes(self._frame)
+
+    def __eq__(self, other):
+        if not isinstance(other, UBXNavPayload):
+            return NotImplemented
+        return self._frame == other._frame
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)}' for name in self._layout.fields)
+        return f'<UBX({self._layout.identity}, {fields})>'
+
+class UBXNavCodec:
+    ''' Parses the UBX NAV position messages into patchable payloads,
+    other messages (or layouts of unexpected length) go to the fallback.
+    The checksum check can be skipped when the frames are validated upstream. '''
+
+    LAYOUTS = {
+        bytes(b'\x01\x02'): NAV_POSLLH,
+        bytes(b'\x01\x07'): NAV_PVT,
+        bytes(b'\x01\x14'): NAV_HPPOSLLH,
+    }
+
+    def __init__(self, fallback: Callable[[Frame], Any], validate: bool = True):
+        self.__fallback = fallback
+        self.__validate = validate
+
+    def parse(self, frame: Frame) -> Any:
+        ''' Validate and decode the frame '''
+        layout = self.LAYOUTS.get(bytes(frame[2:4]))
+        if layout is None or len(frame) != UBX_HEADER_SIZE + layout.length + UBX_CHECKSUM_SIZE:
+            return self.__fallback(frame)
+        if self.__validate and ubx_checksum(frame[2:-2]) != (frame[-2], frame[-1]):
+            raise UBXNavCodecError(layout.identity, 'checksum mismatch')
+        return UBXNavPayload(bytearray(frame), layout)
@@ -3,8 +3,10 @@ xHoundPi program module facade
 '''
 
 # standard libs
+import os
 import signal
 import sys
+import multiprocessing
 import asyncio
 import uuid
 import decimal
@@ -14,10 +16,6 @@ import structlog
 import numpy as np
 from PIL import Image, ImageFont, ImageDraw
 
-# parsing libs
-import pyubx2
-import pynmea2
-
 # extensions and decorators (patch types on load)
 # pylint: disable=unused-import
 import xhoundpi.gnss_service_decorators
@@ -37,37 +35,50 @@ from .panel.fakepanel import GifDisplay, PyGameDisplay
 # pylint: disable=line-too-long
 from .config import display_mode
 from .time import StopWatch
-from .serial import StubSerialBinary
-from .queue_pump import AsyncPump
+from .serial import AsyncSerial, MmapReplaySerial, OutputSerial, SerialClosedError
+from .queue_pump import BatchAsyncPump, FlattenAsyncPump
+from .queue_overflow import OverflowPolicy, SheddingQueue
+from .message_priority import HeaderPriorityClassifier, Priority
 from .message import Message
+from .epoch import Epoch, EpochAssembler, EpochAssemblerPump
 from .gnss_client import GnssClient
 from .proto_class import ProtocolClass
 from .proto_classifier import ProtocolClassifier
+from .message_router import HeaderMessageRouter
+from .frame_validator import ChecksumFrameValidator
+from .message_route import Route
 from .proto_reader import ProtocolReaderProvider, UBXProtocolReader, NMEAProtocolReader
-from .proto_parser import ProtocolParserProvider, UBXProtocolParser, NMEAProtocolParser
-from .proto_serializer import ProtocolSerializerProvider, UBXProtocolSerializer, NMEAProtocolSerializer
+from .proto_parser import ProtocolParserProvider
+from .proto_serializer import ProtocolSerializerProvider
+from .proto_backend import create_backend
 from .gnss_service import GnssService
 from .gnss_service_runner import GnssServiceRunner
-from .data_formatter import NMEADataFormatter, UBXDataFormatter
-from .message_editor import NMEAMessageEditor, UBXMessageEditor
+from .gnss_ring_service import GnssRingService, GnssRingFeeder
+from .frame_ring import FrameRingReader, FrameRingWriter
+from .message_editor import NMEAMessageEditor, UBXMessageEditor, UBXNavMessageEditor
 from .coordinates_extractor import CoordinatesExtractor
 from .orientation import EulerAngles, StaticOrientationProvider
 from .coordinates_provider import DynamicCoordinatesProvider, StaticCoordinatesProvider
-from .conversion_factor import DistAngleFactorProvider
-from .coordinates_offset import GeoCoordinates, ICoordinatesOffsetProvider, OrientationOffsetProvider, StaticOffsetProvider
-from .operator import NMEAOffsetOperator, UBXOffsetOperator, UBXHiResOffsetOperator
+from .coordinates_offset import GeoCoordinates, ICoordinatesOffsetProvider, StaticOffsetProvider
+from .math_tier import create_math_tier
+from .operator import (NMEAOffsetOperator, UBXOffsetOperator, UBXHiResOffsetOperator,
+    UBXFixedOffsetOperator, UBXHiResFixedOffsetOperator)
 from .operator_provider import CoordinateOperationProvider
 from .message_policy_provider import OnePolicyProvider
-from .message_policy import HasLocationPolicy
+from .message_policy import HasLocationPolicy, HeaderIdentityPolicy
 from .processor import CompositeProcessor, NullProcessor, GenericProcessor
 from .events import AppEvent, MetricsReport
-from .metric import LatencyMetric, ValueMetric, SuccessCounterMetric, MetricsCollection
-from .async_ext import loop_forever_async
+from .metric import LatencyMetric, CounterMetric, ValueMetric, SuccessCounterMetric, ReportedMetric, MetricsCollection
+from .async_ext import loop_forever_async, wait_readable
 from .dmath import setup_common_context, DECIMAL0
 # pylint: enable=line-too-long
 
 logger = structlog.get_logger('xhoundpi')
 
+# the pipeline is drained once its queues are seen empty this many checks in a row
+DRAIN_IDLE_CHECKS = 3
+DRAIN_CHECK_INTERVAL = 0.01
+
 # pylint: disable=too-many-instance-attributes,too-many-public-methods
 class XHoundPi:
     '''
@@ -78,11 +89,14 @@ class XHoundPi:
         self._config = config
         self._tasks = []
         self._tasks_gather = None
+        self._exit_code = None
+        self._cleanups = []
         self._setup_signals()
         self._setup_decimal_context()
+        self._math_tier = create_math_tier(config.math_tier)
+        self._setup_metrics()
         self._setup_queues()
         self._setup_location_provider()
-        self._setup_metrics()
         self._setup_metrics_logger()
         self._setup_display()
         self._setup_gnss_service()
@@ -101,8 +115,14 @@ class XHoundPi:
                 signal_name = str(signal.Signals(self._signal)).removeprefix('Signals.') # pylint: disable=no-member
                 logger.warning(AppEvent(f'Received signal \'{signal_name}\', exiting now'))
                 return 0
+            if self._exit_code is not None:
+                return self._exit_code
             logger.exception(AppEvent('Running tasks unexpectedly cancelled'))
             return 1
+        finally:
+            # NOTE in reverse, resources are released after the ones depending on them
+            for cleanup in reversed(self._cleanups):
+                cleanup()
 
     def _setup_signals(self):
         '''
@@ -130,6 +150,58 @@ class XHoundPi:
         if self._tasks_gather:
             self._tasks_gather.cancel()
 
+    def _exit(self, exit_code: int):
+        '''
+        Stop running the tasks, run returns the exit code
+        '''
+        self._exit_code = exit_code
+        if self._tasks_gather:
+            self._tasks_gather.cancel()
+
+    async def _run_until_input_closed(self, runner):
+        '''
+        Run the GNSS service runner until the GNSS input is closed, then exit
+        '''
+        try:
+            await runner
+        except SerialClosedError as ex:
+            self._exit_input_closed(ex)
+
+    async def _exit_when_drained(self):
+        '''
+        Wait for the GNSS input to be closed and for the messages read
+        before to go through the pipeline, then exit
+        '''
+        error = await self._gnss_service_runner.wait_closed()
+        await self._drain_pipeline()
+        self._exit_input_closed(error)
+
+    def _exit_input_closed(self, error: SerialClosedError):
+        '''
+        Exit once the GNSS input is closed, a mock input is only
+        closed once all its passes were replayed (a success)
+        '''
+        if self._config.mock_gnss:
+            logger.info(AppEvent(f'GNSS mock input completed, {error.details}, exiting now'))
+            self._exit(0)
+        else:
+            logger.error(AppEvent(f'GNSS input closed, {error.details}, exiting now'))
+            self._exit(1)
+
+    async def _drain_pipeline(self):
+        '''
+        Wait until the pipeline queues stay empty and no epoch is being assembled
+        '''
+        queues = [self._gnss_inbound_queue, self._gnss_processed_queue, self._gnss_outbound_queue]
+        if self._config.epoch_assembly:
+            queues.append(self._gnss_epoch_queue)
+        idle = 0
+        while idle < DRAIN_IDLE_CHECKS:
+            await asyncio.sleep(DRAIN_CHECK_INTERVAL)
+            drained = all(queue.empty() for queue in queues) and (
+                not self._config.epoch_assembly or self._epoch_assembler.current is None)
+            idle = idle + 1 if drained else 0
+
     @staticmethod
     def _setup_decimal_context():
         '''
@@ -144,15 +216,26 @@ class XHoundPi:
         '''
         self._location_provider = DynamicCoordinatesProvider()
         extractor = CoordinatesExtractor(
-            nmea_formatter=NMEADataFormatter(),
-            ubx_formatter=UBXDataFormatter())
+            nmea_formatter=self._math_tier.nmea_formatter(),
+            ubx_formatter=self._math_tier.ubx_formatter())
         policy = HasLocationPolicy()
+        def qualifies(msg: Message):
+            return msg.route is Route.PROCESS and policy.qualifies(msg)
         def update_location(msg: Message):
-            if policy.qualifies(msg):
+            if qualifies(msg):
                 coordinates = extractor.extract_coordinates(msg)
                 self._location_provider.update(coordinates)
-        self._gnss_inbound_queue = \
-            self._gnss_inbound_queue.with_callback(update_location) # type: ignore
+        def update_epoch_location(epoch: Epoch):
+            # NOTE only the latest location of the epoch is kept
+            msg = epoch.latest(qualifies)
+            if msg is not None:
+                self._location_provider.update(extractor.extract_coordinates(msg))
+        if self._config.epoch_assembly:
+            self._gnss_epoch_queue = \
+                self._gnss_epoch_queue.with_callback(update_epoch_location) # type: ignore
+        else:
+            self._gnss_inbound_queue = \
+                self._gnss_inbound_queue.with_callback(update_location) # type: ignore
 
     def _setup_display(self):
         '''
@@ -164,7 +247,8 @@ class XHoundPi:
         else:
             self.setup_frame_buffer()
             self._gnss_processed_queue = (self._gnss_processed_queue
-                .with_callback(self.update_frame)) # type: ignore
+                .with_callback(self.update_epoch_frame # type: ignore
+                    if self._config.epoch_assembly else self.update_frame))
             if self._config.display_driver == 'pygame':
                 self.setup_display_pygame()
             elif self._config.display_driver == 'gif':
@@ -203,7 +287,7 @@ class XHoundPi:
         '''
         POC method to update frame, used as a callback after changes
         '''
-        if HasLocationPolicy().qualifies(message):
+        if message.route is Route.PROCESS and HasLocationPolicy().qualifies(message):
             geometry = self._frame_buff.geometry
             text_im = self._make_text(geometry,
                 f'lat:{message.payload.lat}\n'
@@ -211,6 +295,15 @@ class XHoundPi:
             np.copyto(self._frame_buff.canvas, text_im)
             self._frame_buff.update()
 
+    def update_epoch_frame(self, epoch: Epoch):
+        '''
+        Update the frame once per epoch, with its latest location
+        '''
+        message = epoch.latest(lambda msg:
+            msg.route is Route.PROCESS and HasLocationPolicy().qualifies(msg))
+        if message is not None:
+            self.update_frame(message)
+
     def _make_text(self, geometry: Geometry, text):
         '''
         Generate text
@@ -229,12 +322,35 @@ class XHoundPi:
         self._metric_hooks = []
         self._metrics = MetricsCollection([
             # gnss service
+            # NOTE gnss_service_write_latency times handing the message to the GNSS
+            #      client, with write coalescing that only holds the message and
+            #      gnss_client_write_latency times it until it is written out
             ValueMetric('gnss_client_read_bytes', self._metric_hooks),
             ValueMetric('gnss_client_written_bytes', self._metric_hooks),
+            SuccessCounterMetric('gnss_client_flush_counter', self._metric_hooks),
+            LatencyMetric('gnss_client_flush_latency', StopWatch(), self._metric_hooks),
+            LatencyMetric('gnss_client_write_latency', StopWatch(), self._metric_hooks),
+            ValueMetric('gnss_classifier_discarded_bytes', self._metric_hooks),
+            CounterMetric('gnss_validator_ubx_rejected', self._metric_hooks),
+            CounterMetric('gnss_validator_nmea_rejected', self._metric_hooks),
             SuccessCounterMetric('gnss_service_read_counter', self._metric_hooks),
             SuccessCounterMetric('gnss_service_write_counter', self._metric_hooks),
             LatencyMetric('gnss_service_read_latency', StopWatch(), self._metric_hooks),
             LatencyMetric('gnss_service_write_latency', StopWatch(), self._metric_hooks),
+            # epochs (success when complete, failure when timed out)
+            SuccessCounterMetric('epoch_assembler_counter', self._metric_hooks),
+            # frame reader process (multi-process mode)
+            ReportedMetric('frame_reader', self._metric_hooks),
+            # queues
+            CounterMetric('gnss_inbound_queue_dropped', self._metric_hooks),
+            CounterMetric('gnss_processed_queue_dropped', self._metric_hooks),
+            CounterMetric('gnss_outbound_queue_dropped', self._metric_hooks),
+            CounterMetric('gnss_inbound_queue_shed_low', self._metric_hooks),
+            CounterMetric('gnss_processed_queue_shed_low', self._metric_hooks),
+            CounterMetric('gnss_outbound_queue_shed_low', self._metric_hooks),
+            CounterMetric('gnss_inbound_queue_shed_normal', self._metric_hooks),
+            CounterMetric('gnss_processed_queue_shed_normal', self._metric_hooks),
+            CounterMetric('gnss_outbound_queue_shed_normal', self._metric_hooks),
             # processors
             SuccessCounterMetric('null_processor_counter', self._metric_hooks),
             SuccessCounterMetric('zero_offset_processor_counter', self._metric_hooks),
@@ -248,6 +364,9 @@ class XHoundPi:
             LatencyMetric('negative_offset_processor_latency', StopWatch(), self._metric_hooks),
             LatencyMetric('zero_offset_orientation_processor_latency', StopWatch(), self._metric_hooks),
             LatencyMetric('positive_offset_orientation_processor_latency', StopWatch(), self._metric_hooks),
+            # offsets
+            CounterMetric('offset_cache_hits', self._metric_hooks),
+            CounterMetric('offset_cache_misses', self._metric_hooks),
         ])
 
     def _setup_metrics_logger(self):
@@ -269,25 +388,80 @@ class XHoundPi:
         '''
         Setup program queues
         '''
-        self._gnss_inbound_queue = asyncio.queues.Queue(self._config.buffer_capacity)
-        self._gnss_outbound_queue = asyncio.queues.Queue(self._config.buffer_capacity)
-        self._gnss_processed_queue = asyncio.queues.Queue(self._config.buffer_capacity)
+        self._message_priority_classifier = self._create_message_priority_classifier()
+        self._gnss_inbound_queue = self._create_queue(
+            'gnss_inbound_queue', self._config.gnss_inbound_queue_policy)
+        self._gnss_outbound_queue = self._create_queue(
+            'gnss_outbound_queue', self._config.gnss_outbound_queue_policy)
+        if self._config.epoch_assembly:
+            # NOTE whole epochs are queued between the assembler and the message
+            #      pump, the overflow policies only apply to the messages queues
+            self._gnss_epoch_queue = asyncio.queues.Queue(self._config.buffer_capacity)
+            self._gnss_processed_queue = asyncio.queues.Queue(self._config.buffer_capacity)
+        else:
+            self._gnss_processed_queue = self._create_queue(
+                'gnss_processed_queue', self._config.gnss_processed_queue_policy)
+
+    def _create_queue(self, name: str, policy: str):
+        '''
+        Create a bounded queue that sheds the low priority messages past
+        the high watermark, when full it sheds messages (counted as dropped)
+        under the non blocking policies so a slow sink does not stall the reads
+        '''
+        capacity = self._config.buffer_capacity
+        return SheddingQueue(capacity,
+            classifier=self._message_priority_classifier,
+            high_watermark=int(capacity * self._config.queue_high_watermark),
+            low_watermark=int(capacity * self._config.queue_low_watermark),
+            shed={
+                Priority.LOW: getattr(self._metrics, f'{name}_shed_low'),
+                Priority.NORMAL: getattr(self._metrics, f'{name}_shed_normal'),
+            },
+            policy=OverflowPolicy(policy),
+            dropped=getattr(self._metrics, f'{name}_dropped'))
+
+    def _create_message_priority_classifier(self): # pylint: disable=no-self-use
+        '''
+        Wire up the header based priority classifier, the position
+        messages are kept flowing and the satellite/text ones shed first
+        '''
+        return HeaderPriorityClassifier({
+            ProtocolClass.UBX: {
+                bytes(b'\x01\x02') : Priority.HIGH, # NAV-POSLLH
+                bytes(b'\x01\x07') : Priority.HIGH, # NAV-PVT
+                bytes(b'\x01\x14') : Priority.HIGH, # NAV-HPPOSLLH
+                bytes(b'\x28\x00') : Priority.HIGH, # HNR-PVT
+                bytes(b'\x01\x30') : Priority.LOW, # NAV-SVINFO
+                bytes(b'\x01\x35') : Priority.LOW, # NAV-SAT
+                bytes(b'\x01\x43') : Priority.LOW, # NAV-SIG
+            },
+            ProtocolClass.NMEA: {
+                bytes(b'GGA') : Priority.HIGH,
+                bytes(b'RMC') : Priority.HIGH,
+                bytes(b'GNS') : Priority.HIGH,
+                bytes(b'GLL') : Priority.HIGH,
+                bytes(b'PUBX') : Priority.HIGH, # PUBX,00 position
+                bytes(b'GSV') : Priority.LOW,
+                bytes(b'GSA') : Priority.LOW,
+                bytes(b'TXT') : Priority.LOW,
+            },
+        }, default=Priority.NORMAL)
 
     def _setup_gnss_service(self):
         '''
-        Ensure all GNSS service dependencies are setup
-        '''
-        self._gnss_client = self._create_gnss_client()
-        self._gnss_protocol_classifier = self._create_protocol_classifier()
-        self._gnss_protocol_reader_provider = self._create_protocol_reader_provider()
-        self._gnss_protocol_parser_provider = self._create_protocol_parser_provider()
-        self._gnss_protocol_serializer_provider = self._create_protocol_serializer_provider()
-        self._gnss_service = (GnssService( # pylint: disable=no-member
-            gnss_client=self._gnss_client,
-            classifier=self._gnss_protocol_classifier,
-            reader_provider=self._gnss_protocol_reader_provider,
-            parser_provider=self._gnss_protocol_parser_provider,
-            serializer_provider=self._gnss_protocol_serializer_provider)
+        Ensure all GNSS service dependencies are setup, in multi-process mode
+        the messages are read from the frames published by the frame reader
+        process and only written through the (output only) GNSS client of this process
+        '''
+        if self._config.multiprocess:
+            self._setup_frame_reader_process()
+        gnss_service = self._create_gnss_service(output_only=self._config.multiprocess)
+        if self._config.multiprocess:
+            gnss_service = GnssRingService(
+                ring=self._frame_ring,
+                parser_provider=self._gnss_protocol_parser_provider,
+                writer=gnss_service)
+        self._gnss_service = (gnss_service # pylint: disable=no-member
             .with_events(logger=logger) # type: ignore
             .with_metrics(
                 # pylint: disable=no-member
@@ -298,41 +472,220 @@ class XHoundPi:
         self._gnss_service_runner = GnssServiceRunner(
             gnss_service=self._gnss_service,
             inbound_queue=self._gnss_inbound_queue,
-            outbound_queue=self._gnss_outbound_queue)
+            outbound_queue=self._gnss_outbound_queue,
+            read_batch_size=self._config.gnss_read_batch_size)
         self._tasks.append(asyncio.create_task(
             self._gnss_service_runner.run(), name='gnss_service'))
+        self._tasks.append(asyncio.create_task(
+            self._exit_when_drained(), name='gnss_drain'))
+
+    def _create_gnss_service(self, output_only: bool = False):
+        '''
+        Create the GNSS service and its dependencies, output
+        only services write to a GNSS client that never reads
+        '''
+        self._gnss_client = self._create_gnss_output_client() \
+            if output_only else self._create_gnss_client()
+        self._gnss_protocol_classifier = self._create_protocol_classifier()
+        self._gnss_protocol_reader_provider = self._create_protocol_reader_provider()
+        self._gnss_protocol_backends = self._create_protocol_backends()
+        self._gnss_protocol_parser_provider = self._create_protocol_parser_provider()
+        self._gnss_protocol_serializer_provider = self._create_protocol_serializer_provider()
+        return GnssService(
+            gnss_client=self._gnss_client,
+            classifier=self._gnss_protocol_classifier,
+            reader_provider=self._gnss_protocol_reader_provider,
+            parser_provider=self._gnss_protocol_parser_provider,
+            serializer_provider=self._gnss_protocol_serializer_provider,
+            router=self._create_message_router(),
+            validator=self._create_frame_validator(),
+            flush_policy=self._create_epoch_end_policy())
+
+    def _setup_frame_reader_process(self):
+        '''
+        Start the frame reader process, it publishes the frames read on a
+        shared memory ring and reports its metrics back to be aggregated
+        '''
+        # NOTE the process is started before the GNSS client of this
+        #      process is created so it does not inherit its transports
+        self._frame_ring = FrameRingReader.create(self._config.frame_ring_capacity)
+        metrics_rx, metrics_tx = multiprocessing.Pipe(duplex=False)
+        self._frame_reader_process = multiprocessing.Process(
+            target=run_frame_reader,
+            args=(self._config, self._frame_ring.handle, metrics_tx),
+            name='frame_reader',
+            daemon=True)
+        self._frame_reader_process.start()
+        self._frame_ring.detach_writer()
+        metrics_tx.close()
+        self._cleanups.append(self._stop_frame_reader_process)
+
+        async def collect_metrics():
+            try:
+                while True:
+                    await wait_readable(metrics_rx)
+                    self._metrics.frame_reader.update(metrics_rx.recv()) # type: ignore # pylint: disable=no-member
+            except EOFError:
+                metrics_rx.close()
+        async def watch_process():
+            await wait_readable(self._frame_reader_process.sentinel)
+            exit_code = self._frame_reader_process.exitcode
+            # NOTE once completed the ring input is closed after its frames are read
+            if exit_code == 0:
+                logger.info(AppEvent('Frame reader process completed'))
+            else:
+                logger.error(AppEvent(f'Frame reader process exited with code {exit_code}'))
+                self._exit(1)
+        self._tasks.append(asyncio.create_task(
+            collect_metrics(), name='frame_reader_metrics'))
+        self._tasks.append(asyncio.create_task(
+            watch_process(), name='frame_reader_watch'))
+
+    def _stop_frame_reader_process(self):
+        '''
+        Stop the frame reader process and destroy the frame ring
+        '''
+        if self._frame_reader_process.is_alive():
+            self._frame_reader_process.terminate()
+        self._frame_reader_process.join()
+        self._frame_ring.close()
 
     def _create_gnss_client(self):
         '''
         Create a GNSS client
         '''
-        gnss_serial = self._create_gnss_serial()
-        return (GnssClient(gnss_serial) # pylint: disable=no-member
+        return (self._decorate_gnss_client(self._create_gnss_serial())
+            # NOTE the buffer must be the outermost decorator, the classifier
+            #      and readers only peek and slice on buffered clients
+            .with_buffer(
+                capacity=self._config.gnss_buffer_capacity,
+                chunk_size=self._config.gnss_read_chunk_size))
+
+    def _create_gnss_output_client(self):
+        '''
+        Create a GNSS client that only writes, its transport is opened
+        for output only (the input is read by another process)
+        '''
+        return self._decorate_gnss_client(self._create_gnss_output_serial())
+
+    def _decorate_gnss_client(self, gnss_serial):
+        '''
+        Wrap the GNSS serial in a client with metrics and write coalescing
+        '''
+        gnss_client = (GnssClient(gnss_serial) # pylint: disable=no-member
             .with_metrics( # type: ignore
                 # pylint: disable=no-member
                 cbytes_read=self._metrics.gnss_client_read_bytes, # type: ignore
                 cbytes_written=self._metrics.gnss_client_written_bytes)) # type: ignore
+        if self._config.gnss_write_coalescing_size:
+            gnss_client = gnss_client.with_write_coalescing( # type: ignore
+                size_threshold=self._config.gnss_write_coalescing_size,
+                deadline=self._config.gnss_write_coalescing_deadline,
+                counter=self._metrics.gnss_client_flush_counter, # type: ignore # pylint: disable=no-member
+                latency=self._metrics.gnss_client_flush_latency, # type: ignore # pylint: disable=no-member
+                logger=logger,
+                write_latency=self._metrics.gnss_client_write_latency) # type: ignore # pylint: disable=no-member
+            self._cleanups.append(gnss_client.flush)
+        return gnss_client
 
     def _create_gnss_serial(self):
         '''
         Resolves the GNSS serial com based on configuration
         '''
-         # pylint: disable=consider-using-with,bad-option-value
         if self._config.mock_gnss:
-            transport_rx = open(self._config.gnss_mock_input, mode='rb')
-            transport_tx = open(self._config.gnss_mock_output, mode='wb')
-            return StubSerialBinary(transport_rx, transport_tx) # type: ignore
-        raise NotImplementedError("Currently only supporting GNSS input from mock file")
+            return self._create_replay_serial(self._config.gnss_mock_output)
+        if self._config.gnss_device:
+            serial = AsyncSerial.open(self._config.gnss_device)
+            self._cleanups.append(serial.close)
+            return serial
+        raise NotImplementedError("No GNSS input configured, provide a device or a mock file")
+
+    def _create_gnss_output_serial(self):
+        '''
+        Resolves the output only GNSS serial com based on configuration,
+        the mock input is not mapped and the device is opened write only
+        '''
+        if self._config.mock_gnss:
+            transport_tx = open(self._config.gnss_mock_output, mode='wb') # pylint: disable=consider-using-with
+            self._cleanups.append(transport_tx.close)
+            return OutputSerial(transport_tx) # type: ignore
+        if self._config.gnss_device:
+            serial = AsyncSerial.open(self._config.gnss_device, output_only=True)
+            self._cleanups.append(serial.close)
+            return serial
+        raise NotImplementedError("No GNSS output configured, provide a device or a mock file")
+
+    def _create_replay_serial(self, output: str):
+        '''
+        Replay the GNSS mock input capture, writing to the output file
+        '''
+         # pylint: disable=consider-using-with,bad-option-value
+        transport_rx = open(self._config.gnss_mock_input, mode='rb')
+        self._cleanups.append(transport_rx.close)
+        transport_tx = open(output, mode='wb')
+        self._cleanups.append(transport_tx.close)
+        serial = MmapReplaySerial(transport_rx, transport_tx, # type: ignore
+            passes=self._config.gnss_mock_passes)
+        self._cleanups.append(serial.close)
+        return serial
 
-    def _create_protocol_classifier(self): # pylint: disable=no-self-use
+    def _create_protocol_classifier(self):
         '''
         Wire up a protocol classifier
         '''
         classifications = {
             bytes(b'\x24') : ProtocolClass.NMEA,
+            bytes(b'\x21') : ProtocolClass.NMEA,
             bytes(b'\xb5\x62') : ProtocolClass.UBX
         }
-        return ProtocolClassifier(classifications)
+        return ProtocolClassifier(classifications,
+            discarded_bytes=self._metrics.gnss_classifier_discarded_bytes) # type: ignore # pylint: disable=no-member
+
+    def _create_frame_validator(self):
+        '''
+        Wire up the checksum validator for the raw frames
+        '''
+        return ChecksumFrameValidator({
+            ProtocolClass.UBX: self._metrics.gnss_validator_ubx_rejected, # type: ignore # pylint: disable=no-member
+            ProtocolClass.NMEA: self._metrics.gnss_validator_nmea_rejected, # type: ignore # pylint: disable=no-member
+        })
+
+    def _create_epoch_end_policy(self):
+        '''
+        Wire up the policy for the messages that close a GNSS epoch, the
+        coalesced output is flushed after writing them. The NMEA sentences
+        closing the epoch depend on the receiver output configuration
+        '''
+        return HeaderIdentityPolicy({
+            ProtocolClass.UBX: {
+                bytes(b'\x01\x61'), # NAV-EOE
+            },
+            ProtocolClass.NMEA: {
+                sentence.strip().encode('ascii')
+                for sentence in self._config.epoch_end_nmea.split(',') if sentence.strip()
+            },
+        })
+
+    def _create_message_router(self): # pylint: disable=no-self-use
+        '''
+        Wire up the header based message router, only
+        messages that may carry a location are processed
+        '''
+        return HeaderMessageRouter({
+            ProtocolClass.UBX: {
+                bytes(b'\x01\x02') : Route.PROCESS, # NAV-POSLLH
+                bytes(b'\x01\x07') : Route.PROCESS, # NAV-PVT
+                bytes(b'\x01\x14') : Route.PROCESS, # NAV-HPPOSLLH
+                bytes(b'\x28\x00') : Route.PROCESS, # HNR-PVT
+            },
+            ProtocolClass.NMEA: {
+                bytes(b'GGA') : Route.PROCESS,
+                bytes(b'RMC') : Route.PROCESS,
+                bytes(b'GNS') : Route.PROCESS,
+                bytes(b'GLL') : Route.PROCESS,
+                bytes(b'PUBX') : Route.PROCESS, # PUBX,00 position
+            },
+        }, default=Route.PASSTHROUGH)
 
     def _create_protocol_reader_provider(self): # pylint: disable=no-self-use
         '''
@@ -346,30 +699,34 @@ class XHoundPi:
         }
         return ProtocolReaderProvider(gnss_protocol_reader_mappings)
 
-    def _create_protocol_parser_provider(self): # pylint: disable=no-self-use
+    def _create_protocol_backends(self):
+        '''
+        Create the parser/serializer backend configured for each protocol
+        '''
+        # NOTE the frame checksums are checked by the frame validator on read
+        return {
+            ProtocolClass.UBX: create_backend(
+                ProtocolClass.UBX, self._config.gnss_ubx_backend, validated=True),
+            ProtocolClass.NMEA: create_backend(
+                ProtocolClass.NMEA, self._config.gnss_nmea_backend, validated=True),
+        }
+
+    def _create_protocol_parser_provider(self):
         '''
         Wire up and return the protocol parsers inside a parser provider
         '''
-        gnss_ubx_frame_parser = UBXProtocolParser(
-            lambda frame: pyubx2.UBXReader.parse(frame, validate=True))
-        gnss_nmea_frame_parser = NMEAProtocolParser(
-            lambda frame: pynmea2.parse(frame.decode(), check=True))
+        # NOTE parsers are invoked lazily on the frame copies held by
+        #      the messages, entry points accept any Frame type though
         return ProtocolParserProvider({
-            ProtocolClass.UBX : gnss_ubx_frame_parser,
-            ProtocolClass.NMEA : gnss_nmea_frame_parser
+            protocol: backend.parser for protocol, backend in self._gnss_protocol_backends.items()
         })
 
-    def _create_protocol_serializer_provider(self): # pylint: disable=no-self-use
+    def _create_protocol_serializer_provider(self):
         '''
         Wire up and return the protocol serializers inside a serializers provider
         '''
-        gnss_ubx_serializer = UBXProtocolSerializer(
-            lambda message: message.payload.serialize())
-        gnss_nmea_serializer = NMEAProtocolSerializer(
-            lambda message: bytearray(message.payload.render(newline=True), 'ascii'))
         return ProtocolSerializerProvider({
-            ProtocolClass.UBX : gnss_ubx_serializer,
-            ProtocolClass.NMEA : gnss_nmea_serializer
+            protocol: backend.serializer for protocol, backend in self._gnss_protocol_backends.items()
         })
 
     def _setup_processors(self):
@@ -378,9 +735,11 @@ class XHoundPi:
         '''
         # TODO cleanup this method!
         # pylint: disable=no-member
-        zero_offset = DECIMAL0
-        pos_offset = decimal.Decimal('0.005')
-        neg_offset = decimal.Decimal('-0.005')
+        # NOTE the offsets are computed in the number type of the configured math tier
+        tier = self._math_tier
+        zero_offset = tier.number(DECIMAL0)
+        pos_offset = tier.number(decimal.Decimal('0.005'))
+        neg_offset = tier.number(decimal.Decimal('-0.005'))
         orientation_zero = StaticOrientationProvider(EulerAngles(yaw=DECIMAL0, pitch=DECIMAL0, roll=DECIMAL0))
         # orientation_non_zero = StaticOrientationProvider(EulerAngles(yaw=DECIMAL1, pitch=DECIMAL1, roll=DECIMAL1))
         coords_provider = StaticCoordinatesProvider(GeoCoordinates(DECIMAL0, DECIMAL0, DECIMAL0))
@@ -390,6 +749,18 @@ class XHoundPi:
         #      factor calculator upon request, it is functional and wired but not adequate for the emulation
         #      scenario because we cannot control the value
         # see ref: https://github.com/dacabdi/xhoundpi/issues/42
+        self._current_epoch_id = None
+        # NOTE the orientation based offset is only recomputed when the orientation, the
+        #      location or the epoch being processed change (no epochs unless assembled)
+        self._orientation_offset_provider = (
+            tier.orientation_offset_provider(orientation_zero, DECIMAL0)
+                .with_conversion(tier.dist_angle_factor_provider(coords_provider).with_inversion()) # type: ignore
+                .with_cache(
+                    orientation=orientation_zero,
+                    location=coords_provider,
+                    epoch=lambda: self._current_epoch_id,
+                    hits=self._metrics.offset_cache_hits, # type: ignore
+                    misses=self._metrics.offset_cache_misses)) # type: ignore
         self._processors = CompositeProcessor([
             NullProcessor()
                 .with_events(logger=logger) # type: ignore
@@ -413,10 +784,7 @@ class XHoundPi:
                 latency=self._metrics.negative_offset_processor_latency), # type: ignore
             self._make_offset_generic_processor(
                 name='ZeroOffsetOrientationBasedProcessor',
-                offset_provider=(
-                    OrientationOffsetProvider(orientation_zero, radius=DECIMAL0)\
-                        .with_conversion(DistAngleFactorProvider(coords_provider).with_inversion()) # type: ignore
-                ),
+                offset_provider=self._orientation_offset_provider,
                 counter=self._metrics.zero_offset_orientation_processor_counter, # type: ignore
                 latency=self._metrics.zero_offset_orientation_processor_latency), # type: ignore
             # TODO activate these once we address the issue with 1-off results at hi res levels
@@ -430,16 +798,52 @@ class XHoundPi:
             #     offset_provider=OrientationOffsetProvider(orientation_non_zero, -DECIMAL1),
             #     counter=self._metrics.negative_offset_processor_counter, # type: ignore
             #     latency=self._metrics.negative_offset_processor_latency), # type: ignore
-        ])
-        self.processors_pipeline = AsyncPump(
+        ]).with_route_bypass() # type: ignore
+        if self._config.epoch_assembly:
+            self._setup_epoch_processors()
+            return
+        # NOTE messages queued together are transformed and forwarded as a batch
+        self.processors_pipeline = BatchAsyncPump(
              # pylint: disable=no-member
             input_queue=(self._gnss_inbound_queue # type: ignore
                 .with_transform(self._processors.process) # type: ignore
                 .with_transform(lambda result: result[1])),
-            output_queue=self._gnss_processed_queue)
+            output_queue=self._gnss_processed_queue,
+            batch_size=self._config.pipeline_batch_size)
+        self._tasks.append(asyncio.create_task(
+            self.processors_pipeline.run(), name='processors_pipeline'))
+
+    def _setup_epoch_processors(self):
+        '''
+        Setup the epoch assembler and the processors pipeline over whole epochs
+        '''
+        self._epoch_assembler = EpochAssembler(
+            end_policy=self._create_epoch_end_policy(),
+            counter=self._metrics.epoch_assembler_counter) # type: ignore # pylint: disable=no-member
+        self._epoch_assembler_pump = EpochAssemblerPump(
+            input_queue=self._gnss_inbound_queue,
+            output_queue=self._gnss_epoch_queue,
+            assembler=self._epoch_assembler,
+            timeout=self._config.epoch_timeout,
+            batch_size=self._config.pipeline_batch_size)
+        self._tasks.append(asyncio.create_task(
+            self._epoch_assembler_pump.run(), name='epoch_assembler'))
+        self.processors_pipeline = BatchAsyncPump(
+            input_queue=self._gnss_epoch_queue.with_transform(self._process_epoch), # type: ignore
+            output_queue=self._gnss_processed_queue,
+            batch_size=self._config.pipeline_batch_size)
         self._tasks.append(asyncio.create_task(
             self.processors_pipeline.run(), name='processors_pipeline'))
 
+    async def _process_epoch(self, epoch: Epoch) -> Epoch:
+        '''
+        Run the processors over the messages of the epoch, in order
+        '''
+        self._current_epoch_id = epoch.epoch_id
+        epoch.messages = [(await self._processors.process(message))[1]
+            for message in epoch.messages]
+        return epoch
+
     # pylint: disable=too-many-arguments, no-self-use
     def _make_offset_generic_processor(
         self,
@@ -452,21 +856,24 @@ class XHoundPi:
         Composes a generic processor
         that uses fixed offsets operators
         '''
+        ubx_operator, ubx_hires_operator = (
+            (UBXFixedOffsetOperator, UBXHiResFixedOffsetOperator)
+            if self._config.ubx_fixed_point else (UBXOffsetOperator, UBXHiResOffsetOperator))
         return (GenericProcessor(
                 name=name,
                 policy_provider=OnePolicyProvider(HasLocationPolicy()),
                 operator_provider=CoordinateOperationProvider(
                     nmea_operator=NMEAOffsetOperator(
                         msg_editor=NMEAMessageEditor(),
-                        data_formatter=NMEADataFormatter(),
+                        data_formatter=self._math_tier.nmea_formatter(),
                         offset_provider=offset_provider),
-                    ubx_operator=UBXOffsetOperator(
-                        msg_editor=UBXMessageEditor(),
-                        data_formatter=UBXDataFormatter(),
+                    ubx_operator=ubx_operator(
+                        msg_editor=UBXNavMessageEditor(fallback=UBXMessageEditor()),
+                        data_formatter=self._math_tier.ubx_formatter(),
                         offset_provider=offset_provider),
-                    ubx_hires_operator=UBXHiResOffsetOperator(
-                        msg_editor=UBXMessageEditor(),
-                        data_formatter=UBXDataFormatter(),
+                    ubx_hires_operator=ubx_hires_operator(
+                        msg_editor=UBXNavMessageEditor(fallback=UBXMessageEditor()),
+                        data_formatter=self._math_tier.ubx_formatter(),
                         offset_provider=offset_provider),))
                 .with_events(logger=logger) # type: ignore
                 .with_metrics(
@@ -475,9 +882,110 @@ class XHoundPi:
                     latency=latency))
 
     def _setup_msg_pump(self):
-        ''' Temporary msg pump '''
-        self._message_pump = AsyncPump(
+        ''' Temporary msg pump, epochs are split back into their messages '''
+        if self._config.epoch_assembly:
+            self._message_pump = FlattenAsyncPump(
+                input_queue=self._gnss_processed_queue.with_transform( # type: ignore
+                    lambda epoch: epoch.messages),
+                output_queue=self._gnss_outbound_queue,
+                batch_size=self._config.pipeline_batch_size)
+            self._tasks.append(asyncio.create_task(
+                self._message_pump.run(), name='message_pump'))
+            return
+        self._message_pump = BatchAsyncPump(
             input_queue=self._gnss_processed_queue,
-            output_queue=self._gnss_outbound_queue)
+            output_queue=self._gnss_outbound_queue,
+            batch_size=self._config.pipeline_batch_size)
         self._tasks.append(asyncio.create_task(
             self._message_pump.run(), name='message_pump'))
+
+def run_frame_reader(config, ring_handle, metrics_connection):
+    '''
+    Frame reader process entry point
+    '''
+    async def main_async():
+        return await XHoundPiFrameReader(config, ring_handle, metrics_connection).run()
+    sys.exit(asyncio.run(main_async()))
+
+class XHoundPiFrameReader(XHoundPi):
+    '''
+    Frame reader stage of the multi-process mode, reads, frames, validates and
+    routes the GNSS input and publishes the frames on the shared memory ring,
+    the payloads are only parsed by the processors stage as they are accessed
+    '''
+
+    def __init__(self, config, ring_handle, metrics_connection): # pylint: disable=super-init-not-called
+        self._config = config
+        self._tasks = []
+        self._tasks_gather = None
+        self._exit_code = None
+        self._cleanups = []
+        self._setup_signals()
+        self._setup_metrics()
+        self._setup_metrics_reporter(metrics_connection)
+        self._setup_frame_ring_feeder(ring_handle)
+
+    def _setup_metrics(self):
+        '''
+        Setup the read side metrics
+        '''
+        self._metric_hooks = []
+        self._metrics = MetricsCollection([
+            ValueMetric('gnss_client_read_bytes', self._metric_hooks),
+            ValueMetric('gnss_client_written_bytes', self._metric_hooks),
+            SuccessCounterMetric('gnss_client_flush_counter', self._metric_hooks),
+            LatencyMetric('gnss_client_flush_latency', StopWatch(), self._metric_hooks),
+            LatencyMetric('gnss_client_write_latency', StopWatch(), self._metric_hooks),
+            ValueMetric('gnss_classifier_discarded_bytes', self._metric_hooks),
+            CounterMetric('gnss_validator_ubx_rejected', self._metric_hooks),
+            CounterMetric('gnss_validator_nmea_rejected', self._metric_hooks),
+            SuccessCounterMetric('gnss_service_read_counter', self._metric_hooks),
+            SuccessCounterMetric('gnss_service_write_counter', self._metric_hooks),
+            LatencyMetric('gnss_service_read_latency', StopWatch(), self._metric_hooks),
+            LatencyMetric('gnss_service_write_latency', StopWatch(), self._metric_hooks),
+        ])
+
+    def _setup_metrics_reporter(self, connection):
+        '''
+        Setup periodic metrics reports to the main process
+        '''
+        async def periodic_report():
+            connection.send(self._metrics.mappify())
+            await asyncio.sleep(self._config.metrics_logger_freq)
+        if self._config.metrics_logger_freq != 0:
+            self._tasks.append(asyncio.create_task(
+                loop_forever_async(periodic_report), name='metrics_reporter'))
+        self._cleanups.append(connection.close)
+
+    def _setup_frame_ring_feeder(self, ring_handle):
+        '''
+        Setup the GNSS service feeding the frames it reads to the ring
+        '''
+        ring = FrameRingWriter.attach(ring_handle)
+        self._cleanups.append(ring.close)
+        self._gnss_service = (self._create_gnss_service() # pylint: disable=no-member
+            .with_metrics( # type: ignore
+                # pylint: disable=no-member
+                rcounter=self._metrics.gnss_service_read_counter, # type: ignore
+                wcounter=self._metrics.gnss_service_write_counter, # type: ignore
+                rlatency=self._metrics.gnss_service_read_latency, # type: ignore
+                wlatency=self._metrics.gnss_service_write_latency)) # type: ignore
+        # NOTE the payloads cheaper to unpickle than to parse are parsed
+        #      here, off the process running the processors and the display
+        self._frame_ring_feeder = GnssRingFeeder(
+            gnss_service=self._gnss_service,
+            ring=ring,
+            read_batch_size=self._config.gnss_read_batch_size,
+            preparsed={protocol for protocol, backend
+                in self._gnss_protocol_backends.items() if backend.preparse})
+        self._tasks.append(asyncio.create_task(
+            self._run_until_input_closed(self._frame_ring_feeder.run()), name='frame_ring_feeder'))
+
+    def _create_gnss_serial(self):
+        '''
+        Resolves the GNSS serial com based on configuration, the mock
+        output is written by the main process, here it is discarded
+        '''
+        if self._config.mock_gnss:
+            return self._create_replay_serial(os.devnull)
+        return super()._create_gnss_serial()